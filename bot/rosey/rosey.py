@@ -21,8 +21,11 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from common import Shell, get_config, configure_logger  # noqa: E402
+from common.channel_state_service import ChannelStateService  # noqa: E402
 from common.database_service import DatabaseService  # noqa: E402
 from lib import Bot  # noqa: E402
+from lib.channel_state import ChannelStatePublisher  # noqa: E402
+from lib.outbound import PRIORITY_AMBIENT  # noqa: E402
 
 # NATS import
 try:
@@ -147,7 +150,7 @@ class LLMHandlers:
             if self.log_only:
                 self.logger.info("[LOG ONLY] Would respond: %s", response)
             else:
-                await self.bot.chat(response)
+                await self.bot.chat(response, priority=PRIORITY_AMBIENT)
                 self.logger.info("Response sent: %s", response[:100])
 
         except Exception as e:
@@ -197,7 +200,7 @@ class LLMHandlers:
             if self.log_only:
                 self.logger.info("[LOG ONLY] Would greet: %s", response)
             else:
-                await self.bot.chat(response)
+                await self.bot.chat(response, priority=PRIORITY_AMBIENT)
                 self.logger.info("Greeting sent: %s", response[:100])
 
         except Exception as e:
@@ -271,7 +274,12 @@ async def run_bot():
 
     if db_config.get('run_as_service', True):
         print(f"[*] Starting DatabaseService: {db_path}")
-        db_service = DatabaseService(nats, db_path)
+        db_service = DatabaseService(
+            nats,
+            db_path,
+            read_db_path=db_config.get('read_path'),
+            sqlite_read_pool=db_config.get('sqlite_read_pool', False)
+        )
         await db_service.start()
         print("[+] DatabaseService started (listening on NATS)")
     else:
@@ -344,6 +352,23 @@ async def run_bot():
     )
     print("[+] Bot created with NATS integration")
 
+    # Publish channel state snapshots and deltas for NATS consumers
+    state_publisher = None
+    state_config = conf.get('channel_state', {})
+    if state_config.get('enabled', True):
+        state_publisher = ChannelStatePublisher(
+            bot, history=state_config.get('history', ChannelStatePublisher.HISTORY)
+        )
+        await state_publisher.start()
+        print(f"[+] Channel state published on {state_publisher.subject}")
+
+    # Answer channel state queries (who is online, ranks, media) from memory
+    state_service = None
+    if state_publisher and state_config.get('query_service', False):
+        state_service = ChannelStateService(nats, [channel_name])
+        await state_service.start()
+        print("[+] Channel state query service started")
+
     # Create shell (PM command handler) if configured
     shell_config = conf.get("shell", {})
     if isinstance(shell_config, dict) and shell_config.get('enabled', True):
@@ -415,6 +440,12 @@ async def run_bot():
         # Cleanup
         print("\n[*] Shutting down...")
 
+        if state_service:
+            await state_service.stop()
+
+        if state_publisher:
+            await state_publisher.stop()
+
         # Close LLM client if active
         if llm_client:
             await llm_client.__aexit__(None, None, None)
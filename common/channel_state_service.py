@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""NATS request/reply queries over replicated channel state
+
+The bot publishes channel state as snapshots and deltas
+(lib.channel_state.ChannelStatePublisher). This service keeps a
+ChannelStateReplica per channel and answers queries from memory, so
+"who is online" or "what rank is this user" never reaches the bot
+process or the database.
+
+Architecture:
+    Bot → rosey.state.<channel>.delta → ChannelStateService (replica)
+    Plugin → rosey.state.<channel>.query.* → ChannelStateService
+
+Usage:
+    # Start as standalone service
+    python -m common.channel_state_service --channel mychannel
+
+    # Or integrate with bot
+    from common.channel_state_service import ChannelStateService
+    state_service = ChannelStateService(nats_client, ['mychannel'])
+    await state_service.start()
+"""
+import asyncio
+import json
+import logging
+import sys
+from typing import Dict, Iterable, List
+
+try:
+    from nats.aio.client import Client as NATS  # noqa: N814 (NATS convention)
+except ImportError:
+    NATS = None  # type: ignore[assignment,misc]
+
+from lib.channel_state import ChannelStateReplica, state_subject
+
+
+class ChannelStateService:
+    """Answers channel state queries from in-memory replicas.
+
+    NATS Subject Design (all request/reply):
+        rosey.state.<channel>.query.users    - Users online
+        rosey.state.<channel>.query.user     - One user's rank and meta
+        rosey.state.<channel>.query.media    - Current media
+        rosey.state.<channel>.query.playlist - Slice of the playlist
+
+    Response:
+        {"success": true, "epoch": int, "seq": int, "result": Any}
+        or
+        {"success": false, "error": {"code": str, "message": str}}
+
+    ``epoch``/``seq`` identify the state version the answer was read from;
+    see ChannelStatePublisher.
+
+    Attributes:
+        replicas: Channel name -> ChannelStateReplica
+        queries: Number of queries answered
+    """
+
+    QUERIES = ('users', 'user', 'media', 'playlist')
+
+    def __init__(self, nats_client, channels: Iterable[str], timeout: float = 2.0):
+        self.nats = nats_client
+        self.channels: List[str] = list(channels)
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+        self.replicas: Dict[str, ChannelStateReplica] = {}
+        self.queries = 0
+        self._subscriptions = []
+
+    async def start(self):
+        """Start replicas and subscribe to query subjects.
+
+        A replica whose snapshot request fails keeps listening for deltas
+        and resyncs on the next one; queries answer NOT_READY until then.
+        """
+        for channel in self.channels:
+            replica = ChannelStateReplica(self.nats, channel, timeout=self.timeout)
+            self.replicas[channel] = replica
+            try:
+                await replica.start()
+            except Exception as e:
+                self.logger.warning(f"Channel state for {channel} not ready: {e}")
+
+            for query in self.QUERIES:
+                handler = getattr(self, f'_handle_{query}')
+                sub = await self.nats.subscribe(
+                    state_subject(channel, f'query.{query}'),
+                    cb=self._wrap(replica, handler)
+                )
+                self._subscriptions.append(sub)
+
+        self.logger.info(f"ChannelStateService started for {', '.join(self.channels)}")
+
+    async def stop(self):
+        """Unsubscribe and stop replicas."""
+        for sub in self._subscriptions:
+            try:
+                await sub.unsubscribe()
+            except Exception as e:
+                self.logger.warning(f"Error unsubscribing: {e}")
+        self._subscriptions.clear()
+        for replica in self.replicas.values():
+            await replica.stop()
+        self.replicas.clear()
+        self.logger.info("ChannelStateService stopped")
+
+    def _wrap(self, replica, handler):
+        async def callback(msg):
+            await msg.respond(json.dumps(self._answer(replica, handler, msg)).encode())
+        return callback
+
+    def _answer(self, replica, handler, msg):
+        if not replica.ready:
+            return self._error('NOT_READY', f'No state for {replica.name} yet')
+        try:
+            request = json.loads(msg.data.decode()) if msg.data else {}
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            return self._error('INVALID_JSON', f'Invalid JSON: {e}')
+        try:
+            result = handler(replica, request)
+        except (KeyError, TypeError, ValueError) as e:
+            return self._error('INVALID_REQUEST', str(e))
+        self.queries += 1
+        return {
+            'success': True,
+            'epoch': replica.epoch,
+            'seq': replica.seq,
+            'result': result,
+        }
+
+    @staticmethod
+    def _error(code, message):
+        return {'success': False, 'error': {'code': code, 'message': message}}
+
+    def _handle_users(self, replica, request):
+        """Request: {} -> list of users (see lib.channel_state.user_data)."""
+        return replica.online()
+
+    def _handle_user(self, replica, request):
+        """Request: {"name": str} -> {"name", "rank", "online", "moderator"}."""
+        name = request['name']
+        rank = replica.rank(name)
+        return {
+            'name': name,
+            'rank': rank,
+            'online': rank is not None,
+            'moderator': replica.is_moderator(name),
+        }
+
+    def _handle_media(self, replica, request):
+        """Request: {} -> current item or null (see lib.channel_state.item_data)."""
+        return replica.current_media()
+
+    def _handle_playlist(self, replica, request):
+        """Request: {"start": int, "count": int} -> {"total", "items"}."""
+        start = int(request.get('start', 0))
+        count = request.get('count')
+        if start < 0 or (count is not None and int(count) < 0):
+            raise ValueError('start and count must be >= 0')
+        return {
+            'total': len(replica.channel.playlist.queue),
+            'items': replica.playlist_slice(start, None if count is None else int(count)),
+        }
+
+
+async def main():
+    """Standalone channel state service entry point.
+
+    Run this file directly to answer state queries in a separate process:
+        python -m common.channel_state_service --channel NAME [--nats-url URL]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Channel State Query Service with NATS')
+    parser.add_argument(
+        '--channel',
+        action='append',
+        required=True,
+        help='Channel to replicate (repeat for several channels)'
+    )
+    parser.add_argument(
+        '--nats-url',
+        default='nats://localhost:4222',
+        help='NATS server URL (default: nats://localhost:4222)'
+    )
+    parser.add_argument(
+        '--log-level',
+        default='INFO',
+        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+        help='Logging level (default: INFO)'
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    logger = logging.getLogger(__name__)
+
+    if NATS is None:
+        logger.error("NATS package not installed. Install with: pip install nats-py")
+        sys.exit(1)
+
+    logger.info(f"Connecting to NATS at {args.nats_url}...")
+    nats = NATS()
+
+    try:
+        await nats.connect(args.nats_url)
+        logger.info("Connected to NATS")
+    except Exception as e:
+        logger.error(f"Failed to connect to NATS: {e}")
+        sys.exit(1)
+
+    service = ChannelStateService(nats, args.channel)
+
+    try:
+        await service.start()
+        logger.info("ChannelStateService running - press Ctrl+C to stop")
+
+        while True:
+            await asyncio.sleep(1)
+
+    except KeyboardInterrupt:
+        logger.info("Shutdown requested")
+    except Exception as e:
+        logger.error(f"Fatal error: {e}", exc_info=True)
+    finally:
+        await service.stop()
+        await nats.close()
+        logger.info("ChannelStateService shutdown complete")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
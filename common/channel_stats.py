@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Materialized Channel Statistics
+===============================
+
+In-memory snapshot of the channel statistics served by
+``rosey.db.query.channel_stats``: high water marks, total users seen and
+the top chatters. The snapshot is built once from the database and then
+maintained incrementally from the join / chat / high-water events the
+DatabaseService already handles, so a stats request is answered from
+memory instead of running four queries (one of them a sort over
+``user_stats``).
+
+The snapshot is reconciled with the database whenever it is older than
+``max_staleness`` seconds, which bounds any drift from writes that do not
+pass through the service. It is persisted to the KV store periodically so
+a restart can reuse a recent snapshot instead of rebuilding it.
+
+Usage:
+    snapshot = ChannelStatsSnapshot(db)
+    stats = await snapshot.get()
+
+    # From event handlers
+    snapshot.record_user_joined(await db.user_joined('Alice'))
+    snapshot.record_chat('Alice', await db.user_chat_message('Alice', 'hi'))
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class TopChatters:
+    """
+    Bounded top-N chatters by chat line count.
+
+    Members live in a dict; a min-heap over (lines, username) finds the
+    member to evict. Heap entries for members whose count has moved on are
+    left in place and skipped lazily, and the heap is rebuilt when stale
+    entries pile up.
+
+    Chat line counts only grow and every update carries the user's full
+    total, so a user outside the top N can always be placed exactly.
+    """
+
+    def __init__(self, capacity: int = 10):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._counts: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def offer(self, username: str, lines: int) -> None:
+        """Record that ``username`` now has ``lines`` chat lines in total."""
+        if lines <= 0:
+            return
+
+        if username in self._counts:
+            if lines == self._counts[username]:
+                return
+            self._counts[username] = lines
+            self._push(lines, username)
+            return
+
+        if len(self._counts) < self.capacity:
+            self._counts[username] = lines
+            self._push(lines, username)
+            return
+
+        min_lines, min_user = self._peek_min()
+        if lines > min_lines:
+            heapq.heappop(self._heap)
+            del self._counts[min_user]
+            self._counts[username] = lines
+            self._push(lines, username)
+
+    def replace(self, entries: List[Tuple[str, int]]) -> None:
+        """Reset contents to ``entries`` (username, lines)."""
+        self._counts = {
+            username: lines for username, lines in entries[:self.capacity] if lines > 0
+        }
+        self._rebuild_heap()
+
+    def top(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Members ordered by lines descending (ties by username)."""
+        ranked = sorted(self._counts.items(), key=lambda item: (-item[1], item[0]))
+        return ranked if limit is None else ranked[:limit]
+
+    def _push(self, lines: int, username: str) -> None:
+        heapq.heappush(self._heap, (lines, username))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def _peek_min(self) -> Tuple[int, str]:
+        heap = self._heap
+        while self._counts.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0]
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(lines, username) for username, lines in self._counts.items()]
+        heapq.heapify(self._heap)
+
+
+class ChannelStatsSnapshot:
+    """
+    Incrementally maintained channel statistics.
+
+    Attributes:
+        top_n: Number of top chatters kept
+        max_staleness: Seconds before the snapshot is rebuilt from the
+            database on the next read
+        loaded: Whether the snapshot holds data yet (updates recorded
+            before the first load are ignored; the load reads them)
+        dirty: Whether there are changes not yet persisted
+    """
+
+    KV_PLUGIN = 'rosey'
+    KV_KEY = 'channel_stats_snapshot'
+
+    def __init__(self, db, top_n: int = 10, max_staleness: float = 300.0):
+        """
+        Initialize an empty snapshot.
+
+        Args:
+            db: BotDatabase instance
+            top_n: Number of top chatters to maintain (default 10)
+            max_staleness: Maximum age in seconds of the last database
+                reconciliation before a read triggers a rebuild
+        """
+        self.db = db
+        self.top_n = top_n
+        self.max_staleness = max_staleness
+        self.logger = logging.getLogger(__name__)
+
+        self.max_users = 0
+        self.max_users_timestamp: Optional[int] = None
+        self.max_connected = 0
+        self.max_connected_timestamp: Optional[int] = None
+        self.total_users_seen = 0
+        self.top_chatters = TopChatters(top_n)
+
+        self.loaded = False
+        self.dirty = False
+        self.reconciled_at = 0.0  # time.time() of last database rebuild
+        self.updated_at = 0.0
+
+        self.rebuilds = 0
+        self._rebuild_lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was last reconciled with the database."""
+        return time.time() - self.reconciled_at
+
+    @property
+    def is_stale(self) -> bool:
+        return not self.loaded or self.age > self.max_staleness
+
+    async def get(self) -> dict:
+        """
+        Get channel stats, rebuilding first if the snapshot is stale.
+
+        Returns:
+            Dict in the rosey.db.query.channel_stats response format
+            (without the 'success' flag)
+        """
+        if self.is_stale:
+            await self.load()
+        return self.to_dict()
+
+    def to_dict(self) -> dict:
+        return {
+            'high_water_mark': {
+                'users': self.max_users,
+                'timestamp': self.max_users_timestamp,
+            },
+            'high_water_connected': {
+                'users': self.max_connected,
+                'timestamp': self.max_connected_timestamp,
+            },
+            'top_chatters': [
+                {'username': username, 'chat_lines': lines}
+                for username, lines in self.top_chatters.top()
+            ],
+            'total_users_seen': self.total_users_seen,
+            'snapshot_age': round(self.age, 1),
+        }
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def record_user_joined(self, is_new_user) -> None:
+        """Apply the result of BotDatabase.user_joined()."""
+        if not self.loaded or is_new_user is not True:
+            return
+        self.total_users_seen += 1
+        self._touch()
+
+    def record_chat(self, username: str, total_chat_lines) -> None:
+        """Apply the result of BotDatabase.user_chat_message()."""
+        if not self.loaded or not isinstance(total_chat_lines, int):
+            return
+        self.top_chatters.offer(username, total_chat_lines)
+        self._touch()
+
+    def record_high_water(self, chat_count, connected_count=None,
+                          timestamp: Optional[int] = None) -> None:
+        """Apply a BotDatabase.update_high_water_mark() call."""
+        if not self.loaded:
+            return
+        now = timestamp if timestamp is not None else int(time.time())
+        if isinstance(chat_count, int) and chat_count > self.max_users:
+            self.max_users = chat_count
+            self.max_users_timestamp = now
+            self._touch()
+        if isinstance(connected_count, int) and connected_count > self.max_connected:
+            self.max_connected = connected_count
+            self.max_connected_timestamp = now
+            self._touch()
+
+    def _touch(self) -> None:
+        self.dirty = True
+        self.updated_at = time.time()
+
+    # ------------------------------------------------------------------
+    # Loading and persistence
+    # ------------------------------------------------------------------
+
+    async def load(self) -> None:
+        """
+        Load the snapshot, preferring a persisted copy within max_staleness.
+
+        Falls back to rebuild() when no usable persisted copy exists.
+        """
+        async with self._rebuild_lock:
+            if not self.is_stale:
+                return  # Another reader finished loading while we waited
+
+            if not self.loaded and await self._load_persisted():
+                return
+
+            await self._rebuild()
+
+    async def rebuild(self) -> None:
+        """Rebuild the snapshot from the database."""
+        async with self._rebuild_lock:
+            await self._rebuild()
+
+    async def _rebuild(self) -> None:
+        start = time.time()
+        channel = await self.db.get_channel_stats()
+        top = await self.db.get_top_chatters(limit=self.top_n)
+        total_users = await self.db.get_total_users_seen()
+
+        self.max_users = channel['max_users']
+        self.max_users_timestamp = channel['max_users_timestamp']
+        self.max_connected = channel['max_connected']
+        self.max_connected_timestamp = channel['max_connected_timestamp']
+        self.total_users_seen = total_users or 0
+        self.top_chatters.replace(
+            [(row['username'], row['total_chat_lines']) for row in top]
+        )
+
+        self.loaded = True
+        self.dirty = True
+        self.reconciled_at = self.updated_at = start
+        self.rebuilds += 1
+        self.logger.debug(
+            'Channel stats snapshot rebuilt in %.1fms', (time.time() - start) * 1000
+        )
+
+    async def _load_persisted(self) -> bool:
+        try:
+            result = await self.db.kv_get(self.KV_PLUGIN, self.KV_KEY)
+        except Exception as e:
+            self.logger.warning('Could not read persisted channel stats: %s', e)
+            return False
+
+        if not result.get('exists'):
+            return False
+
+        data = result['value']
+        try:
+            reconciled_at = float(data['reconciled_at'])
+            if time.time() - reconciled_at > self.max_staleness:
+                return False
+
+            self.max_users = data['max_users']
+            self.max_users_timestamp = data['max_users_timestamp']
+            self.max_connected = data['max_connected']
+            self.max_connected_timestamp = data['max_connected_timestamp']
+            self.total_users_seen = data['total_users_seen']
+            self.top_chatters.replace(
+                [(username, lines) for username, lines in data['top_chatters']]
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            self.logger.warning('Ignoring malformed persisted channel stats: %s', e)
+            return False
+
+        self.loaded = True
+        self.dirty = False
+        self.reconciled_at = reconciled_at
+        self.updated_at = time.time()
+        return True
+
+    async def persist(self) -> bool:
+        """
+        Write the snapshot to the KV store if it has unpersisted changes.
+
+        Returns:
+            True if a write happened
+        """
+        if not self.loaded or not self.dirty:
+            return False
+
+        # Clear first so updates recorded during the write stay dirty
+        self.dirty = False
+        try:
+            await self.db.kv_set(self.KV_PLUGIN, self.KV_KEY, {
+                'max_users': self.max_users,
+                'max_users_timestamp': self.max_users_timestamp,
+                'max_connected': self.max_connected,
+                'max_connected_timestamp': self.max_connected_timestamp,
+                'total_users_seen': self.total_users_seen,
+                'top_chatters': self.top_chatters.top(),
+                'reconciled_at': self.reconciled_at,
+            })
+        except Exception:
+            self.dirty = True
+            raise
+        return True
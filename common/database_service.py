@@ -21,13 +21,15 @@ import asyncio
 import json
 import logging
 import sys
-from typing import Any, Dict, List
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional
 
 try:
     from nats.aio.client import Client as NATS  # noqa: N814 (NATS convention)
 except ImportError:
     NATS = None  # type: ignore[assignment,misc]
 
+from common.channel_stats import ChannelStatsSnapshot
 from common.database import BotDatabase
 from common.migrations import (
     DryRunRollbackError,
@@ -74,24 +76,46 @@ class DatabaseService:
     """
 
     def __init__(self, nats_client, db_path: str = 'bot_data.db',
-                 cleanup_interval_seconds: int = 300):
+                 cleanup_interval_seconds: int = 300,
+                 read_db_path: Optional[str] = None,
+                 sqlite_read_pool: bool = False,
+                 stats_persist_interval_seconds: int = 60,
+                 stats_max_staleness_seconds: int = 300):
         """Initialize database service.
 
         Args:
             nats_client: Connected NATS client instance
             db_path: Path to SQLite database file
             cleanup_interval_seconds: Interval for KV cleanup task (default 300 = 5 minutes)
+            read_db_path: Optional read replica URL/path for read-only queries
+            sqlite_read_pool: Serve read-only queries from a second,
+                read-only SQLite connection pool on db_path
+            stats_persist_interval_seconds: Interval for persisting the
+                channel stats snapshot (default 60)
+            stats_max_staleness_seconds: Maximum age of the channel stats
+                snapshot before it is rebuilt from the database (default 300)
         """
         if NATS is None:
             raise ImportError("NATS not available - install nats-py package")
 
         self.nats = nats_client
-        self.db = BotDatabase(db_path)
+        self.db = BotDatabase(
+            db_path,
+            read_database_url=read_db_path,
+            sqlite_read_pool=sqlite_read_pool
+        )
         self.cleanup_interval_seconds = cleanup_interval_seconds
         self.logger = logging.getLogger(__name__)
         self._subscriptions: List[Any] = []
         self._running = False
         self._cleanup_task = None
+
+        # Channel stats served from memory, maintained from events
+        self.stats_snapshot = ChannelStatsSnapshot(
+            self.db, max_staleness=stats_max_staleness_seconds
+        )
+        self.stats_persist_interval_seconds = stats_persist_interval_seconds
+        self._stats_task = None
         self._shutdown = False
 
         # Migration support (Sprint 15 Sorties 2-3)
@@ -176,6 +200,10 @@ class DatabaseService:
                                         cb=self._handle_row_delete),
                 await self.nats.subscribe('rosey.db.row.*.search',
                                         cb=self._handle_row_search),
+                await self.nats.subscribe('rosey.db.row.*.batch',
+                                        cb=self._handle_row_batch),
+                await self.nats.subscribe('rosey.db.row.*.random',
+                                        cb=self._handle_row_random),
             ])
 
             # Migration handlers (request/reply) - Sprint 15 Sortie 2
@@ -194,6 +222,7 @@ class DatabaseService:
             # Start background cleanup task
             self._shutdown = False
             self._cleanup_task = asyncio.create_task(self._kv_cleanup_loop())
+            self._stats_task = asyncio.create_task(self._stats_snapshot_loop())
 
             self.logger.info(
                 f"DatabaseService started with {len(self._subscriptions)} subscriptions "
@@ -220,13 +249,20 @@ class DatabaseService:
         # Signal shutdown
         self._shutdown = True
 
-        # Cancel cleanup task
-        if self._cleanup_task:
-            self._cleanup_task.cancel()
-            try:
-                await self._cleanup_task
-            except asyncio.CancelledError:
-                pass
+        # Cancel background tasks
+        for task in (self._cleanup_task, self._stats_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+        # Keep the latest stats snapshot for the next start
+        try:
+            await self.stats_snapshot.persist()
+        except Exception as e:
+            self.logger.error(f"Error persisting channel stats snapshot: {e}")
 
         for sub in self._subscriptions:
             try:
@@ -258,7 +294,8 @@ class DatabaseService:
             username = data.get('username', '')
 
             if username:
-                await self.db.user_joined(username)
+                is_new_user = await self.db.user_joined(username)
+                self.stats_snapshot.record_user_joined(is_new_user)
                 self.logger.debug(f"[NATS] User joined: {username}")
             else:
                 self.logger.warning("[NATS] user_joined: Missing username")
@@ -302,7 +339,8 @@ class DatabaseService:
 
             if username and message:
                 # BotDatabase method is user_chat_message()
-                await self.db.user_chat_message(username, message)
+                total_lines = await self.db.user_chat_message(username, message)
+                self.stats_snapshot.record_chat(username, total_lines)
                 self.logger.debug(f"[NATS] Message logged: {username}")
             else:
                 self.logger.warning(
@@ -350,6 +388,7 @@ class DatabaseService:
             connected_count = data.get('connected_count', None)
 
             await self.db.update_high_water_mark(chat_count, connected_count)
+            self.stats_snapshot.record_high_water(chat_count, connected_count)
             self.logger.debug(
                 f"[NATS] High water updated: chat={chat_count}, "
                 f"connected={connected_count}"
@@ -474,40 +513,16 @@ class DatabaseService:
             'high_water_connected': {'users': int, 'timestamp': int},
             'top_chatters': [{'username': str, 'chat_lines': int}, ...],
             'total_users_seen': int,
+            'snapshot_age': float,
             'success': bool
         }
+
+        Served from the in-memory stats snapshot; 'snapshot_age' is the
+        number of seconds since it was last rebuilt from the database.
         """
         try:
-            # Get high water mark (max users in chat)
-            max_users, max_users_ts = await self.db.get_high_water_mark()
-
-            # Get high water mark for connected viewers
-            max_connected, max_connected_ts = await self.db.get_high_water_mark_connected()
-
-            # Get top chatters (top 10)
-            top_chatters_raw = await self.db.get_top_chatters(limit=10)
-            top_chatters = [
-                {'username': username, 'chat_lines': chat_lines}
-                for username, chat_lines in top_chatters_raw
-            ]
-
-            # Get total unique users
-            total_users = await self.db.get_total_users_seen()
-
-            # Build response
-            response_data = {
-                'high_water_mark': {
-                    'users': max_users,
-                    'timestamp': max_users_ts
-                },
-                'high_water_connected': {
-                    'users': max_connected,
-                    'timestamp': max_connected_ts
-                },
-                'top_chatters': top_chatters,
-                'total_users_seen': total_users,
-                'success': True
-            }
+            response_data = await self.stats_snapshot.get()
+            response_data['success'] = True
 
             # Send response back to requester
             await self.nats.publish(
@@ -675,6 +690,16 @@ class DatabaseService:
 
     # ==================== KV Storage Handlers ====================
 
+    def _read_scope(self, request: dict):
+        """Read-your-writes escape hatch for read handlers.
+
+        Requests with ``"consistent": true`` bypass the read pool so the
+        caller sees its own preceding writes.
+        """
+        if isinstance(request, dict) and request.get('consistent'):
+            return self.db.primary_reads()
+        return nullcontext()
+
     async def _handle_kv_set(self, msg):
         """Handle rosey.db.kv.set requests.
 
@@ -799,7 +824,7 @@ class DatabaseService:
         NATS Subject: rosey.db.kv.get (request/reply)
 
         Request:
-            {"plugin_name": str, "key": str}
+            {"plugin_name": str, "key": str, "consistent": bool (optional)}
 
         Response:
             {"success": true, "data": {"exists": bool, "value": Any}}
@@ -846,7 +871,8 @@ class DatabaseService:
 
             # Call database method
             try:
-                result = await self.db.kv_get(plugin_name, key)
+                with self._read_scope(request):
+                    result = await self.db.kv_get(plugin_name, key)
             except Exception as e:
                 self.logger.error(f"Error in kv_get: {e}", exc_info=True)
                 await msg.respond(json.dumps({
@@ -970,7 +996,8 @@ class DatabaseService:
             {
                 "plugin_name": str,
                 "prefix": Optional[str],
-                "limit": Optional[int]
+                "limit": Optional[int],
+                "consistent": Optional[bool]
             }
 
         Response:
@@ -1010,7 +1037,8 @@ class DatabaseService:
 
             # Call database method
             try:
-                result = await self.db.kv_list(plugin_name, prefix, limit)
+                with self._read_scope(request):
+                    result = await self.db.kv_list(plugin_name, prefix, limit)
             except Exception as e:
                 self.logger.error(f"Error in kv_list: {e}", exc_info=True)
                 await msg.respond(json.dumps({
@@ -1277,7 +1305,8 @@ class DatabaseService:
         Request:
             {
                 "table": str,
-                "id": int
+                "id": int,
+                "consistent": bool (optional)
             }
 
         Response:
@@ -1341,7 +1370,8 @@ class DatabaseService:
 
             # Select
             try:
-                result = await self.db.row_select(plugin_name, table_name, row_id)
+                with self._read_scope(request):
+                    result = await self.db.row_select(plugin_name, table_name, row_id)
             except ValueError as e:
                 await msg.respond(json.dumps({
                     "success": False,
@@ -1401,9 +1431,14 @@ class DatabaseService:
                 "operations": dict
             }
 
+        Either mode accepts "returning": [field, ...] to get those fields
+        of the updated row back in "data" (no follow-up select needed).
+
         Response:
             {"success": true, "id": 42, "updated": true}
             or
+            {"success": true, "id": 42, "updated": true, "data": {...}}
+            or
             {"success": true, "exists": false}
             or
             {"success": false, "error": {...}}
@@ -1431,6 +1466,7 @@ class DatabaseService:
             row_id = request.get('id')
             data = request.get('data')
             operations = request.get('operations')
+            returning = request.get('returning')
 
             if not table_name:
                 await msg.respond(json.dumps({
@@ -1467,7 +1503,7 @@ class DatabaseService:
             try:
                 result = await self.db.row_update(
                     plugin_name, table_name, row_id,
-                    data=data, operations=operations
+                    data=data, operations=operations, returning=returning
                 )
             except ValueError as e:
                 await msg.respond(json.dumps({
@@ -1603,6 +1639,99 @@ class DatabaseService:
             except Exception:
                 pass
 
+    async def _handle_row_batch(self, msg):
+        """
+        Handle rosey.db.row.{plugin}.batch requests.
+
+        Applies a list of upserts/updates/reads in one transaction; see
+        BotDatabase.row_batch for the step format.
+
+        Request:
+            {
+                "steps": [
+                    {
+                        "table": str,
+                        "match": dict,
+                        "insert": dict (optional),
+                        "data": dict | "operations": dict (optional),
+                        "returning": bool (optional)
+                    },
+                    ...
+                ]
+            }
+
+        Response:
+            {"success": true, "results": [{"ids": [...], "created": bool, "rows": [...]}]}
+            or
+            {"success": false, "error": {...}}
+        """
+        try:
+            # Parse request
+            try:
+                request = json.loads(msg.data.decode())
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                await msg.respond(json.dumps({
+                    "success": False,
+                    "error": {
+                        "code": "INVALID_JSON",
+                        "message": f"Invalid JSON: {str(e)}"
+                    }
+                }).encode())
+                return
+
+            # Extract plugin from subject
+            parts = msg.subject.split('.')
+            plugin_name = parts[3]  # rosey.db.row.{plugin}.batch
+
+            steps = request.get('steps')
+            if not isinstance(steps, list) or not steps:
+                await msg.respond(json.dumps({
+                    "success": False,
+                    "error": {
+                        "code": "MISSING_FIELD",
+                        "message": "Required field 'steps' missing or empty"
+                    }
+                }).encode())
+                return
+
+            try:
+                result = await self.db.row_batch(plugin_name, steps)
+            except (ValueError, TypeError) as e:
+                await msg.respond(json.dumps({
+                    "success": False,
+                    "error": {
+                        "code": "VALIDATION_ERROR",
+                        "message": str(e)
+                    }
+                }).encode())
+                return
+            except Exception as e:
+                self.logger.error(f"Batch failed: {e}", exc_info=True)
+                await msg.respond(json.dumps({
+                    "success": False,
+                    "error": {
+                        "code": "DATABASE_ERROR",
+                        "message": "Batch operation failed"
+                    }
+                }).encode())
+                return
+
+            response = {"success": True, **result}
+            await msg.respond(json.dumps(response).encode())
+
+        except Exception as e:
+            self.logger.error(f"Unexpected error in row_batch: {e}", exc_info=True)
+            try:
+                await msg.respond(json.dumps({
+                    "success": False,
+                    "error": {
+                        "code": "INTERNAL_ERROR",
+                        "message": "Unexpected error"
+                    }
+                }).encode())
+            except Exception:
+                pass
+
     async def _handle_row_search(self, msg):
         """
         Handle rosey.db.row.{plugin}.search requests.
@@ -1615,7 +1744,8 @@ class DatabaseService:
                 "filters": dict (optional),                         # Equality filters (AND logic)
                 "sort": {"field": str, "order": "asc"|"desc"} (optional),
                 "limit": int (optional, default 100, max 1000),
-                "offset": int (optional, default 0)
+                "offset": int (optional, default 0),
+                "consistent": bool (optional)                       # Read from primary
             }
 
         Response (success):
@@ -1686,14 +1816,15 @@ class DatabaseService:
 
             # Search rows
             try:
-                result = await self.db.row_search(
-                    plugin_name,
-                    table_name,
-                    filters=filters,
-                    sort=sort,
-                    limit=limit,
-                    offset=offset
-                )
+                with self._read_scope(request):
+                    result = await self.db.row_search(
+                        plugin_name,
+                        table_name,
+                        filters=filters,
+                        sort=sort,
+                        limit=limit,
+                        offset=offset
+                    )
             except (ValueError, TypeError) as e:
                 await msg.respond(json.dumps({
                     "success": False,
@@ -1731,6 +1862,106 @@ class DatabaseService:
             except Exception:
                 pass
 
+    async def _handle_row_random(self, msg):
+        """
+        Handle rosey.db.row.{plugin}.random requests.
+
+        Returns distinct rows chosen uniformly at random; see
+        BotDatabase.row_random for how rows are sampled and its cost.
+
+        Request:
+            {
+                "table": str,                   # Required
+                "filters": dict (optional),     # As for search
+                "count": int (optional, default 1, max 1000),
+                "consistent": bool (optional)   # Read from primary
+            }
+
+        Response:
+            {"success": true, "rows": [...], "count": int}
+            or
+            {"success": false, "error": {...}}
+
+        Example:
+            rosey.db.row.quote_db.random -> {
+                "table": "quotes",
+                "filters": {"score": {"$gte": 1}},
+                "count": 3
+            }
+        """
+        try:
+            # Parse request
+            try:
+                request = json.loads(msg.data.decode())
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                await msg.respond(json.dumps({
+                    "success": False,
+                    "error": {
+                        "code": "INVALID_JSON",
+                        "message": f"Invalid JSON: {str(e)}"
+                    }
+                }).encode())
+                return
+
+            # Extract plugin from subject (rosey.db.row.{plugin}.random)
+            parts = msg.subject.split('.')
+            plugin_name = parts[3]
+
+            table_name = request.get('table')
+            if not table_name:
+                await msg.respond(json.dumps({
+                    "success": False,
+                    "error": {
+                        "code": "MISSING_FIELD",
+                        "message": "Required field 'table' missing"
+                    }
+                }).encode())
+                return
+
+            try:
+                with self._read_scope(request):
+                    result = await self.db.row_random(
+                        plugin_name,
+                        table_name,
+                        filters=request.get('filters'),
+                        count=request.get('count', 1)
+                    )
+            except (ValueError, TypeError) as e:
+                await msg.respond(json.dumps({
+                    "success": False,
+                    "error": {
+                        "code": "VALIDATION_ERROR",
+                        "message": str(e)
+                    }
+                }).encode())
+                return
+            except Exception as e:
+                self.logger.error(f"Random select failed: {e}", exc_info=True)
+                await msg.respond(json.dumps({
+                    "success": False,
+                    "error": {
+                        "code": "DATABASE_ERROR",
+                        "message": "Random select failed"
+                    }
+                }).encode())
+                return
+
+            response = {"success": True, **result}
+            await msg.respond(json.dumps(response).encode())
+
+        except Exception as e:
+            self.logger.error(f"Unexpected error in row_random: {e}", exc_info=True)
+            try:
+                await msg.respond(json.dumps({
+                    "success": False,
+                    "error": {
+                        "code": "INTERNAL_ERROR",
+                        "message": "Unexpected error"
+                    }
+                }).encode())
+            except Exception:
+                pass
+
     # ==================== Migration Handlers (Sprint 15 Sortie 2) ====================
 
     def _get_plugin_lock(self, plugin_name: str) -> asyncio.Lock:
@@ -2304,6 +2535,31 @@ class DatabaseService:
 
     # ==================== Background Tasks ====================
 
+    async def _stats_snapshot_loop(self):
+        """
+        Background task to persist the channel stats snapshot.
+
+        Runs every stats_persist_interval_seconds and writes the snapshot
+        to the KV store when it has changed. Errors are logged but don't
+        stop the loop.
+        """
+        while not self._shutdown:
+            try:
+                await asyncio.sleep(self.stats_persist_interval_seconds)
+
+                if self._shutdown:
+                    break
+
+                await self.stats_snapshot.persist()
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(
+                    f"Error persisting channel stats snapshot: {e}",
+                    exc_info=True
+                )
+
     async def _kv_cleanup_loop(self):
         """
         Background task to clean up expired KV entries.
@@ -2371,6 +2627,16 @@ async def main():
         default='bot_data.db',
         help='Path to SQLite database file (default: bot_data.db)'
     )
+    parser.add_argument(
+        '--read-db-path',
+        default=None,
+        help='Read replica URL/path for read-only queries (default: none)'
+    )
+    parser.add_argument(
+        '--sqlite-read-pool',
+        action='store_true',
+        help='Serve read-only queries from a read-only SQLite connection pool'
+    )
     parser.add_argument(
         '--nats-url',
         default='nats://localhost:4222',
@@ -2408,7 +2674,12 @@ async def main():
         sys.exit(1)
 
     # Start database service
-    db_service = DatabaseService(nats, args.db_path)
+    db_service = DatabaseService(
+        nats,
+        args.db_path,
+        read_db_path=args.read_db_path,
+        sqlite_read_pool=args.sqlite_read_pool
+    )
 
     try:
         await db_service.start()
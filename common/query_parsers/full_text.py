@@ -0,0 +1,230 @@
+"""
+Full-text search for plugin row tables.
+
+String and text fields declared with ``"search": true`` in a table schema
+are indexed when the table is registered:
+
+- SQLite: an FTS5 external-content table ``<table>_fts`` over those
+  fields, kept in sync by triggers (updates to other columns do not
+  touch the index)
+- PostgreSQL: a GIN index on ``to_tsvector()`` of those fields
+
+Rows are matched with the ``$search`` filter operator (see OperatorParser),
+which compiles to an index lookup on either database. Every word in the
+query must appear (stemmed, case- and accent-insensitive); results can be
+ordered by relevance with ``fts_hits`` (SQLite) or ``FullTextRank``
+(PostgreSQL).
+
+Example:
+    >>> schema = {'fields': [
+    ...     {'name': 'text', 'type': 'text', 'search': True},
+    ...     {'name': 'author', 'type': 'string', 'search': True},
+    ... ]}
+    >>> search_fields(schema)
+    ['text', 'author']
+    >>> fts5_query('Einstein "relativity"')
+    '"einstein" "relativity"'
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import (
+    Boolean,
+    Float,
+    and_,
+    bindparam,
+    column,
+    false,
+    or_,
+    select,
+    table,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+
+# Field types that can be indexed
+SEARCH_FIELD_TYPES = {'string', 'text'}
+
+# PostgreSQL text search configuration, and the matching SQLite tokenizer
+TS_CONFIG = 'english'
+FTS5_TOKENIZER = 'porter unicode61 remove_diacritics 2'
+
+_WORDS = re.compile(r'\w+', re.UNICODE)
+
+
+def search_fields(schema: Dict[str, Any]) -> List[str]:
+    """Names of the schema's full-text indexed fields, in schema order."""
+    return [f['name'] for f in schema.get('fields', []) if f.get('search')]
+
+
+def fts_table_name(table_name: str) -> str:
+    """Name of the SQLite FTS5 table indexing ``table_name``."""
+    return f"{table_name}_fts"
+
+
+def search_terms(query: str) -> List[str]:
+    """Lowercased words of a search query; punctuation and operators are ignored."""
+    return [word.lower() for word in _WORDS.findall(query)]
+
+
+def fts5_query(query: str, field: Optional[str] = None) -> str:
+    """
+    FTS5 MATCH expression requiring every word of ``query``.
+
+    Words are quoted, so user input cannot inject FTS5 syntax.
+    """
+    phrase = ' '.join(f'"{term}"' for term in search_terms(query))
+    if field is not None:
+        return f'{_quote(field)} : ({phrase})'
+    return phrase
+
+
+def _quote(name: str) -> str:
+    """Quote an identifier (names are validated by SchemaRegistry)."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _tsvector_sql(fields: List[str]) -> str:
+    """to_tsvector() over fields; must match the GIN index expression exactly."""
+    document = " || ' ' || ".join(f"coalesce({_quote(f)}, '')" for f in fields)
+    return f"to_tsvector('{TS_CONFIG}', {document})"
+
+
+def index_statements(table_name: str, fields: List[str], postgresql: bool) -> List[str]:
+    """
+    DDL creating the full-text index for a table (idempotent).
+
+    Args:
+        table_name: Full table name (e.g. "quote-db_quotes")
+        fields: Indexed field names
+        postgresql: True for PostgreSQL, False for SQLite
+
+    Returns:
+        SQL statements to execute in order
+    """
+    if postgresql:
+        return [
+            f"CREATE INDEX IF NOT EXISTS {_quote(table_name + '_search_idx')} "
+            f"ON {_quote(table_name)} USING GIN ({_tsvector_sql(fields)})"
+        ]
+
+    fts = fts_table_name(table_name)
+    columns = ', '.join(_quote(f) for f in fields)
+    new_values = ', '.join(f"new.{_quote(f)}" for f in fields)
+    old_values = ', '.join(f"old.{_quote(f)}" for f in fields)
+    insert_new = (
+        f"INSERT INTO {_quote(fts)}(rowid, {columns}) VALUES (new.id, {new_values});"
+    )
+    delete_old = (
+        f"INSERT INTO {_quote(fts)}({_quote(fts)}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {_quote(fts)} USING fts5({columns}, "
+        f"content='{table_name}', content_rowid='id', tokenize='{FTS5_TOKENIZER}')",
+        f"CREATE TRIGGER IF NOT EXISTS {_quote(fts + '_ai')} AFTER INSERT ON {_quote(table_name)} "
+        f"BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {_quote(fts + '_ad')} AFTER DELETE ON {_quote(table_name)} "
+        f"BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {_quote(fts + '_au')} AFTER UPDATE OF {columns} "
+        f"ON {_quote(table_name)} BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def rebuild_statement(table_name: str) -> str:
+    """SQLite statement re-indexing every existing row of a table."""
+    fts = _quote(fts_table_name(table_name))
+    return f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"
+
+
+class FullTextMatch(ColumnElement):
+    """
+    WHERE clause matching rows whose indexed fields contain every query word.
+
+    Compiles to an FTS5 lookup on SQLite, a tsvector match on PostgreSQL
+    and LIKE comparisons elsewhere. With ``field``, only that indexed
+    field must match.
+    """
+
+    type = Boolean()
+    inherit_cache = False
+
+    def __init__(self, table, fields: List[str], query: str, field: Optional[str] = None):
+        self.table = table
+        self.fields = fields
+        self.query = query
+        self.field = field
+
+
+class FullTextRank(ColumnElement):
+    """Relevance of a PostgreSQL $search match; sort ascending (best first)."""
+
+    type = Float()
+    inherit_cache = False
+
+    def __init__(self, fields: List[str], query: str):
+        self.fields = fields
+        self.query = query
+
+
+def fts_hits(table_name: str, query: str):
+    """
+    SQLite subquery of (id, rank) for rows matching ``query``, best first.
+
+    Join it to the table and order by ``rank`` for relevance ranking.
+    """
+    fts = fts_table_name(table_name)
+    fts_table = table(fts, column('rowid'), column('rank'), column(fts))
+    return (
+        select(fts_table.c.rowid.label('id'), fts_table.c.rank.label('rank'))
+        .where(fts_table.c[fts].op('MATCH')(fts5_query(query)))
+        .subquery()
+    )
+
+
+@compiles(FullTextMatch, 'sqlite')
+def _compile_match_sqlite(element, compiler, **kw):
+    fts = fts_table_name(element.table.name)
+    fts_table = table(fts, column('rowid'), column(fts))
+    hits = select(fts_table.c.rowid).where(
+        fts_table.c[fts].op('MATCH')(fts5_query(element.query, element.field))
+    )
+    return compiler.process(element.table.c.id.in_(hits), **kw)
+
+
+@compiles(FullTextMatch, 'postgresql')
+def _compile_match_postgresql(element, compiler, **kw):
+    clause = _tsquery_match(element.fields, element.query, compiler, **kw)
+    if element.field is not None:
+        # The combined document uses the index; the field check rechecks matches
+        clause += " AND " + _tsquery_match([element.field], element.query, compiler, **kw)
+    return f"({clause})"
+
+
+@compiles(FullTextMatch)
+def _compile_match_default(element, compiler, **kw):
+    terms = search_terms(element.query)
+    fields = [element.field] if element.field is not None else element.fields
+    if not terms:
+        return compiler.process(false(), **kw)
+    clause = and_(*[
+        or_(*[element.table.c[f].ilike(f"%{term}%") for f in fields])
+        for term in terms
+    ])
+    return compiler.process(clause, **kw)
+
+
+@compiles(FullTextRank, 'postgresql')
+def _compile_rank_postgresql(element, compiler, **kw):
+    return f"-ts_rank_cd({_tsvector_sql(element.fields)}, {_tsquery(element.query, compiler, **kw)})"
+
+
+def _tsquery(query: str, compiler, **kw) -> str:
+    """plainto_tsquery() of a bound query string."""
+    param = compiler.process(bindparam(None, query, unique=True), **kw)
+    return f"plainto_tsquery('{TS_CONFIG}', {param})"
+
+
+def _tsquery_match(fields: List[str], query: str, compiler, **kw) -> str:
+    return f"{_tsvector_sql(fields)} @@ {_tsquery(query, compiler, **kw)}"
@@ -9,6 +9,7 @@ Supports:
 - Set operators: $in, $nin (Sprint 14 Sortie 2)
 - Pattern operators: $like, $ilike (Sprint 14 Sortie 2)
 - Existence operators: $exists, $null (Sprint 14 Sortie 2)
+- Full-text search: $search on indexed fields (see full_text)
 - Update operators: $set, $inc, $dec, $mul, $max, $min (Sprint 14 Sortie 3)
 - Compound logic: $and, $or, $not (Sprint 14 Sortie 3)
 - Aggregation functions: $count, $sum, $avg, $min, $max (Sprint 14 Sortie 4)
@@ -41,6 +42,10 @@ Example:
     >>> filters = {'username': {'$like': 'test_%'}}
     >>> clauses = parser.parse_filters(filters, table)
     >>>
+    >>> # Full-text search over the schema's "search": true fields
+    >>> filters = {'$search': 'theory of relativity'}
+    >>> clauses = parser.parse_filters(filters, table)
+    >>>
     >>> # Compound logic (Sortie 3)
     >>> filters = {
     ...     '$and': [
@@ -53,11 +58,49 @@ Example:
     >>> # Atomic updates (Sortie 3)
     >>> updates = {'score': {'$inc': 10}, 'high_score': {'$max': 95}}
     >>> expressions = parser.parse_update_operations(updates, table)
+    >>>
+    >>> # Update from another column of the same row
+    >>> updates = {'best_streak': {'$max': {'$field': 'streak'}}}
+    >>> expressions = parser.parse_update_operations(updates, table)
 """
 
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
+
+from sqlalchemy import Column, and_, false, func, not_, or_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import GenericFunction
+
+from common.query_parsers.full_text import FullTextMatch, search_fields, search_terms
+
+
+class greatest(GenericFunction):  # noqa: N801 - SQL function name
+    """GREATEST(a, b); NULL arguments are ignored, as in PostgreSQL."""
+
+    name = 'greatest'
+    inherit_cache = True
+
+
+class least(GenericFunction):  # noqa: N801 - SQL function name
+    """LEAST(a, b); NULL arguments are ignored, as in PostgreSQL."""
+
+    name = 'least'
+    inherit_cache = True
 
-from sqlalchemy import Column, and_, func, not_, or_
+
+def _compile_sqlite_extremum(sql_func):
+    """SQLite has no GREATEST/LEAST, and its max()/min() return NULL if any argument is."""
+    def compile_(element, compiler, **kw):
+        current, value = list(element.clauses)
+        current = compiler.process(current, **kw)
+        value = compiler.process(value, **kw)
+        return '%s(coalesce(%s, %s), coalesce(%s, %s))' % (
+            sql_func, current, value, value, current
+        )
+    return compile_
+
+
+compiles(greatest, 'sqlite')(_compile_sqlite_extremum('max'))
+compiles(least, 'sqlite')(_compile_sqlite_extremum('min'))
 
 
 class OperatorParser:
@@ -69,6 +112,7 @@ class OperatorParser:
     - Set operators: $in, $nin (Sortie 2)
     - Pattern operators: $like, $ilike (Sortie 2)
     - Existence operators: $exists, $null (Sortie 2)
+    - Full-text search: $search, across all indexed fields or on one
     - Update operators: $set, $inc, $dec, $mul, $max, $min (Sortie 3)
     - Compound logic: $and, $or, $not (Sortie 3)
 
@@ -124,13 +168,16 @@ class OperatorParser:
         '$inc': lambda col, val: col + val,  # Increment
         '$dec': lambda col, val: col - val,  # Decrement
         '$mul': lambda col, val: col * val,  # Multiply
-        '$max': lambda col, val: func.greatest(col, val),  # Maximum
-        '$min': lambda col, val: func.least(col, val),  # Minimum
+        '$max': lambda col, val: greatest(col, val),  # Maximum (NULL-safe)
+        '$min': lambda col, val: least(col, val),  # Minimum (NULL-safe)
     }
 
     # Compound logical operators (Sortie 3)
     LOGICAL_OPS = {'$and', '$or', '$not'}
 
+    # Full-text search operator, top-level or on an indexed field
+    SEARCH_OP = '$search'
+
     # Aggregation functions (Sortie 4)
     AGGREGATION_FUNCS = {
         '$count': func.count,
@@ -196,12 +243,16 @@ class OperatorParser:
         self.fields['created_at'] = {'name': 'created_at', 'type': 'datetime'}
         self.fields['updated_at'] = {'name': 'updated_at', 'type': 'datetime'}
 
+        # Full-text indexed fields
+        self.search_fields = search_fields(schema)
+
         # Combined operator registry for validation and error messages
         self.all_operators = {
             **self.COMPARISON_OPS,
             **self.SET_OPS,
             **self.PATTERN_OPS,
-            **self.EXISTENCE_OPS
+            **self.EXISTENCE_OPS,
+            self.SEARCH_OP: None
         }
 
     def parse_filters(self, filters: Dict[str, Any], table) -> List:
@@ -217,6 +268,8 @@ class OperatorParser:
                 - Operators: {'score': {'$gte': 100}}
                 - Multiple operators: {'score': {'$gte': 100, '$lte': 200}}
                 - Compound logic: {'$and': [{...}, {...}]}
+                - Full-text search: {'$search': 'words'} (combinable with
+                  the forms above)
             table: SQLAlchemy table object with columns
 
         Returns:
@@ -261,6 +314,13 @@ class OperatorParser:
             >>> clauses = parser.parse_filters(filters, table)
             >>> # Returns: [and_(score >= 100, status.in_([...]))]
         """
+        # Full-text search applies alongside any other filters
+        if self.SEARCH_OP in filters:
+            rest = {k: v for k, v in filters.items() if k != self.SEARCH_OP}
+            clauses = self.parse_filters(rest, table) if rest else []
+            clauses.append(self.parse_search(filters[self.SEARCH_OP], table))
+            return clauses
+
         # Handle compound logical operators (Sortie 3)
         if '$and' in filters:
             conditions = filters['$and']
@@ -313,7 +373,7 @@ class OperatorParser:
             if field_name.startswith('$'):
                 raise ValueError(
                     f"Unknown logical operator: {field_name}. "
-                    f"Supported: $and, $or, $not"
+                    f"Supported: $and, $or, $not, $search"
                 )
 
             # Validate field exists
@@ -452,12 +512,60 @@ class OperatorParser:
             op_func = self.EXISTENCE_OPS[operator]
             return op_func(column, value)
 
+        # Full-text search on one indexed field
+        if operator == self.SEARCH_OP:
+            return self.parse_search(value, column.table, field_name)
+
         # Unknown operator
         raise ValueError(
             f"Unknown operator '{operator}' on field '{field_name}'. "
             f"Supported operators: {', '.join(sorted(self.all_operators.keys()))}"
         )
 
+    def parse_search(self, query: Any, table, field_name: Optional[str] = None):
+        """
+        Parse a $search query into a full-text match clause.
+
+        Every word of the query must appear in the row's indexed fields
+        (or in ``field_name`` only). Punctuation is ignored, so a query
+        with no words matches nothing.
+
+        Args:
+            query: Search text
+            table: SQLAlchemy table object
+            field_name: Restrict the match to this indexed field
+
+        Returns:
+            SQLAlchemy where clause
+
+        Raises:
+            ValueError: If the table (or field) has no full-text index
+            TypeError: If query is not a string
+
+        Example:
+            >>> clause = parser.parse_search('relativity', table)
+            >>> clause = parser.parse_search('einstein', table, 'author')
+        """
+        target = f"field '{field_name}'" if field_name else "table"
+        if not isinstance(query, str):
+            raise TypeError(
+                f"Search operator '{self.SEARCH_OP}' on {target} requires "
+                f"string value, got {type(query).__name__}"
+            )
+        if field_name is not None and field_name not in self.search_fields:
+            raise ValueError(
+                f"Field '{field_name}' is not full-text indexed. "
+                f"Declare it with \"search\": true in the schema"
+            )
+        if not self.search_fields:
+            raise ValueError(
+                "Table has no full-text indexed fields. "
+                "Declare string/text fields with \"search\": true in the schema"
+            )
+        if not search_terms(query):
+            return false()
+        return FullTextMatch(table, self.search_fields, query, field_name)
+
     def validate_filter_dict(self, filters: Dict[str, Any]) -> None:
         """
         Validate filter dict without generating clauses.
@@ -485,6 +593,13 @@ class OperatorParser:
             ...     print(f"Invalid filter: {e}")
         """
         for field_name, filter_value in filters.items():
+            if field_name == self.SEARCH_OP:
+                if not isinstance(filter_value, str):
+                    raise TypeError(f"Search operator {field_name} requires string value")
+                if not self.search_fields:
+                    raise ValueError("Table has no full-text indexed fields")
+                continue
+
             # Check field exists
             if field_name not in self.fields:
                 raise ValueError(
@@ -538,6 +653,17 @@ class OperatorParser:
                                 f"Existence operator {operator} requires boolean value"
                             )
 
+                    # Validate field search
+                    if operator == self.SEARCH_OP:
+                        if field_name not in self.search_fields:
+                            raise ValueError(
+                                f"Field '{field_name}' is not full-text indexed"
+                            )
+                        if not isinstance(value, str):
+                            raise TypeError(
+                                f"Search operator {operator} requires string value"
+                            )
+
     def parse_update_operations(
         self,
         operations: Dict[str, Any],
@@ -550,7 +676,9 @@ class OperatorParser:
         preventing race conditions in concurrent scenarios (Sortie 3).
 
         Args:
-            operations: Dict of {field: {operator: value}}
+            operations: Dict of {field: {operator: value}}. A value of
+                {'$field': name} refers to another column of the row (its
+                value before this update).
                 Example: {
                     'score': {'$inc': 10},
                     'high_score': {'$max': 95},
@@ -562,7 +690,7 @@ class OperatorParser:
             Dict of {field: SQLAlchemy_expression} for use in update() statement
             Example: {
                 'score': Column('score') + 10,
-                'high_score': func.greatest(Column('high_score'), 95),
+                'high_score': greatest(Column('high_score'), 95),
                 'status': 'active'
             }
 
@@ -613,6 +741,22 @@ class OperatorParser:
                     f"Supported: {', '.join(sorted(self.UPDATE_OPS.keys()))}"
                 )
 
+            # Column reference: {'$field': 'other'} uses the row's current value
+            is_field_ref = isinstance(value, dict)
+            if is_field_ref:
+                ref = value.get('$field') if len(value) == 1 else None
+                if not isinstance(ref, str):
+                    raise TypeError(
+                        f"Update value for field '{field_name}' must be a literal "
+                        f"or {{'$field': name}}, got {value!r}"
+                    )
+                if ref not in self.fields:
+                    raise ValueError(
+                        f"Field '{ref}' not in schema. "
+                        f"Available fields: {', '.join(sorted(self.fields.keys()))}"
+                    )
+                value = table.c[ref]
+
             # Type validation for numeric operators ($inc, $dec, $mul)
             if operator in self.NUMERIC_UPDATE_OPS:
                 if field_type not in self.NUMERIC_TYPES:
@@ -624,7 +768,7 @@ class OperatorParser:
                     )
 
                 # Validate value is numeric
-                if not isinstance(value, (int, float)):
+                if not is_field_ref and not isinstance(value, (int, float)):
                     raise TypeError(
                         f"Operator {operator} requires numeric value, "
                         f"got {type(value).__name__}"
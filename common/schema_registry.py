@@ -21,7 +21,7 @@ Usage:
     schema = {
         "fields": [
             {"name": "text", "type": "text", "required": True},
-            {"name": "author", "type": "string", "required": False}
+            {"name": "author", "type": "string", "required": False, "search": True}
         ]
     }
     await registry.register_schema("quote-db", "quotes", schema)
@@ -48,9 +48,17 @@ from sqlalchemy import (
     Text,
     delete,
     select,
+    text,
 )
 
 from common.models import PluginTableSchema
+from common.query_parsers.full_text import (
+    SEARCH_FIELD_TYPES,
+    fts_table_name,
+    index_statements,
+    rebuild_statement,
+    search_fields,
+)
 
 
 class SchemaRegistry:
@@ -156,6 +164,16 @@ class SchemaRegistry:
             if 'required' in field and not isinstance(field['required'], bool):
                 return False, f"Field '{name}' 'required' must be boolean"
 
+            # Validate 'search' field (full-text index)
+            if 'search' in field:
+                if not isinstance(field['search'], bool):
+                    return False, f"Field '{name}' 'search' must be boolean"
+                if field['search'] and field['type'] not in SEARCH_FIELD_TYPES:
+                    return False, (
+                        f"Field '{name}' cannot be searchable: "
+                        f"only string and text fields support full-text search"
+                    )
+
         return True, ""
 
     def validate_table_name(self, table_name: str) -> tuple[bool, str]:
@@ -196,6 +214,9 @@ class SchemaRegistry:
         Returns:
             True if registered successfully, False if already exists
 
+        An existing schema is left unchanged, except that a change in its
+        ``"search": true`` fields (re)builds the full-text index.
+
         Raises:
             ValueError: If schema validation fails
         """
@@ -212,9 +233,12 @@ class SchemaRegistry:
         # Check if already exists
         key = (plugin_name, table_name)
         if key in self._cache:
-            self.logger.warning(
-                f"Schema for {plugin_name}.{table_name} already exists, skipping"
-            )
+            if search_fields(schema) != search_fields(self._cache[key]):
+                await self._update_search_index(plugin_name, table_name, schema)
+            else:
+                self.logger.warning(
+                    f"Schema for {plugin_name}.{table_name} already exists, skipping"
+                )
             return False
 
         # Update cache FIRST (cache-first pattern for NATS handlers)
@@ -286,6 +310,96 @@ class SchemaRegistry:
 
         self.logger.info(f"Created table: {full_table_name}")
 
+        fields = search_fields(schema)
+        if fields:
+            await self._create_search_index(full_table_name, fields)
+
+    async def _create_search_index(self, full_table_name: str, fields: list) -> None:
+        """
+        Create the full-text index for a table's searchable fields.
+
+        On SQLite, a newly created FTS5 table is populated from the rows
+        already in the table. Failures are logged; $search queries on the
+        table then fail until the index exists.
+        """
+        try:
+            async with self.db.engine.begin() as conn:
+                existed = True
+                if not self.db.is_postgresql:
+                    result = await conn.execute(
+                        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                        {'name': fts_table_name(full_table_name)}
+                    )
+                    existed = result.first() is not None
+                for statement in index_statements(full_table_name, fields, self.db.is_postgresql):
+                    await conn.execute(text(statement))
+                if not existed:
+                    await conn.execute(text(rebuild_statement(full_table_name)))
+        except Exception as e:
+            self.logger.error(
+                f"Failed to create full-text index for {full_table_name}: {e}", exc_info=True
+            )
+            return
+
+        self.logger.info(f"Created full-text index on {full_table_name}: {', '.join(fields)}")
+
+    async def _drop_search_index(self, full_table_name: str) -> None:
+        """Drop a table's full-text index (SQLite FTS table and triggers too)."""
+        if self.db.is_postgresql:
+            statements = [f'DROP INDEX IF EXISTS "{full_table_name}_search_idx"']
+        else:
+            fts = fts_table_name(full_table_name)
+            statements = [
+                f'DROP TRIGGER IF EXISTS "{fts}_{suffix}"' for suffix in ('ai', 'ad', 'au')
+            ] + [f'DROP TABLE IF EXISTS "{fts}"']
+        async with self.db.engine.begin() as conn:
+            for statement in statements:
+                await conn.execute(text(statement))
+
+    async def _update_search_index(
+        self,
+        plugin_name: str,
+        table_name: str,
+        schema: dict
+    ) -> None:
+        """Rebuild the full-text index of an existing table for changed search fields."""
+        full_table_name = f"{plugin_name}_{table_name}"
+        key = (plugin_name, table_name)
+
+        # Only the search flags change; columns stay as stored
+        flags = {f['name']: f.get('search', False) for f in schema['fields']}
+        updated = {
+            **self._cache[key],
+            'fields': [
+                {**{k: v for k, v in f.items() if k != 'search'},
+                 **({'search': True} if flags.get(f['name']) else {})}
+                for f in self._cache[key]['fields']
+            ]
+        }
+        self._cache[key] = updated
+
+        await self._drop_search_index(full_table_name)
+        fields = search_fields(updated)
+        if fields:
+            await self._create_search_index(full_table_name, fields)
+
+        now = int(time.time())
+        async with self.db.session_factory() as session:
+            stmt = select(PluginTableSchema).where(
+                PluginTableSchema.plugin_name == plugin_name,
+                PluginTableSchema.table_name == table_name
+            )
+            schema_model = (await session.execute(stmt)).scalar_one_or_none()
+            if schema_model is not None:
+                schema_model.set_schema(updated)
+                schema_model.updated_at = now
+                await session.commit()
+
+        self.logger.info(
+            f"Updated full-text index for {plugin_name}.{table_name}: "
+            f"{', '.join(fields) or 'none'}"
+        )
+
     async def _store_schema_in_db(
         self,
         plugin_name: str,
@@ -374,8 +488,9 @@ class SchemaRegistry:
 
         # Drop table
         full_table_name = f"{plugin_name}_{table_name}"
+        if search_fields(self._cache[key]):
+            await self._drop_search_index(full_table_name)
         async with self.db.engine.begin() as conn:
-            from sqlalchemy import text
             await conn.execute(text(f"DROP TABLE IF EXISTS {full_table_name}"))
 
         # Delete from database
@@ -13,8 +13,11 @@ from .connection.errors import ConnectionError as ConnError
 from .connection.errors import NotConnectedError
 from .error import ChannelError, ChannelPermissionError, Kicked, LoginError
 from .media_link import MediaLink
+from .outbound import PRIORITY_MODERATION, PRIORITY_NORMAL, OutboundScheduler
 from .playlist import PlaylistItem
+from .socket_io import SocketIOResponse
 from .user import User
+from .util import backoff_delay
 
 try:
     from common.database import BotDatabase
@@ -34,8 +37,11 @@ class Bot:
     response_timeout : `float`
         socket.io event response timeout in seconds.
     restart_delay : `None` or `float`
-        Delay in seconds before reconnection.
+        Delay in seconds before the first reconnection attempt; doubles,
+        with jitter, for each consecutive failure.
         `None` or < 0 - do not reconnect.
+    max_restart_delay : `float`
+        Cap on the nominal reconnection delay in seconds.
     domain : `str`
         Domain.
     channel : `cytube_bot.channel.Channel`
@@ -48,6 +54,8 @@ class Bot:
         socket.io connection.
     handlers : `collections.defaultdict` of (`str`, `list` of `function`)
         Event handlers.
+    outbound : `lib.outbound.OutboundScheduler`
+        Flood control for `chat` and `pm`.
     """
     logger = logging.getLogger(__name__)
 
@@ -127,7 +135,8 @@ class Bot:
 
     def __init__(self, connection: ConnectionAdapter,
                  nats_client,
-                 restart_delay: float = 5.0):
+                 restart_delay: float = 5.0,
+                 max_restart_delay: float = 60.0):
         """
         Initialize bot with connection adapter and NATS event bus.
 
@@ -146,8 +155,10 @@ class Bot:
             Bot cannot operate without NATS. All database operations
             publish events to NATS subjects.
         restart_delay : float, optional
-            Delay in seconds before reconnection.
+            Delay in seconds before the first reconnection attempt.
             0 or negative - do not reconnect.
+        max_restart_delay : float, optional
+            Cap on the nominal reconnection delay in seconds.
 
         Raises
         ------
@@ -183,6 +194,7 @@ class Bot:
 
         self.connection = connection
         self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
         self.channel = Channel()
         self.user = User()
         try:
@@ -190,6 +202,7 @@ class Bot:
         except RuntimeError:
             self.loop = asyncio.new_event_loop()
         self.handlers: Dict[str, List] = collections.defaultdict(list)
+        self.outbound = OutboundScheduler(self._send_outbound)
         self.start_time = time.time()  # Track bot start time
         self.connect_time = None  # Track connection time
         self._history_task = None  # Background task for logging user counts
@@ -204,13 +217,12 @@ class Bot:
         # NO self.db - Database operations go through NATS only
         # DatabaseService subscribes to NATS subjects separately
 
-        # Register event handlers
+        # Register event handlers. run() feeds every event from
+        # connection.recv_events() to trigger(), so they are not also
+        # registered as connection callbacks (that ran each one twice).
         for attr in dir(self):
             if attr.startswith('_on_'):
-                event_name = attr[4:]
-                self.on(event_name, getattr(self, attr))
-                # Also register handler with connection adapter
-                self.connection.on_event(event_name, getattr(self, attr))
+                self.on(attr[4:], getattr(self, attr))
 
     @property
     def socket(self):
@@ -245,6 +257,7 @@ class Bot:
 
     def _on_channelOpts(self, _, data):  # noqa: N802 (CyTube API naming)
         self.channel.options = data
+        self.outbound.configure(data)
 
     def _on_setPermissions(self, _, data):  # noqa: N802 (CyTube API naming)
         self.channel.permissions = data
@@ -276,6 +289,7 @@ class Bot:
 
     def _on_noflood(self, _, data):
         self.logger.error('noflood: %r', data)
+        self.outbound.on_noflood()
 
     def _on_errorMsg(self, _, data):  # noqa: N802 (CyTube API naming)
         self.logger.error('error: %r', data)
@@ -296,45 +310,62 @@ class Bot:
         Args:
             data: User data dict with either 'username' or 'name' field
         """
+        self.channel.userlist.add(self._user_from_data(data))
+
+    def _user_from_data(self, data):
+        """Build a User from user data, reusing self.user for the bot itself."""
         # Support both normalized 'username' and CyTube 'name'
         username = data.get('username', data.get('name', ''))
+        if username != self.user.name:
+            return User.from_data(data)
 
-        # Create User with basic fields that __init__ accepts
-        user_dict = {
-            'name': username,
-            'rank': data.get('rank', 0),
-            'meta': data.get('meta', {})
-        }
-
-        if username == self.user.name:
-            self.user.update(**user_dict)
-            # Set afk attribute directly (not in __init__)
-            self.user.afk = data.get('is_afk', data.get('afk', False))
-            self.channel.userlist.add(self.user)
-        else:
-            new_user = User(**user_dict)
-            # Set afk attribute directly (not in __init__)
-            new_user.afk = data.get('is_afk', data.get('afk', False))
-            self.channel.userlist.add(new_user)
+        self.user.update(
+            name=username,
+            rank=data.get('rank', 0),
+            meta=data.get('meta', {})
+        )
+        # Set afk attribute directly (not in meta)
+        self.user.afk = data.get('is_afk', data.get('afk', False))
+        return self.user
 
-    def _on_user_list(self, _, data):
+    async def _on_user_list(self, _, data):
         """Handle normalized user_list event.
 
         Uses normalized 'users' field which contains array of user objects
         with platform-agnostic structure (username, rank, is_moderator, etc).
+        The userlist is rebuilt in one pass with User.from_data().
+
+        A userlist for a channel that already has users means the bot
+        rejoined after a reconnect: it is diffed against the previous one,
+        and only users who joined or left while disconnected are published,
+        instead of replaying everyone.
 
         ✅ NORMALIZATION COMPLETE (Sortie 2): Uses normalized 'users' array
         """
-        self.channel.userlist.clear()
+        users = (self._user_from_data(user) for user in data.get('users', []))
+        userlist = self.channel.userlist
 
-        # ✅ Use normalized 'users' array (Sortie 1 provides full objects)
-        users_data = data.get('users', [])
+        if not userlist:
+            userlist.reset(users)
+            self.logger.info('userlist: %s users', len(userlist))
+            return
 
-        for user in users_data:
-            # user is now guaranteed to be a dict with normalized fields
-            self._add_user(user)
+        joined, left, kept = userlist.sync(users)
+        for username in left:
+            await self.nats.publish('rosey.db.user.left', json.dumps({
+                'username': username
+            }).encode())
+        for username in joined:
+            await self.nats.publish('rosey.db.user.joined', json.dumps({
+                'username': username
+            }).encode())
+        if isinstance(self.connection, CyTubeConnection):
+            self.connection.stats.user_replays_avoided += kept
 
-        self.logger.info('userlist: %s users', len(self.channel.userlist))
+        self.logger.info(
+            'userlist: %s users (%s joined, %s left while disconnected)',
+            len(userlist), len(joined), len(left)
+        )
 
     async def _on_user_join(self, _, data):
         """Handle normalized user_join event.
@@ -464,25 +495,25 @@ class Bot:
         self.logger.info('setCurrent %s', self.channel.playlist.current)
 
     def _on_queue(self, _, data):
-        self.channel.playlist.add(data['after'], data['item'])
-        self.logger.info('queue %s', self.channel.playlist.queue)
+        item = self.channel.playlist.add(data['after'], data['item'])
+        self.logger.info('queue %s after %s', item, data['after'])
 
     def _on_delete(self, _, data):
         self.channel.playlist.remove(data['uid'])
-        self.logger.info('delete %s', self.channel.playlist.queue)
+        self.logger.info('delete %s', data['uid'])
 
     def _on_setTemp(self, _, data):  # noqa: N802 (CyTube API naming)
         self.channel.playlist.get(data['uid']).temp = data['temp']
 
     def _on_moveVideo(self, _, data):  # noqa: N802 (CyTube API naming)
         self.channel.playlist.move(data['from'], data['after'])
-        self.logger.info('move %s', self.channel.playlist.queue)
+        self.logger.info('move %s after %s', data['from'], data['after'])
 
     def _on_playlist(self, _, data):
         self.channel.playlist.clear()
         for item in data:
             self.channel.playlist.add(None, item)
-        self.logger.info('playlist %s', self.channel.playlist.queue)
+        self.logger.info('playlist: %s items', len(data))
 
     def _on_setPlaylistLocked(self, _, data):  # noqa: N802 (CyTube API naming)
         self.channel.playlist.locked = data
@@ -726,12 +757,15 @@ class Bot:
                 self._perform_maintenance_periodically()
             )
 
+            attempts = 0
+            connected_at = None
             while True:
                 try:
                     if not self.connection.is_connected:
                         self.logger.info('connecting')
                         await self.connection.connect()
                         self.connect_time = time.time()  # Record connection time
+                        connected_at = time.monotonic()
 
                     async for ev, data in self.connection.recv_events():
                         await self.trigger(ev, data)
@@ -746,9 +780,18 @@ class Bot:
                     if self.restart_delay is None or self.restart_delay <= 0:
                         break
 
-                    self.logger.error('restarting in %s seconds', self.restart_delay)
-                    await asyncio.sleep(self.restart_delay)
-                    await self.connection.reconnect()
+                    # Back off while the link keeps failing; start over
+                    # once a connection has stayed up for a while
+                    if (connected_at is not None
+                            and time.monotonic() - connected_at > self.max_restart_delay):
+                        attempts = 0
+                    connected_at = None
+                    attempts += 1
+                    delay = backoff_delay(attempts, self.restart_delay, self.max_restart_delay)
+                    self.logger.error(
+                        'restarting in %.1f seconds (attempt %d)', delay, attempts
+                    )
+                    await asyncio.sleep(delay)
 
         except asyncio.CancelledError:
             self.logger.info('cancelled')
@@ -782,6 +825,8 @@ class Bot:
                 except asyncio.CancelledError:
                     pass
 
+            await self.outbound.close()
+
             try:
                 await self.connection.disconnect()
             except Exception as ex:
@@ -864,13 +909,18 @@ class Bot:
                     'error': ex
                 })
 
-    async def chat(self, msg, meta=None):
+    async def chat(self, msg, meta=None, priority=PRIORITY_NORMAL):
         """Send a chat message.
 
+        Waits for the outbound scheduler when sending faster than the
+        channel's flood limits allow.
+
         Parameters
         ----------
         msg : `str`
         meta : `None` or `dict`, optional
+        priority : `int`, optional
+            Outbound lane (see `lib.outbound.PRIORITIES`).
 
         Returns
         -------
@@ -888,18 +938,11 @@ class Bot:
         if self.user.muted or self.user.smuted:
             raise ChannelPermissionError('muted')
 
-        try:
-            await self.connection.send_message(msg, meta=meta)
-            # Return dict for compatibility
-            return {'msg': msg, 'meta': meta if meta else {}}
-        except NotConnectedError:
-            self.logger.error('chat: not connected')
-            raise ChannelError('not connected')
-        except Exception as ex:
-            self.logger.error('chat: error: %r', ex)
-            raise ChannelError(f'could not send chat message: {ex}')
+        await self.outbound.submit('chat', None, msg, meta, priority)
+        # Return dict for compatibility
+        return {'msg': msg, 'meta': meta if meta else {}}
 
-    async def pm(self, to, msg, meta=None):
+    async def pm(self, to, msg, meta=None, priority=PRIORITY_NORMAL):
         """Send a private chat message.
 
         Parameters
@@ -907,6 +950,8 @@ class Bot:
         to : `str`
         msg : `str`
         meta : `None` or `dict`, optional
+        priority : `int`, optional
+            Outbound lane (see `lib.outbound.PRIORITIES`).
 
         Returns
         -------
@@ -924,16 +969,34 @@ class Bot:
         if self.user.muted or self.user.smuted:
             raise ChannelPermissionError('muted')
 
+        await self.outbound.submit('pm', to, msg, meta, priority)
+        # Return dict for compatibility
+        return {'to': to, 'msg': msg, 'meta': meta if meta else {}}
+
+    async def _send_outbound(self, kind, to, msg, meta):
+        """Send one line for the outbound scheduler.
+
+        Raises
+        ------
+        cytube_bot.error.ChannelError
+        """
         try:
-            await self.connection.send_pm(to, msg)
-            # Return dict for compatibility
-            return {'to': to, 'msg': msg, 'meta': meta if meta else {}}
+            if kind == 'pm':
+                await self.connection.send_pm(to, msg)
+            else:
+                await self.connection.send_message(msg, meta=meta)
         except NotConnectedError:
-            self.logger.error('pm: %s: not connected', to)
+            if kind == 'pm':
+                self.logger.error('pm: %s: not connected', to)
+            else:
+                self.logger.error('chat: not connected')
             raise ChannelError('not connected')
         except Exception as ex:
-            self.logger.error('pm: %s: error: %r', to, ex)
-            raise ChannelError(f'could not send private message: {ex}')
+            if kind == 'pm':
+                self.logger.error('pm: %s: error: %r', to, ex)
+                raise ChannelError(f'could not send private message: {ex}')
+            self.logger.error('chat: error: %r', ex)
+            raise ChannelError(f'could not send chat message: {ex}')
 
     async def set_afk(self, value=True):
         """Set bot AFK.
@@ -957,7 +1020,7 @@ class Bot:
         cytube_bot.error.ChannelPermissionError
         """
         self.channel.check_permission('chatclear', self.user)
-        await self.connection.send_message('/clear')
+        await self.outbound.submit('chat', None, '/clear', None, PRIORITY_MODERATION)
 
     async def kick(self, user, reason=''):
         """Kick a user.
@@ -973,6 +1036,7 @@ class Bot:
         cytube_bot.error.ChannelPermissionError
         ValueError
         """
+        @SocketIOResponse.expects('errorMsg', 'userLeave')
         def match_kick_response(event, data):
             if event == 'errorMsg':
                 return True
@@ -1025,6 +1089,7 @@ class Bot:
         ValueError
         """
 
+        @SocketIOResponse.expects('queue', 'queueFail')
         def match_add_media_response(event, data):
             if event == 'queueFail':
                 return True
@@ -1082,6 +1147,7 @@ class Bot:
         ValueError
         """
 
+        @SocketIOResponse.expects('delete')
         def match_remove_media_response(event, data):
             if event == 'delete':
                 return data.get('uid') == item.uid
@@ -1117,6 +1183,7 @@ class Bot:
         cytube_bot.error.ChannelPermissionError
         ValueError
         """
+        @SocketIOResponse.expects('moveVideo')
         def match_remove_media_response(event, data):
             if event == 'moveVideo':
                 return (
@@ -1161,6 +1228,7 @@ class Bot:
         cytube_bot.error.ChannelPermissionError
         ValueError
         """
+        @SocketIOResponse.expects('setCurrent')
         def match_set_current_response(event, data):
             if event == 'setCurrent':
                 return data == item.uid
@@ -1195,6 +1263,7 @@ class Bot:
         cytube_bot.error.ChannelError
         ValueError
         """
+        @SocketIOResponse.expects('setLeader')
         def match_set_leader_response(event, data):
             if event == 'setLeader':
                 if user is None:
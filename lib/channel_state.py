@@ -0,0 +1,727 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Channel state snapshots and deltas over NATS.
+
+The bot process owns the live `lib.channel.Channel`. Instead of
+republishing whole userlists and playlists, `ChannelStatePublisher`
+turns each change the bot applies into a small delta with a sequence
+number and publishes them on ``rosey.state.<channel>.delta``:
+
+==============  ==================================================
+op              fields
+==============  ==================================================
+users           users (userlist snapshot from the server)
+user.add        user
+user.remove     name
+user.meta       name and any of rank, afk, meta
+playlist        items (playlist snapshot from the server)
+item.add        after, item
+item.remove     uid
+item.move       uid, after
+item.meta       uid, temp
+playlist.meta   any of current, locked
+==============  ==================================================
+
+Users and items use the CyTube wire format (without IP addresses), so a
+consumer can rebuild them with `User.from_data` / `PlaylistItem`.
+Deltas produced while handling one burst of events are published
+together, as ``{"epoch": epoch, "seq": last_seq, "deltas": [...]}``.
+Sequence numbers restart with each publisher; ``epoch`` tells consumers
+when that happened.
+
+Two request/reply endpoints let consumers join at any time:
+
+- ``rosey.state.<channel>.snapshot``: the full state and the sequence
+  number it includes
+- ``rosey.state.<channel>.resume``: ``{"since": seq}`` returns the deltas
+  after ``seq`` from a bounded history, or ``{"resync": true}`` if they
+  are no longer available
+
+`ChannelStateReplica` is the consumer side: it subscribes to the deltas,
+fetches a snapshot, and keeps a local `Channel` in sync, resuming or
+resyncing when it misses a delta. `ChannelStateClient` keeps one replica
+per channel for plugins, started on first use, so lookups such as "is
+this user a moderator" are answered from local memory.
+common.channel_state_service answers the same queries over NATS.
+
+Usage:
+    publisher = ChannelStatePublisher(bot)
+    await publisher.start()
+
+    replica = ChannelStateReplica(nats, 'mychannel')
+    await replica.start()
+    replica.rank('Alice')
+
+    state = ChannelStateClient(nats)
+    if await state.is_moderator('mychannel', 'Alice'):
+        ...
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from itertools import islice
+
+from .channel import Channel
+from .user import User
+
+SUBJECT_PREFIX = 'rosey.state'
+
+# CyTube ranks: 1 registered user, 2 moderator, 3 channel admin, 4+ owner
+MODERATOR_RANK = 2
+
+
+def state_subject(channel, kind):
+    """Subject for a channel state message kind (delta, snapshot, resume).
+
+    Parameters
+    ----------
+    channel : `str`
+    kind : `str`
+
+    Returns
+    -------
+    `str`
+    """
+    return '%s.%s.%s' % (SUBJECT_PREFIX, channel, kind)
+
+
+def user_data(user):
+    """Serialize a user for deltas and snapshots (IP addresses omitted).
+
+    Parameters
+    ----------
+    user : `lib.user.User`
+
+    Returns
+    -------
+    `dict`
+    """
+    return {
+        'name': user.name,
+        'rank': user.rank,
+        'profile': {'image': user.image, 'text': user.text},
+        'meta': {'afk': user.afk, 'muted': user.muted, 'smuted': user.smuted},
+    }
+
+
+def item_data(item):
+    """Serialize a playlist item in the CyTube format.
+
+    Parameters
+    ----------
+    item : `lib.playlist.PlaylistItem`
+
+    Returns
+    -------
+    `dict`
+    """
+    return {
+        'uid': item.uid,
+        'temp': item.temp,
+        'queueby': item.username,
+        'media': {
+            'type': item.link.type,
+            'id': item.link.id,
+            'title': item.title,
+            'seconds': item.duration,
+        },
+    }
+
+
+def _public_meta(meta):
+    return {key: meta[key] for key in ('afk', 'muted', 'smuted') if key in meta}
+
+
+class ChannelStatePublisher:
+    """Publishes a bot's channel state as versioned snapshots and deltas.
+
+    While started, handlers registered on the bot run after the bot's own
+    handlers, so each delta describes a change already applied to
+    `bot.channel`.
+
+    Attributes
+    ----------
+    epoch : `int`
+        Publisher start time (ms); sequence numbers are only comparable
+        within an epoch.
+    seq : `int`
+        Sequence number of the last delta (0 before any change).
+    history : `collections.deque` of `dict`
+        Most recent deltas, for ``resume`` requests.
+    published : `int`
+        Delta messages (batches) published.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    HISTORY = 4096
+
+    def __init__(self, bot, nats=None, channel=None, history=HISTORY):
+        self.bot = bot
+        self.channel = bot.channel
+        self.nats = nats if nats is not None else bot.nats
+        self.name = channel or self.channel.name
+        self.epoch = int(time.time() * 1000)
+        self.seq = 0
+        self.history = deque(maxlen=history)
+        self.published = 0
+        self._pending = []
+        self._flush_handle = None
+        self._tasks = set()
+        self._subscriptions = []
+        self._handlers = (
+            ('user_list', self._on_user_list),
+            ('user_join', self._on_user_join),
+            ('user_leave', self._on_user_leave),
+            ('setUserRank', self._on_user_meta),
+            ('setAFK', self._on_user_meta),
+            ('setUserMeta', self._on_user_meta),
+            ('playlist', self._on_playlist),
+            ('queue', self._on_queue),
+            ('delete', self._on_delete),
+            ('moveVideo', self._on_move_video),
+            ('setTemp', self._on_set_temp),
+            ('setCurrent', self._on_playlist_meta),
+            ('setPlaylistLocked', self._on_playlist_meta),
+        )
+
+    @property
+    def subject(self):
+        return state_subject(self.name, 'delta')
+
+    async def start(self):
+        """Start recording deltas and serving snapshot and resume requests."""
+        for event, handler in self._handlers:
+            self.bot.on(event, handler)
+        for kind, handler in (('snapshot', self._handle_snapshot),
+                              ('resume', self._handle_resume)):
+            self._subscriptions.append(
+                await self.nats.subscribe(state_subject(self.name, kind), cb=handler)
+            )
+        self.logger.info('serving channel state on %s.*',
+                         state_subject(self.name, '')[:-1])
+
+    async def stop(self):
+        """Stop recording deltas and serving requests; publish pending deltas."""
+        for event, handler in self._handlers:
+            self.bot.off(event, handler)
+        for sub in self._subscriptions:
+            await sub.unsubscribe()
+        self._subscriptions.clear()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending:
+            await self._publish(self._flush_batch())
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def snapshot(self):
+        """Full channel state at `seq`.
+
+        Returns
+        -------
+        `dict`
+        """
+        playlist = self.channel.playlist
+        current = playlist.current
+        return {
+            'epoch': self.epoch,
+            'seq': self.seq,
+            'channel': self.name,
+            'users': [user_data(user) for user in self.channel.userlist.values()],
+            'items': [item_data(item) for item in playlist],
+            'current': current.uid if current is not None else None,
+            'locked': playlist.locked,
+        }
+
+    def deltas_since(self, seq):
+        """Deltas after `seq`, or `None` if they are no longer in `history`.
+
+        Parameters
+        ----------
+        seq : `int`
+
+        Returns
+        -------
+        `None` or `list` of `dict`
+        """
+        if seq >= self.seq:
+            return []
+        if not self.history or self.history[0]['seq'] > seq + 1:
+            return None
+        return list(islice(self.history, seq + 1 - self.history[0]['seq'], None))
+
+    def record(self, op, **fields):
+        """Record a delta and schedule its publication.
+
+        Deltas recorded before control returns to the event loop are
+        published as one message.
+
+        Parameters
+        ----------
+        op : `str`
+        **fields
+            Delta fields.
+
+        Returns
+        -------
+        `dict`
+            The delta.
+        """
+        self.seq += 1
+        fields['seq'] = self.seq
+        fields['op'] = op
+        self.history.append(fields)
+        self._pending.append(fields)
+        if self._flush_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass  # published by the next flush
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+        return fields
+
+    def _flush_batch(self):
+        batch, self._pending = self._pending, []
+        return batch
+
+    def _flush(self):
+        self._flush_handle = None
+        if not self._pending:
+            return
+        task = asyncio.ensure_future(self._publish(self._flush_batch()))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _publish(self, batch):
+        payload = json.dumps({
+            'epoch': self.epoch, 'seq': batch[-1]['seq'], 'deltas': batch
+        })
+        try:
+            await self.nats.publish(self.subject, payload.encode())
+            self.published += 1
+        except Exception as ex:  # consumers recover through resume
+            self.logger.warning('state delta publish failed: %r', ex)
+
+    async def _handle_snapshot(self, msg):
+        await msg.respond(json.dumps(self.snapshot()).encode())
+
+    async def _handle_resume(self, msg):
+        try:
+            since = int(json.loads(msg.data.decode()).get('since', 0))
+        except (ValueError, TypeError, AttributeError):
+            since = -1
+        deltas = self.deltas_since(since) if since >= 0 else None
+        if deltas is None:
+            response = {'epoch': self.epoch, 'seq': self.seq, 'resync': True}
+        else:
+            response = {'epoch': self.epoch, 'seq': self.seq, 'deltas': deltas}
+        await msg.respond(json.dumps(response).encode())
+
+    # ------------------------------------------------------------------
+    # Bot event handlers
+    # ------------------------------------------------------------------
+
+    def _on_user_list(self, _, data):
+        self.record('users', users=[
+            user_data(user) for user in self.channel.userlist.values()
+        ])
+
+    def _on_user_join(self, _, data):
+        name = data.get('user') or data.get('user_data', {}).get('username')
+        if name in self.channel.userlist:
+            self.record('user.add', user=user_data(self.channel.userlist[name]))
+
+    def _on_user_leave(self, _, data):
+        name = data.get('user', '')
+        if name and name not in self.channel.userlist:
+            self.record('user.remove', name=name)
+
+    def _on_user_meta(self, event, data):
+        name = data.get('name', '')
+        if name not in self.channel.userlist:
+            return
+        if event == 'setUserRank':
+            self.record('user.meta', name=name, rank=data['rank'])
+        elif event == 'setAFK':
+            self.record('user.meta', name=name, afk=data['afk'])
+        else:
+            self.record('user.meta', name=name, meta=_public_meta(data['meta']))
+
+    def _on_playlist(self, _, data):
+        self.record('playlist', items=[item_data(item) for item in self.channel.playlist])
+
+    def _on_queue(self, _, data):
+        item = self.channel.playlist.get(data['item']['uid'])
+        self.record('item.add', after=data['after'], item=item_data(item))
+
+    def _on_delete(self, _, data):
+        self.record('item.remove', uid=data['uid'])
+
+    def _on_move_video(self, _, data):
+        self.record('item.move', uid=data['from'], after=data['after'])
+
+    def _on_set_temp(self, _, data):
+        self.record('item.meta', uid=data['uid'], temp=data['temp'])
+
+    def _on_playlist_meta(self, event, data):
+        playlist = self.channel.playlist
+        if event == 'setCurrent':
+            current = playlist.current
+            self.record('playlist.meta',
+                        current=current.uid if current is not None else None)
+        else:
+            self.record('playlist.meta', locked=playlist.locked)
+
+
+class ChannelStateReplica:
+    """Local copy of a channel's state, kept in sync from NATS.
+
+    Deltas received before the snapshot arrives are buffered and applied
+    on top of it. A gap in sequence numbers triggers a ``resume``
+    request, and a full resync if the publisher no longer has the
+    missing deltas or has restarted (new epoch).
+
+    Attributes
+    ----------
+    channel : `lib.channel.Channel`
+        Replicated state; treat as read-only.
+    epoch : `None` or `int`
+        Epoch of the loaded snapshot.
+    seq : `int`
+        Sequence number of the last applied delta.
+    ready : `bool`
+        `True` once a snapshot has been loaded.
+    resyncs : `int`
+        Snapshots loaded.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, nats, channel, timeout=2.0):
+        self.nats = nats
+        self.name = channel
+        self.timeout = timeout
+        self.channel = Channel(channel)
+        self.epoch = None
+        self.seq = 0
+        self.ready = False
+        self.resyncs = 0
+        self._buffer = []
+        self._subscription = None
+        self._resyncing = False
+
+    async def start(self):
+        """Subscribe to deltas and load a snapshot."""
+        self._subscription = await self.nats.subscribe(
+            state_subject(self.name, 'delta'), cb=self._on_message
+        )
+        await self.resync()
+
+    async def stop(self):
+        if self._subscription is not None:
+            await self._subscription.unsubscribe()
+            self._subscription = None
+        self.ready = False
+
+    async def resync(self):
+        """Load a fresh snapshot, then apply buffered newer deltas."""
+        self.ready = False
+        self._resyncing = True
+        try:
+            response = await self.nats.request(
+                state_subject(self.name, 'snapshot'), b'', timeout=self.timeout
+            )
+        finally:
+            self._resyncing = False
+        self.load(json.loads(response.data.decode()))
+        buffered, self._buffer = self._buffer, []
+        await self._apply_all(buffered)
+
+    async def resume(self):
+        """Fetch missed deltas, falling back to a resync.
+
+        The replica is resynced if the deltas do not apply cleanly or do
+        not reach the publisher's sequence number.
+        """
+        response = await self.nats.request(
+            state_subject(self.name, 'resume'),
+            json.dumps({'since': self.seq}).encode(),
+            timeout=self.timeout
+        )
+        data = json.loads(response.data.decode())
+        if data.get('resync') or data.get('epoch') != self.epoch:
+            await self.resync()
+            return
+        for delta in data['deltas']:
+            if delta['seq'] <= self.seq:
+                continue
+            if delta['seq'] != self.seq + 1:
+                break
+            try:
+                self.apply(delta)
+            except (KeyError, ValueError) as ex:
+                self.logger.warning('channel state out of sync (%r), resyncing', ex)
+                await self.resync()
+                return
+        if self.seq < data.get('seq', self.seq):
+            self.logger.warning('channel state resume left a gap at %s, resyncing', self.seq)
+            await self.resync()
+
+    def load(self, snapshot):
+        """Replace the state with a snapshot.
+
+        Parameters
+        ----------
+        snapshot : `dict`
+        """
+        channel = self.channel
+        channel.userlist.reset(User.from_data(user) for user in snapshot['users'])
+        channel.playlist.clear()
+        for item in snapshot['items']:
+            channel.playlist.add(None, item)
+        channel.playlist.current = snapshot.get('current')
+        channel.playlist.locked = snapshot.get('locked', False)
+        self.epoch = snapshot.get('epoch')
+        self.seq = snapshot['seq']
+        self.ready = True
+        self.resyncs += 1
+
+    def apply(self, delta):
+        """Apply the delta following `seq`.
+
+        Parameters
+        ----------
+        delta : `dict`
+
+        Raises
+        ------
+        ValueError
+            If `delta` does not directly follow `seq`.
+        """
+        if delta['seq'] != self.seq + 1:
+            raise ValueError('delta %s does not follow %s' % (delta['seq'], self.seq))
+        op = delta['op']
+        userlist = self.channel.userlist
+        playlist = self.channel.playlist
+        if op == 'user.add':
+            user = User.from_data(delta['user'])
+            userlist[user.name] = user
+        elif op == 'user.remove':
+            userlist.pop(delta['name'], None)
+        elif op == 'user.meta':
+            user = userlist.get(delta['name'])
+            if 'rank' in delta:
+                user.rank = delta['rank']
+            if 'afk' in delta:
+                user.afk = delta['afk']
+            if 'meta' in delta:
+                user.afk = delta['meta'].get('afk', False)
+                user.muted = delta['meta'].get('muted', False)
+                user.smuted = delta['meta'].get('smuted', False)
+        elif op == 'users':
+            userlist.reset(User.from_data(user) for user in delta['users'])
+        elif op == 'item.add':
+            playlist.add(delta['after'], delta['item'])
+        elif op == 'item.remove':
+            playlist.remove(delta['uid'])
+        elif op == 'item.move':
+            playlist.move(delta['uid'], delta['after'])
+        elif op == 'item.meta':
+            playlist.get(delta['uid']).temp = delta['temp']
+        elif op == 'playlist':
+            playlist.clear()
+            for item in delta['items']:
+                playlist.add(None, item)
+        elif op == 'playlist.meta':
+            if 'current' in delta:
+                playlist.current = delta['current']
+            if 'locked' in delta:
+                playlist.locked = delta['locked']
+        else:
+            self.logger.warning('unknown channel state op: %s', op)
+        self.seq = delta['seq']
+
+    @property
+    def version(self):
+        """(epoch, seq) of the replicated state."""
+        return self.epoch, self.seq
+
+    def online(self):
+        """Users in the channel.
+
+        Returns
+        -------
+        `list` of `dict`
+            Users as in `user_data`, sorted by name.
+        """
+        userlist = self.channel.userlist
+        return [user_data(userlist[name]) for name in sorted(userlist)]
+
+    def rank(self, name):
+        """Rank of a user in the channel.
+
+        Parameters
+        ----------
+        name : `str`
+
+        Returns
+        -------
+        `None` or `float`
+            `None` if the user is not in the channel.
+        """
+        user = dict.get(self.channel.userlist, name)
+        return user.rank if user is not None else None
+
+    def is_moderator(self, name, min_rank=MODERATOR_RANK):
+        """`True` if the user is in the channel with at least `min_rank`."""
+        rank = self.rank(name)
+        return rank is not None and rank >= min_rank
+
+    def current_media(self):
+        """Current playlist item.
+
+        Returns
+        -------
+        `None` or `dict`
+            Item as in `item_data`.
+        """
+        current = self.channel.playlist.current
+        return item_data(current) if current is not None else None
+
+    def playlist_slice(self, start=0, count=None):
+        """Playlist items `start` to `start + count`.
+
+        Returns
+        -------
+        `list` of `dict`
+            Items as in `item_data`.
+        """
+        queue = self.channel.playlist.queue
+        stop = None if count is None else start + count
+        return [item_data(item) for item in queue[start:stop]]
+
+    async def _apply_all(self, deltas):
+        for delta in deltas:
+            if delta['seq'] <= self.seq:
+                continue  # already in the snapshot
+            if delta['seq'] != self.seq + 1:
+                await self.resume()
+                if delta['seq'] != self.seq + 1:
+                    continue
+            try:
+                self.apply(delta)
+            except (KeyError, ValueError) as ex:
+                self.logger.warning('channel state out of sync (%r), resyncing', ex)
+                await self.resync()
+
+    async def _on_message(self, msg):
+        data = json.loads(msg.data.decode())
+        if not self.ready:
+            self._buffer.extend(data['deltas'])
+            if not self._resyncing:
+                # An earlier snapshot request failed; the publisher is back
+                try:
+                    await self.resync()
+                except Exception as ex:
+                    self.logger.warning('channel state resync failed: %r', ex)
+            return
+        if data.get('epoch') != self.epoch:
+            self.logger.info('channel state publisher restarted, resyncing')
+            await self.resync()
+            return
+        await self._apply_all(data['deltas'])
+
+
+class ChannelStateClient:
+    """Per-channel replicas for plugins, started on first use.
+
+    If a replica cannot be started (no publisher answering), lookups
+    return `None` and the channel is retried after `retry_interval`
+    seconds.
+
+    Attributes
+    ----------
+    replicas : `dict` of (`str`, `ChannelStateReplica`)
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, nats, timeout=2.0, retry_interval=30.0):
+        self.nats = nats
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.replicas = {}
+        self._starting = {}
+        self._failed = {}
+
+    async def replica(self, channel):
+        """Replica for `channel`, or `None` if it is unavailable.
+
+        Parameters
+        ----------
+        channel : `str`
+
+        Returns
+        -------
+        `None` or `ChannelStateReplica`
+        """
+        replica = self.replicas.get(channel)
+        if replica is not None:
+            return replica
+        failed = self._failed.get(channel)
+        if failed is not None and asyncio.get_running_loop().time() - failed < self.retry_interval:
+            return None
+
+        starting = self._starting.get(channel)
+        if starting is None:
+            starting = self._starting[channel] = asyncio.ensure_future(self._start(channel))
+            starting.add_done_callback(lambda _: self._starting.pop(channel, None))
+        return await asyncio.shield(starting)
+
+    async def _start(self, channel):
+        replica = ChannelStateReplica(self.nats, channel, timeout=self.timeout)
+        try:
+            await replica.start()
+        except Exception as ex:
+            self.logger.warning('channel state for %s unavailable: %r', channel, ex)
+            await replica.stop()
+            self._failed[channel] = asyncio.get_running_loop().time()
+            return None
+        self._failed.pop(channel, None)
+        self.replicas[channel] = replica
+        return replica
+
+    async def rank(self, channel, name):
+        """Rank of `name` in `channel` (`None` if unknown)."""
+        replica = await self.replica(channel)
+        return replica.rank(name) if replica is not None else None
+
+    async def is_moderator(self, channel, name, min_rank=MODERATOR_RANK):
+        """`True` if `name` is in `channel` with at least `min_rank`.
+
+        `False` when the channel state is unavailable.
+        """
+        replica = await self.replica(channel)
+        return replica is not None and replica.is_moderator(name, min_rank)
+
+    async def online(self, channel):
+        """Users in `channel` (`None` if unknown)."""
+        replica = await self.replica(channel)
+        return replica.online() if replica is not None else None
+
+    async def current_media(self, channel):
+        """Current item in `channel` (`None` if none or unknown)."""
+        replica = await self.replica(channel)
+        return replica.current_media() if replica is not None else None
+
+    async def stop(self):
+        """Stop all replicas."""
+        for replica in self.replicas.values():
+            await replica.stop()
+        self.replicas.clear()
@@ -16,6 +16,7 @@ from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
 
 from ..error import LoginError, SocketConfigError
 from ..socket_io import SocketIO, SocketIOError, SocketIOResponse
+from ..util import backoff_delay
 from ..util import get as http_get
 from .adapter import ConnectionAdapter
 from .errors import AuthenticationError, ConnectionError, NotConnectedError, SendError
@@ -31,6 +32,11 @@ class ConnectionStats:
     last_error: Optional[str] = None
     connected_since: Optional[float] = None
     last_health_check: Optional[float] = None
+    reconnects: int = 0
+    last_reconnect_time: Optional[float] = None
+    total_reconnect_time: float = 0.0
+    socket_config_cache_hits: int = 0
+    user_replays_avoided: int = 0
 
 
 class CyTubeConnection(ConnectionAdapter):
@@ -68,6 +74,7 @@ class CyTubeConnection(ConnectionAdapter):
                  password: Optional[str] = None,
                  response_timeout: float = 3.0,
                  reconnect_delay: float = 5.0,
+                 socket_config_ttl: float = 300.0,
                  get_func: Optional[Callable] = None,
                  socket_io_func: Optional[Callable] = None,
                  logger: Optional[logging.Logger] = None):
@@ -82,6 +89,8 @@ class CyTubeConnection(ConnectionAdapter):
             password: Optional user password (registered account)
             response_timeout: Timeout for socket.io responses (seconds)
             reconnect_delay: Initial delay between reconnection attempts (seconds)
+            socket_config_ttl: How long a fetched socket config is reused
+                               (seconds, 0 = fetch on every connect)
             get_func: HTTP GET function (default: lib.util.get)
             socket_io_func: socket.io connect function (default: SocketIO.connect)
             logger: Logger instance
@@ -99,6 +108,7 @@ class CyTubeConnection(ConnectionAdapter):
         self.response_timeout = response_timeout
         self.reconnect_delay = reconnect_delay
         self._max_reconnect_delay = 60.0
+        self.socket_config_ttl = socket_config_ttl
 
         # Dependency injection
         self.get_func = get_func or http_get
@@ -108,6 +118,8 @@ class CyTubeConnection(ConnectionAdapter):
         self.socket: Optional[SocketIO] = None
         self.server_url: Optional[str] = None
         self._reconnect_attempts = 0
+        self._socket_config_time: Optional[float] = None
+        self._disconnected_at: Optional[float] = None
 
         # Event handling
         self._event_handlers: Dict[str, list] = defaultdict(list)
@@ -120,7 +132,7 @@ class CyTubeConnection(ConnectionAdapter):
         Establish connection to CyTube channel.
 
         Steps:
-        1. Fetch socket.io configuration
+        1. Fetch socket.io configuration (unless cached)
         2. Connect to socket.io server
         3. Authenticate and join channel
 
@@ -138,10 +150,15 @@ class CyTubeConnection(ConnectionAdapter):
 
             # Connect to socket.io server
             self.logger.info(f"Connecting to {self.server_url}")
-            self.socket = await self.socket_io_func(
-                self.server_url,
-                loop=asyncio.get_event_loop()
-            )
+            try:
+                self.socket = await self.socket_io_func(
+                    self.server_url,
+                    loop=asyncio.get_event_loop()
+                )
+            except Exception:
+                # The server may have moved; fetch the config next time
+                self._socket_config_time = None
+                raise
 
             # Login to channel
             await self._login()
@@ -150,6 +167,13 @@ class CyTubeConnection(ConnectionAdapter):
             self._reconnect_attempts = 0
             self.stats.connected_since = time.time()
             self.stats.reconnection_count = 0
+            if self._disconnected_at is not None:
+                elapsed = time.monotonic() - self._disconnected_at
+                self._disconnected_at = None
+                self.stats.reconnects += 1
+                self.stats.last_reconnect_time = elapsed
+                self.stats.total_reconnect_time += elapsed
+                self.logger.info(f"Reconnected after {elapsed:.1f}s")
             self.logger.info("Connected successfully")
 
             # Emit connected event
@@ -182,6 +206,7 @@ class CyTubeConnection(ConnectionAdapter):
 
             self._is_connected = False
             self.stats.connected_since = None
+            self._disconnected_at = time.monotonic()
             self.logger.info("Disconnected")
 
             # Emit disconnected event
@@ -338,10 +363,11 @@ class CyTubeConnection(ConnectionAdapter):
 
     async def reconnect(self) -> None:
         """
-        Reconnect with exponential backoff.
+        Reconnect with jittered exponential backoff.
 
-        Calculates backoff delay using formula:
-        delay = min(initial_delay * 2^(attempts-1), max_delay)
+        Nominal delay is min(initial_delay * 2^(attempts-1), max_delay);
+        the actual delay is between half of it and all of it (see
+        lib.util.backoff_delay). The socket config is reused while fresh.
 
         Raises:
             ConnectionError: If reconnection fails
@@ -349,14 +375,12 @@ class CyTubeConnection(ConnectionAdapter):
         self._reconnect_attempts += 1
         self.stats.reconnection_count += 1
 
-        # Calculate backoff delay
-        delay = min(
-            self.reconnect_delay * (2 ** (self._reconnect_attempts - 1)),
-            self._max_reconnect_delay
+        delay = backoff_delay(
+            self._reconnect_attempts, self.reconnect_delay, self._max_reconnect_delay
         )
 
         self.logger.info(
-            f"Reconnecting to {self.domain}/{self.channel_name} in {delay}s "
+            f"Reconnecting to {self.domain}/{self.channel_name} in {delay:.1f}s "
             f"(attempt {self._reconnect_attempts})"
         )
         await asyncio.sleep(delay)
@@ -411,10 +435,20 @@ class CyTubeConnection(ConnectionAdapter):
         """
         Fetch socket.io server URL from CyTube.
 
+        A config fetched less than `socket_config_ttl` seconds ago is
+        reused, so reconnects skip the HTTP round trip.
+
         Raises:
             ConnectionError: If config fetch fails
             SocketConfigError: If config is invalid
         """
+        if (self.server_url is not None
+                and self._socket_config_time is not None
+                and time.monotonic() - self._socket_config_time < self.socket_config_ttl):
+            self.stats.socket_config_cache_hits += 1
+            self.logger.info(f"Using cached socket.io server: {self.server_url}")
+            return
+
         data = {
             'domain': self.domain,
             'channel': self.channel_name
@@ -461,6 +495,7 @@ class CyTubeConnection(ConnectionAdapter):
         # Build socket.io URL
         data['domain'] = server_url
         self.server_url = self.SOCKET_IO_URL % data
+        self._socket_config_time = time.monotonic()
         self.logger.info(f"Socket.io server: {self.server_url}")
 
     async def _login(self) -> None:
@@ -23,6 +23,8 @@ class MediaLink:
         (type, url format string)
     """
 
+    __slots__ = ('type', 'id')
+
     logger = logging.getLogger(__name__)
 
     URL_TO_LINK = [
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Flood-controlled outbound chat.
+
+CyTube drops chat messages sent faster than the channel's antiflood
+settings allow (``chat_antiflood_params``: a ``burst`` of messages, then
+``sustained`` messages per second) and answers with ``noflood``.
+`OutboundScheduler` sits in front of `Bot.chat` / `Bot.pm`:
+
+- a `TokenBucket` matched to the channel's settings paces sends;
+- queued messages go out by priority lane (moderation, normal, ambient);
+- consecutive queued messages to the same target are joined into one
+  line, up to `OutboundScheduler.max_length`;
+- after ``noflood`` the bucket is emptied, sending pauses for the
+  channel's cooldown and the last line is sent again.
+
+Messages are sent immediately while the bucket has tokens and nothing is
+queued, so the scheduler only adds latency under pressure.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+
+from .error import ChannelError
+
+PRIORITY_MODERATION = 0
+PRIORITY_NORMAL = 1
+PRIORITY_AMBIENT = 2
+PRIORITIES = (PRIORITY_MODERATION, PRIORITY_NORMAL, PRIORITY_AMBIENT)
+
+
+class TokenBucket:
+    """Token bucket rate limiter.
+
+    Attributes
+    ----------
+    rate : `float`
+        Tokens added per second.
+    burst : `float`
+        Bucket capacity.
+    tokens : `float`
+        Tokens available as of the last refill.
+    """
+
+    __slots__ = ('rate', 'burst', 'tokens', '_clock', '_updated')
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._clock = clock
+        self._updated = clock()
+
+    def configure(self, rate, burst):
+        """Change rate and capacity, keeping the tokens available."""
+        self._refill()
+        self.rate = rate
+        self.burst = burst
+        self.tokens = min(self.tokens, burst)
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self):
+        """Take a token if one is available.
+
+        Returns
+        -------
+        `bool`
+        """
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self):
+        """Seconds until a token is available."""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def drain(self):
+        """Empty the bucket."""
+        self._refill()
+        self.tokens = 0.0
+
+
+class OutboundMessage:
+    """Queued message.
+
+    Attributes
+    ----------
+    kind : `str`
+        ``'chat'`` or ``'pm'``.
+    target : `None` or `str`
+        PM recipient.
+    text : `str`
+    meta : `None` or `dict`
+    priority : `int`
+    futures : `list` of `asyncio.Future`
+        Resolved when the message (possibly joined with others) is sent.
+    queued_at : `float`
+        Monotonic time of submission.
+    """
+
+    __slots__ = ('kind', 'target', 'text', 'meta', 'priority', 'futures', 'queued_at')
+
+    def __init__(self, kind, target, text, meta, priority, futures=None, queued_at=None):
+        self.kind = kind
+        self.target = target
+        self.text = text
+        self.meta = meta
+        self.priority = priority
+        self.futures = futures if futures is not None else []
+        self.queued_at = queued_at if queued_at is not None else time.monotonic()
+
+
+class OutboundScheduler:
+    """Paces, prioritizes and coalesces outbound messages.
+
+    Attributes
+    ----------
+    send : `function` (kind, target, text, meta)
+        Coroutine sending one message.
+    bucket : `lib.outbound.TokenBucket`
+    cooldown : `float`
+        Pause in seconds after a ``noflood``.
+    max_length : `int`
+        Longest line produced by joining messages.
+    max_queue : `int`
+        Messages queued per lane before `submit` raises.
+    separator : `str`
+        Inserted between joined messages.
+    sent : `int`
+        Lines sent.
+    coalesced : `int`
+        Messages sent as part of another message's line.
+    throttled : `int`
+        ``noflood`` responses received.
+    latencies : `collections.deque` of `float`
+        Seconds from submission to send, for recent lines.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    # CyTube's default chat_antiflood_params and chat line limit
+    BURST = 4
+    SUSTAINED = 1.0
+    COOLDOWN = 4.0
+    MAX_LENGTH = 240
+    MAX_QUEUE = 200
+    LATENCY_SAMPLES = 1000
+    # A noflood this soon after a send is taken to refer to it
+    RESEND_WINDOW = 2.0
+
+    def __init__(self, send, burst=BURST, sustained=SUSTAINED, cooldown=COOLDOWN,
+                 max_length=MAX_LENGTH, max_queue=MAX_QUEUE, separator=' ',
+                 clock=time.monotonic):
+        self.send = send
+        self.bucket = TokenBucket(sustained, burst, clock)
+        self.cooldown = cooldown
+        self.max_length = max_length
+        self.max_queue = max_queue
+        self.separator = separator
+        self.sent = 0
+        self.coalesced = 0
+        self.throttled = 0
+        self.latencies = deque(maxlen=self.LATENCY_SAMPLES)
+        self._clock = clock
+        self._lanes = {priority: deque() for priority in PRIORITIES}
+        self._paused_until = 0.0
+        self._last = None
+        self._last_sent_at = None
+        self._worker = None
+
+    @property
+    def depth(self):
+        """Messages waiting to be sent."""
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def configure(self, options):
+        """Match the bucket to a channel's options.
+
+        Parameters
+        ----------
+        options : `dict`
+            CyTube ``channelOpts`` data.
+        """
+        params = options.get('chat_antiflood_params') or {}
+        if not options.get('chat_antiflood') or not params:
+            return
+        burst = max(1, int(params.get('burst', self.BURST)))
+        sustained = float(params.get('sustained', self.SUSTAINED)) or self.SUSTAINED
+        self.bucket.configure(sustained, burst)
+        self.cooldown = float(params.get('cooldown', self.cooldown))
+        self.logger.info('outbound: %s burst, %s/s sustained', burst, sustained)
+
+    async def submit(self, kind, target, text, meta=None, priority=PRIORITY_NORMAL):
+        """Send a message, waiting for a token if necessary.
+
+        Parameters
+        ----------
+        kind : `str`
+            ``'chat'`` or ``'pm'``.
+        target : `None` or `str`
+            PM recipient.
+        text : `str`
+        meta : `None` or `dict`
+        priority : `int`
+            One of `PRIORITIES`; lower is sent first.
+
+        Raises
+        ------
+        cytube_bot.error.ChannelError
+            If the lane is full, or as raised by `send`.
+        """
+        lane = self._lanes[priority]
+        if not self.depth and self._clock() >= self._paused_until and self.bucket.try_take():
+            message = OutboundMessage(kind, target, text, meta, priority)
+            await self._send(message)
+            return
+
+        if len(lane) >= self.max_queue:
+            raise ChannelError('outbound queue full')
+        future = asyncio.get_running_loop().create_future()
+        lane.append(OutboundMessage(kind, target, text, meta, priority, [future]))
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+        await future
+
+    def on_noflood(self):
+        """Back off after the server rejected a message for flooding."""
+        self.throttled += 1
+        self.bucket.drain()
+        now = self._clock()
+        self._paused_until = now + self.cooldown
+        last, self._last = self._last, None
+        if last is not None and now - self._last_sent_at <= self.RESEND_WINDOW:
+            # Resend once, ahead of everything else in its lane
+            self._lanes[last.priority].appendleft(
+                OutboundMessage(last.kind, last.target, last.text, last.meta,
+                                last.priority, [], last.queued_at)
+            )
+            if self._worker is None:
+                self._worker = asyncio.create_task(self._run())
+
+    def stats(self):
+        """Queue depth and send latency.
+
+        Returns
+        -------
+        `dict`
+        """
+        latencies = sorted(self.latencies)
+        n = len(latencies)
+        return {
+            'depth': self.depth,
+            'lanes': {priority: len(lane) for priority, lane in self._lanes.items()},
+            'sent': self.sent,
+            'coalesced': self.coalesced,
+            'throttled': self.throttled,
+            'latency_p50': latencies[n // 2] if n else None,
+            'latency_p99': latencies[min(n - 1, n * 99 // 100)] if n else None,
+            'latency_max': latencies[-1] if n else None,
+        }
+
+    async def close(self):
+        """Stop sending and fail queued messages."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for lane in self._lanes.values():
+            for message in lane:
+                for future in message.futures:
+                    if not future.done():
+                        future.set_exception(ChannelError('outbound scheduler closed'))
+            lane.clear()
+
+    def _next(self):
+        """Pop the next line, joining queued messages to the same target."""
+        for lane in self._lanes.values():
+            if lane:
+                break
+        message = lane.popleft()
+        if message.text.startswith('/'):
+            return message
+        while lane:
+            other = lane[0]
+            text = message.text + self.separator + other.text
+            if (other.kind != message.kind or other.target != message.target
+                    or other.meta != message.meta or other.text.startswith('/')
+                    or len(text) > self.max_length):
+                break
+            lane.popleft()
+            message = OutboundMessage(
+                message.kind, message.target, text, message.meta, message.priority,
+                message.futures + other.futures, message.queued_at
+            )
+            self.coalesced += 1
+        return message
+
+    async def _send(self, message):
+        now = self._clock()
+        self.latencies.append(now - message.queued_at)
+        self._last = message
+        self._last_sent_at = now
+        self.sent += 1
+        await self.send(message.kind, message.target, message.text, message.meta)
+
+    async def _run(self):
+        try:
+            while self.depth:
+                wait = max(self._paused_until - self._clock(), self.bucket.wait_time())
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                    continue
+                if not self.bucket.try_take():
+                    await asyncio.sleep(0)
+                    continue
+                message = self._next()
+                try:
+                    await self._send(message)
+                except Exception as ex:  # pylint: disable=broad-except
+                    for future in message.futures:
+                        if not future.done():
+                            future.set_exception(ex)
+                    if not message.futures:
+                        self.logger.error('outbound: %r', ex)
+                else:
+                    for future in message.futures:
+                        if not future.done():
+                            future.set_result(None)
+        finally:
+            self._worker = None
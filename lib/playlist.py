@@ -20,6 +20,8 @@ class PlaylistItem:
     username : `str`
     """
 
+    __slots__ = ('uid', 'temp', 'username', 'link', 'title', 'duration')
+
     def __init__(self, data):
         self.uid = data['uid']
         self.temp = data['temp']
@@ -40,13 +42,33 @@ class PlaylistItem:
         return self.uid == item.uid
 
 
+class _Node:
+    """Playlist linked list node."""
+
+    __slots__ = ('item', 'prev', 'next')
+
+    def __init__(self, item):
+        self.item = item
+        self.prev = None
+        self.next = None
+
+
 class Playlist:
     """CyTube playlist.
 
+    Items are kept in a doubly linked list with a uid -> node map, so
+    lookup, insert-after, remove and move are O(1) regardless of playlist
+    size. `queue` is a list materialized from the linked list on first
+    access after a reordering and reused until the next one (appends
+    update it in place); treat it as read-only and modify the playlist
+    through its methods.
+
     Attributes
     ----------
     time : `int`
-        Playlist duration in seconds.
+        Playlist duration in seconds (as reported by the server).
+    duration : `int`
+        Sum of item durations in seconds (maintained locally).
     current : `None` or `cytube_bot.playlist.PlaylistItem`
         Current playlist item.
     current_time : `int`
@@ -64,13 +86,46 @@ class Playlist:
         self.paused = True
         self.current_time = 0
         self._current = None
-        self.queue = []
+        self._nodes = {}
+        self._head = None
+        self._tail = None
+        self._duration = 0
+        self._queue = []
+        self._positions = {}
 
     def __str__(self):
         return '<playlist %s>' % self.queue
 
     __repr__ = __str__
 
+    def __contains__(self, item):
+        return _uid(item) in self._nodes
+
+    def __iter__(self):
+        node = self._head
+        while node is not None:
+            yield node.item
+            node = node.next
+
+    @property
+    def queue(self):
+        if self._queue is None:
+            self._queue = list(self)
+        return self._queue
+
+    @queue.setter
+    def queue(self, items):
+        self._nodes.clear()
+        self._head = self._tail = None
+        self._duration = 0
+        self._invalidate()
+        for item in items:
+            self._link(self._tail, item)
+
+    @property
+    def duration(self):
+        return self._duration
+
     @property
     def current(self):
         return self._current
@@ -98,7 +153,14 @@ class Playlist:
         ValueError
             If item does not exist.
         """
-        return self.queue.index(item)
+        uid = _uid(item)
+        if uid not in self._nodes:
+            raise ValueError('%r is not in playlist' % (item,))
+        if self._positions is None:
+            self._positions = {
+                queued.uid: i for i, queued in enumerate(self.queue)
+            }
+        return self._positions[uid]
 
     def get(self, uid):
         """Get playlist item by ID.
@@ -117,7 +179,7 @@ class Playlist:
         ValueError
             If item does not exist.
         """
-        return self.queue[self.index(uid)]
+        return self._node(uid).item
 
     def remove(self, item):
         """Remove playlist item.
@@ -132,11 +194,12 @@ class Playlist:
         ValueError
             If item does not exist.
         """
+        node = self._node(item)
         if self.current == item:
             self.current = None
             self.current_time = 0
             self.paused = True
-        self.queue.remove(item)
+        self._unlink(node)
 
     def add(self, after, item):
         """Add playlist item.
@@ -147,13 +210,22 @@ class Playlist:
             `int` - insert after item with ID, `None` - append.
         item : `dict` or `cytube_bot.playlist.PlaylistItem`
             Playlist item or data.
+
+        Returns
+        -------
+        `cytube_bot.playlist.PlaylistItem`
+            Added item.
+
+        Raises
+        ------
+        ValueError
+            If `after` does not exist or an item with the same ID exists.
         """
         if not isinstance(item, PlaylistItem):
             item = PlaylistItem(item)
-        if not isinstance(after, int):
-            self.queue.append(item)
-        else:
-            self.queue.insert(self.index(after) + 1, item)
+        prev = self._node(after) if isinstance(after, int) else self._tail
+        self._link(prev, item)
+        return item
 
     def move(self, item, after):
         """Move playlist item.
@@ -162,10 +234,17 @@ class Playlist:
         ----------
         after : `int`
         item : `int`
+
+        Raises
+        ------
+        ValueError
+            If either item does not exist.
         """
-        item = self.get(item)
-        self.remove(item)
-        self.add(after, item)
+        node = self._node(item)
+        if isinstance(after, int) and (after == node.item.uid or after not in self._nodes):
+            raise ValueError('%r is not in playlist' % (after,))
+        self.remove(node.item)
+        self.add(after, node.item)
 
     def clear(self):
         """Clear playlist.
@@ -174,4 +253,64 @@ class Playlist:
         self.paused = True
         self.current = None
         self.current_time = 0
-        self.queue.clear()
+        self.queue = []
+
+    def _node(self, item):
+        try:
+            return self._nodes[_uid(item)]
+        except (KeyError, TypeError):
+            raise ValueError('%r is not in playlist' % (item,)) from None
+
+    def _link(self, prev, item):
+        """Insert `item` after node `prev` (`None` - at the head)."""
+        if item.uid in self._nodes:
+            raise ValueError('item exists: %s' % item.uid)
+        node = _Node(item)
+        self._nodes[item.uid] = node
+        self._duration += item.duration
+
+        node.prev = prev
+        if prev is None:
+            node.next = self._head
+            self._head = node
+        else:
+            node.next = prev.next
+            prev.next = node
+        if node.next is None:
+            self._tail = node
+            if self._queue is not None:
+                # Append: extend the materialized queue in place
+                if self._positions is not None:
+                    self._positions[item.uid] = len(self._queue)
+                self._queue.append(item)
+                return
+        else:
+            node.next.prev = node
+        self._invalidate()
+
+    def _unlink(self, node):
+        del self._nodes[node.item.uid]
+        self._duration -= node.item.duration
+
+        if node.prev is None:
+            self._head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self._tail = node.prev
+            if self._queue is not None:
+                self._queue.pop()
+                if self._positions is not None:
+                    del self._positions[node.item.uid]
+                return
+        else:
+            node.next.prev = node.prev
+        self._invalidate()
+
+    def _invalidate(self):
+        self._queue = None
+        self._positions = None
+
+
+def _uid(item):
+    return item.uid if isinstance(item, PlaylistItem) else item
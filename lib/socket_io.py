@@ -14,6 +14,59 @@ from .proxy import ProxyError
 from .util import Queue, current_task
 from .util import get as default_get
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional fast JSON backend for large frames (playlist, userlist)
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+json_loads = orjson.loads if orjson is not None else json.loads
+
+# Regex of literal event names: ^name$ or ^(name|name|)$
+_LITERAL_EVENTS_RE = re.compile(r'^\^\(?((?:[A-Za-z0-9_]*\|)*[A-Za-z0-9_]*)\)?\$$')
+
+
+def decode_event(data, loads=None):
+    """Decode a socket.io message packet (``4`` + packet type + payload).
+
+    Parameters
+    ----------
+    data : `str`
+        Raw frame starting with ``4``.
+    loads : `function` or `None`, optional
+        JSON decoder (default: fastest available backend).
+
+    Returns
+    -------
+    (`str`, `object`)
+        Event name and data.
+
+    Raises
+    ------
+    `ValueError`
+        Malformed packet.
+    """
+    packet_type = data[1:2]
+    if packet_type == '0':
+        return '', None
+    if packet_type == '1':
+        return data[2:], None
+    if not packet_type:
+        raise ValueError('empty packet')
+    payload = (loads or json_loads)(data[2:])
+
+    if not isinstance(payload, list):
+        raise ValueError('not an array')
+    size = len(payload)
+    if size == 2:
+        return payload[0], payload[1]
+    if size == 0:
+        raise ValueError('empty array')
+    if size == 1:
+        return payload[0], None
+    return payload[0], payload[1:]
+
 
 class SocketIOResponse:
     """socket.io event response.
@@ -22,29 +75,42 @@ class SocketIOResponse:
     ----------
     id : `int`
     match : `function`(`str`, `object`)
+    events : `None` or `frozenset` of `str`
+        Event names `match` can accept, if known.
     future : `asyncio.Future`
+    timer : `None` or `asyncio.TimerHandle`
+        Timeout handle, resolving `future` to `None`.
     """
     MAX_ID = 2 ** 32
     last_id = 0
 
-    def __init__(self, match):
-        self.id = (self.last_id + 1) % self.MAX_ID
-        self.__class__.last_id = self.id
+    __slots__ = ('id', 'match', 'events', 'future', 'timer')
+
+    def __init__(self, match, events=None):
+        self.id = (SocketIOResponse.last_id + 1) % self.MAX_ID
+        SocketIOResponse.last_id = self.id
         self.match = match
+        if events is None:
+            events = getattr(match, 'events', None)
+        self.events = frozenset(events) if events is not None else None
         self.future = asyncio.Future()
+        self.timer = None
 
     def __eq__(self, res):
         if isinstance(res, SocketIOResponse):
             return self is res
         return self.id == res
 
+    __hash__ = object.__hash__
+
     def __str__(self):
         return '<SocketIOResponse #%d>' % self.id
 
     __repr__ = __str__
 
     def set(self, value):
-        self.future.set_result(value)
+        if not self.future.done():
+            self.future.set_result(value)
 
     def cancel(self, ex=None):
         if not self.future.done():
@@ -53,6 +119,33 @@ class SocketIOResponse:
             else:
                 self.future.set_exception(ex)
 
+    def set_timeout(self, loop, timeout):
+        """Resolve to `None` after `timeout` seconds unless set first."""
+        self.timer = loop.call_later(timeout, self.set, None)
+
+    def clear_timeout(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    @staticmethod
+    def expects(*events):
+        """Declare the event names a match function can accept.
+
+        Responses with known event names are indexed so incoming events
+        only run the match functions registered for them.
+
+        Examples
+        --------
+        >>> @SocketIOResponse.expects('queue', 'queueFail')
+        ... def match(event, data):
+        ...     return event == 'queueFail' or data.get('id') == media_id
+        """
+        def decorator(match):
+            match.events = frozenset(events)
+            return match
+        return decorator
+
     @staticmethod
     def match_event(ev=None, data=None):
         def match(ev_, data_):
@@ -68,6 +161,9 @@ class SocketIOResponse:
                 else:
                     raise NotImplementedError('match_event !isinstance(data, dict)')
             return True
+        literal = _LITERAL_EVENTS_RE.match(ev) if isinstance(ev, str) else None
+        if literal is not None:
+            match.events = frozenset(literal.group(1).split('|'))
         return match
 
 
@@ -85,8 +181,12 @@ class SocketIO:
     error : `None` or `Exception`
     events : `asyncio.Queue` of ((`str`, `object`) or `None`)
         Event queue.
-    response : `list` of `cytube_bot.socket_io.SocketIOResponse`
-    response_lock : `asyncio.Lock`
+    response : `dict` of (`int`, `cytube_bot.socket_io.SocketIOResponse`)
+        Pending responses without known event names, by id.
+    response_index : `dict` of (`str`, `dict` of (`int`, `cytube_bot.socket_io.SocketIOResponse`))
+        Pending responses by expected event name, then id.
+        Waiters are registered, resolved and removed in O(1) from the
+        event loop thread, so no lock is needed.
     ping_task : `asyncio.tasks.Task`
     recv_task : `asyncio.tasks.Task`
     close_task : `asyncio.tasks.Task`
@@ -119,8 +219,8 @@ class SocketIO:
         self.closed = asyncio.Event()
         self.ping_response = asyncio.Event()
         self.events = Queue(maxsize=qsize)
-        self.response = []
-        self.response_lock = asyncio.Lock()
+        self.response = {}
+        self.response_index = {}
         self.ping_interval = max(1, config.get('pingInterval', 10000) / 1000)
         self.ping_timeout = max(1, config.get('pingTimeout', 10000) / 1000)
         self.ping_task = self.loop.create_task(self._ping())
@@ -179,9 +279,11 @@ class SocketIO:
                 pass
 
             self.logger.info('set response future exception')
-            for res in self.response:
+            for res in self._pending_responses():
+                res.clear_timeout()
                 res.cancel(self.error)
-            self.response = []
+            self.response = {}
+            self.response_index = {}
 
             self.logger.info('cancel ping task')
             self.ping_task.cancel()
@@ -260,47 +362,26 @@ class SocketIO:
             raise self.error  # pylint:disable=raising-bad-type
         data = '42%s' % json.dumps((event, data))
         self.logger.info('emit %s', data)
-        release = False
         response = None
         try:
             if match_response is not None:
-                await self.response_lock.acquire()
-                release = True
+                # Register before sending so a fast response is not missed
                 response = SocketIOResponse(match_response)
                 self.logger.info('get response %s', response)
-                self.response.append(response)
+                self._add_response(response)
+                if response_timeout is not None:
+                    response.set_timeout(self.loop, response_timeout)
 
             await self.websocket.send(data)
 
-            if match_response is not None:
-                self.response_lock.release()
-                release = False
-
-                if response_timeout is not None:
-                    res = asyncio.wait_for(response.future,
-                                           response_timeout)
-                else:
-                    res = response.future
-
+            if response is not None:
                 try:
-                    res = await res
-                    self.logger.info('%s', res)
+                    res = await response.future
                 except asyncio.CancelledError:
                     self.logger.info('response cancelled %s', event)
                     raise
-                except asyncio.TimeoutError:
+                if res is None:
                     self.logger.info('response timeout %s', event)
-                    response.cancel()
-                    res = None
-                finally:
-                    await self.response_lock.acquire()
-                    try:
-                        self.response.remove(response)
-                    except ValueError:
-                        pass
-                    finally:
-                        self.response_lock.release()
-
                 self.logger.info('response %s %r', event, res)
                 return res
         except asyncio.CancelledError:
@@ -312,9 +393,52 @@ class SocketIO:
                 ex = SocketIOError(ex)
             raise ex
         finally:
-            if release:
-                self.response_lock.release()
+            if response is not None:
+                self._remove_response(response)
+
+    def _add_response(self, response):
+        if response.events is None:
+            self.response[response.id] = response
+            return
+        index = self.response_index
+        for event in response.events:
+            waiters = index.get(event)
+            if waiters is None:
+                index[event] = {response.id: response}
+            else:
+                waiters[response.id] = response
 
+    def _remove_response(self, response):
+        response.clear_timeout()
+        if response.events is None:
+            self.response.pop(response.id, None)
+            return
+        index = self.response_index
+        for event in response.events:
+            waiters = index.get(event)
+            if waiters is not None and waiters.pop(response.id, None) is not None and not waiters:
+                del index[event]
+
+    def _pending_responses(self):
+        seen = set()
+        for waiters in self.response_index.values():
+            for response in waiters.values():
+                if response.id not in seen:
+                    seen.add(response.id)
+                    yield response
+        yield from self.response.values()
+
+    def _match_response(self, event, data):
+        """Find the first pending response matching an event."""
+        waiters = self.response_index.get(event)
+        if waiters:
+            for response in waiters.values():
+                if not response.future.done() and response.match(event, data):
+                    return response
+        for response in self.response.values():
+            if not response.future.done() and response.match(event, data):
+                return response
+        return None
 
     async def _ping(self):
         """Ping task."""
@@ -351,47 +475,38 @@ class SocketIO:
         try:
             while self.error is None:
                 data = await self.websocket.recv()
-                self.logger.debug('recv %s', data)
-                if data.startswith('2'):
-                    data = data[1:]
-                    self.logger.debug('ping %s', data)
-                    await self.websocket.send('3' + data)
-                elif data.startswith('3'):
-                    self.logger.debug('pong %s', data[1:])
-                    self.ping_response.set()
-                elif data.startswith('4'):
+                debug = self.logger.isEnabledFor(logging.DEBUG)
+                packet = data[:1]
+                if packet == '4':
                     try:
-                        if data[1] == '0':
-                            event = ''
-                            data = None
-                        elif data[1] == '1':
-                            event = data[2:]
-                            data = None
-                        else:
-                            data = json.loads(data[2:])
-                            if not isinstance(data, list):
-                                raise ValueError('not an array')
-                            if len(data) == 0:
-                                raise ValueError('empty array')
-                            if len(data) == 1:
-                                event, data = data[0], None
-                            elif len(data) == 2:
-                                event, data = data
-                            else:
-                                event = data[0]
-                                data = data[1:]
+                        event, data = decode_event(data)
                     except ValueError as ex:
-                        self.logger.error('invalid event %s: %r', data, ex)
-                    else:
-                        self.logger.debug('event %s %s', event, data)
+                        self.logger.error('invalid event %.200s: %r', data, ex)
+                        continue
+                    if debug:
+                        self.logger.debug('event %s %.200s', event, data)
+                    try:
+                        self.events.put_nowait((event, data))
+                    except asyncio.QueueFull:
                         await self.events.put((event, data))
-                        for response in self.response:
-                            if response.match(event, data):
-                                self.logger.debug('response %s %s', event, data)
-                                response.set((event, data))
-                                break
+                    if self.response or event in self.response_index:
+                        response = self._match_response(event, data)
+                        if response is not None:
+                            if debug:
+                                self.logger.debug('response %s %.200s', event, data)
+                            response.set((event, data))
+                            self._remove_response(response)
+                elif packet == '2':
+                    data = data[1:]
+                    if debug:
+                        self.logger.debug('ping %s', data)
+                    await self.websocket.send('3' + data)
+                elif packet == '3':
+                    if debug:
+                        self.logger.debug('pong %s', data[1:])
+                    self.ping_response.set()
                 else:
-                    self.logger.warning('unknown event: "%s"', data)
+                    self.logger.warning('unknown event: "%.200s"', data)
         except asyncio.CancelledError:
             self.logger.info('recv cancelled')
             self.error = ConnectionClosed()
@@ -15,6 +15,7 @@ from .errors import (
 )
 from .sql_audit import AuditLogEntry, QueryMetrics, SQLAuditLogger
 from .sql_client import SQLClient, SQLClientConfig, SQLResult
+from .sql_cost import CostPolicy, QueryCostError, QueryCostGuard, QueryPlan
 from .sql_errors import (
     ExecutionError,
     ForbiddenStatementError,
@@ -34,6 +35,12 @@ from .sql_formatter import ResultFormatter
 from .sql_handler import SQLExecutionHandler, extract_plugin_from_subject
 from .sql_parameter import ParameterBinder
 from .sql_rate_limit import RateLimitError, RateLimitStatus, SQLRateLimiter
+from .sql_stats import (
+    LatencyHistogram,
+    QueryShapeStats,
+    QueryStatsCollector,
+    fingerprint_query,
+)
 from .sql_validator import QueryValidator
 from .sqlite import SQLiteStorage
 
@@ -64,6 +71,11 @@ __all__ = [
     "TimeoutError",
     "PermissionDeniedError",
     "ExecutionError",
+    # Query cost guard
+    "QueryCostGuard",
+    "CostPolicy",
+    "QueryPlan",
+    "QueryCostError",
     # NATS handler (Sprint 17, Sortie 3)
     "SQLExecutionHandler",
     "extract_plugin_from_subject",
@@ -78,4 +90,9 @@ __all__ = [
     "SQLRateLimiter",
     "RateLimitError",
     "RateLimitStatus",
+    # Query shape statistics
+    "QueryStatsCollector",
+    "QueryShapeStats",
+    "LatencyHistogram",
+    "fingerprint_query",
 ]
@@ -6,26 +6,55 @@ supporting security compliance, debugging, and performance analysis.
 
 Features:
     - 100% query logging with structured JSON output
+    - Optional sampling of successful queries (errors/slow always logged)
+    - Optional bounded queue drained by a background task, keeping log
+      formatting and handler I/O off the request path
     - Slow query detection and logging
-    - Query hashing for pattern analysis
+    - Query hashing for pattern analysis (memoized)
+    - Per-query-shape latency histograms (see sql_stats)
     - SIEM-compatible format
 
 Example:
     >>> logger = SQLAuditLogger(slow_query_threshold_ms=500.0)
     >>> result = SQLResult(rows=[...], row_count=10, ...)
     >>> logger.log_query("my-plugin", "SELECT ...", [], result, start_time)
+
+    >>> # Queued + sampled pipeline
+    >>> logger = SQLAuditLogger(sample_rate=0.1, queue_size=10000)
+    >>> await logger.start()
+    >>> logger.log_query(...)  # Returns immediately, emitted in background
+    >>> await logger.stop()    # Flushes remaining entries
 """
 
+import asyncio
+import functools
 import hashlib
 import logging
+import random
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Optional
 
+from .sql_stats import QueryStatsCollector
+
 # Configure audit loggers
 _audit_logger = logging.getLogger("sql.audit")
 _slow_logger = logging.getLogger("sql.slow")
 
+# Max distinct queries kept in the hash memo (plugins reuse a small set)
+QUERY_HASH_CACHE_SIZE = 1024
+
+# Max entries emitted per drain wakeup before yielding to the event loop
+DRAIN_BATCH_SIZE = 100
+
+
+@functools.lru_cache(maxsize=QUERY_HASH_CACHE_SIZE)
+def _hash_normalized_query(query: str) -> str:
+    """Hash a query after whitespace/case normalization (memoized)."""
+    normalized = " ".join(query.split()).lower()
+    return hashlib.sha256(normalized.encode()).hexdigest()[:16]
+
 
 @dataclass
 class AuditLogEntry:
@@ -178,10 +207,14 @@ class SQLAuditLogger:
 
     Features:
         - 100% query logging (configurable log level)
+        - Sampling of successful queries (errors and slow queries are
+          always logged)
+        - Optional bounded queue drained by a background task
         - Slow query detection with separate logger
         - Query hashing for pattern grouping
         - Param sanitization (truncate long values)
         - Aggregated metrics collection
+        - Per-fingerprint statistics (query_stats)
 
     Example:
         >>> logger = SQLAuditLogger(slow_query_threshold_ms=500.0)
@@ -201,8 +234,17 @@ class SQLAuditLogger:
         >>> metrics = logger.get_metrics()
         >>> print(f"Slow queries: {metrics.total_slow_queries}")
 
+    Queued Mode:
+        With queue_size > 0 and after start(), log_query/log_error only
+        record metrics and push a raw record onto a bounded asyncio.Queue.
+        Entry construction, timestamp formatting, hashing and handler
+        emission happen in a background drain task. When the queue is
+        full the record is dropped and counted (see get_pipeline_stats).
+        Before start() (or after stop()) records are emitted inline.
+
     Thread Safety:
-        All methods are thread-safe.
+        All methods are thread-safe. Queued mode must be used from the
+        event loop that called start().
     """
 
     def __init__(
@@ -213,6 +255,9 @@ class SQLAuditLogger:
         max_param_length: int = 100,
         log_level: int = logging.INFO,
         slow_log_level: int = logging.WARNING,
+        sample_rate: float = 1.0,
+        queue_size: int = 0,
+        max_fingerprints: int = QueryStatsCollector.DEFAULT_MAX_FINGERPRINTS,
     ) -> None:
         """
         Initialize audit logger.
@@ -224,6 +269,11 @@ class SQLAuditLogger:
             max_param_length: Max length for param values in logs
             log_level: Log level for regular queries
             slow_log_level: Log level for slow queries
+            sample_rate: Fraction (0.0-1.0) of successful, non-slow queries
+                to log. Errors and slow queries are always logged.
+            queue_size: Bound for the background emission queue. 0 emits
+                inline (default).
+            max_fingerprints: Max query shapes tracked in query_stats
         """
         self.logger = logger or _audit_logger
         self.slow_logger = slow_logger or _slow_logger
@@ -231,11 +281,23 @@ class SQLAuditLogger:
         self.max_param_length = max_param_length
         self.log_level = log_level
         self.slow_log_level = slow_log_level
+        self.sample_rate = max(0.0, min(sample_rate, 1.0))
+        self.queue_size = max(0, queue_size)
+
+        # Background emission pipeline (queued mode)
+        self._queue: Optional[asyncio.Queue] = None
+        self._drain_task: Optional[asyncio.Task] = None
+        self._sampled_out = 0
+        self._dropped = 0
+        self._emitted = 0
 
         # Per-plugin metrics
         self._metrics: dict[str, QueryMetrics] = {}
         self._global_metrics = QueryMetrics()
 
+        # Per-query-shape metrics (recorded for every query, unsampled)
+        self.query_stats = QueryStatsCollector(max_fingerprints=max_fingerprints)
+
     def log_query(
         self,
         plugin: str,
@@ -244,7 +306,7 @@ class SQLAuditLogger:
         row_count: int,
         execution_time_ms: float,
         truncated: bool = False,
-    ) -> AuditLogEntry:
+    ) -> Optional[AuditLogEntry]:
         """
         Log successful query execution.
 
@@ -257,10 +319,164 @@ class SQLAuditLogger:
             truncated: Whether results were truncated
 
         Returns:
-            AuditLogEntry for the query
+            AuditLogEntry for the query, or None if the entry was sampled
+            out or deferred to the background queue
+        """
+        is_slow = execution_time_ms > self.slow_threshold_ms
+        self._record_metrics(plugin, execution_time_ms, is_error=False, is_slow=is_slow)
+        self.query_stats.record(plugin, query, execution_time_ms, row_count)
+
+        if not is_slow and not self._should_sample():
+            self._sampled_out += 1
+            return None
+
+        record = (
+            "query",
+            time.time(),
+            plugin,
+            query,
+            params,
+            row_count,
+            execution_time_ms,
+            truncated,
+        )
+        if self._enqueue(record):
+            return None
+        return self._emit(record)
+
+    def log_error(
+        self,
+        plugin: str,
+        query: str,
+        params: list[Any],
+        error: Exception,
+        execution_time_ms: float,
+    ) -> Optional[AuditLogEntry]:
+        """
+        Log failed query execution.
+
+        Args:
+            plugin: Plugin that executed the query
+            query: SQL query string
+            params: Parameter values
+            error: Exception that occurred
+            execution_time_ms: Time until error in milliseconds
+
+        Returns:
+            AuditLogEntry for the failed query, or None if the entry was
+            deferred to the background queue
+        """
+        self._record_metrics(plugin, execution_time_ms, is_error=True, is_slow=False)
+        self.query_stats.record(plugin, query, execution_time_ms, is_error=True)
+
+        record = ("error", time.time(), plugin, query, params, error, execution_time_ms)
+        if self._enqueue(record):
+            return None
+        return self._emit(record)
+
+    # Emission pipeline
+
+    async def start(self) -> None:
+        """
+        Start the background drain task (queued mode only).
+
+        No-op when queue_size is 0 or the task is already running.
+        """
+        if self.queue_size <= 0 or self._drain_task is not None:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._drain_task = asyncio.create_task(self._drain_loop())
+
+    async def stop(self) -> None:
+        """
+        Stop the drain task and flush any queued entries inline.
+        """
+        queue = self._queue
+        self._queue = None
+
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            try:
+                await self._drain_task
+            except asyncio.CancelledError:
+                pass
+            self._drain_task = None
+
+        if queue is not None:
+            while not queue.empty():
+                self._emit_safely(queue.get_nowait())
+
+    async def _drain_loop(self) -> None:
+        """Emit queued records, in batches, until cancelled."""
+        queue = self._queue
+        assert queue is not None
+
+        while True:
+            record = await queue.get()
+            self._emit_safely(record)
+
+            # Drain what is already buffered without waking up per entry
+            for _ in range(DRAIN_BATCH_SIZE - 1):
+                if queue.empty():
+                    break
+                self._emit_safely(queue.get_nowait())
+
+            # Yield so a burst of audit work never starves request handlers
+            await asyncio.sleep(0)
+
+    def _should_sample(self) -> bool:
+        """Decide whether a successful, non-slow query is logged."""
+        if self.sample_rate >= 1.0:
+            return True
+        if self.sample_rate <= 0.0:
+            return False
+        return random.random() < self.sample_rate
+
+    def _enqueue(self, record: tuple) -> bool:
+        """
+        Hand a raw record to the background queue.
+
+        Returns:
+            True if the record was queued (or dropped because the queue
+            is full), False if it must be emitted inline
         """
+        if self._queue is None:
+            return False
+
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self._dropped += 1
+        return True
+
+    def _emit_safely(self, record: tuple) -> None:
+        """Emit a queued record, never letting a bad record kill the drain."""
+        try:
+            self._emit(record)
+        except Exception:
+            self.logger.exception("Failed to emit SQL audit record")
+
+    def _emit(self, record: tuple) -> AuditLogEntry:
+        """Build the log entry for a raw record and emit it."""
+        self._emitted += 1
+        if record[0] == "query":
+            return self._emit_query(*record[1:])
+        return self._emit_error(*record[1:])
+
+    def _emit_query(
+        self,
+        wall_time: float,
+        plugin: str,
+        query: str,
+        params: list[Any],
+        row_count: int,
+        execution_time_ms: float,
+        truncated: bool,
+    ) -> AuditLogEntry:
+        """Build and log the entry for a successful query."""
         entry = AuditLogEntry(
-            timestamp=datetime.now(timezone.utc).isoformat(),
+            timestamp=self._format_timestamp(wall_time),
             plugin=plugin,
             query_hash=self._hash_query(query),
             query_preview=self._truncate(query, 100),
@@ -279,38 +495,23 @@ class SQLAuditLogger:
         )
 
         # Check for slow query
-        is_slow = execution_time_ms > self.slow_threshold_ms
-        if is_slow:
+        if execution_time_ms > self.slow_threshold_ms:
             self._log_slow_query(entry, query, params)
 
-        # Update metrics
-        self._record_metrics(plugin, execution_time_ms, is_error=False, is_slow=is_slow)
-
         return entry
 
-    def log_error(
+    def _emit_error(
         self,
+        wall_time: float,
         plugin: str,
         query: str,
         params: list[Any],
         error: Exception,
         execution_time_ms: float,
     ) -> AuditLogEntry:
-        """
-        Log failed query execution.
-
-        Args:
-            plugin: Plugin that executed the query
-            query: SQL query string
-            params: Parameter values
-            error: Exception that occurred
-            execution_time_ms: Time until error in milliseconds
-
-        Returns:
-            AuditLogEntry for the failed query
-        """
+        """Build and log the entry for a failed query."""
         entry = AuditLogEntry(
-            timestamp=datetime.now(timezone.utc).isoformat(),
+            timestamp=self._format_timestamp(wall_time),
             plugin=plugin,
             query_hash=self._hash_query(query),
             query_preview=self._truncate(query, 100),
@@ -328,11 +529,23 @@ class SQLAuditLogger:
             extra={"audit": entry.to_dict()},
         )
 
-        # Update metrics
-        self._record_metrics(plugin, execution_time_ms, is_error=True, is_slow=False)
-
         return entry
 
+    def get_pipeline_stats(self) -> dict[str, Any]:
+        """
+        Get emission pipeline statistics.
+
+        Returns:
+            Dict with sample_rate, queued, emitted, sampled_out, dropped
+        """
+        return {
+            "sample_rate": self.sample_rate,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "emitted": self._emitted,
+            "sampled_out": self._sampled_out,
+            "dropped": self._dropped,
+        }
+
     def _log_slow_query(
         self,
         entry: AuditLogEntry,
@@ -357,6 +570,7 @@ class SQLAuditLogger:
         Generate hash for query (for grouping similar queries).
 
         Normalizes whitespace before hashing for consistent grouping.
+        Results are memoized since plugins reuse a small set of queries.
 
         Args:
             query: SQL query string
@@ -364,9 +578,11 @@ class SQLAuditLogger:
         Returns:
             First 16 characters of SHA256 hash
         """
-        # Normalize whitespace and case for consistent hashing
-        normalized = " ".join(query.split()).lower()
-        return hashlib.sha256(normalized.encode()).hexdigest()[:16]
+        return _hash_normalized_query(query)
+
+    def _format_timestamp(self, wall_time: float) -> str:
+        """Format a time.time() value as an ISO UTC timestamp."""
+        return datetime.fromtimestamp(wall_time, timezone.utc).isoformat()
 
     def _truncate(self, value: str, max_length: int) -> str:
         """Truncate string if too long."""
@@ -444,10 +660,12 @@ class SQLAuditLogger:
         Reset metrics.
 
         Args:
-            plugin: Plugin to reset, or None to reset all
+            plugin: Plugin to reset, or None to reset all (including
+                per-query-shape statistics)
         """
         if plugin is None:
             self._metrics.clear()
             self._global_metrics = QueryMetrics()
+            self.query_stats.reset()
         else:
             self._metrics.pop(plugin, None)
@@ -0,0 +1,443 @@
+"""
+Query cost guard for parameterized SQL queries.
+
+This module provides an optional pre-execution plan check for the SQL
+API. Before a query runs, its plan is obtained with EXPLAIN QUERY PLAN
+(SQLite) or EXPLAIN (FORMAT JSON) (PostgreSQL) and checked against a
+per-plugin CostPolicy, e.g. rejecting full scans of large tables or
+unindexed cross joins.
+
+Plans are cached by query fingerprint and table sizes are cached with a
+TTL, so the guard adds at most one extra round trip per new query shape.
+
+Example:
+    >>> guard = QueryCostGuard(
+    ...     default_policy=CostPolicy(max_full_scan_rows=100000),
+    ...     plugin_policies={"analytics-db": CostPolicy(max_full_scan_rows=None)},
+    ... )
+    >>> executor = PreparedStatementExecutor(database, cost_guard=guard)
+"""
+
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from .sql_errors import SQLValidationError
+from .sql_stats import fingerprint_query
+
+logger = logging.getLogger(__name__)
+
+# SQLite EXPLAIN QUERY PLAN detail patterns
+_SQLITE_SCAN_PATTERN = re.compile(r"^SCAN (?:TABLE )?([A-Za-z_]\w*)")
+_SQLITE_TEMP_BTREE = "USE TEMP B-TREE"
+
+# Table alias extraction (FROM/JOIN clauses and comma-separated FROM lists)
+_ALIAS_PATTERN = re.compile(
+    r"(?:\bfrom|\bjoin|,)\s+([A-Za-z_]\w*)(?:\s+(?:as\s+)?([A-Za-z_]\w*))?",
+    re.IGNORECASE,
+)
+_ALIAS_KEYWORDS = frozenset(
+    {
+        "where", "join", "inner", "left", "right", "full", "outer", "cross",
+        "natural", "on", "using", "group", "order", "limit", "offset",
+        "having", "union", "except", "intersect", "window", "as", "set",
+        "values", "returning", "from", "select", "and", "or", "not", "is",
+        "in", "like", "null", "asc", "desc", "case", "when", "then", "else",
+        "end",
+    }
+)
+
+# Identifiers safe to interpolate into row count queries
+_IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_]\w*$")
+
+# Pseudo-tables reported by SQLite that are never real table scans
+_SQLITE_PSEUDO_TABLES = frozenset({"CONSTANT"})
+
+
+class QueryCostError(SQLValidationError):
+    """
+    Query plan exceeds the plugin's cost policy.
+
+    Raised before execution when:
+    - A table larger than max_full_scan_rows would be fully scanned
+    - The product of fully scanned table sizes exceeds max_scan_product
+      (unindexed cross joins)
+    - A temporary B-tree sort is required and not allowed
+    """
+
+    def __init__(self, message: str, details: Optional[dict[str, Any]] = None) -> None:
+        """Initialize with QUERY_TOO_EXPENSIVE code."""
+        super().__init__("QUERY_TOO_EXPENSIVE", message, details)
+
+
+@dataclass
+class CostPolicy:
+    """
+    Per-plugin query cost policy.
+
+    Attributes:
+        max_full_scan_rows: Reject full scans of tables with more rows
+            than this (None = no limit)
+        max_scan_product: Reject plans whose fully scanned table sizes
+            multiply to more than this (None = no limit)
+        allow_temp_btree: Allow plans needing a temporary sort B-tree
+            (SQLite only)
+    """
+
+    max_full_scan_rows: Optional[int] = 100000
+    max_scan_product: Optional[int] = 10_000_000
+    allow_temp_btree: bool = True
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CostPolicy":
+        """Create policy from a config dict (unknown keys ignored)."""
+        defaults = cls()
+        return cls(
+            max_full_scan_rows=data.get("max_full_scan_rows", defaults.max_full_scan_rows),
+            max_scan_product=data.get("max_scan_product", defaults.max_scan_product),
+            allow_temp_btree=data.get("allow_temp_btree", defaults.allow_temp_btree),
+        )
+
+
+@dataclass
+class QueryPlan:
+    """
+    Summary of a query plan relevant to cost checks.
+
+    Attributes:
+        full_scans: Tables read with a full (table or index) scan
+        uses_temp_btree: Whether a temporary sort B-tree is needed
+        details: Raw plan lines (for error details and debugging)
+    """
+
+    full_scans: list[str] = field(default_factory=list)
+    uses_temp_btree: bool = False
+    details: list[str] = field(default_factory=list)
+
+
+class QueryCostGuard:
+    """
+    Pre-execution plan checker with per-plugin policies.
+
+    Plugins without a policy (and no default policy) are not checked and
+    pay no cost. Plans are cached per (fingerprint, dialect) in an LRU of
+    plan_cache_size entries; table row counts are cached for
+    table_stats_ttl seconds. SQLite sizes use MAX(rowid) (an O(log n)
+    estimate), PostgreSQL sizes use pg_class.reltuples.
+
+    Example:
+        >>> guard = QueryCostGuard(default_policy=CostPolicy(max_full_scan_rows=1000))
+        >>> async with database._get_session() as session:
+        ...     await guard.check(session, "quote-db", query, params)
+        QueryCostError: [QUERY_TOO_EXPENSIVE] Full scan of quote_db__quotes ...
+    """
+
+    DEFAULT_PLAN_CACHE_SIZE: int = 512
+    DEFAULT_TABLE_STATS_TTL: float = 60.0
+
+    def __init__(
+        self,
+        default_policy: Optional[CostPolicy] = None,
+        plugin_policies: Optional[dict[str, CostPolicy]] = None,
+        plan_cache_size: int = DEFAULT_PLAN_CACHE_SIZE,
+        table_stats_ttl: float = DEFAULT_TABLE_STATS_TTL,
+    ) -> None:
+        """
+        Initialize cost guard.
+
+        Args:
+            default_policy: Policy for plugins without their own (None = unchecked)
+            plugin_policies: Per-plugin policies
+            plan_cache_size: Max cached plans
+            table_stats_ttl: Seconds to cache table row counts
+        """
+        self.default_policy = default_policy
+        self._policies: dict[str, CostPolicy] = dict(plugin_policies or {})
+        self.plan_cache_size = max(1, plan_cache_size)
+        self.table_stats_ttl = table_stats_ttl
+
+        self._plan_cache: OrderedDict[tuple[str, bool], QueryPlan] = OrderedDict()
+        self._table_rows: dict[tuple[str, bool], tuple[Optional[int], float]] = {}
+
+        # Metrics
+        self.checks = 0
+        self.rejections = 0
+        self.plan_cache_hits = 0
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "QueryCostGuard":
+        """
+        Create guard from a config dict.
+
+        Format:
+            {
+                "default": {"max_full_scan_rows": 100000},
+                "plugins": {"analytics-db": {"max_full_scan_rows": null}},
+                "plan_cache_size": 512,
+                "table_stats_ttl": 60
+            }
+        """
+        default = config.get("default")
+        return cls(
+            default_policy=CostPolicy.from_dict(default) if default is not None else None,
+            plugin_policies={
+                name: CostPolicy.from_dict(policy)
+                for name, policy in config.get("plugins", {}).items()
+            },
+            plan_cache_size=config.get("plan_cache_size", cls.DEFAULT_PLAN_CACHE_SIZE),
+            table_stats_ttl=config.get("table_stats_ttl", cls.DEFAULT_TABLE_STATS_TTL),
+        )
+
+    def set_policy(self, plugin: str, policy: Optional[CostPolicy]) -> None:
+        """Set (or remove, with None) the policy for a plugin."""
+        if policy is None:
+            self._policies.pop(plugin, None)
+        else:
+            self._policies[plugin] = policy
+
+    def get_policy(self, plugin: str) -> Optional[CostPolicy]:
+        """Get the effective policy for a plugin."""
+        return self._policies.get(plugin, self.default_policy)
+
+    async def check(
+        self,
+        session: Any,
+        plugin: str,
+        query: str,
+        params: tuple[Any, ...] = (),
+        is_postgresql: bool = False,
+    ) -> Optional[QueryPlan]:
+        """
+        Check a query's plan against the plugin's policy.
+
+        Args:
+            session: Database session (same one used for execution)
+            plugin: Plugin executing the query
+            query: SQL query with ? placeholders
+            params: Parameter tuple
+            is_postgresql: Use PostgreSQL EXPLAIN instead of SQLite
+
+        Returns:
+            QueryPlan that was checked, or None if the plugin has no policy
+
+        Raises:
+            QueryCostError: If the plan violates the policy
+        """
+        policy = self.get_policy(plugin)
+        if policy is None:
+            return None
+
+        self.checks += 1
+        plan = await self._get_plan(session, query, params, is_postgresql)
+
+        if not policy.allow_temp_btree and plan.uses_temp_btree:
+            self._reject(
+                plugin,
+                "Query requires a temporary sort (add an index for ORDER BY/GROUP BY)",
+                {"plan": plan.details},
+            )
+
+        if plan.full_scans and (
+            policy.max_full_scan_rows is not None or policy.max_scan_product is not None
+        ):
+            product = 1
+            for table in plan.full_scans:
+                rows = await self._get_table_rows(session, table, is_postgresql)
+                if rows is None:
+                    continue
+                if policy.max_full_scan_rows is not None and rows > policy.max_full_scan_rows:
+                    self._reject(
+                        plugin,
+                        f"Full scan of {table} (~{rows} rows) exceeds limit of "
+                        f"{policy.max_full_scan_rows} rows",
+                        {"table": table, "rows": rows, "plan": plan.details},
+                    )
+                product *= max(rows, 1)
+
+            if (
+                policy.max_scan_product is not None
+                and len(plan.full_scans) > 1
+                and product > policy.max_scan_product
+            ):
+                self._reject(
+                    plugin,
+                    f"Unindexed join over {', '.join(plan.full_scans)} "
+                    f"(~{product} row combinations) exceeds limit of "
+                    f"{policy.max_scan_product}",
+                    {"tables": plan.full_scans, "rows": product, "plan": plan.details},
+                )
+
+        return plan
+
+    def _reject(self, plugin: str, message: str, details: dict[str, Any]) -> None:
+        """Count and raise a policy violation."""
+        self.rejections += 1
+        details["plugin"] = plugin
+        logger.warning("Query rejected by cost guard: %s", message, extra={"plugin": plugin})
+        raise QueryCostError(message, details)
+
+    async def _get_plan(
+        self,
+        session: Any,
+        query: str,
+        params: tuple[Any, ...],
+        is_postgresql: bool,
+    ) -> QueryPlan:
+        """Get the plan for a query, from cache when possible."""
+        key = (fingerprint_query(query), is_postgresql)
+        plan = self._plan_cache.get(key)
+        if plan is not None:
+            self._plan_cache.move_to_end(key)
+            self.plan_cache_hits += 1
+            return plan
+
+        from sqlalchemy import text
+
+        if is_postgresql:
+            result = await session.execute(
+                text(f"EXPLAIN (FORMAT JSON) {query}"), dict(enumerate(params))
+            )
+            plan = parse_postgresql_plan(result.scalar())
+        else:
+            result = await session.execute(
+                text(f"EXPLAIN QUERY PLAN {query}"), dict(enumerate(params))
+            )
+            plan = parse_sqlite_plan([row[3] for row in result.fetchall()], query)
+
+        self._plan_cache[key] = plan
+        if len(self._plan_cache) > self.plan_cache_size:
+            self._plan_cache.popitem(last=False)
+        return plan
+
+    async def _get_table_rows(
+        self,
+        session: Any,
+        table: str,
+        is_postgresql: bool,
+    ) -> Optional[int]:
+        """Get (cached) approximate row count for a table, None if unknown."""
+        key = (table, is_postgresql)
+        cached = self._table_rows.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[1] < self.table_stats_ttl:
+            return cached[0]
+
+        rows: Optional[int] = None
+        if _IDENTIFIER_PATTERN.match(table):
+            from sqlalchemy import text
+
+            try:
+                if is_postgresql:
+                    result = await session.execute(
+                        text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"),
+                        {"table": table},
+                    )
+                else:
+                    result = await session.execute(text(f'SELECT MAX(rowid) FROM "{table}"'))
+                value = result.scalar()
+                rows = int(value) if value is not None else 0
+            except Exception as e:
+                logger.debug("Could not estimate rows for %s: %s", table, e)
+
+        self._table_rows[key] = (rows, now)
+        return rows
+
+    def clear_cache(self) -> None:
+        """Clear cached plans and table sizes (e.g. after schema changes)."""
+        self._plan_cache.clear()
+        self._table_rows.clear()
+
+    def get_metrics(self) -> dict[str, Any]:
+        """
+        Get guard metrics.
+
+        Returns:
+            Dict with checks, rejections, plan cache hits and size
+        """
+        return {
+            "checks": self.checks,
+            "rejections": self.rejections,
+            "plan_cache_hits": self.plan_cache_hits,
+            "plan_cache_size": len(self._plan_cache),
+        }
+
+
+def _extract_aliases(query: str) -> dict[str, str]:
+    """Map table aliases to table names from FROM/JOIN clauses."""
+    aliases: dict[str, str] = {}
+    for match in _ALIAS_PATTERN.finditer(query):
+        table, alias = match.group(1), match.group(2)
+        if alias is None or table.lower() in _ALIAS_KEYWORDS:
+            continue
+        if alias.lower() in _ALIAS_KEYWORDS or alias in aliases:
+            continue
+        aliases[alias] = table
+    return aliases
+
+
+def parse_sqlite_plan(details: list[str], query: str = "") -> QueryPlan:
+    """
+    Summarize SQLite EXPLAIN QUERY PLAN detail lines.
+
+    "SCAN <table>" lines (with or without a covering index) are full
+    scans; "SEARCH" lines use an index lookup. Aliases are resolved back
+    to table names using the query text.
+
+    Args:
+        details: Detail column of EXPLAIN QUERY PLAN rows
+        query: Original query (for alias resolution)
+
+    Returns:
+        QueryPlan summary
+    """
+    aliases = _extract_aliases(query) if query else {}
+    plan = QueryPlan(details=list(details))
+
+    for detail in details:
+        if detail.startswith(_SQLITE_TEMP_BTREE):
+            plan.uses_temp_btree = True
+            continue
+
+        match = _SQLITE_SCAN_PATTERN.match(detail)
+        if match and match.group(1) not in _SQLITE_PSEUDO_TABLES:
+            table = aliases.get(match.group(1), match.group(1))
+            if table not in plan.full_scans:
+                plan.full_scans.append(table)
+
+    return plan
+
+
+def parse_postgresql_plan(explain_output: Any) -> QueryPlan:
+    """
+    Summarize PostgreSQL EXPLAIN (FORMAT JSON) output.
+
+    Every "Seq Scan" node is a full scan of its relation.
+
+    Args:
+        explain_output: JSON text or decoded JSON from EXPLAIN
+
+    Returns:
+        QueryPlan summary
+    """
+    if isinstance(explain_output, (str, bytes)):
+        explain_output = json.loads(explain_output)
+
+    plan = QueryPlan()
+    stack = [entry["Plan"] for entry in explain_output or [] if "Plan" in entry]
+
+    while stack:
+        node = stack.pop()
+        node_type = node.get("Node Type", "")
+        relation = node.get("Relation Name")
+        plan.details.append(f"{node_type} {relation}" if relation else node_type)
+
+        if node_type == "Seq Scan" and relation and relation not in plan.full_scans:
+            plan.full_scans.append(relation)
+
+        stack.extend(node.get("Plans", []))
+
+    return plan
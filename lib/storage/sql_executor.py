@@ -9,8 +9,9 @@ against SQL injection while supporting timeout and row limit enforcement.
 import asyncio
 import logging
 import time
-from typing import Any
+from typing import Any, Optional
 
+from .sql_cost import QueryCostError, QueryCostGuard
 from .sql_errors import (
     ExecutionError,
     PermissionDeniedError,
@@ -30,7 +31,10 @@ class PreparedStatementExecutor:
 
     Features:
     - Prepared statement execution (no SQL injection possible)
-    - Configurable timeout enforcement via asyncio.timeout
+    - Configurable timeout enforcement via asyncio.timeout (SQLite
+      statements are interrupted on timeout so they stop running in the
+      driver thread)
+    - Optional pre-execution plan check (QueryCostGuard)
     - Row limit enforcement with truncation detection
     - Write permission control (allow_write flag)
     - Slow query logging
@@ -64,6 +68,7 @@ class PreparedStatementExecutor:
         self,
         database: Any,
         slow_query_threshold_ms: int = SLOW_QUERY_THRESHOLD_MS,
+        cost_guard: Optional[QueryCostGuard] = None,
     ) -> None:
         """
         Initialize executor.
@@ -73,11 +78,16 @@ class PreparedStatementExecutor:
                      and execute() method)
             slow_query_threshold_ms: Queries taking longer than this are logged
                                     as warnings (default 500ms)
+            cost_guard: Optional plan checker run before each query
         """
         self.database = database
         self.slow_query_threshold_ms = slow_query_threshold_ms
+        self.cost_guard = cost_guard
         self.logger = logging.getLogger(__name__)
 
+        # Statements interrupted after timeout (SQLite)
+        self.interrupted_count = 0
+
     async def execute(
         self,
         plugin: str,
@@ -112,6 +122,7 @@ class PreparedStatementExecutor:
         Raises:
             TimeoutError: Query exceeded timeout limit
             PermissionDeniedError: Write operation without allow_write=True
+            QueryCostError: Query plan rejected by the cost guard
             ExecutionError: Database error during execution
 
         Example:
@@ -148,14 +159,16 @@ class PreparedStatementExecutor:
         try:
             # Execute with timeout
             timeout_sec = timeout_ms / 1000.0
+            deadline = asyncio.get_running_loop().time() + timeout_sec
 
-            async with asyncio.timeout(timeout_sec):
+            async with asyncio.timeout_at(deadline):
                 result = await self._execute_query(
                     plugin=plugin,
                     query=query,
                     params=params,
                     stmt_type=stmt_type,
                     max_rows=max_rows,
+                    deadline=deadline,
                 )
 
         except asyncio.TimeoutError:
@@ -180,8 +193,8 @@ class PreparedStatementExecutor:
                 },
             )
 
-        except PermissionDeniedError:
-            # Re-raise permission errors as-is
+        except (PermissionDeniedError, QueryCostError):
+            # Re-raise permission and cost policy errors as-is
             raise
 
         except TimeoutError:
@@ -235,6 +248,7 @@ class PreparedStatementExecutor:
         params: tuple[Any, ...],
         stmt_type: str,
         max_rows: int,
+        deadline: Optional[float] = None,
     ) -> dict[str, Any]:
         """
         Execute query and fetch results.
@@ -245,15 +259,51 @@ class PreparedStatementExecutor:
             params: Parameter tuple
             stmt_type: Statement type (SELECT, INSERT, etc.)
             max_rows: Maximum rows to return
+            deadline: Event loop time at which a still-running SQLite
+                statement is interrupted (None = never)
 
         Returns:
             Dict with rows, row_count, truncated (no execution_time_ms yet)
         """
-        async with self.database._get_session() as session:
+        # Plain SELECTs can be served by the database's read pool, if any
+        get_session = self.database._get_session
+        if stmt_type == "SELECT":
+            get_session = getattr(self.database, "_get_read_session", get_session)
+
+        async with get_session() as session:
             from sqlalchemy import text
 
-            # Execute prepared statement
-            result = await session.execute(text(query), dict(enumerate(params)))
+            # Arm an interrupt at the deadline: cancelling the awaiting task
+            # alone leaves the statement running in the driver thread (and
+            # holding the writer) until it finishes on its own
+            interrupt_handle = None
+            if deadline is not None:
+                driver_connection = await self._get_interruptible_connection(session)
+                if driver_connection is not None:
+                    interrupt_handle = asyncio.get_running_loop().call_at(
+                        deadline,
+                        self._interrupt,
+                        driver_connection,
+                        plugin,
+                        query,
+                    )
+
+            try:
+                # Check plan against cost policy before running anything
+                if self.cost_guard is not None:
+                    await self.cost_guard.check(
+                        session,
+                        plugin,
+                        query,
+                        params,
+                        is_postgresql=getattr(self.database, "is_postgresql", False),
+                    )
+
+                # Execute prepared statement
+                result = await session.execute(text(query), dict(enumerate(params)))
+            finally:
+                if interrupt_handle is not None:
+                    interrupt_handle.cancel()
 
             if stmt_type == "SELECT" or stmt_type == "WITH":
                 # Fetch results with row limit
@@ -300,6 +350,40 @@ class PreparedStatementExecutor:
                     "truncated": False,
                 }
 
+    async def _get_interruptible_connection(self, session: Any) -> Optional[Any]:
+        """
+        Get the driver connection to interrupt on timeout (SQLite only).
+
+        PostgreSQL (asyncpg) cancels the running statement itself when the
+        awaiting task is cancelled, so no handle is needed there.
+
+        Args:
+            session: Database session
+
+        Returns:
+            aiosqlite connection, or None if unavailable
+        """
+        if getattr(self.database, "is_postgresql", False):
+            return None
+
+        try:
+            connection = await session.connection()
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+        except Exception:
+            return None
+
+        return driver_connection if hasattr(driver_connection, "interrupt") else None
+
+    def _interrupt(self, driver_connection: Any, plugin: str, query: str) -> None:
+        """Interrupt the running SQLite statement (sqlite3_interrupt)."""
+        self.interrupted_count += 1
+        self.logger.warning(
+            "Interrupting query at timeout",
+            extra={"plugin": plugin, "query_hash": hash(query)},
+        )
+        asyncio.ensure_future(driver_connection.interrupt())
+
     def _detect_statement_type(self, query: str) -> str:
         """
         Detect SQL statement type from query string.
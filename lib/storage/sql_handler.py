@@ -12,6 +12,8 @@ import re
 import time
 from typing import Any, Optional
 
+from .sql_audit import SQLAuditLogger
+from .sql_cost import QueryCostGuard
 from .sql_errors import (
     RequestValidationError,
 )
@@ -69,6 +71,7 @@ class SQLExecutionHandler:
 
     Subject Pattern:
         rosey.db.sql.<plugin>.execute
+        rosey.db.sql.admin.stats  (per-query-shape statistics)
 
     Request Format:
         {
@@ -104,9 +107,13 @@ class SQLExecutionHandler:
         Handler is async-safe and can process concurrent requests.
     """
 
+    # Admin subject for per-query-shape statistics
+    STATS_SUBJECT: str = "rosey.db.sql.admin.stats"
+
     # Default configuration
     DEFAULT_TIMEOUT_MS: int = 10000
     DEFAULT_MAX_ROWS: int = 10000
+    DEFAULT_AUDIT_QUEUE_SIZE: int = 10000
 
     # Bounds for configuration
     MIN_TIMEOUT_MS: int = 100
@@ -129,6 +136,15 @@ class SQLExecutionHandler:
             config: Optional configuration dict with:
                 - default_timeout_ms: Default query timeout (default: 10000)
                 - default_max_rows: Default row limit (default: 10000)
+                - slow_query_threshold_ms: Always-audited threshold (default: 500)
+                - audit_sample_rate: Fraction of successful queries to
+                  audit-log (default: 1.0; errors/slow always logged)
+                - audit_queue_size: Background audit queue bound
+                  (default: 10000, 0 = log inline)
+                - max_query_fingerprints: Query shapes tracked for the
+                  stats subject (default: 500)
+                - cost_guard: Optional EXPLAIN-based cost policies (see
+                  QueryCostGuard.from_config; default: disabled)
         """
         self.nats_client = nats_client
         self.database = database
@@ -137,11 +153,26 @@ class SQLExecutionHandler:
         # Initialize execution pipeline components
         self.validator = QueryValidator()
         self.binder = ParameterBinder()
-        self.executor = PreparedStatementExecutor(database)
+        cost_config = self.config.get("cost_guard")
+        self.executor = PreparedStatementExecutor(
+            database,
+            cost_guard=QueryCostGuard.from_config(cost_config) if cost_config else None,
+        )
         self.formatter = ResultFormatter()
 
+        # Audit logging runs off the request path (queued after start())
+        self.audit_logger = SQLAuditLogger(
+            slow_query_threshold_ms=self.config.get("slow_query_threshold_ms", 500.0),
+            sample_rate=self.config.get("audit_sample_rate", 1.0),
+            queue_size=self.config.get(
+                "audit_queue_size", self.DEFAULT_AUDIT_QUEUE_SIZE
+            ),
+            max_fingerprints=self.config.get("max_query_fingerprints", 500),
+        )
+
         self.logger = logging.getLogger(__name__)
         self.subscription: Optional[Any] = None
+        self.stats_subscription: Optional[Any] = None
 
         # Metrics
         self.request_count: int = 0
@@ -152,15 +183,21 @@ class SQLExecutionHandler:
         """
         Start handler by subscribing to NATS subjects.
 
-        Subscribes to: rosey.db.sql.*.execute
+        Subscribes to: rosey.db.sql.*.execute, rosey.db.sql.admin.stats
         """
         self.logger.info("Starting SQL execution handler")
 
+        await self.audit_logger.start()
+
         # Subscribe to wildcard pattern: rosey.db.sql.*.execute
         self.subscription = await self.nats_client.subscribe(
             "rosey.db.sql.*.execute",
             cb=self.handle_execute,
         )
+        self.stats_subscription = await self.nats_client.subscribe(
+            self.STATS_SUBJECT,
+            cb=self.handle_stats,
+        )
 
         self.logger.info(
             "SQL execution handler started, subscribed to rosey.db.sql.*.execute"
@@ -168,6 +205,10 @@ class SQLExecutionHandler:
 
     async def stop(self) -> None:
         """Stop handler and clean up resources."""
+        if self.stats_subscription:
+            await self.stats_subscription.unsubscribe()
+            self.stats_subscription = None
+
         if self.subscription:
             await self.subscription.unsubscribe()
             self.subscription = None
@@ -176,6 +217,9 @@ class SQLExecutionHandler:
                 f"(requests: {self.request_count}, errors: {self.error_count})"
             )
 
+        # Flush queued audit entries
+        await self.audit_logger.stop()
+
     async def handle_execute(self, msg: Any) -> None:
         """
         Handle SQL execution request from NATS.
@@ -224,18 +268,16 @@ class SQLExecutionHandler:
             response = json.dumps(result).encode()
             await msg.respond(response)
 
-            # Log success
+            # Audit (sampled, queued - no formatting or I/O on this path)
             execution_time_ms = (time.perf_counter() - start_time) * 1000
             self.total_execution_time_ms += execution_time_ms
-            self.logger.info(
-                "SQL query executed successfully",
-                extra={
-                    "plugin": plugin,
-                    "execution_time_ms": round(execution_time_ms, 2),
-                    "row_count": result.get("row_count", 0),
-                    "truncated": result.get("truncated", False),
-                    "query_hash": hash(validated_request["query"]),
-                },
+            self.audit_logger.log_query(
+                plugin=plugin,
+                query=validated_request["query"],
+                params=validated_request["params"],
+                row_count=result.get("row_count", 0),
+                execution_time_ms=execution_time_ms,
+                truncated=result.get("truncated", False),
             )
 
         except Exception as e:
@@ -250,17 +292,78 @@ class SQLExecutionHandler:
             response = json.dumps(error_response).encode()
             await msg.respond(response)
 
-            # Log error
-            self.logger.error(
-                "SQL query execution failed: %s",
-                str(e),
-                extra={
-                    "plugin": plugin,
-                    "execution_time_ms": round(execution_time_ms, 2),
-                    "error_type": type(e).__name__,
-                    "error_code": getattr(e, "code", "UNKNOWN_ERROR"),
-                },
+            # Audit error (always logged, never sampled)
+            query = request_data.get("query", "")
+            params = request_data.get("params", [])
+            self.audit_logger.log_error(
+                plugin=plugin,
+                query=query if isinstance(query, str) else "",
+                params=params if isinstance(params, list) else [],
+                error=e,
+                execution_time_ms=execution_time_ms,
+            )
+
+    async def handle_stats(self, msg: Any) -> None:
+        """
+        Handle per-query-shape statistics request from NATS.
+
+        Request Format (all fields optional):
+            {
+                "limit": 20,
+                "sort_by": "total_time_ms",
+                "plugin": "quote-db",
+                "format": "json"          # or "prometheus"
+            }
+
+        Response: JSON with handler metrics, collector summary and the
+        top query shapes, or Prometheus exposition text when
+        format is "prometheus".
+
+        Args:
+            msg: NATS message containing stats request
+        """
+        query_stats = self.audit_logger.query_stats
+
+        try:
+            request_data = json.loads(msg.data.decode()) if msg.data else {}
+            if not isinstance(request_data, dict):
+                raise RequestValidationError(
+                    "Request body must be a JSON object",
+                    field="body",
+                )
+
+            limit = request_data.get("limit", 20)
+            if not isinstance(limit, int) or limit < 1:
+                raise RequestValidationError(
+                    "Field 'limit' must be a positive integer",
+                    field="limit",
+                )
+
+            if request_data.get("format") == "prometheus":
+                await msg.respond(query_stats.to_prometheus(limit=limit).encode())
+                return
+
+            try:
+                shapes = query_stats.top(
+                    limit=limit,
+                    sort_by=request_data.get("sort_by", "total_time_ms"),
+                    plugin=request_data.get("plugin"),
+                )
+            except ValueError as e:
+                raise RequestValidationError(str(e), field="sort_by")
+
+            response = {
+                "handler": self.get_metrics(),
+                "summary": query_stats.get_summary(),
+                "shapes": shapes,
+            }
+            await msg.respond(json.dumps(response).encode())
+
+        except Exception as e:
+            error_response = self.formatter.format_error(
+                error=e, query="", params=[], plugin="admin"
             )
+            await msg.respond(json.dumps(error_response).encode())
 
     def _validate_request(self, data: dict[str, Any]) -> dict[str, Any]:
         """
@@ -441,6 +544,7 @@ class SQLExecutionHandler:
 
         Returns:
             Dict with request_count, error_count, avg_execution_time_ms
+            audit pipeline stats and query shape summary
         """
         avg_time = (
             self.total_execution_time_ms / self.request_count
@@ -456,4 +560,6 @@ class SQLExecutionHandler:
                 else 0.0
             ),
             "avg_execution_time_ms": round(avg_time, 2),
+            "audit": self.audit_logger.get_pipeline_stats(),
+            "query_shapes": self.audit_logger.query_stats.get_summary(),
         }
@@ -0,0 +1,428 @@
+"""
+Per-query-shape statistics for parameterized SQL queries.
+
+This module groups queries by fingerprint (normalized query text with
+literals and placeholders collapsed) and keeps per-fingerprint latency
+histograms, row counts and error rates in bounded memory, so the few
+query shapes that dominate database time can be found.
+
+Features:
+    - Query fingerprinting (memoized)
+    - HDR-style log-linear latency histograms (p50/p95/p99, ~6% error)
+    - Top-K retention by total execution time with batch eviction
+    - JSON and Prometheus text exports
+
+Example:
+    >>> stats = QueryStatsCollector(max_fingerprints=500)
+    >>> stats.record("quote-db", "SELECT * FROM quote_db__quotes WHERE id = $1",
+    ...              execution_time_ms=1.2, row_count=1)
+    >>> stats.top(10)[0]["p99_ms"]
+    1.2
+    >>> print(stats.to_prometheus())
+"""
+
+import functools
+import hashlib
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+# Max distinct raw queries kept in the fingerprint memo
+FINGERPRINT_CACHE_SIZE = 2048
+
+# Normalization patterns (applied in order)
+_COMMENT_PATTERN = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING_PATTERN = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_PATTERN = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_PATTERN = re.compile(r"\$\d+|:\w+|\?")
+_IN_LIST_PATTERN = re.compile(r"\bin\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_REPEATED_GROUP_PATTERN = re.compile(r"(\([^()]*\))(?:\s*,\s*\1)+")
+
+
+@functools.lru_cache(maxsize=FINGERPRINT_CACHE_SIZE)
+def fingerprint_query(query: str) -> str:
+    """
+    Normalize a query into its shape.
+
+    Comments are removed, string/number literals and placeholders
+    ($N, ?, :name) become ?, IN lists and repeated VALUES groups are
+    collapsed, and whitespace/case are normalized.
+
+    Args:
+        query: SQL query string
+
+    Returns:
+        Normalized query fingerprint
+
+    Example:
+        >>> fingerprint_query("SELECT * FROM t WHERE id IN ($1, $2, 3)")
+        'select * from t where id in (?)'
+    """
+    normalized = _COMMENT_PATTERN.sub(" ", query)
+    normalized = _STRING_PATTERN.sub("?", normalized)
+    normalized = _PLACEHOLDER_PATTERN.sub("?", normalized)
+    normalized = _NUMBER_PATTERN.sub("?", normalized)
+    normalized = " ".join(normalized.split()).lower()
+    normalized = _IN_LIST_PATTERN.sub("in (?)", normalized)
+    normalized = _REPEATED_GROUP_PATTERN.sub(r"\1", normalized)
+    return normalized
+
+
+@functools.lru_cache(maxsize=FINGERPRINT_CACHE_SIZE)
+def fingerprint_id(fingerprint: str) -> str:
+    """Short stable identifier for a fingerprint (first 16 chars of SHA256)."""
+    return hashlib.sha256(fingerprint.encode()).hexdigest()[:16]
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in the style of HdrHistogram.
+
+    Values are recorded in microseconds. Values below SUB_BUCKETS are
+    counted exactly; above that each power of two is split into
+    SUB_BUCKETS / 2 linear sub-buckets, giving a bounded relative error
+    (~6%) with a few hundred buckets covering microseconds to hours.
+    Recording is O(1); buckets are stored sparsely.
+
+    Example:
+        >>> hist = LatencyHistogram()
+        >>> for ms in (1.0, 2.0, 100.0):
+        ...     hist.record(ms)
+        >>> round(hist.percentile(50))
+        2
+    """
+
+    SUB_BUCKET_BITS: int = 5
+    SUB_BUCKETS: int = 1 << SUB_BUCKET_BITS
+    HALF_SUB_BUCKETS: int = SUB_BUCKETS >> 1
+
+    __slots__ = ("_counts", "count", "min_us", "max_us")
+
+    def __init__(self) -> None:
+        """Initialize empty histogram."""
+        self._counts: dict[int, int] = {}
+        self.count = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def record(self, value_ms: float) -> None:
+        """
+        Record a latency value.
+
+        Args:
+            value_ms: Latency in milliseconds
+        """
+        value_us = max(0, int(value_ms * 1000))
+        index = self._bucket_index(value_us)
+        self._counts[index] = self._counts.get(index, 0) + 1
+
+        if self.count == 0 or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+        self.count += 1
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Get the latency at a percentile.
+
+        Args:
+            percentile: Percentile in range 0-100
+
+        Returns:
+            Latency in milliseconds (0.0 if empty)
+        """
+        if self.count == 0:
+            return 0.0
+
+        target = max(1, int(round(self.count * percentile / 100.0)))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                value_us = self._bucket_value(index)
+                return round(min(max(value_us, self.min_us), self.max_us) / 1000, 3)
+
+        return round(self.max_us / 1000, 3)
+
+    @property
+    def bucket_count(self) -> int:
+        """Number of non-empty buckets."""
+        return len(self._counts)
+
+    def _bucket_index(self, value_us: int) -> int:
+        """Map a value to its bucket index."""
+        if value_us < self.SUB_BUCKETS:
+            return value_us
+        shift = value_us.bit_length() - self.SUB_BUCKET_BITS
+        return shift * self.HALF_SUB_BUCKETS + (value_us >> shift)
+
+    def _bucket_value(self, index: int) -> int:
+        """Representative (midpoint) value for a bucket index."""
+        if index < self.SUB_BUCKETS:
+            return index
+        shift = index // self.HALF_SUB_BUCKETS - 1
+        mantissa = index - shift * self.HALF_SUB_BUCKETS
+        return (mantissa << shift) + (1 << (shift - 1))
+
+
+@dataclass
+class QueryShapeStats:
+    """
+    Statistics for one query fingerprint.
+
+    Attributes:
+        fingerprint: Normalized query text
+        fingerprint_id: Short hash of the fingerprint
+        plugin: Plugin that first executed this shape
+        sample_query: First raw query seen (truncated)
+        count: Total executions (including errors)
+        errors: Failed executions
+        total_time_ms: Sum of execution times
+        max_time_ms: Maximum execution time
+        rows_total: Sum of rows returned/affected
+        last_seen: Unix timestamp of the last execution
+        histogram: Latency histogram
+    """
+
+    fingerprint: str
+    fingerprint_id: str
+    plugin: str
+    sample_query: str
+    count: int = 0
+    errors: int = 0
+    total_time_ms: float = 0.0
+    max_time_ms: float = 0.0
+    rows_total: int = 0
+    last_seen: float = 0.0
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram, repr=False)
+
+    def record(self, execution_time_ms: float, row_count: int, is_error: bool) -> None:
+        """Record one execution."""
+        self.count += 1
+        self.total_time_ms += execution_time_ms
+        self.max_time_ms = max(self.max_time_ms, execution_time_ms)
+        self.rows_total += row_count
+        if is_error:
+            self.errors += 1
+        self.last_seen = time.time()
+        self.histogram.record(execution_time_ms)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for export."""
+        return {
+            "fingerprint": self.fingerprint,
+            "fingerprint_id": self.fingerprint_id,
+            "plugin": self.plugin,
+            "sample_query": self.sample_query,
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.count if self.count else 0, 4),
+            "total_time_ms": round(self.total_time_ms, 2),
+            "avg_time_ms": round(
+                self.total_time_ms / self.count if self.count else 0, 3
+            ),
+            "max_time_ms": round(self.max_time_ms, 3),
+            "p50_ms": self.histogram.percentile(50),
+            "p95_ms": self.histogram.percentile(95),
+            "p99_ms": self.histogram.percentile(99),
+            "rows_total": self.rows_total,
+            "avg_rows": round(self.rows_total / self.count if self.count else 0, 2),
+            "last_seen": self.last_seen,
+        }
+
+
+class QueryStatsCollector:
+    """
+    Bounded collector of per-fingerprint query statistics.
+
+    Keeps at most max_fingerprints shapes. When a new shape arrives at
+    capacity, the shapes contributing least total execution time are
+    evicted in a batch (evict_fraction of capacity) so eviction cost is
+    amortized across many inserts.
+
+    Example:
+        >>> stats = QueryStatsCollector(max_fingerprints=100)
+        >>> stats.record("p", "SELECT 1", 2.5, row_count=1)
+        >>> stats.get_summary()["fingerprints"]
+        1
+
+    Thread Safety:
+        Intended for use from a single event loop.
+    """
+
+    DEFAULT_MAX_FINGERPRINTS: int = 500
+    DEFAULT_EVICT_FRACTION: float = 0.1
+    SAMPLE_QUERY_LENGTH: int = 200
+
+    def __init__(
+        self,
+        max_fingerprints: int = DEFAULT_MAX_FINGERPRINTS,
+        evict_fraction: float = DEFAULT_EVICT_FRACTION,
+    ) -> None:
+        """
+        Initialize collector.
+
+        Args:
+            max_fingerprints: Maximum query shapes retained
+            evict_fraction: Fraction of capacity evicted when full
+        """
+        self.max_fingerprints = max(1, max_fingerprints)
+        self._evict_count = max(1, int(self.max_fingerprints * evict_fraction))
+        self._shapes: dict[str, QueryShapeStats] = {}
+        self._evicted = 0
+
+    def record(
+        self,
+        plugin: str,
+        query: str,
+        execution_time_ms: float,
+        row_count: int = 0,
+        is_error: bool = False,
+    ) -> QueryShapeStats:
+        """
+        Record one query execution.
+
+        Args:
+            plugin: Plugin that executed the query
+            query: Raw SQL query string
+            execution_time_ms: Execution time in milliseconds
+            row_count: Rows returned/affected
+            is_error: Whether the query failed
+
+        Returns:
+            Updated QueryShapeStats for the query's fingerprint
+        """
+        fingerprint = fingerprint_query(query)
+        shape = self._shapes.get(fingerprint)
+
+        if shape is None:
+            if len(self._shapes) >= self.max_fingerprints:
+                self._evict()
+            shape = QueryShapeStats(
+                fingerprint=fingerprint,
+                fingerprint_id=fingerprint_id(fingerprint),
+                plugin=plugin,
+                sample_query=query[: self.SAMPLE_QUERY_LENGTH],
+            )
+            self._shapes[fingerprint] = shape
+
+        shape.record(execution_time_ms, row_count, is_error)
+        return shape
+
+    def _evict(self) -> None:
+        """Evict the shapes with the least total execution time."""
+        victims = sorted(self._shapes.values(), key=lambda s: s.total_time_ms)
+        for shape in victims[: self._evict_count]:
+            del self._shapes[shape.fingerprint]
+        self._evicted += min(self._evict_count, len(victims))
+
+    def get(self, query: str) -> Optional[QueryShapeStats]:
+        """Get stats for the fingerprint of a raw query, if tracked."""
+        return self._shapes.get(fingerprint_query(query))
+
+    def top(
+        self,
+        limit: int = 20,
+        sort_by: str = "total_time_ms",
+        plugin: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get the top query shapes.
+
+        Args:
+            limit: Maximum shapes to return
+            sort_by: Sort key (total_time_ms, count, errors, max_time_ms,
+                rows_total)
+            plugin: Optional plugin filter
+
+        Returns:
+            List of shape dicts, highest first
+
+        Raises:
+            ValueError: If sort_by is not a known key
+        """
+        if sort_by not in ("total_time_ms", "count", "errors", "max_time_ms", "rows_total"):
+            raise ValueError(f"Invalid sort key: {sort_by}")
+
+        shapes = [
+            s for s in self._shapes.values() if plugin is None or s.plugin == plugin
+        ]
+        shapes.sort(key=lambda s: getattr(s, sort_by), reverse=True)
+        return [s.to_dict() for s in shapes[:limit]]
+
+    def get_summary(self) -> dict[str, Any]:
+        """
+        Get collector summary.
+
+        Returns:
+            Dict with fingerprints tracked, capacity and evicted count
+        """
+        return {
+            "fingerprints": len(self._shapes),
+            "max_fingerprints": self.max_fingerprints,
+            "evicted": self._evicted,
+        }
+
+    def reset(self) -> None:
+        """Clear all statistics."""
+        self._shapes.clear()
+        self._evicted = 0
+
+    def to_prometheus(self, limit: Optional[int] = None) -> str:
+        """
+        Export statistics in Prometheus text exposition format.
+
+        Latency is exported as a summary (p50/p95/p99 quantiles plus
+        _sum/_count); rows and errors as counters. Shapes are labelled by
+        plugin and fingerprint_id (see top() for the full text).
+
+        Args:
+            limit: Only export the top N shapes by total time
+
+        Returns:
+            Prometheus exposition text
+        """
+        shapes = sorted(
+            self._shapes.values(), key=lambda s: s.total_time_ms, reverse=True
+        )
+        if limit is not None:
+            shapes = shapes[:limit]
+
+        lines = [
+            "# HELP rosey_sql_query_duration_ms SQL execution time per query shape",
+            "# TYPE rosey_sql_query_duration_ms summary",
+        ]
+        for shape in shapes:
+            labels = _format_labels(shape)
+            for quantile in (50, 95, 99):
+                lines.append(
+                    f'rosey_sql_query_duration_ms{{{labels},quantile="{quantile / 100}"}} '
+                    f"{shape.histogram.percentile(quantile)}"
+                )
+            lines.append(
+                f"rosey_sql_query_duration_ms_sum{{{labels}}} {round(shape.total_time_ms, 3)}"
+            )
+            lines.append(f"rosey_sql_query_duration_ms_count{{{labels}}} {shape.count}")
+
+        lines.append("# HELP rosey_sql_query_errors_total Failed executions per query shape")
+        lines.append("# TYPE rosey_sql_query_errors_total counter")
+        for shape in shapes:
+            lines.append(f"rosey_sql_query_errors_total{{{_format_labels(shape)}}} {shape.errors}")
+
+        lines.append("# HELP rosey_sql_query_rows_total Rows returned per query shape")
+        lines.append("# TYPE rosey_sql_query_rows_total counter")
+        for shape in shapes:
+            lines.append(f"rosey_sql_query_rows_total{{{_format_labels(shape)}}} {shape.rows_total}")
+
+        lines.append("# TYPE rosey_sql_query_shapes_evicted_total counter")
+        lines.append(f"rosey_sql_query_shapes_evicted_total {self._evicted}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(shape: QueryShapeStats) -> str:
+    """Format Prometheus labels for a shape."""
+    plugin = shape.plugin.replace("\\", "\\\\").replace('"', '\\"')
+    return f'plugin="{plugin}",fingerprint_id="{shape.fingerprint_id}"'
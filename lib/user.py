@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 from .util import uncloak_ip
 
+_UNSET = object()
+
 
 class User:
     """CyTube user.
@@ -13,7 +15,7 @@ class User:
     password : `None` or `str`
         Password.
     uncloaked_ip : `None` or `list` of `str`
-        Uncloaked IP.
+        Uncloaked IP (computed from `ip` on first access).
     rank : `float`
         Rank.
     image : `str`
@@ -28,6 +30,11 @@ class User:
         `True` if user is shadow muted.
     """
 
+    __slots__ = (
+        'name', 'password', 'rank', 'image', 'text',
+        'afk', 'muted', 'smuted', '_ip', '_uncloaked_ip', 'aliases',
+    )
+
     def __init__(self,
                  name='', password=None,
                  rank=-1, profile=None, meta=None):
@@ -40,10 +47,42 @@ class User:
         self.muted = False
         self.smuted = False
         self._ip = None
-        self.uncloaked_ip = None
+        self._uncloaked_ip = None
         self.aliases = []
         self.update(profile=profile, meta=meta)
 
+    @classmethod
+    def from_data(cls, data):
+        """Create a user from a userlist / addUser entry.
+
+        Accepts both the normalized format (``username``, ``is_afk``) and
+        the CyTube format (``name``, ``afk`` in ``meta``), reading fields
+        straight into the instance without intermediate dicts.
+
+        Parameters
+        ----------
+        data : `dict`
+
+        Returns
+        -------
+        `cytube_bot.user.User`
+        """
+        meta = data.get('meta') or {}
+        profile = data.get('profile') or {}
+        user = cls.__new__(cls)
+        user.name = data.get('username', data.get('name', ''))
+        user.password = None
+        user.rank = data.get('rank', 0)
+        user.image = profile.get('image', '')
+        user.text = profile.get('text', '')
+        user.afk = data.get('is_afk', data.get('afk', False))
+        user.muted = meta.get('muted', False)
+        user.smuted = meta.get('smuted', False)
+        user._ip = meta.get('ip', None)
+        user._uncloaked_ip = _UNSET if user._ip is not None else None
+        user.aliases = meta.get('aliases', [])
+        return user
+
     def __str__(self):
         if self.ip is None:
             return '<user "%s" (rank %.2f)>' % (self.name, self.rank)
@@ -69,10 +108,18 @@ class User:
     @ip.setter
     def ip(self, ip):
         self._ip = ip
-        if ip is None:
-            self.uncloaked_ip = None
-        else:
-            self.uncloaked_ip = uncloak_ip(ip)
+        self._uncloaked_ip = None if ip is None else _UNSET
+
+    @property
+    def uncloaked_ip(self):
+        """Uncloaked IP, brute-forced from `ip` on first access."""
+        if self._uncloaked_ip is _UNSET:
+            self._uncloaked_ip = uncloak_ip(self._ip)
+        return self._uncloaked_ip
+
+    @uncloaked_ip.setter
+    def uncloaked_ip(self, uncloaked_ip):
+        self._uncloaked_ip = uncloaked_ip
 
     @property
     def profile(self):
@@ -171,6 +218,42 @@ class UserList(dict):
             raise ValueError('user exists: %s' % user.name)
         self[user.name] = user
 
+    def reset(self, users):
+        """Replace all users (userlist snapshot).
+
+        Parameters
+        ----------
+        users : iterable of `cytube_bot.user.User`
+            New users; a later duplicate name replaces an earlier one.
+        """
+        self.clear()
+        self.update((user.name, user) for user in users)
+
+    def sync(self, users):
+        """Replace all users with a new snapshot, returning the difference.
+
+        Used when a userlist arrives for a channel that already has one
+        (after a reconnect), so users who stayed are not treated as having
+        left and joined again.
+
+        Parameters
+        ----------
+        users : iterable of `cytube_bot.user.User`
+
+        Returns
+        -------
+        (`list` of `str`, `list` of `str`, `int`)
+            Names that joined, names that left, and the number of users
+            present in both.
+        """
+        previous = set(self)
+        self.reset(users)
+        joined = [name for name in self if name not in previous]
+        left = [name for name in previous if name not in self]
+        if self._leader is not None:
+            self._leader = dict.get(self, self._leader.name)
+        return joined, left, len(previous) - len(left)
+
     def get(self, name):
         """Get user by name.
 
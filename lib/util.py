@@ -3,7 +3,10 @@
 
 import asyncio
 import logging
+import random
+import re
 from base64 import b64encode
+from collections import OrderedDict
 from collections.abc import Sequence
 from hashlib import md5
 from html import unescape
@@ -34,9 +37,54 @@ except AttributeError:
     current_task = asyncio.Task.current_task  # type: ignore[attr-defined]
 
 
+# Start/end tags the single-pass tokenizer understands: a strict subset of
+# what HTMLParser accepts, so anything it matches is parsed identically.
+_TAG_WS = '[ \t\n\r\f]'
+_ATTR = (
+    r'[a-zA-Z_:][-a-zA-Z0-9_:.]*'
+    r'(?:' + _TAG_WS + r'*=' + _TAG_WS + r'*(?:"[^"]*"|\'[^\']*\'|(?![\'"])[^>\s]+))?'
+)
+_TAG_RE = re.compile(
+    r'<(?:/([a-zA-Z][a-zA-Z0-9]*)' + _TAG_WS + r'*'
+    r'|([a-zA-Z][a-zA-Z0-9]*)((?:' + _TAG_WS + r'+' + _ATTR + r')*)'
+    + _TAG_WS + r'*(/?))>'
+)
+_ATTR_RE = re.compile(
+    r'([a-zA-Z_:][-a-zA-Z0-9_:.]*)'
+    r'(?:' + _TAG_WS + r'*=' + _TAG_WS + r'*("[^"]*"|\'[^\']*\'|(?![\'"])[^>\s]+))?'
+)
+# Elements whose content HTMLParser treats as raw text (the set grows in
+# newer Python releases); messages containing them take the slow path.
+_RAW_TEXT_ELEMENTS = frozenset(HTMLParser.CDATA_CONTENT_ELEMENTS) | {
+    'script', 'style', 'textarea', 'title', 'plaintext', 'xmp',
+    'iframe', 'noembed', 'noframes', 'noscript',
+}
+
+
+def _unescape_text(text):
+    # HTMLParser converts character references before handle_data(), which
+    # unescapes again
+    return unescape(unescape(text)) if '&' in text else text
+
+
+def _attr_value(value):
+    if not value:
+        return None
+    if value[0] in '"\'':
+        value = value[1:-1]
+    return unescape(value) if value else value
+
+
 class MessageParser(HTMLParser):
     """Chat message parser.
 
+    Messages are converted in a single pass by a regex tokenizer that
+    handles the tags CyTube emits. Anything it does not recognise (comments,
+    raw text elements, malformed tags) falls back to `HTMLParser`, so the
+    output is the same either way. Results for the last `CACHE_SIZE`
+    distinct messages, and the conversion of up to `TAG_CACHE_SIZE`
+    distinct tags, are cached; assigning `markup` clears both.
+
     Attributes
     ----------
     markup : `None` or `list` of (`str`, `None` or `dict` of (`str`, `str`), `None` or `str`, `None` or `str`)
@@ -52,11 +100,46 @@ class MessageParser(HTMLParser):
         (None, {'class': 'spoiler'}, '[sp]', '[/sp]')
     ]
 
+    CACHE_SIZE = 256
+    TAG_CACHE_SIZE = 1024
+
     def __init__(self, markup=DEFAULT_MARKUP):
         super().__init__()
         self.markup = markup
         self.message = ''
         self.tags = []
+        self._parts = []
+
+    @property
+    def markup(self):
+        return self._markup
+
+    @markup.setter
+    def markup(self, markup):
+        self._markup = markup
+        self._rules, self._default_rules = self._compile_markup(markup)
+        self._cache = OrderedDict()
+        self._tag_ops = {}
+
+    @staticmethod
+    def _compile_markup(markup):
+        """Build the tag -> candidate rules lookup table.
+
+        Each tag maps to the markup entries that can apply to it, in
+        declaration order, as (required attributes, start, end) tuples.
+        Tags without an entry of their own use the `None` (any tag) rules.
+        """
+        if markup is None:
+            return None, ()
+        rules = [
+            (tag_, tuple(attr_.items()) if attr_ else None, start, end)
+            for tag_, attr_, start, end in markup
+        ]
+        table = {
+            tag: tuple(rule[1:] for rule in rules if rule[0] in (None, tag))
+            for tag in {rule[0] for rule in rules if rule[0] is not None}
+        }
+        return table, tuple(rule[1:] for rule in rules if rule[0] is None)
 
     def get_tag_markup(self, tag, attr):
         """Get markup delimiters for a given HTML tag and attributes
@@ -68,52 +151,53 @@ class MessageParser(HTMLParser):
         Returns:
             Tuple of (start_markup, end_markup) or None if no match
         """
-        if self.markup is None:
+        if self._rules is None:
             return None
 
-        # Convert attribute list to dict for easier lookup
-        attr = dict(attr)
-
-        # Search for matching markup definition
-        for tag_, attr_, start, end in self.markup:
-            # Check if tag matches (None means any tag)
-            if tag_ is not None and tag_ != tag:
-                continue
-
-            # Check if attributes match (None means any attributes)
-            if attr_ is not None:
-                match = True
-                for name, value in attr_.items():
-                    if attr.get(name, None) != value:
-                        match = False
-                        break
-                if not match:
+        attrs = None
+        for required, start, end in self._rules.get(tag, self._default_rules):
+            if required:
+                # Later duplicates win, as with dict(attr)
+                if attrs is None:
+                    attrs = dict(attr)
+                if any(attrs.get(name) != value for name, value in required):
                     continue
-
-            # Found a match
             return start, end
+        return None
 
-    def handle_starttag(self, tag, attr):
-        """Handle opening HTML tags by converting to markup syntax
-
-        Args:
-            tag: HTML tag name
-            attr: List of (name, value) tuples for attributes
-        """
+    def _starttag(self, tag, attr, parts, tags):
         markup = self.get_tag_markup(tag, attr)
         if markup is not None:
             start, end = markup
             # Add opening delimiter if specified
             if start is not None:
-                self.message += start
+                parts.append(start)
             # Push closing delimiter onto stack if specified
             if end is not None:
-                self.tags.append((tag, end))
+                tags.append((tag, end))
         else:
             # For unrecognized tags, extract URLs from src/href attributes
             for name, value in attr:
                 if name in ('src', 'href'):
-                    self.message += ' %s ' % value
+                    parts.append(' %s ' % value)
+
+    @staticmethod
+    def _endtag(tag, parts, tags):
+        # Pop tags from stack until we find the matching opening tag
+        while tags:
+            tag_, end = tags.pop()
+            parts.append(end)
+            if tag_ == tag:
+                return
+
+    def handle_starttag(self, tag, attr):
+        """Handle opening HTML tags by converting to markup syntax
+
+        Args:
+            tag: HTML tag name
+            attr: List of (name, value) tuples for attributes
+        """
+        self._starttag(tag, attr, self._parts, self.tags)
 
     def handle_endtag(self, tag):
         """Handle closing HTML tags by adding closing markup
@@ -121,12 +205,7 @@ class MessageParser(HTMLParser):
         Args:
             tag: HTML tag name
         """
-        # Pop tags from stack until we find the matching opening tag
-        while self.tags:
-            tag_, end = self.tags.pop()
-            self.message += end
-            if tag_ == tag:
-                return
+        self._endtag(tag, self._parts, self.tags)
 
     def handle_data(self, data):
         """Handle text data between HTML tags
@@ -135,7 +214,90 @@ class MessageParser(HTMLParser):
             data: Text content
         """
         # Unescape HTML entities (e.g., &lt; -> <)
-        self.message += unescape(data)
+        self._parts.append(unescape(data))
+
+    def _tag_op(self, closing, tag, attrs, empty):
+        """Compile a tag matched by `_TAG_RE`.
+
+        Returns
+        -------
+        (`str`, `str`, `None` or `str`, `bool`)
+            Tag name, text to output, end markup to push (`None` if
+            nothing is pushed), and whether the tag is closed right away.
+            `False` if the tag needs `HTMLParser`.
+        """
+        if closing is not None:
+            return closing.lower(), '', None, True
+        tag = tag.lower()
+        if tag in _RAW_TEXT_ELEMENTS:
+            return False
+        attr = [
+            (name.lower(), _attr_value(value))
+            for name, value in _ATTR_RE.findall(attrs)
+        ] if attrs else []
+        parts = []
+        tags = []
+        self._starttag(tag, attr, parts, tags)
+        end = tags[0][1] if tags else None
+        return tag, ''.join(parts), end, bool(empty)
+
+    def _tokenize(self, msg):
+        """Convert `msg` in a single pass.
+
+        Returns
+        -------
+        `None` or (`list` of `str`, `list` of (`str`, `str`))
+            Output parts and unclosed tags, or `None` if `msg` contains
+            something only `HTMLParser` can handle.
+        """
+        parts = []
+        tags = []
+        if '<' not in msg:
+            if msg:
+                parts.append(_unescape_text(msg))
+            return parts, tags
+
+        match = _TAG_RE.match
+        ops = self._tag_ops
+        pos = 0
+        while True:
+            lt = msg.find('<', pos)
+            if lt < 0:
+                break
+            if lt > pos:
+                parts.append(_unescape_text(msg[pos:lt]))
+            m = match(msg, lt)
+            if m is None:
+                return None
+            pos = m.end()
+            op = ops.get(m.group())
+            if op is None:
+                if len(ops) >= self.TAG_CACHE_SIZE:
+                    ops.clear()
+                op = ops[m.group()] = self._tag_op(*m.groups())
+            if not op:
+                return None
+            tag, text, end, close = op
+            if text:
+                parts.append(text)
+            if end is not None:
+                tags.append((tag, end))
+            if close:
+                self._endtag(tag, parts, tags)
+        if pos < len(msg):
+            parts.append(_unescape_text(msg[pos:]))
+        return parts, tags
+
+    def _parse_html(self, msg):
+        """Convert `msg` with `HTMLParser`."""
+        self._parts = parts = []
+        self.tags = tags = []
+        try:
+            self.feed(msg)
+            self.close()
+        finally:
+            self.reset()
+        return parts, tags
 
     def parse(self, msg):
         """Parse a message.
@@ -150,19 +312,29 @@ class MessageParser(HTMLParser):
         `str`
             Parsed message.
         """
-        # Reset parser state
-        self.message = ''
-        self.tags = []
-
-        # Parse the HTML
-        self.feed(msg)
-        self.close()
-        self.reset()
+        cache = self._cache
+        cached = cache.get(msg)
+        if cached is not None:
+            cache.move_to_end(msg)
+            self.message, tags = cached
+            self.tags = list(tags)
+            return self.message
+
+        result = self._tokenize(msg)
+        if result is None:
+            result = self._parse_html(msg)
+        parts, tags = result
 
         # Close any unclosed tags
-        for _, end in reversed(self.tags):
-            self.message += end
-
+        for _, end in reversed(tags):
+            parts.append(end)
+
+        self.message = ''.join(parts)
+        self.tags = tags
+        if self.CACHE_SIZE > 0:
+            cache[msg] = (self.message, tuple(tags))
+            if len(cache) > self.CACHE_SIZE:
+                cache.popitem(last=False)
         return self.message
 
 
@@ -198,6 +370,41 @@ def to_sequence(obj):
     return obj
 
 
+def backoff_delay(attempt, base, cap, rand=random.random):
+    """Jittered exponential backoff delay.
+
+    Half of ``min(cap, base * 2 ** (attempt - 1))`` is fixed and half is
+    random, so clients dropped at the same moment do not reconnect in
+    lockstep but still wait at least half the nominal delay.
+
+    Parameters
+    ----------
+    attempt : `int`
+        Attempt number (1 for the first retry).
+    base : `float`
+        Delay of the first attempt in seconds.
+    cap : `float`
+        Maximum nominal delay in seconds.
+    rand : `function`, optional
+        Source of floats in [0, 1).
+
+    Returns
+    -------
+    `float`
+
+    Examples
+    --------
+    >>> backoff_delay(1, 5, 60, rand=lambda: 0.0)
+    2.5
+    >>> backoff_delay(3, 5, 60, rand=lambda: 0.5)
+    15.0
+    >>> backoff_delay(10, 5, 60, rand=lambda: 0.0)
+    30.0
+    """
+    delay = min(cap, base * 2.0 ** min(max(attempt - 1, 0), 64))
+    return delay / 2 * (1 + rand())
+
+
 async def get(url):
     """Asynchronous HTTP GET request.
 
@@ -14,7 +14,7 @@ Provides event countdown functionality with:
 
 from .countdown import Countdown, parse_datetime, format_remaining
 from .plugin import CountdownPlugin
-from .recurrence import RecurrenceRule, RecurrenceType
+from .recurrence import RecurrenceRule, RecurrenceType, expand_rules
 from .alerts import AlertConfig, AlertManager
 
 __all__ = [
@@ -24,6 +24,7 @@ __all__ = [
     "format_remaining",
     "RecurrenceRule",
     "RecurrenceType",
+    "expand_rules",
     "AlertConfig",
     "AlertManager",
 ]
@@ -39,15 +39,20 @@ from typing import Any, Dict, List, Optional
 
 from nats.aio.client import Client as NATS
 
+try:
+    from lib.channel_state import ChannelStateClient
+except ImportError:
+    ChannelStateClient = None
+
 try:
     from .countdown import Countdown, parse_datetime, format_remaining
     from .scheduler import CountdownScheduler
-    from .recurrence import RecurrenceRule
+    from .recurrence import RecurrenceRule, expand_rules
     from .alerts import AlertConfig, AlertManager
 except ImportError:
     from countdown import Countdown, parse_datetime, format_remaining
     from scheduler import CountdownScheduler
-    from recurrence import RecurrenceRule
+    from recurrence import RecurrenceRule, expand_rules
     from alerts import AlertConfig, AlertManager
 
 
@@ -60,6 +65,7 @@ class CountdownPlugin:
         !countdown <name> every <pattern> - Create recurring countdown
         !countdown <name> - Check remaining time
         !countdown list - List all countdowns in channel
+        !countdown upcoming [days] - List occurrences in the next days
         !countdown delete <name> - Delete a countdown
         !countdown alerts <name> <minutes> - Set T-minus alerts (e.g., 5,1)
         !countdown pause <name> - Pause a recurring countdown
@@ -89,6 +95,7 @@ class CountdownPlugin:
     SUBJECT_ALERTS = "rosey.command.countdown.alerts"
     SUBJECT_PAUSE = "rosey.command.countdown.pause"
     SUBJECT_RESUME = "rosey.command.countdown.resume"
+    SUBJECT_UPCOMING = "rosey.command.countdown.upcoming"
     
     # NATS subjects - Events
     EVENT_CREATED = "rosey.event.countdown.created"
@@ -102,6 +109,7 @@ class CountdownPlugin:
     # Storage API subjects (via NATS)
     STORAGE_INSERT = f"rosey.db.row.{NAMESPACE}.insert"
     STORAGE_SELECT = f"rosey.db.row.{NAMESPACE}.select"
+    STORAGE_SEARCH = f"rosey.db.row.{NAMESPACE}.search"
     STORAGE_UPDATE = f"rosey.db.row.{NAMESPACE}.update"
     STORAGE_DELETE = f"rosey.db.row.{NAMESPACE}.delete"
     MIGRATION_STATUS = f"rosey.db.migrate.{NAMESPACE}.status"
@@ -127,6 +135,22 @@ class CountdownPlugin:
         self.default_alerts = self.config.get("default_alerts", [5, 1])
         self.allow_custom_alerts = self.config.get("allow_custom_alerts", True)
         self.max_alert_minutes = self.config.get("max_alert_minutes", 60)
+        # Minimum CyTube rank to delete/pause/resume other users' countdowns
+        # (None: anyone may)
+        self.manage_rank = self.config.get("manage_rank")
+        # Rows per storage request when loading pending countdowns
+        self.load_page_size = self.config.get("load_page_size", 500)
+        # Recurring countdowns overdue by more than this at startup skip
+        # to their next occurrence instead of announcing a stale T-0
+        self.catchup_grace = self.config.get("catchup_grace", 300.0)
+        # !countdown upcoming: default window (days) and lines shown
+        self.upcoming_days = self.config.get("upcoming_days", 7)
+        self.max_upcoming = self.config.get("max_upcoming", 10)
+        
+        # Channel state replicas for rank checks
+        self.channel_state = None
+        if self.manage_rank is not None and ChannelStateClient is not None:
+            self.channel_state = ChannelStateClient(self.nats)
         
         # Scheduler
         self.scheduler: Optional[CountdownScheduler] = None
@@ -134,6 +158,12 @@ class CountdownPlugin:
         # Alert manager
         self.alert_manager: Optional[AlertManager] = None
         
+        # Write-through cache of active countdowns, filled by
+        # _load_pending_countdowns; storage is read directly until then
+        self._countdowns: Dict[str, Countdown] = {}  # "channel:name" -> countdown
+        self._by_channel: Dict[str, Dict[str, Countdown]] = {}  # channel -> name -> countdown
+        self._cache_loaded = False
+        
         # Subscription tracking
         self._subscriptions = []
         self._initialized = False
@@ -159,11 +189,13 @@ class CountdownPlugin:
         self.scheduler = CountdownScheduler(
             check_interval=self.check_interval,
             on_complete=self._on_countdown_complete,
-            on_check=self._on_scheduler_check
+            on_check=self._on_scheduler_check,
+            next_check=self._next_alert_check
         )
         
         # Load existing countdowns into scheduler
         pending = await self._load_pending_countdowns()
+        await self._catch_up_recurring(pending)
         for countdown in pending:
             countdown_id = f"{countdown.channel}:{countdown.name}"
             
@@ -206,6 +238,9 @@ class CountdownPlugin:
         sub = await self.nats.subscribe(self.SUBJECT_RESUME, cb=self._handle_resume)
         self._subscriptions.append(sub)
         
+        sub = await self.nats.subscribe(self.SUBJECT_UPCOMING, cb=self._handle_upcoming)
+        self._subscriptions.append(sub)
+        
         self._initialized = True
         self.logger.info(
             f"{self.NAMESPACE} plugin loaded with {len(pending)} pending countdowns"
@@ -232,6 +267,9 @@ class CountdownPlugin:
             await sub.unsubscribe()
         self._subscriptions.clear()
         
+        if self.channel_state:
+            await self.channel_state.stop()
+        
         self._initialized = False
         self.logger.info(f"{self.NAMESPACE} plugin unloaded")
     
@@ -401,34 +439,57 @@ class CountdownPlugin:
         """
         Load all pending (non-completed) countdowns from storage.
         
-        Called during initialization to restore scheduler state.
+        Called during initialization to restore scheduler state. Pages
+        through the table `load_page_size` rows at a time and fills the
+        countdown cache; if any page fails the cache stays unloaded and
+        lookups keep going to storage.
         
         Returns:
             List of pending countdowns.
         """
-        payload = {
-            "table": "countdowns",
-            "filters": {"completed": {"$eq": False}},
-            "limit": 1000  # Reasonable upper bound
-        }
+        countdowns: List[Countdown] = []
+        offset = 0
         
         try:
-            response = await self.nats.request(
-                self.STORAGE_SELECT,
-                json.dumps(payload).encode(),
-                timeout=5.0
-            )
-            result = json.loads(response.data.decode())
-            rows = result.get("rows", [])
-            
-            return [Countdown.from_dict(row) for row in rows]
+            while True:
+                payload = {
+                    "table": "countdowns",
+                    "filters": {"completed": {"$eq": False}},
+                    "sort": {"field": "id", "order": "asc"},
+                    "limit": self.load_page_size,
+                    "offset": offset
+                }
+                response = await self.nats.request(
+                    self.STORAGE_SEARCH,
+                    json.dumps(payload).encode(),
+                    timeout=5.0
+                )
+                result = json.loads(response.data.decode())
+                if not result.get("success"):
+                    self.logger.error(
+                        f"Failed to load pending countdowns: {result.get('error', 'Unknown error')}"
+                    )
+                    return countdowns
+                rows = result.get("rows", [])
+                countdowns.extend(Countdown.from_dict(row) for row in rows)
+                
+                if len(rows) < self.load_page_size:
+                    break
+                offset += len(rows)
             
         except asyncio.TimeoutError:
             self.logger.error("NATS timeout loading pending countdowns")
-            return []
+            return countdowns
         except Exception as e:
             self.logger.error(f"Error loading pending countdowns: {e}")
-            return []
+            return countdowns
+        
+        self._countdowns.clear()
+        self._by_channel.clear()
+        for countdown in countdowns:
+            self._cache_put(countdown)
+        self._cache_loaded = True
+        return countdowns
     
     async def _storage_mark_completed(self, countdown_id: int) -> None:
         """
@@ -624,6 +685,104 @@ class CountdownPlugin:
                 f"NATS timeout updating last alert for countdown {countdown_id}"
             )
 
+    async def _catch_up_recurring(self, pending: List[Countdown]) -> None:
+        """
+        Move recurring countdowns missed during downtime to their next occurrence.
+        
+        Countdowns overdue by less than `catchup_grace` are left for the
+        scheduler to fire as usual. Occurrences of all overdue rules are
+        expanded in one batch.
+        
+        Args:
+            pending: Countdowns loaded at startup (updated in place).
+        """
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=self.catchup_grace)
+        overdue, rules = [], []
+        for countdown in pending:
+            if not countdown.is_recurring or countdown.is_paused:
+                continue
+            if countdown.target_time >= cutoff:
+                continue
+            try:
+                rules.append(RecurrenceRule.from_string(countdown.recurrence_rule))
+            except (ValueError, AttributeError):
+                continue
+            overdue.append(countdown)
+        
+        if not overdue:
+            return
+        
+        earliest = min(countdown.target_time for countdown in overdue)
+        missed = expand_rules(rules, after=earliest - timedelta(seconds=1), until=now)
+        upcoming = expand_rules(rules, after=now, count=1)
+        
+        for countdown, occurrences, (next_target,) in zip(overdue, missed, upcoming):
+            skipped = sum(1 for t in occurrences if t >= countdown.target_time)
+            await self._storage_update_target_time(countdown.id, next_target)
+            countdown.target_time = next_target
+            self.logger.info(
+                f"Caught up {countdown.channel}:{countdown.name}: skipped {skipped} "
+                f"missed occurrence(s), next {next_target}"
+            )
+    
+    # =========================================================================
+    # Countdown Cache
+    # =========================================================================
+    
+    def _cache_put(self, countdown: Countdown) -> None:
+        """Add or replace an active countdown in the cache."""
+        self._countdowns[f"{countdown.channel}:{countdown.name}"] = countdown
+        self._by_channel.setdefault(countdown.channel, {})[countdown.name] = countdown
+    
+    def _cache_remove(self, channel: str, name: str) -> None:
+        """Drop a countdown that was deleted or completed."""
+        self._countdowns.pop(f"{channel}:{name}", None)
+        names = self._by_channel.get(channel)
+        if names is not None:
+            names.pop(name, None)
+            if not names:
+                del self._by_channel[channel]
+    
+    async def _get_countdown(self, channel: str, name: str) -> Optional[Countdown]:
+        """
+        Get an active countdown, from the cache once loaded.
+        
+        Args:
+            channel: Channel to search in.
+            name: Countdown name.
+            
+        Returns:
+            Countdown if found, None otherwise.
+        """
+        if self._cache_loaded:
+            return self._countdowns.get(f"{channel}:{name}")
+        return await self._storage_get_by_name(channel, name)
+    
+    async def _get_channel_countdowns(self, channel: str) -> List[Countdown]:
+        """
+        Get a channel's active countdowns, soonest first.
+        
+        Args:
+            channel: Channel to get countdowns for.
+            
+        Returns:
+            Up to max_countdowns_per_channel countdowns.
+        """
+        if self._cache_loaded:
+            countdowns = sorted(
+                self._by_channel.get(channel, {}).values(),
+                key=lambda cd: cd.target_time
+            )
+            return countdowns[:self.max_countdowns_per_channel]
+        return await self._storage_get_for_channel(channel)
+    
+    async def _count_channel_countdowns(self, channel: str) -> int:
+        """Number of active countdowns in a channel."""
+        if self._cache_loaded:
+            return len(self._by_channel.get(channel, ()))
+        return await self._storage_count_for_channel(channel)
+    
     # =========================================================================
     # Command Handlers
     # =========================================================================
@@ -677,8 +836,11 @@ class CountdownPlugin:
                 })
                 return
             
-            # Check if name already exists
-            existing = await self._storage_get_by_name(channel, name)
+            # Check if name already exists (completed countdowns keep their
+            # name, so a cache miss still has to ask storage)
+            existing = await self._get_countdown(channel, name)
+            if not existing and self._cache_loaded:
+                existing = await self._storage_get_by_name(channel, name)
             if existing:
                 await self._send_reply(reply_to, {
                     "success": False,
@@ -688,7 +850,7 @@ class CountdownPlugin:
                 return
             
             # Check channel limit
-            count = await self._storage_count_for_channel(channel)
+            count = await self._count_channel_countdowns(channel)
             if count >= self.max_countdowns_per_channel:
                 await self._send_reply(reply_to, {
                     "success": False,
@@ -767,6 +929,7 @@ class CountdownPlugin:
         
         # Store in database
         countdown.id = await self._storage_insert(countdown)
+        self._cache_put(countdown)
         
         # Schedule in memory
         countdown_id = f"{channel}:{name}"
@@ -836,6 +999,7 @@ class CountdownPlugin:
         
         # Store in database
         countdown.id = await self._storage_insert(countdown)
+        self._cache_put(countdown)
         
         # Schedule in memory
         countdown_id = f"{channel}:{name}"
@@ -904,7 +1068,7 @@ class CountdownPlugin:
                 return
             
             # Look up countdown
-            countdown = await self._storage_get_by_name(channel, name)
+            countdown = await self._get_countdown(channel, name)
             
             if not countdown:
                 await self._send_reply(reply_to, {
@@ -962,7 +1126,7 @@ class CountdownPlugin:
             reply_to = data.get("reply_to")
             
             # Get all countdowns for channel
-            countdowns = await self._storage_get_for_channel(channel)
+            countdowns = await self._get_channel_countdowns(channel)
             
             if not countdowns:
                 await self._send_reply(reply_to, {
@@ -999,6 +1163,94 @@ class CountdownPlugin:
         except Exception as e:
             self.logger.exception(f"Error handling list: {e}")
     
+    async def _handle_upcoming(self, msg) -> None:
+        """
+        Handle !countdown upcoming [days] command.
+        
+        Lists one-time countdowns and every occurrence of active recurring
+        countdowns in the next `days` (default: upcoming_days), soonest first.
+        
+        Message format:
+        {
+            "channel": "string",
+            "user": "string",
+            "args": "7",
+            "reply_to": "rosey.reply.xyz"
+        }
+        """
+        try:
+            data = json.loads(msg.data.decode())
+            channel = data.get("channel", "unknown")
+            args = data.get("args", "").strip()
+            reply_to = data.get("reply_to")
+            
+            try:
+                days = int(args) if args else self.upcoming_days
+            except ValueError:
+                days = 0
+            if not 1 <= days <= self.max_duration_days:
+                await self._send_reply(reply_to, {
+                    "success": False,
+                    "error": "⏰ Usage: !countdown upcoming [days]"
+                })
+                return
+            
+            now = datetime.now(timezone.utc)
+            until = now + timedelta(days=days)
+            events = []
+            recurring, rules = [], []
+            
+            for cd in await self._get_channel_countdowns(channel):
+                if not cd.is_recurring:
+                    if now < cd.target_time <= until:
+                        events.append((cd.target_time, cd.name))
+                elif not cd.is_paused:
+                    try:
+                        rules.append(RecurrenceRule.from_string(cd.recurrence_rule))
+                    except (ValueError, AttributeError):
+                        continue
+                    recurring.append(cd)
+            
+            for cd, occurrences in zip(recurring, expand_rules(rules, after=now, until=until)):
+                events.extend((t, cd.name) for t in occurrences)
+            
+            events.sort()
+            events = events[:self.max_upcoming]
+            
+            if not events:
+                await self._send_reply(reply_to, {
+                    "success": True,
+                    "result": {
+                        "events": [],
+                        "message": f"⏰ Nothing coming up in the next {days} days"
+                    }
+                })
+                return
+            
+            event_list = []
+            lines = [f"⏰ Coming up in the next {days} days:"]
+            for target, name in events:
+                remaining = format_remaining(target - now, short=True)
+                event_list.append({
+                    "name": name,
+                    "target_time": target.isoformat(),
+                    "remaining": remaining
+                })
+                lines.append(f"  • {name} — {remaining}")
+            
+            await self._send_reply(reply_to, {
+                "success": True,
+                "result": {
+                    "events": event_list,
+                    "message": "\n".join(lines)
+                }
+            })
+            
+        except json.JSONDecodeError as e:
+            self.logger.error(f"Invalid JSON in upcoming request: {e}")
+        except Exception as e:
+            self.logger.exception(f"Error handling upcoming: {e}")
+    
     async def _handle_delete(self, msg) -> None:
         """
         Handle !countdown delete <name> command.
@@ -1026,7 +1278,7 @@ class CountdownPlugin:
                 return
             
             # Check if exists
-            countdown = await self._storage_get_by_name(channel, name)
+            countdown = await self._get_countdown(channel, name)
             if not countdown:
                 await self._send_reply(reply_to, {
                     "success": False,
@@ -1034,8 +1286,16 @@ class CountdownPlugin:
                 })
                 return
             
+            if not await self._can_manage(channel, user, countdown):
+                await self._send_reply(reply_to, {
+                    "success": False,
+                    "error": f"⏰ Only {countdown.created_by} or a moderator can delete '{name}'"
+                })
+                return
+            
             # Delete from storage
             await self._storage_delete(channel, name)
+            self._cache_remove(channel, name)
             
             # Remove from scheduler
             countdown_id = f"{channel}:{name}"
@@ -1067,6 +1327,27 @@ class CountdownPlugin:
         except Exception as e:
             self.logger.exception(f"Error handling delete: {e}")
     
+    async def _can_manage(self, channel: str, user: str, countdown: Countdown) -> bool:
+        """
+        Check whether a user may delete, pause or resume a countdown.
+        
+        The creator always may; others need at least `manage_rank`, looked
+        up in the replicated channel state rather than the bot or database.
+        
+        Args:
+            channel: Channel of the countdown.
+            user: User issuing the command.
+            countdown: The countdown.
+            
+        Returns:
+            True if allowed.
+        """
+        if self.manage_rank is None or user == countdown.created_by:
+            return True
+        if self.channel_state is None:
+            return False
+        return await self.channel_state.is_moderator(channel, user, self.manage_rank)
+    
     async def _handle_alerts(self, msg) -> None:
         """
         Handle !countdown alerts <name> <minutes> command.
@@ -1099,7 +1380,7 @@ class CountdownPlugin:
             minutes_str = parts[1]
             
             # Check if countdown exists
-            countdown = await self._storage_get_by_name(channel, name)
+            countdown = await self._get_countdown(channel, name)
             if not countdown:
                 await self._send_reply(reply_to, {
                     "success": False,
@@ -1126,10 +1407,12 @@ class CountdownPlugin:
             
             # Update storage
             await self._storage_update_alerts(countdown.id, config.to_string())
+            countdown.alert_minutes = config.to_string()
             
             # Configure alert manager
             countdown_id = f"{channel}:{name}"
             self.alert_manager.configure(countdown_id, config)
+            self.scheduler.wake(countdown_id)
             
             await self._send_reply(reply_to, {
                 "success": True,
@@ -1176,7 +1459,7 @@ class CountdownPlugin:
                 return
             
             # Check if countdown exists
-            countdown = await self._storage_get_by_name(channel, name)
+            countdown = await self._get_countdown(channel, name)
             if not countdown:
                 await self._send_reply(reply_to, {
                     "success": False,
@@ -1184,6 +1467,13 @@ class CountdownPlugin:
                 })
                 return
             
+            if not await self._can_manage(channel, user, countdown):
+                await self._send_reply(reply_to, {
+                    "success": False,
+                    "error": f"⏰ Only {countdown.created_by} or a moderator can pause '{name}'"
+                })
+                return
+            
             # Verify it's recurring
             if not countdown.is_recurring:
                 await self._send_reply(reply_to, {
@@ -1202,6 +1492,7 @@ class CountdownPlugin:
             
             # Update storage
             await self._storage_update_paused(countdown.id, True)
+            countdown.is_paused = True
             
             # Remove from scheduler (won't fire while paused)
             countdown_id = f"{channel}:{name}"
@@ -1259,7 +1550,7 @@ class CountdownPlugin:
                 return
             
             # Check if countdown exists
-            countdown = await self._storage_get_by_name(channel, name)
+            countdown = await self._get_countdown(channel, name)
             if not countdown:
                 await self._send_reply(reply_to, {
                     "success": False,
@@ -1267,6 +1558,13 @@ class CountdownPlugin:
                 })
                 return
             
+            if not await self._can_manage(channel, user, countdown):
+                await self._send_reply(reply_to, {
+                    "success": False,
+                    "error": f"⏰ Only {countdown.created_by} or a moderator can resume '{name}'"
+                })
+                return
+            
             # Verify it's recurring
             if not countdown.is_recurring:
                 await self._send_reply(reply_to, {
@@ -1290,6 +1588,8 @@ class CountdownPlugin:
             # Update storage
             await self._storage_update_paused(countdown.id, False)
             await self._storage_update_target_time(countdown.id, next_target)
+            countdown.is_paused = False
+            countdown.target_time = next_target
             
             # Add back to scheduler
             countdown_id = f"{channel}:{name}"
@@ -1342,7 +1642,7 @@ class CountdownPlugin:
         """
         try:
             channel, name = countdown_id.split(":", 1)
-            countdown = await self._storage_get_by_name(channel, name)
+            countdown = await self._get_countdown(channel, name)
             
             if not countdown or countdown.completed:
                 return
@@ -1365,6 +1665,8 @@ class CountdownPlugin:
             else:
                 # One-time: mark as completed
                 await self._storage_mark_completed(countdown.id)
+                countdown.completed = True
+                self._cache_remove(channel, name)
                 # Remove from alert manager
                 self.alert_manager.remove(countdown_id)
             
@@ -1387,6 +1689,7 @@ class CountdownPlugin:
             
             # Update target time in storage
             await self._storage_update_target_time(countdown.id, next_target)
+            countdown.target_time = next_target
             
             # Reschedule
             countdown_id = f"{countdown.channel}:{countdown.name}"
@@ -1465,12 +1768,28 @@ class CountdownPlugin:
         if alerts:
             # Get countdown info for announcement
             channel, name = countdown_id.split(":", 1)
-            countdown = await self._storage_get_by_name(channel, name)
+            countdown = await self._get_countdown(channel, name)
             
             if countdown:
                 for minutes in alerts:
                     await self._fire_alert(countdown, minutes)
     
+    def _next_alert_check(
+        self, countdown_id: str, remaining: timedelta
+    ) -> Optional[timedelta]:
+        """
+        Tell the scheduler when the next alert threshold is reached.
+        
+        Args:
+            countdown_id: The "channel:name" identifier.
+            remaining: Time remaining until T-0.
+            
+        Returns:
+            Time before T-0 of the next unsent alert, or None.
+        """
+        minutes = self.alert_manager.get_next_alert(countdown_id, remaining)
+        return None if minutes is None else timedelta(minutes=minutes)
+    
     async def _on_alert(self, countdown_id: str, minutes: int) -> None:
         """
         Called by alert manager when an alert fires.
@@ -1483,7 +1802,7 @@ class CountdownPlugin:
             minutes: Minutes value of the alert.
         """
         channel, name = countdown_id.split(":", 1)
-        countdown = await self._storage_get_by_name(channel, name)
+        countdown = await self._get_countdown(channel, name)
         
         if countdown:
             await self._fire_alert(countdown, minutes)
@@ -1524,6 +1843,7 @@ class CountdownPlugin:
             
             # Update last alert sent in storage
             await self._storage_update_last_alert(countdown.id, minutes)
+            countdown.last_alert_sent = minutes
             
             self.logger.info(
                 f"Alert fired: {countdown.channel}:{countdown.name} T-{minutes}"
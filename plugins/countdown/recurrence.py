@@ -7,13 +7,16 @@ This module provides support for recurring countdowns like:
 - "every 1st 12:00" - Monthly on the 1st at 12:00 UTC
 
 All times are UTC. Pattern parsing is case-insensitive.
+
+expand_rules() lists the occurrences of many rules at once (for upcoming
+events and catching up after downtime).
 """
 
 from dataclasses import dataclass
 from datetime import datetime, time, timedelta
 from datetime import timezone
 from enum import Enum
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import re
 import calendar
 
@@ -178,6 +181,25 @@ class RecurrenceRule:
         
         return candidate
     
+    def occurrences(
+        self,
+        after: Optional[datetime] = None,
+        count: Optional[int] = None,
+        until: Optional[datetime] = None
+    ) -> Tuple[datetime, ...]:
+        """
+        List occurrences after a given time.
+        
+        Args:
+            after: Reference time (default: now UTC), exclusive.
+            count: Maximum number of occurrences.
+            until: End of the window, inclusive.
+            
+        Returns:
+            Occurrences in order (UTC). See expand_rules().
+        """
+        return expand_rules([self], after, count, until)[0]
+    
     def to_string(self) -> str:
         """
         Serialize to string for storage.
@@ -336,6 +358,131 @@ class RecurrenceRule:
             return f"Unknown pattern at {time_str}"
 
 
+def expand_rules(
+    rules: Iterable[RecurrenceRule],
+    after: Optional[datetime] = None,
+    count: Optional[int] = None,
+    until: Optional[datetime] = None
+) -> List[Tuple[datetime, ...]]:
+    """
+    List the occurrences of many rules at once.
+    
+    Each occurrence is computed by arithmetic on precomputed calendars
+    instead of calling next_occurrence() in a loop. Daily and weekly rules
+    add a shared table of day offsets to their first occurrence; monthly
+    rules read a shared table of month lengths. Identical rules are
+    expanded once and share the result.
+    
+    Args:
+        rules: Rules to expand.
+        after: Reference time (default: now UTC), exclusive. If naive,
+            assumed UTC.
+        count: Maximum number of occurrences per rule.
+        until: End of the window, inclusive. If naive, assumed UTC.
+        
+    Returns:
+        One tuple of occurrences (UTC, in order) per rule, in input order.
+        
+    Raises:
+        ValueError: If neither count nor until is given.
+    """
+    if count is None and until is None:
+        raise ValueError("expand_rules needs count or until")
+    after = _as_utc(after) if after is not None else datetime.now(timezone.utc)
+    if until is not None:
+        until = _as_utc(until)
+    
+    expanded: Dict[tuple, Tuple[datetime, ...]] = {}
+    offsets: Dict[Tuple[int, int], List[timedelta]] = {}
+    months = _MonthTable(after.year, after.month)
+    results = []
+    
+    for rule in rules:
+        key = (rule.type, rule.time_of_day, rule.day_of_week, rule.day_of_month)
+        occurrences = expanded.get(key)
+        if occurrences is None:
+            if rule.type == RecurrenceType.MONTHLY:
+                occurrences = months.expand(rule, after, count, until)
+            else:
+                occurrences = _expand_fixed(rule, after, count, until, offsets)
+            expanded[key] = occurrences
+        results.append(occurrences)
+    
+    return results
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _expand_fixed(
+    rule: RecurrenceRule,
+    after: datetime,
+    count: Optional[int],
+    until: Optional[datetime],
+    offsets: Dict[Tuple[int, int], List[timedelta]]
+) -> Tuple[datetime, ...]:
+    """Expand a daily or weekly rule: first occurrence plus n steps."""
+    first = rule.next_occurrence(after)
+    step = 1 if rule.type == RecurrenceType.DAILY else 7
+    
+    n = count if count is not None else None
+    if until is not None:
+        if first > until:
+            return ()
+        in_window = (until - first).days // step + 1
+        n = in_window if n is None else min(n, in_window)
+    
+    table = offsets.get((step, n))
+    if table is None:
+        table = offsets[(step, n)] = [timedelta(days=step * i) for i in range(n)]
+    return tuple([first + offset for offset in table])
+
+
+class _MonthTable:
+    """(year, month, days in month) from a starting month, grown on demand."""
+    
+    def __init__(self, year: int, month: int):
+        self.months: List[Tuple[int, int, int]] = []
+        self._year = year
+        self._month = month
+    
+    def __getitem__(self, index: int) -> Tuple[int, int, int]:
+        while index >= len(self.months):
+            year, month = self._year, self._month
+            self.months.append((year, month, calendar.monthrange(year, month)[1]))
+            self._year, self._month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return self.months[index]
+    
+    def expand(
+        self,
+        rule: RecurrenceRule,
+        after: datetime,
+        count: Optional[int],
+        until: Optional[datetime]
+    ) -> Tuple[datetime, ...]:
+        """Expand a monthly rule, clamping the day to each month's length."""
+        if rule.day_of_month is None:
+            raise ValueError("Monthly recurrence requires day_of_month")
+        hour, minute = rule.time_of_day.hour, rule.time_of_day.minute
+        occurrences = []
+        index = 0
+        while count is None or len(occurrences) < count:
+            year, month, days = self[index]
+            index += 1
+            candidate = datetime(
+                year, month, min(rule.day_of_month, days), hour, minute,
+                tzinfo=timezone.utc
+            )
+            if candidate <= after:
+                continue
+            if until is not None and candidate > until:
+                break
+            occurrences.append(candidate)
+        return tuple(occurrences)
+
+
 def _validate_time(hour: int, minute: int) -> None:
     """Validate hour and minute values."""
     if not (0 <= hour <= 23):
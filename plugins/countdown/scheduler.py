@@ -3,13 +3,17 @@ plugins/countdown/scheduler.py
 
 Asyncio-based countdown scheduler.
 
-Uses a single polling loop to check all active countdowns rather than
-creating individual tasks per countdown. This is more efficient and
-easier to manage.
+Uses a single loop over a min-heap of due times rather than creating
+individual tasks per countdown. The loop sleeps until the next due
+countdown, so CPU use scales with events rather than with the number
+of countdowns being tracked.
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Callable, Dict, List, Optional, Awaitable
 
@@ -18,46 +22,67 @@ class CountdownScheduler:
     """
     Manages countdown timers using asyncio.
     
-    Uses a single task that checks countdowns at regular intervals
-    rather than creating one task per countdown. This approach is:
-    - More memory efficient
-    - Easier to stop cleanly
-    - Simpler to debug
+    Each countdown has one heap entry at its next interesting instant:
+    T-0, or the next time ``on_check`` should see it (an alert threshold).
+    A single task sleeps until the earliest entry is due. This approach is:
+    - O(log n) to schedule or reschedule, O(1) to cancel
+    - Idle between due times, however many countdowns are tracked
+    - Easy to stop cleanly
     
     Args:
-        check_interval: Seconds between checks (default: 30).
+        check_interval: Longest sleep in seconds (default: 30). Bounds the
+            effect of wall-clock jumps, and is the re-check interval for
+            ``on_check`` when ``next_check`` is not given.
         on_complete: Async callback when countdown completes.
-        on_check: Async callback for each countdown during checks (for alerts).
+        on_check: Async callback for a pending countdown when it is due
+            for a check (for alerts).
+        next_check: Callback returning, for a countdown and its remaining
+            time, how long before T-0 ``on_check`` is next needed (None if
+            only T-0 matters).
     """
     
+    # Rebuild the heap once cancelled entries outnumber live ones
+    COMPACT_MIN = 1024
+    
     def __init__(
         self,
         check_interval: float = 30.0,
         on_complete: Optional[Callable[[str], Awaitable[None]]] = None,
-        on_check: Optional[Callable[[str, timedelta], Awaitable[None]]] = None
+        on_check: Optional[Callable[[str, timedelta], Awaitable[None]]] = None,
+        next_check: Optional[Callable[[str, timedelta], Optional[timedelta]]] = None
     ):
         """
         Initialize the scheduler.
         
         Args:
-            check_interval: Seconds between scheduler checks.
+            check_interval: Longest time the loop sleeps, in seconds.
             on_complete: Async callback called with countdown_id when complete.
-            on_check: Async callback called with (countdown_id, remaining) each check.
+            on_check: Async callback called with (countdown_id, remaining)
+                when the countdown is scheduled and at each requested check.
+            next_check: Called with (countdown_id, remaining) after each
+                check; returns the remaining time at which to check again.
         """
         self.check_interval = check_interval
         self.on_complete = on_complete
         self.on_check = on_check
+        self.next_check = next_check
         self.running = False
         self._task: Optional[asyncio.Task] = None
         self._pending: Dict[str, datetime] = {}  # countdown_id -> target_time
+        self._targets: Dict[str, float] = {}  # countdown_id -> target timestamp
+        self._heap: List[list] = []  # [due timestamp, seq, countdown_id or None]
+        self._entries: Dict[str, list] = {}  # countdown_id -> live heap entry
+        self._stale = 0
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
         self.logger = logging.getLogger(f"{__name__}.scheduler")
     
     async def start(self) -> None:
         """
         Start the scheduler loop.
         
-        Creates a background task that periodically checks for
-        completed countdowns.
+        Creates a background task that fires countdowns as they
+        become due.
         """
         if self.running:
             self.logger.warning("Scheduler already running")
@@ -66,7 +91,7 @@ class CountdownScheduler:
         self.running = True
         self._task = asyncio.create_task(self._check_loop())
         self.logger.info(
-            f"Scheduler started (interval: {self.check_interval}s, "
+            f"Scheduler started (max sleep: {self.check_interval}s, "
             f"tracking: {len(self._pending)} countdowns)"
         )
     
@@ -94,15 +119,40 @@ class CountdownScheduler:
     
     def schedule(self, countdown_id: str, target_time: datetime) -> None:
         """
-        Add a countdown to track.
+        Add a countdown to track, or move an existing one.
+        
+        The countdown is checked (``on_check``) as soon as the loop runs,
+        then at the times ``next_check`` asks for.
         
         Args:
             countdown_id: Unique identifier (usually "channel:name").
             target_time: When the countdown should fire.
         """
+        # Handle both aware and naive datetimes
+        if target_time.tzinfo is None:
+            target = target_time.replace(tzinfo=timezone.utc).timestamp()
+        else:
+            target = target_time.timestamp()
         self._pending[countdown_id] = target_time
+        self._targets[countdown_id] = target
+        self._push(countdown_id, time.time() if self.on_check else target)
         self.logger.debug(f"Scheduled countdown: {countdown_id} at {target_time}")
     
+    def wake(self, countdown_id: str) -> bool:
+        """
+        Check a countdown on the next loop iteration.
+        
+        Call after changing what ``next_check`` returns for it (e.g. new
+        alert thresholds).
+        
+        Returns:
+            True if the countdown is scheduled, False otherwise.
+        """
+        if countdown_id not in self._targets:
+            return False
+        self._push(countdown_id, time.time())
+        return True
+    
     def cancel(self, countdown_id: str) -> bool:
         """
         Remove a countdown from tracking.
@@ -115,6 +165,8 @@ class CountdownScheduler:
         """
         if countdown_id in self._pending:
             del self._pending[countdown_id]
+            del self._targets[countdown_id]
+            self._discard(countdown_id)
             self.logger.debug(f"Cancelled countdown: {countdown_id}")
             return True
         return False
@@ -132,58 +184,63 @@ class CountdownScheduler:
         """Get list of all pending countdown IDs."""
         return list(self._pending.keys())
     
+    def next_due(self) -> Optional[float]:
+        """Timestamp of the earliest heap entry, or None if idle."""
+        heap = self._heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+            self._stale -= 1
+        return heap[0][0] if heap else None
+    
+    def _push(self, countdown_id: str, due: float) -> None:
+        """Replace the countdown's heap entry with one at ``due``."""
+        self._discard(countdown_id)
+        entry = [due, next(self._seq), countdown_id]
+        self._entries[countdown_id] = entry
+        if not self._heap or due < self._heap[0][0]:
+            self._wakeup.set()
+        heapq.heappush(self._heap, entry)
+    
+    def _discard(self, countdown_id: str) -> None:
+        """Invalidate the countdown's heap entry in place."""
+        entry = self._entries.pop(countdown_id, None)
+        if entry is None:
+            return
+        entry[2] = None
+        self._stale += 1
+        if self._stale > self.COMPACT_MIN and self._stale * 2 > len(self._heap):
+            self._heap = [e for e in self._heap if e[2] is not None]
+            heapq.heapify(self._heap)
+            self._stale = 0
+    
     async def _check_loop(self) -> None:
         """
-        Main loop that checks for completed countdowns.
+        Main loop that fires due countdowns.
         
-        Runs until stopped, checking all pending countdowns each interval.
-        When a countdown completes, calls the on_complete callback.
-        For pending countdowns, calls on_check for alert processing.
+        Sleeps until the earliest heap entry is due (or a sooner one is
+        scheduled), then pops every due entry. A countdown past T-0 is
+        removed and passed to on_complete; any other due countdown is
+        passed to on_check and pushed back at its next check time.
         """
         self.logger.debug("Check loop started")
         
         while self.running:
             try:
-                now = datetime.now(timezone.utc)
-                
-                # Find completed countdowns
-                completed = self._get_completed()
+                due = self.next_due()
+                delay = self.check_interval
+                if due is not None:
+                    delay = min(delay, max(due - time.time(), 0))
+                if delay > 0:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
                 
-                # Process non-completed countdowns for alerts
-                if self.on_check:
-                    for countdown_id, target_time in self._pending.items():
-                        if countdown_id in completed:
-                            continue  # Skip completed ones
-                        
-                        # Handle both aware and naive datetimes
-                        if target_time.tzinfo is None:
-                            target_time = target_time.replace(tzinfo=timezone.utc)
-                        
-                        remaining = target_time - now
-                        if remaining.total_seconds() > 0:
-                            try:
-                                await self.on_check(countdown_id, remaining)
-                            except Exception as e:
-                                self.logger.error(
-                                    f"Error in check callback for {countdown_id}: {e}"
-                                )
-                
-                # Process each completed countdown
-                for countdown_id in completed:
-                    # Remove from pending
-                    del self._pending[countdown_id]
-                    
-                    # Call completion callback
-                    if self.on_complete:
-                        try:
-                            await self.on_complete(countdown_id)
-                        except Exception as e:
-                            self.logger.exception(
-                                f"Error in completion callback for {countdown_id}: {e}"
-                            )
-                
-                # Wait for next check
-                await asyncio.sleep(self.check_interval)
+                await self._fire_due(time.time())
+                # Let other tasks run between batches of due countdowns
+                await asyncio.sleep(0)
                 
             except asyncio.CancelledError:
                 self.logger.debug("Check loop cancelled")
@@ -195,22 +252,61 @@ class CountdownScheduler:
         
         self.logger.debug("Check loop ended")
     
-    def _get_completed(self) -> List[str]:
-        """
-        Get list of countdown IDs that have completed.
-        
-        Returns:
-            List of countdown_ids whose target_time has passed.
-        """
-        now = datetime.now(timezone.utc)
-        completed = []
-        
-        for countdown_id, target_time in self._pending.items():
-            # Handle both aware and naive datetimes
-            if target_time.tzinfo is None:
-                target_time = target_time.replace(tzinfo=timezone.utc)
+    async def _fire_due(self, now: float) -> None:
+        """Process every heap entry due at ``now``."""
+        # Callbacks can cancel enough countdowns to compact the heap into a
+        # new list, so don't hold on to self._heap across them
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            countdown_id = entry[2]
+            if countdown_id is None:
+                self._stale -= 1
+                continue
+            del self._entries[countdown_id]
+            target = self._targets[countdown_id]
             
-            if now >= target_time:
-                completed.append(countdown_id)
-        
-        return completed
+            if now >= target:
+                del self._pending[countdown_id]
+                del self._targets[countdown_id]
+                
+                # Call completion callback
+                if self.on_complete:
+                    try:
+                        await self.on_complete(countdown_id)
+                    except Exception as e:
+                        self.logger.exception(
+                            f"Error in completion callback for {countdown_id}: {e}"
+                        )
+                continue
+            
+            remaining = timedelta(seconds=target - now)
+            if self.on_check:
+                try:
+                    await self.on_check(countdown_id, remaining)
+                except Exception as e:
+                    self.logger.error(
+                        f"Error in check callback for {countdown_id}: {e}"
+                    )
+            
+            # Callbacks may have cancelled or moved this countdown
+            if countdown_id in self._entries or countdown_id not in self._targets:
+                continue
+            self._push(countdown_id, self._next_due(countdown_id, target, now, remaining))
+    
+    def _next_due(
+        self, countdown_id: str, target: float, now: float, remaining: timedelta
+    ) -> float:
+        """Next instant a pending countdown needs attention."""
+        if not self.on_check:
+            return target
+        if self.next_check is None:
+            return min(target, now + self.check_interval)
+        try:
+            before = self.next_check(countdown_id, remaining)
+        except Exception as e:
+            self.logger.error(f"Error in next_check for {countdown_id}: {e}")
+            return min(target, now + self.check_interval)
+        if before is None:
+            return target
+        due = target - before.total_seconds()
+        return due if due > now else target
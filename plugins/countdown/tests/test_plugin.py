@@ -14,6 +14,8 @@ Tests cover:
 
 import json
 import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
 
 import sys
 from pathlib import Path
@@ -22,6 +24,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from plugin import CountdownPlugin
+from recurrence import RecurrenceRule
 
 
 # =============================================================================
@@ -79,8 +82,8 @@ class TestPluginLifecycle:
         plugin = CountdownPlugin(mock_nats)
         await plugin.initialize()
         
-        # Should have subscribed to 7 command subjects
-        assert len(mock_nats._subscriptions) == 7
+        # Should have subscribed to 8 command subjects
+        assert len(mock_nats._subscriptions) == 8
         
         subjects = [s.subject for s in mock_nats._subscriptions]
         assert "rosey.command.countdown.create" in subjects
@@ -90,6 +93,7 @@ class TestPluginLifecycle:
         assert "rosey.command.countdown.alerts" in subjects
         assert "rosey.command.countdown.pause" in subjects
         assert "rosey.command.countdown.resume" in subjects
+        assert "rosey.command.countdown.upcoming" in subjects
         
         await plugin.shutdown()
     
@@ -397,6 +401,292 @@ class TestHandleDelete:
         await plugin.shutdown()
 
 
+class TestManagePermissions:
+    """Tests for manage_rank checks on delete/pause/resume."""
+    
+    @pytest.fixture
+    def plugin(self, mock_nats, sample_countdown_data):
+        from unittest.mock import AsyncMock, MagicMock
+        from countdown import Countdown
+        
+        plugin = CountdownPlugin(mock_nats, {"manage_rank": 2})
+        plugin.scheduler = MagicMock()
+        plugin.alert_manager = MagicMock()
+        plugin._storage_get_by_name = AsyncMock(
+            return_value=Countdown.from_dict(sample_countdown_data)
+        )
+        plugin._storage_delete = AsyncMock(return_value=True)
+        plugin.channel_state = MagicMock()
+        plugin.channel_state.is_moderator = AsyncMock(side_effect=lambda c, u, r: u == "mod")
+        return plugin
+    
+    async def _delete(self, plugin, mock_nats, mock_message, user):
+        await plugin._handle_delete(mock_message({
+            "channel": "lobby",
+            "user": user,
+            "args": "movie_night",
+            "reply_to": "rosey.reply.123"
+        }))
+        replies = [
+            json.loads(call[0][1].decode()) for call in mock_nats.publish.call_args_list
+            if call[0][0] == "rosey.reply.123"
+        ]
+        return replies[-1]
+    
+    @pytest.mark.asyncio
+    async def test_creator_may_delete(self, plugin, mock_nats, mock_message):
+        data = await self._delete(plugin, mock_nats, mock_message, "testuser")
+        
+        assert data["success"] is True
+        plugin.channel_state.is_moderator.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_moderator_may_delete(self, plugin, mock_nats, mock_message):
+        data = await self._delete(plugin, mock_nats, mock_message, "mod")
+        
+        assert data["success"] is True
+        plugin.channel_state.is_moderator.assert_called_once_with("lobby", "mod", 2)
+    
+    @pytest.mark.asyncio
+    async def test_other_user_may_not_delete(self, plugin, mock_nats, mock_message):
+        data = await self._delete(plugin, mock_nats, mock_message, "someone")
+        
+        assert data["success"] is False
+        assert "moderator" in data["error"]
+        plugin._storage_delete.assert_not_called()
+
+
+# =============================================================================
+# Countdown Cache Tests
+# =============================================================================
+
+class TestCountdownCache:
+    """Tests for the write-through countdown cache."""
+    
+    @pytest.fixture
+    def stored(self, sample_countdown_data):
+        """Five active countdowns across two channels."""
+        rows = []
+        for i in range(5):
+            row = dict(sample_countdown_data)
+            row.update(
+                id=i + 1,
+                name=f"cd{i}",
+                channel="lobby" if i < 3 else "other",
+                target_time=f"2099-01-0{5 - i}T00:00:00+00:00",
+            )
+            rows.append(row)
+        return rows
+    
+    @pytest.fixture
+    def plugin(self, mock_nats, stored):
+        """Plugin whose storage pages `stored` and records requests."""
+        plugin = CountdownPlugin(mock_nats, {"load_page_size": 2, "emit_events": False})
+        mock_nats.requests = []
+        default_request = mock_nats.request
+        
+        async def request(subject, data, timeout=2.0):
+            payload = json.loads(data.decode())
+            mock_nats.requests.append((subject, payload))
+            if subject == plugin.STORAGE_SEARCH:
+                response = MagicMock()
+                page = stored[payload["offset"]:payload["offset"] + payload["limit"]]
+                response.data = json.dumps({"success": True, "rows": page}).encode()
+                return response
+            return await default_request(subject, data, timeout)
+        
+        mock_nats.request = request
+        return plugin
+    
+    def _reply(self, mock_nats):
+        return json.loads(mock_nats.publish.call_args[0][1].decode())
+    
+    @pytest.mark.asyncio
+    async def test_load_pages_through_storage(self, plugin, mock_nats):
+        """Pending countdowns are loaded page by page into the cache."""
+        await plugin.initialize()
+        
+        pages = [
+            payload for subject, payload in mock_nats.requests
+            if subject == plugin.STORAGE_SEARCH
+        ]
+        assert [page["offset"] for page in pages] == [0, 2, 4]
+        assert pages[0]["sort"] == {"field": "id", "order": "asc"}
+        assert plugin._cache_loaded is True
+        assert set(plugin._by_channel) == {"lobby", "other"}
+        assert plugin.scheduler.pending_count == 5
+        
+        await plugin.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_check_and_list_served_from_cache(self, plugin, mock_nats, mock_message):
+        """check/list don't go to storage once the cache is loaded."""
+        await plugin.initialize()
+        mock_nats.requests.clear()
+        
+        await plugin._handle_check(mock_message({
+            "channel": "lobby", "args": "cd1", "reply_to": "rosey.reply.1"
+        }))
+        assert self._reply(mock_nats)["result"]["name"] == "cd1"
+        
+        await plugin._handle_list(mock_message({
+            "channel": "lobby", "args": "", "reply_to": "rosey.reply.2"
+        }))
+        names = [cd["name"] for cd in self._reply(mock_nats)["result"]["countdowns"]]
+        assert names == ["cd2", "cd1", "cd0"]  # soonest first
+        
+        assert mock_nats.requests == []
+        
+        await plugin.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_failed_load_keeps_storage_lookups(self, plugin, mock_nats, mock_message):
+        """A storage error while loading leaves lookups going to storage."""
+        search_request = mock_nats.request
+        
+        async def request(subject, data, timeout=2.0):
+            if subject == plugin.STORAGE_SEARCH:
+                mock_nats.requests.append((subject, json.loads(data.decode())))
+                response = MagicMock()
+                response.data = json.dumps({"success": False}).encode()
+                return response
+            return await search_request(subject, data, timeout)
+        
+        mock_nats.request = request
+        await plugin.initialize()
+        assert plugin._cache_loaded is False
+        mock_nats.requests.clear()
+        
+        await plugin._handle_check(mock_message({
+            "channel": "lobby", "args": "cd1", "reply_to": "rosey.reply.1"
+        }))
+        assert mock_nats.requests
+        
+        await plugin.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_write_paths_update_cache(self, plugin, mock_nats, mock_message):
+        """create, alerts and delete keep the cache consistent."""
+        await plugin.initialize()
+        
+        target = datetime.now(timezone.utc) + timedelta(days=30)
+        await plugin._handle_create(mock_message({
+            "channel": "other",
+            "user": "testuser",
+            "args": f"fresh {target:%Y-%m-%d %H:%M}",
+            "reply_to": "rosey.reply.1"
+        }))
+        assert "other:fresh" in plugin._countdowns
+        assert await plugin._count_channel_countdowns("other") == 3
+        
+        await plugin._handle_alerts(mock_message({
+            "channel": "lobby", "user": "testuser", "args": "cd0 10,2",
+            "reply_to": "rosey.reply.2"
+        }))
+        assert plugin._countdowns["lobby:cd0"].alert_minutes == "10,2"
+        
+        await plugin._handle_delete(mock_message({
+            "channel": "lobby", "user": "testuser", "args": "cd0",
+            "reply_to": "rosey.reply.3"
+        }))
+        assert self._reply(mock_nats)["success"] is True
+        assert "lobby:cd0" not in plugin._countdowns
+        assert "cd0" not in plugin._by_channel["lobby"]
+        
+        await plugin.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_completion_removes_from_cache(self, plugin, mock_nats):
+        """A completed one-time countdown leaves the cache."""
+        await plugin.initialize()
+        
+        await plugin._on_countdown_complete("other:cd4")
+        
+        assert "other:cd4" not in plugin._countdowns
+        assert await plugin._get_countdown("other", "cd4") is None
+        
+        await plugin.shutdown()
+
+
+# =============================================================================
+# Upcoming / Catch-up Tests
+# =============================================================================
+
+class TestUpcomingAndCatchUp:
+    """Tests for !countdown upcoming and startup catch-up."""
+    
+    @pytest.fixture
+    def plugin(self, mock_nats):
+        from countdown import Countdown
+        
+        plugin = CountdownPlugin(mock_nats, {"emit_events": False})
+        plugin._cache_loaded = True
+        now = datetime.now(timezone.utc)
+        plugin._cache_put(Countdown(
+            name="launch", channel="lobby", created_by="a", id=1,
+            target_time=now + timedelta(days=1, hours=1),
+        ))
+        plugin._cache_put(Countdown(
+            name="later", channel="lobby", created_by="a", id=2,
+            target_time=now + timedelta(days=30),
+        ))
+        rule = RecurrenceRule.parse("day 09:00")
+        plugin._cache_put(Countdown(
+            name="standup", channel="lobby", created_by="a", id=3,
+            target_time=rule.next_occurrence(now), is_recurring=True,
+            recurrence_rule=rule.to_string(),
+        ))
+        return plugin
+    
+    @pytest.mark.asyncio
+    async def test_upcoming_expands_recurring(self, plugin, mock_nats, mock_message):
+        await plugin._handle_upcoming(mock_message({
+            "channel": "lobby", "args": "3", "reply_to": "rosey.reply.1"
+        }))
+        
+        result = json.loads(mock_nats.publish.call_args[0][1].decode())["result"]
+        names = [event["name"] for event in result["events"]]
+        assert names.count("standup") == 3
+        assert names.count("launch") == 1
+        assert "later" not in names
+        times = [event["target_time"] for event in result["events"]]
+        assert times == sorted(times)
+    
+    @pytest.mark.asyncio
+    async def test_upcoming_invalid_days(self, plugin, mock_nats, mock_message):
+        await plugin._handle_upcoming(mock_message({
+            "channel": "lobby", "args": "soon", "reply_to": "rosey.reply.1"
+        }))
+        
+        data = json.loads(mock_nats.publish.call_args[0][1].decode())
+        assert data["success"] is False
+        assert "Usage" in data["error"]
+    
+    @pytest.mark.asyncio
+    async def test_catch_up_skips_missed_occurrences(self, plugin):
+        from countdown import Countdown
+        
+        now = datetime.now(timezone.utc)
+        rule = RecurrenceRule.parse("day 09:00")
+        stale = Countdown(
+            name="stale", channel="lobby", created_by="a", id=4,
+            target_time=rule.next_occurrence(now - timedelta(days=3)),
+            is_recurring=True, recurrence_rule=rule.to_string(),
+        )
+        recent = Countdown(
+            name="recent", channel="lobby", created_by="a", id=5,
+            target_time=now - timedelta(seconds=10),
+            is_recurring=True, recurrence_rule=rule.to_string(),
+        )
+        plugin._storage_update_target_time = AsyncMock()
+        
+        await plugin._catch_up_recurring([stale, recent])
+        
+        assert stale.target_time == rule.next_occurrence(now)
+        assert recent.target_time == now - timedelta(seconds=10)  # within grace
+        plugin._storage_update_target_time.assert_awaited_once_with(4, stale.target_time)
+
+
 # =============================================================================
 # Name Validation Tests
 # =============================================================================
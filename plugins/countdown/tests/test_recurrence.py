@@ -2,11 +2,13 @@
 Tests for countdown recurrence patterns.
 """
 
+import random
+
 import pytest
-from datetime import datetime, time, timezone
+from datetime import datetime, time, timedelta, timezone
 
 from countdown.recurrence import (
-    RecurrenceRule, RecurrenceType, DAYS, _ordinal_suffix
+    RecurrenceRule, RecurrenceType, DAYS, _ordinal_suffix, expand_rules
 )
 
 
@@ -283,6 +285,85 @@ class TestRecurrenceRuleNextOccurrence:
         assert result.tzinfo == timezone.utc
 
 
+class TestExpandRules:
+    """Tests for batch occurrence expansion."""
+    
+    START = datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc)
+    
+    @staticmethod
+    def iterate(rule, after, count=None, until=None):
+        """Reference: next_occurrence() in a loop."""
+        occurrences = []
+        current = rule.next_occurrence(after)
+        while (count is None or len(occurrences) < count) and (
+            until is None or current <= until
+        ):
+            occurrences.append(current)
+            current = rule.next_occurrence(current)
+        return tuple(occurrences)
+    
+    @pytest.fixture
+    def rules(self):
+        rng = random.Random(7)
+        rules = []
+        for _ in range(300):
+            tod = time(hour=rng.randrange(24), minute=rng.randrange(60))
+            kind = rng.choice(list(RecurrenceType))
+            rules.append(RecurrenceRule(
+                type=kind,
+                time_of_day=tod,
+                day_of_week=rng.randrange(7) if kind == RecurrenceType.WEEKLY else None,
+                day_of_month=rng.randint(1, 31) if kind == RecurrenceType.MONTHLY else None,
+            ))
+        return rules
+    
+    def test_window_matches_next_occurrence(self, rules):
+        """Occurrences in a window match repeated next_occurrence()."""
+        until = self.START + timedelta(days=400)
+        
+        expanded = expand_rules(rules, after=self.START, until=until)
+        
+        assert expanded == [self.iterate(r, self.START, until=until) for r in rules]
+    
+    def test_count_matches_next_occurrence(self, rules):
+        """The first N occurrences match repeated next_occurrence()."""
+        expanded = expand_rules(rules, after=self.START, count=14)
+        
+        assert expanded == [self.iterate(r, self.START, count=14) for r in rules]
+    
+    def test_count_and_until_both_limit(self):
+        """count and until together stop at whichever comes first."""
+        rule = RecurrenceRule.parse("day 09:00")
+        
+        assert len(rule.occurrences(self.START, count=3, until=self.START + timedelta(days=10))) == 3
+        assert len(rule.occurrences(self.START, count=30, until=self.START + timedelta(days=2))) == 2
+    
+    def test_monthly_clamps_to_month_length(self):
+        """A 31st rule falls on the last day of shorter months."""
+        rule = RecurrenceRule.parse("31st 12:00")
+        
+        days = [t.day for t in rule.occurrences(self.START, count=4)]
+        
+        assert days == [31, 28, 31, 30]
+    
+    def test_empty_window(self):
+        rule = RecurrenceRule.parse("friday 19:00")
+        
+        assert rule.occurrences(self.START, until=self.START + timedelta(hours=1)) == ()
+    
+    def test_naive_datetimes_are_utc(self):
+        rule = RecurrenceRule.parse("day 09:00")
+        
+        occurrences = rule.occurrences(datetime(2025, 1, 1), until=datetime(2025, 1, 3))
+        
+        assert occurrences[0] == datetime(2025, 1, 1, 9, 0, tzinfo=timezone.utc)
+        assert len(occurrences) == 2
+    
+    def test_requires_count_or_until(self):
+        with pytest.raises(ValueError):
+            expand_rules([RecurrenceRule.parse("day 09:00")], after=self.START)
+
+
 class TestRecurrenceRuleSerialization:
     """Tests for to_string() and from_string()."""
     
@@ -153,9 +153,11 @@ class TestScheduleCancel:
 class TestCompletionDetection:
     """Tests for countdown completion detection."""
     
-    def test_get_completed_finds_expired(self):
-        """_get_completed finds expired countdowns."""
-        scheduler = CountdownScheduler()
+    @pytest.mark.asyncio
+    async def test_fire_due_completes_expired(self):
+        """_fire_due completes expired countdowns only."""
+        callback = AsyncMock()
+        scheduler = CountdownScheduler(on_complete=callback)
         
         # Add one expired, one future
         past = datetime.now(timezone.utc) - timedelta(minutes=1)
@@ -164,21 +166,24 @@ class TestCompletionDetection:
         scheduler.schedule("expired", past)
         scheduler.schedule("future", future)
         
-        completed = scheduler._get_completed()
+        await scheduler._fire_due(datetime.now(timezone.utc).timestamp())
         
-        assert "expired" in completed
-        assert "future" not in completed
+        callback.assert_called_once_with("expired")
+        assert scheduler.get_pending_ids() == ["future"]
+        assert scheduler.next_due() == future.timestamp()
     
-    def test_get_completed_handles_naive_datetime(self):
-        """_get_completed handles naive datetimes."""
-        scheduler = CountdownScheduler()
+    @pytest.mark.asyncio
+    async def test_fire_due_handles_naive_datetime(self):
+        """_fire_due handles naive datetimes."""
+        callback = AsyncMock()
+        scheduler = CountdownScheduler(on_complete=callback)
         
         # Naive datetime (no timezone) - use datetime.now(timezone.utc).replace(tzinfo=None)
         past = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=1)
         scheduler.schedule("expired", past)
         
-        completed = scheduler._get_completed()
-        assert "expired" in completed
+        await scheduler._fire_due(datetime.now(timezone.utc).timestamp())
+        callback.assert_called_once_with("expired")
     
     @pytest.mark.asyncio
     async def test_completion_callback_called(self):
@@ -266,3 +271,134 @@ class TestErrorHandling:
         
         # Both should have been processed
         assert call_count == 2
+
+
+# =============================================================================
+# Timer Heap Tests
+# =============================================================================
+
+class TestTimerHeap:
+    """Tests for due-time ordering and wakeups."""
+    
+    @pytest.mark.asyncio
+    async def test_fires_when_due_not_on_interval(self):
+        """A countdown fires at its target even with a long check_interval."""
+        callback = AsyncMock()
+        scheduler = CountdownScheduler(check_interval=30.0, on_complete=callback)
+        
+        await scheduler.start()
+        scheduler.schedule("soon", datetime.now(timezone.utc) + timedelta(seconds=0.05))
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+        
+        callback.assert_called_once_with("soon")
+    
+    @pytest.mark.asyncio
+    async def test_fires_in_target_order(self):
+        """Countdowns complete in target order regardless of insertion order."""
+        fired = []
+        
+        async def on_complete(countdown_id):
+            fired.append(countdown_id)
+        
+        scheduler = CountdownScheduler(on_complete=on_complete)
+        now = datetime.now(timezone.utc)
+        for i in (3, 1, 2):
+            scheduler.schedule(f"c{i}", now + timedelta(seconds=0.02 * i))
+        
+        await scheduler.start()
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+        
+        assert fired == ["c1", "c2", "c3"]
+    
+    @pytest.mark.asyncio
+    async def test_reschedule_and_cancel(self):
+        """Rescheduling moves the only entry; cancelled countdowns never fire."""
+        callback = AsyncMock()
+        scheduler = CountdownScheduler(on_complete=callback)
+        now = datetime.now(timezone.utc)
+        
+        scheduler.schedule("moved", now - timedelta(seconds=1))
+        scheduler.schedule("moved", now + timedelta(hours=1))
+        scheduler.schedule("gone", now - timedelta(seconds=1))
+        scheduler.cancel("gone")
+        
+        await scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+        
+        callback.assert_not_called()
+        assert scheduler.is_scheduled("moved")
+        assert scheduler.next_due() == pytest.approx(
+            (now + timedelta(hours=1)).timestamp()
+        )
+    
+    @pytest.mark.asyncio
+    async def test_checks_only_at_requested_times(self):
+        """on_check runs on schedule and at the next_check threshold only."""
+        checks = []
+        
+        async def on_check(countdown_id, remaining):
+            checks.append(remaining.total_seconds())
+        
+        def next_check(countdown_id, remaining):
+            # One alert threshold 0.1s before T-0
+            if remaining.total_seconds() > 0.1:
+                return timedelta(seconds=0.1)
+            return None
+        
+        complete = AsyncMock()
+        scheduler = CountdownScheduler(
+            check_interval=30.0, on_complete=complete,
+            on_check=on_check, next_check=next_check
+        )
+        scheduler.schedule("a", datetime.now(timezone.utc) + timedelta(seconds=0.25))
+        
+        await scheduler.start()
+        await asyncio.sleep(0.4)
+        await scheduler.stop()
+        
+        assert len(checks) == 2
+        assert checks[0] > 0.2
+        assert 0 < checks[1] <= 0.1
+        complete.assert_called_once_with("a")
+    
+    def test_cancelled_entries_are_compacted(self):
+        """Cancelling many countdowns doesn't grow the heap without bound."""
+        scheduler = CountdownScheduler()
+        target = datetime.now(timezone.utc) + timedelta(hours=1)
+        
+        for i in range(5000):
+            scheduler.schedule(f"c{i}", target)
+        for i in range(4990):
+            scheduler.cancel(f"c{i}")
+        
+        assert scheduler.pending_count == 10
+        assert len(scheduler._heap) < 2 * CountdownScheduler.COMPACT_MIN
+    
+    @pytest.mark.asyncio
+    async def test_compaction_during_callbacks(self):
+        """Compacting the heap from a callback fires each countdown once."""
+        fired = []
+        scheduler = CountdownScheduler()
+        now = datetime.now(timezone.utc)
+        
+        async def on_complete(countdown_id):
+            if not fired:
+                for i in range(3000):
+                    scheduler.cancel(f"later{i}")
+            fired.append(countdown_id)
+        
+        scheduler.on_complete = on_complete
+        for i in range(1500):
+            scheduler.schedule(f"due{i}", now - timedelta(seconds=1500 - i))
+        for i in range(3000):
+            scheduler.schedule(f"later{i}", now + timedelta(hours=1))
+        
+        await scheduler._fire_due(now.timestamp())
+        await scheduler._fire_due(now.timestamp())
+        
+        assert fired == [f"due{i}" for i in range(1500)]
+        assert scheduler.pending_count == 0
+        assert scheduler.next_due() is None
@@ -5,6 +5,11 @@ from .buffer import EventBuffer, CapturedEvent
 from .filters import FilterChain
 from .service import InspectorService
 
+try:
+    from lib.channel_state import ChannelStateClient
+except ImportError:
+    ChannelStateClient = None
+
 
 class InspectorPlugin:
     """
@@ -60,6 +65,12 @@ class InspectorPlugin:
         # Initialize service
         self.service = InspectorService(self.buffer, self.filter_chain)
         
+        # Optional rank-based admin check against replicated channel state
+        self.admin_rank = self.config.get("admin_rank")
+        self.channel_state = None
+        if self.admin_rank is not None and ChannelStateClient is not None:
+            self.channel_state = ChannelStateClient(self.nc)
+        
         # Track subscriptions
         self._subscriptions = []
         self._initialized = False
@@ -106,6 +117,8 @@ class InspectorPlugin:
         
         self._subscriptions.clear()
         self.buffer.clear()
+        if self.channel_state:
+            await self.channel_state.stop()
         self._initialized = False
         self.logger.info(f"{self.NAMESPACE} plugin shutdown")
     
@@ -131,7 +144,7 @@ class InspectorPlugin:
         """Handle !inspect events [pattern]."""
         data = json.loads(msg.data.decode())
         
-        if not await self._check_admin(data["user"]):
+        if not await self._check_admin(data["user"], data.get("channel")):
             return await self._reply_error(msg, "Admin only command")
         
         pattern = data.get("args", "").strip() or None
@@ -156,7 +169,7 @@ class InspectorPlugin:
         """Handle !inspect plugins."""
         data = json.loads(msg.data.decode())
         
-        if not await self._check_admin(data["user"]):
+        if not await self._check_admin(data["user"], data.get("channel")):
             return await self._reply_error(msg, "Admin only command")
         
         if not self.plugin_manager:
@@ -180,7 +193,7 @@ class InspectorPlugin:
         """Handle !inspect plugin <name>."""
         data = json.loads(msg.data.decode())
         
-        if not await self._check_admin(data["user"]):
+        if not await self._check_admin(data["user"], data.get("channel")):
             return await self._reply_error(msg, "Admin only command")
         
         name = data.get("args", "").strip()
@@ -215,7 +228,7 @@ class InspectorPlugin:
         """Handle !inspect stats."""
         data = json.loads(msg.data.decode())
         
-        if not await self._check_admin(data["user"]):
+        if not await self._check_admin(data["user"], data.get("channel")):
             return await self._reply_error(msg, "Admin only command")
         
         stats = self.buffer.get_stats()
@@ -236,7 +249,7 @@ class InspectorPlugin:
         """Handle !inspect pause."""
         data = json.loads(msg.data.decode())
         
-        if not await self._check_admin(data["user"]):
+        if not await self._check_admin(data["user"], data.get("channel")):
             return await self._reply_error(msg, "Admin only command")
         
         self.service.pause()
@@ -246,16 +259,22 @@ class InspectorPlugin:
         """Handle !inspect resume."""
         data = json.loads(msg.data.decode())
         
-        if not await self._check_admin(data["user"]):
+        if not await self._check_admin(data["user"], data.get("channel")):
             return await self._reply_error(msg, "Admin only command")
         
         self.service.resume()
         await self._reply(msg, {"success": True, "result": {"message": "📡 Event capturing resumed"}})
     
-    async def _check_admin(self, user: str) -> bool:
-        """Check if user is an admin."""
+    async def _check_admin(self, user: str, channel: str = None) -> bool:
+        """Check if user is an admin (listed, or with at least admin_rank)."""
         admins = self.config.get("admins", [])
-        return user in admins or not admins  # If no admins configured, allow all
+        if user in admins:
+            return True
+        if self.admin_rank is not None:
+            if not channel or not self.channel_state:
+                return False
+            return await self.channel_state.is_moderator(channel, user, self.admin_rank)
+        return not admins  # If no admins configured, allow all
     
     async def _reply(self, msg, response_dict: dict) -> None:
         """Reply to a NATS message."""
@@ -71,6 +71,19 @@ class TestInspectorPlugin:
         if not response["success"]:
             assert "Admin only" not in response.get("error", "")
 
+    @pytest.mark.asyncio
+    async def test_admin_rank_check(self, mock_nats):
+        """Test rank-based admin check against channel state."""
+        plugin = InspectorPlugin(mock_nats, {"admins": ["owner"], "admin_rank": 3})
+        plugin.channel_state = MagicMock()
+        plugin.channel_state.is_moderator = AsyncMock(side_effect=lambda c, u, r: u == "mod")
+
+        assert await plugin._check_admin("owner")
+        assert await plugin._check_admin("mod", "lobby")
+        assert not await plugin._check_admin("user", "lobby")
+        assert not await plugin._check_admin("mod")  # no channel to look up
+        plugin.channel_state.is_moderator.assert_called_with("lobby", "user", 3)
+
     @pytest.mark.asyncio
     async def test_handle_stats(self, plugin):
         """Test stats command."""
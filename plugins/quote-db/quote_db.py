@@ -12,7 +12,6 @@ Serves as canonical example for migrating plugins from direct SQLite access.
 import logging
 import json
 import asyncio
-import random
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 
@@ -128,8 +127,9 @@ class QuoteDBPlugin:
             "table": "quotes",
             "schema": {
                 "fields": [
-                    {"name": "text", "type": "string", "required": True, "max_length": 1000},
-                    {"name": "author", "type": "string", "max_length": 100},
+                    {"name": "text", "type": "string", "required": True, "max_length": 1000,
+                     "search": True},
+                    {"name": "author", "type": "string", "max_length": 100, "search": True},
                     {"name": "added_by", "type": "string", "max_length": 50},
                     {"name": "added_at", "type": "datetime", "required": True},
                     {"name": "score", "type": "integer", "required": True, "default": 0},
@@ -488,12 +488,16 @@ class QuoteDBPlugin:
         """
         Search quotes by author or text.
 
+        Uses the full-text index on text and author: every word of the
+        query must appear (case-insensitive, stemmed, so "dreams" finds
+        "dream").
+
         Args:
             query: Search query string
             limit: Maximum results to return (1-100, default 10)
 
         Returns:
-            List of matching quote dicts, sorted by timestamp descending
+            List of matching quote dicts, most relevant first
 
         Raises:
             ValueError: If limit out of range
@@ -506,16 +510,16 @@ class QuoteDBPlugin:
         if limit < 1 or limit > 100:
             raise ValueError("Limit must be between 1 and 100")
 
-        # Build search payload with $or and $like
+        # No sort: full-text matches come back ranked by relevance
+        return await self._search_rows({"$search": query}, limit, query)
+
+    async def _search_rows(
+        self, filters: Dict[str, Any], limit: int, query: str
+    ) -> List[Dict[str, Any]]:
+        """Run a quotes row search; ``query`` is only used in log messages."""
         payload = {
             "table": "quotes",
-            "filters": {
-                "$or": [
-                    {"author": {"$like": f"%{query}%"}},
-                    {"text": {"$like": f"%{query}%"}}
-                ]
-            },
-            "sort": {"field": "added_at", "order": "desc"},
+            "filters": filters,
             "limit": limit
         }
 
@@ -550,7 +554,8 @@ class QuoteDBPlugin:
         Atomically increment quote score by 1.
 
         Uses atomic $inc operator to prevent race conditions in concurrent
-        upvotes. See DATABASE_SERVICE.md for atomic operations documentation.
+        upvotes, and reads the new score back in the same request. See
+        DATABASE_SERVICE.md for atomic operations documentation.
 
         Args:
             quote_id: The ID of the quote to upvote
@@ -569,7 +574,8 @@ class QuoteDBPlugin:
         payload = {
             "table": "quotes",
             "id": quote_id,
-            "operations": {"score": {"$inc": 1}}
+            "operations": {"score": {"$inc": 1}},
+            "returning": ["score"]
         }
 
         try:
@@ -589,9 +595,8 @@ class QuoteDBPlugin:
             if not result.get("updated"):
                 raise ValueError(f"Quote {quote_id} not found")
 
-            # Retrieve updated score
-            quote = await self.get_quote(quote_id)
-            score = quote["score"]
+            # Score as written by this update
+            score = result["data"]["score"]
 
             self.logger.info(f"Upvoted quote {quote_id}, new score: {score}")
             return score
@@ -608,7 +613,8 @@ class QuoteDBPlugin:
         Atomically decrement quote score by 1.
 
         Uses atomic $inc operator with negative value to prevent race conditions
-        in concurrent downvotes. See DATABASE_SERVICE.md for atomic operations.
+        in concurrent downvotes, and reads the new score back in the same
+        request. See DATABASE_SERVICE.md for atomic operations.
 
         Args:
             quote_id: The ID of the quote to downvote
@@ -627,7 +633,8 @@ class QuoteDBPlugin:
         payload = {
             "table": "quotes",
             "id": quote_id,
-            "operations": {"score": {"$inc": -1}}
+            "operations": {"score": {"$inc": -1}},
+            "returning": ["score"]
         }
 
         try:
@@ -647,9 +654,8 @@ class QuoteDBPlugin:
             if not result.get("updated"):
                 raise ValueError(f"Quote {quote_id} not found")
 
-            # Retrieve updated score
-            quote = await self.get_quote(quote_id)
-            score = quote["score"]
+            # Score as written by this update
+            score = result["data"]["score"]
 
             self.logger.info(f"Downvoted quote {quote_id}, new score: {score}")
             return score
@@ -711,52 +717,42 @@ class QuoteDBPlugin:
         """
         Get a random quote.
 
-        Uses KV-cached total count for efficient random selection.
-        Falls back to first quote if random ID has gap.
+        Every quote is equally likely, whatever ids have been deleted;
+        the database service samples in one request (see
+        rosey.db.row.{plugin}.random in DATABASE_SERVICE.md).
 
         Returns:
             Random quote dict, or None if database empty
 
         Raises:
-            RuntimeError: If plugin not initialized
+            RuntimeError: If plugin not initialized or the request fails
             asyncio.TimeoutError: If NATS request times out
         """
         self._ensure_initialized()
 
-        # Get total count (KV cached)
-        count = await self._get_quote_count()
-        if count == 0:
-            self.logger.info("No quotes available for random selection")
-            return None
-
-        # Generate random ID
-        random_id = random.randint(1, count)
-
-        # Try to get quote
-        quote = await self.get_quote(random_id)
-        if quote:
-            return quote
-
-        # Fallback: get first quote (handles ID gaps)
-        self.logger.warning(f"Quote {random_id} not found, using fallback")
-        payload = {
-            "table": "quotes",
-            "filters": {},
-            "limit": 1
-        }
+        payload = {"table": "quotes"}
 
         try:
             response = await self.nats.request(
-                f"rosey.db.row.{self.NAMESPACE}.search",
+                f"rosey.db.row.{self.NAMESPACE}.random",
                 json.dumps(payload).encode(),
                 timeout=2.0
             )
             result = json.loads(response.data.decode())
+
+            if not result.get("success"):
+                error = result.get("error", "Unknown error")
+                self.logger.error(f"Random quote failed: {error}")
+                raise RuntimeError(f"Failed to get random quote: {error}")
+
             rows = result.get("rows", [])
-            return rows[0] if rows else None
+            if not rows:
+                self.logger.info("No quotes available for random selection")
+                return None
+            return rows[0]
 
         except asyncio.TimeoutError:
-            self.logger.error("NATS timeout getting random quote fallback")
+            self.logger.error("NATS timeout getting random quote")
             raise asyncio.TimeoutError("NATS request timed out: random_quote")
         except json.JSONDecodeError as e:
             self.logger.error(f"Invalid JSON response: {e}")
@@ -768,8 +764,8 @@ class QuoteDBPlugin:
         """
         Find all quotes by a specific author.
 
-        This is a convenience wrapper around search_quotes() that performs
-        an author name search.
+        Matches the author field only, through the full-text index, so
+        "einstein" finds "Albert Einstein".
 
         Args:
             author: Author name to search for
@@ -787,8 +783,7 @@ class QuoteDBPlugin:
         """
         self._ensure_initialized()
 
-        # Use search_quotes() which handles author searches
-        return await self.search_quotes(author, limit=100)
+        return await self._search_rows({"author": {"$search": author}}, 100, author)
 
     async def increment_score(self, quote_id: int, amount: int = 1) -> int:
         """
@@ -819,8 +814,9 @@ class QuoteDBPlugin:
         # Atomic increment via $inc
         payload = {
             "table": "quotes",
-            "filters": {"id": {"$eq": quote_id}},
-            "operations": {"score": {"$inc": amount}}
+            "id": quote_id,
+            "operations": {"score": {"$inc": amount}},
+            "returning": ["score"]
         }
 
         try:
@@ -831,12 +827,17 @@ class QuoteDBPlugin:
             )
             result = json.loads(response.data.decode())
 
-            if result.get("updated", 0) == 0:
+            # Check for error
+            if not result.get("success"):
+                error = result.get("error", "Unknown error")
+                self.logger.error(f"Row update failed for quote {quote_id}: {error}")
+                raise RuntimeError(f"Failed to increment score: {error}")
+
+            if not result.get("updated"):
                 raise ValueError(f"Quote {quote_id} not found")
 
-            # Retrieve updated score
-            quote = await self.get_quote(quote_id)
-            score = quote["score"]
+            # Score as written by this update
+            score = result["data"]["score"]
 
             self.logger.info(
                 f"Incremented quote {quote_id} by {amount}, new score: {score}"
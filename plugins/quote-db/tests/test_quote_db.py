@@ -304,7 +304,7 @@ class TestPlaceholderMethods:
 
     @pytest.mark.asyncio
     async def test_find_by_author_success(self, initialized_plugin, mock_nats):
-        """Test find_by_author calls search_quotes."""
+        """Test find_by_author searches the author field."""
         mock_nats.reset_mock()
 
         mock_response = MagicMock()
@@ -321,30 +321,33 @@ class TestPlaceholderMethods:
         assert len(quotes) == 1
         assert quotes[0]["author"] == "Einstein"
         mock_nats.request.assert_called_once()
+        payload = json.loads(mock_nats.request.call_args[0][1].decode())
+        assert payload["filters"] == {"author": {"$search": "Einstein"}}
+        assert payload["limit"] == 100
 
     @pytest.mark.asyncio
     async def test_increment_score_success(self, initialized_plugin, mock_nats):
         """Test increment_score increases score by custom amount."""
         mock_nats.reset_mock()
 
-        # Mock update response (atomic $inc)
+        # Mock update response (atomic $inc, new score returned)
         update_response = MagicMock()
-        update_response.data = json.dumps({"success": True, "updated": True}).encode()
-
-        # Mock get_quote response (retrieve updated score)
-        get_response = MagicMock()
-        get_response.data = json.dumps({
-            "success": True,
-            "exists": True,
-            "data": {"id": 1, "text": "Test", "author": "Author", "score": 15}
+        update_response.data = json.dumps({
+            "success": True, "id": 1, "updated": True, "data": {"score": 15}
         }).encode()
-
-        mock_nats.request.side_effect = [update_response, get_response]
+        mock_nats.request.return_value = update_response
 
         score = await initialized_plugin.increment_score(1, amount=10)
 
         assert score == 15
-        assert mock_nats.request.call_count == 2
+        mock_nats.request.assert_called_once()
+        payload = json.loads(mock_nats.request.call_args[0][1].decode())
+        assert payload == {
+            "table": "quotes",
+            "id": 1,
+            "operations": {"score": {"$inc": 10}},
+            "returning": ["score"]
+        }
 
     @pytest.mark.asyncio
     async def test_increment_score_not_found(self, initialized_plugin, mock_nats):
@@ -384,9 +387,9 @@ class TestSearchQuotes:
         call_args = mock_nats.request.call_args
         assert "search" in call_args[0][0]
         payload = json.loads(call_args[0][1].decode())
-        assert "$or" in payload["filters"]
-        assert payload["filters"]["$or"][0]["author"]["$like"] == "%test%"
-        assert payload["filters"]["$or"][1]["text"]["$like"] == "%test%"
+        assert payload["filters"] == {"$search": "test"}
+        # Ranked by relevance, not re-sorted
+        assert "sort" not in payload
 
     @pytest.mark.asyncio
     async def test_search_quotes_no_results(self, initialized_plugin, mock_nats):
@@ -417,28 +420,23 @@ class TestVoting:
         # Reset mock to clear initialization calls
         mock_nats.request.reset_mock()
 
-        # Mock update response (atomic $inc)
+        # Mock update response (atomic $inc, new score returned)
         update_response = MagicMock()
-        update_response.data = json.dumps({"success": True, "updated": True}).encode()
-
-        # Mock get_quote response (retrieve updated score)
-        get_response = MagicMock()
-        get_response.data = json.dumps({
-            "success": True,
-            "exists": True,
-            "data": {"id": 42, "text": "Test", "author": "Alice", "score": 6}
+        update_response.data = json.dumps({
+            "success": True, "id": 42, "updated": True, "data": {"score": 6}
         }).encode()
-
-        mock_nats.request.side_effect = [update_response, get_response]
+        mock_nats.request.return_value = update_response
 
         score = await initialized_plugin.upvote_quote(42)
         assert score == 6
 
-        # Verify update payload uses atomic $inc
-        call_args = mock_nats.request.call_args_list[0]
+        # One request: atomic $inc returning the new score
+        mock_nats.request.assert_called_once()
+        call_args = mock_nats.request.call_args
         assert "update" in call_args[0][0]
         payload = json.loads(call_args[0][1].decode())
         assert payload["operations"]["score"]["$inc"] == 1
+        assert payload["returning"] == ["score"]
 
     @pytest.mark.asyncio
     async def test_downvote_quote_success(self, initialized_plugin, mock_nats):
@@ -446,27 +444,21 @@ class TestVoting:
         # Reset mock to clear initialization calls
         mock_nats.request.reset_mock()
 
-        # Mock update response (atomic $inc with -1)
+        # Mock update response (atomic $inc with -1, new score returned)
         update_response = MagicMock()
-        update_response.data = json.dumps({"success": True, "updated": True}).encode()
-
-        # Mock get_quote response (retrieve updated score)
-        get_response = MagicMock()
-        get_response.data = json.dumps({
-            "success": True,
-            "exists": True,
-            "data": {"id": 42, "text": "Test", "author": "Alice", "score": 4}
+        update_response.data = json.dumps({
+            "success": True, "id": 42, "updated": True, "data": {"score": 4}
         }).encode()
-
-        mock_nats.request.side_effect = [update_response, get_response]
+        mock_nats.request.return_value = update_response
 
         score = await initialized_plugin.downvote_quote(42)
         assert score == 4
 
-        # Verify $inc with negative value
-        call_args = mock_nats.request.call_args_list[0]
-        payload = json.loads(call_args[0][1].decode())
+        # Verify $inc with negative value, in one request
+        mock_nats.request.assert_called_once()
+        payload = json.loads(mock_nats.request.call_args[0][1].decode())
         assert payload["operations"]["score"]["$inc"] == -1
+        assert payload["returning"] == ["score"]
 
     @pytest.mark.asyncio
     async def test_upvote_quote_not_found(self, initialized_plugin, mock_nats):
@@ -538,61 +530,47 @@ class TestRandomQuote:
 
     @pytest.mark.asyncio
     async def test_random_quote_success(self, initialized_plugin, mock_nats):
-        """Test getting a random quote."""
-        # Mock KV cache hit
-        kv_response = MagicMock()
-        kv_response.data = json.dumps({"exists": True, "value": "5"}).encode()
-
-        # Mock get_quote response
-        get_response = MagicMock()
-        get_response.data = json.dumps({
+        """Test getting a random quote in one request."""
+        mock_nats.reset_mock()
+        mock_response = MagicMock()
+        mock_response.data = json.dumps({
             "success": True,
-            "exists": True,
-            "data": {"id": 3, "text": "Random quote", "author": "Alice", "score": 2}
+            "rows": [{"id": 3, "text": "Random quote", "author": "Alice", "score": 2}],
+            "count": 1
         }).encode()
-
-        mock_nats.request.side_effect = [kv_response, get_response]
+        mock_nats.request.return_value = mock_response
 
         quote = await initialized_plugin.random_quote()
 
         assert quote is not None
         assert quote["text"] == "Random quote"
+        mock_nats.request.assert_called_once()
+        call_args = mock_nats.request.call_args
+        assert call_args[0][0] == "rosey.db.row.quote-db.random"
+        assert json.loads(call_args[0][1].decode()) == {"table": "quotes"}
 
     @pytest.mark.asyncio
     async def test_random_quote_empty_database(self, initialized_plugin, mock_nats):
         """Test random quote with empty database."""
-        # Mock KV cache returning 0 count
-        kv_response = MagicMock()
-        kv_response.data = json.dumps({"exists": True, "value": "0"}).encode()
-        mock_nats.request.return_value = kv_response
+        mock_response = MagicMock()
+        mock_response.data = json.dumps({"success": True, "rows": [], "count": 0}).encode()
+        mock_nats.request.return_value = mock_response
 
         quote = await initialized_plugin.random_quote()
         assert quote is None
 
     @pytest.mark.asyncio
-    async def test_random_quote_fallback(self, initialized_plugin, mock_nats):
-        """Test random quote with ID gap fallback."""
-        # Mock KV cache
-        kv_response = MagicMock()
-        kv_response.data = json.dumps({"exists": True, "value": "10"}).encode()
-
-        # Mock get_quote returning None (ID gap)
-        get_none = MagicMock()
-        get_none.data = json.dumps({"success": True, "exists": False}).encode()
-
-        # Mock fallback search
-        fallback_response = MagicMock()
-        fallback_response.data = json.dumps({
-            "success": True,
-            "rows": [{"id": 1, "text": "First quote", "author": "Alice", "score": 0}]
+    async def test_random_quote_error(self, initialized_plugin, mock_nats):
+        """Test random quote surfaces database errors."""
+        mock_response = MagicMock()
+        mock_response.data = json.dumps({
+            "success": False,
+            "error": {"code": "DATABASE_ERROR", "message": "Random select failed"}
         }).encode()
+        mock_nats.request.return_value = mock_response
 
-        mock_nats.request.side_effect = [kv_response, get_none, fallback_response]
-
-        quote = await initialized_plugin.random_quote()
-
-        assert quote is not None
-        assert quote["text"] == "First quote"
+        with pytest.raises(RuntimeError, match="Failed to get random quote"):
+            await initialized_plugin.random_quote()
 
 
 class TestKVCaching:
@@ -12,6 +12,8 @@ Commands:
 
 from .question import Answer, Difficulty, Question, QuestionType
 from .game import GameConfig, GameState, PlayerScore, TriviaGame
+from .pool import QuestionPool
+from .leaderboard import LeaderboardCache, RankedScores
 from .providers.base import QuestionProvider
 from .providers.opentdb import OpenTDBProvider
 
@@ -26,6 +28,11 @@ __all__ = [
     "GameState",
     "PlayerScore",
     "TriviaGame",
+    # Pool module
+    "QuestionPool",
+    # Leaderboard module
+    "LeaderboardCache",
+    "RankedScores",
     # Providers
     "QuestionProvider",
     "OpenTDBProvider",
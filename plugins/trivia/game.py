@@ -7,7 +7,7 @@ timing, and score tracking.
 
 import asyncio
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Callable, Dict, List, Optional, Set
 
@@ -35,6 +35,7 @@ class PlayerScore:
         correct_answers: Number of correct answers
         total_answers: Number of answers submitted
         fastest_time: Fastest correct answer time
+        categories: Category -> [answers, correct answers]
     """
 
     user: str
@@ -42,8 +43,15 @@ class PlayerScore:
     correct_answers: int = 0
     total_answers: int = 0
     fastest_time: Optional[float] = None
+    categories: Dict[str, List[int]] = field(default_factory=dict)
 
-    def record_answer(self, correct: bool, points: int, time_taken: float) -> None:
+    def record_answer(
+        self,
+        correct: bool,
+        points: int,
+        time_taken: float,
+        category: Optional[str] = None,
+    ) -> None:
         """
         Record an answer submission.
 
@@ -51,9 +59,16 @@ class PlayerScore:
             correct: Whether answer was correct
             points: Points to award
             time_taken: Time taken to answer
+            category: Category of the question answered
         """
         self.total_answers += 1
 
+        if category:
+            tally = self.categories.setdefault(category, [0, 0])
+            tally[0] += 1
+            if correct:
+                tally[1] += 1
+
         if correct:
             self.score += points
             self.correct_answers += 1
@@ -277,7 +292,9 @@ class TriviaGame:
         # Update player score
         if user not in self.scores:
             self.scores[user] = PlayerScore(user=user)
-        self.scores[user].record_answer(correct, points, time_taken)
+        self.scores[user].record_answer(
+            correct, points, time_taken, self.current_question.category
+        )
 
         # Trigger callback
         if self.on_answer:
@@ -0,0 +1,299 @@
+"""
+Trivia Leaderboards
+
+In-memory leaderboards kept in step with trivia storage.
+
+Each leaderboard is an indexable skip list ordered by points, so the
+top N and a user's rank are O(log n) (plus N for the entries returned)
+instead of a sorted search per command. Boards are built from storage
+on startup, updated from the rows each finished game writes, and
+periodically compared against storage.
+"""
+
+import logging
+import random
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .storage import TriviaStorage
+
+logger = logging.getLogger(__name__)
+
+# (total_points, games_played, correct_answers)
+Score = Tuple[int, int, int]
+
+
+class _Node:
+    """Skip list node; ``width[i]`` is how many entries ``next[i]`` skips."""
+
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Optional[Tuple[int, str]], level: int):
+        self.key = key
+        self.next: List[Optional["_Node"]] = [None] * level
+        self.width = [1] * level
+
+
+class RankedScores:
+    """
+    Scores ordered highest first, with O(log n) update, rank and slicing.
+
+    Entries are ordered by points (descending), then user ID. Setting a
+    user's score moves their entry; reading never sorts.
+
+    Args:
+        max_level: Skip list height; handles about 2**max_level entries
+            before lookups degrade.
+    """
+
+    def __init__(self, max_level: int = 24):
+        self.max_level = max_level
+        self._head = _Node(None, max_level)
+        self._scores: Dict[str, Score] = {}
+        self._random = random.Random()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._scores
+
+    def get(self, user_id: str) -> Optional[Score]:
+        """A user's (points, games, correct), or None."""
+        return self._scores.get(user_id)
+
+    def items(self) -> Dict[str, Score]:
+        """Copy of every user's score."""
+        return dict(self._scores)
+
+    def set(self, user_id: str, points: int, games: int, correct: int) -> None:
+        """Add a user or update their score."""
+        old = self._scores.get(user_id)
+        if old is not None:
+            if old[0] == points:
+                self._scores[user_id] = (points, games, correct)
+                return
+            self._remove((-old[0], user_id))
+        self._scores[user_id] = (points, games, correct)
+        self._insert((-points, user_id))
+
+    def remove(self, user_id: str) -> bool:
+        """Remove a user; False if they were not on the board."""
+        old = self._scores.pop(user_id, None)
+        if old is None:
+            return False
+        self._remove((-old[0], user_id))
+        return True
+
+    def rank(self, user_id: str) -> Optional[int]:
+        """1-based position of a user, or None if not on the board."""
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        key = (-score[0], user_id)
+        node, position = self._head, 0
+        for level in reversed(range(self.max_level)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        return position + 1
+
+    def top(self, limit: int, offset: int = 0) -> List[Tuple[int, str, Score]]:
+        """
+        Entries ``offset + 1`` to ``offset + limit``.
+
+        Returns:
+            List of (rank, user_id, (points, games, correct)).
+        """
+        node, position = self._head, 0
+        # Skip to the entry before the first one wanted
+        for level in reversed(range(self.max_level)):
+            while node.next[level] is not None and position + node.width[level] <= offset:
+                position += node.width[level]
+                node = node.next[level]
+        entries = []
+        node = node.next[0]
+        while node is not None and len(entries) < limit:
+            position += 1
+            user_id = node.key[1]
+            entries.append((position, user_id, self._scores[user_id]))
+            node = node.next[0]
+        return entries
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < self.max_level and self._random.random() < 0.5:
+            level += 1
+        return level
+
+    def _insert(self, key: Tuple[int, str]) -> None:
+        chain: List[_Node] = [self._head] * self.max_level
+        steps = [0] * self.max_level
+        node = self._head
+        for level in reversed(range(self.max_level)):
+            while node.next[level] is not None and node.next[level].key < key:
+                steps[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        new = _Node(key, self._random_level())
+        skipped = 0
+        for level in range(len(new.next)):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - skipped
+            prev.width[level] = skipped + 1
+            skipped += steps[level]
+        for level in range(len(new.next), self.max_level):
+            chain[level].width[level] += 1
+
+    def _remove(self, key: Tuple[int, str]) -> None:
+        chain: List[_Node] = [self._head] * self.max_level
+        node = self._head
+        for level in reversed(range(self.max_level)):
+            while node.next[level] is not None and node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), self.max_level):
+            chain[level].width[level] -= 1
+
+
+class LeaderboardCache:
+    """
+    Global and per-channel leaderboards mirrored from trivia storage.
+
+    Global entries mirror ``user_stats`` rows and channel entries mirror
+    ``channel_stats`` rows; updates take the row as written (absolute
+    values), so applying one twice is harmless.
+    """
+
+    def __init__(self):
+        self.global_board = RankedScores()
+        self.channels: Dict[str, RankedScores] = {}
+        self.loaded = False
+        # Entries written while verify() is reading storage
+        self._touched: Optional[Set[Tuple[Optional[str], str]]] = None
+
+    async def load(self, storage: "TriviaStorage") -> None:
+        """Build every board from storage."""
+        self.global_board, self.channels = await self._read(storage)
+        self.loaded = True
+        logger.info(
+            f"Loaded trivia leaderboards: {len(self.global_board)} players, "
+            f"{len(self.channels)} channels"
+        )
+
+    async def verify(self, storage: "TriviaStorage") -> int:
+        """
+        Compare the boards with storage and adopt storage's values.
+
+        Entries updated while storage was being read keep their newer
+        in-memory values.
+
+        Returns:
+            Number of entries that differed.
+        """
+        self._touched = set()
+        try:
+            global_board, channels = await self._read(storage)
+        finally:
+            touched, self._touched = self._touched, None
+
+        mismatches = self._diff(self.global_board, global_board, None, touched)
+        for channel in set(self.channels) | set(channels):
+            mismatches += self._diff(
+                self.channels.get(channel, RankedScores()),
+                channels.setdefault(channel, RankedScores()),
+                channel, touched
+            )
+        self.global_board = global_board
+        self.channels = {c: board for c, board in channels.items() if len(board)}
+        self.loaded = True
+        if mismatches:
+            logger.warning(f"Trivia leaderboards differed from storage in {mismatches} entries")
+        return mismatches
+
+    def update_user(self, row: dict) -> None:
+        """Apply a user_stats row to the global board."""
+        self.global_board.set(
+            row["user_id"],
+            row.get("total_points") or 0,
+            row.get("total_games") or 0,
+            row.get("correct_answers") or 0,
+        )
+        if self._touched is not None:
+            self._touched.add((None, row["user_id"]))
+
+    def update_channel(self, row: dict) -> None:
+        """Apply a channel_stats row to its channel's board."""
+        board = self.channels.setdefault(row["channel"], RankedScores())
+        board.set(
+            row["user_id"],
+            row.get("total_points") or 0,
+            row.get("games_played") or 0,
+            row.get("correct_answers") or 0,
+        )
+        if self._touched is not None:
+            self._touched.add((row["channel"], row["user_id"]))
+
+    def top(
+        self, channel: Optional[str] = None, limit: int = 10
+    ) -> List[Tuple[int, str, Score]]:
+        """Top players globally (channel None) or in a channel; see RankedScores.top."""
+        board = self.global_board if channel is None else self.channels.get(channel)
+        return board.top(limit) if board is not None else []
+
+    def rank(self, user_id: str, channel: Optional[str] = None) -> Optional[int]:
+        """A user's rank globally (channel None) or in a channel."""
+        board = self.global_board if channel is None else self.channels.get(channel)
+        return board.rank(user_id) if board is not None else None
+
+    @staticmethod
+    async def _read(
+        storage: "TriviaStorage"
+    ) -> Tuple[RankedScores, Dict[str, RankedScores]]:
+        """Build fresh boards from storage rows."""
+        global_board = RankedScores()
+        for row in await storage.search_all("user_stats"):
+            global_board.set(
+                row["user_id"],
+                row.get("total_points") or 0,
+                row.get("total_games") or 0,
+                row.get("correct_answers") or 0,
+            )
+        channels: Dict[str, RankedScores] = {}
+        for row in await storage.search_all("channel_stats"):
+            channels.setdefault(row["channel"], RankedScores()).set(
+                row["user_id"],
+                row.get("total_points") or 0,
+                row.get("games_played") or 0,
+                row.get("correct_answers") or 0,
+            )
+        return global_board, channels
+
+    @staticmethod
+    def _diff(
+        current: RankedScores,
+        fresh: RankedScores,
+        channel: Optional[str],
+        touched: Set[Tuple[Optional[str], str]],
+    ) -> int:
+        """Count differing entries; copies touched entries into ``fresh``."""
+        mismatches = 0
+        current_scores = current.items()
+        for user_id in set(current_scores) | set(fresh.items()):
+            score = current_scores.get(user_id)
+            if (channel, user_id) in touched:
+                if score is not None:
+                    fresh.set(user_id, *score)
+                continue
+            if score != fresh.get(user_id):
+                mismatches += 1
+        return mismatches
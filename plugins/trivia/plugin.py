@@ -25,6 +25,7 @@ NATS Subjects:
         trivia.game.ended - Event when game ends
 """
 
+import asyncio
 import json
 import logging
 import uuid
@@ -39,9 +40,15 @@ except ImportError:
 from .game import GameConfig, GameState, TriviaGame
 from .question import Answer, Question
 from .providers.opentdb import OpenTDBProvider
+from .pool import QuestionPool
 from .storage import TriviaStorage
 from .achievements import AchievementChecker, Achievement, GameResult
 
+try:
+    from lib.channel_state import ChannelStateClient
+except ImportError:
+    ChannelStateClient = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -117,15 +124,25 @@ class TriviaPlugin:
         self._initialized = False
         self._subscriptions: List[Any] = []
 
-        # Question provider
+        # Question provider, behind a local pool
         self.provider = OpenTDBProvider()
+        self.pool = QuestionPool(
+            self.provider,
+            low_water=self.config.get("pool_low_water", 20),
+            batch_size=self.config.get("pool_batch_size", 50),
+            max_size=self.config.get("pool_max_size", 5000),
+            recent_size=self.config.get("recent_questions", 500),
+            fetch_interval=self.config.get("prefetch_interval", 5.0),
+        )
+        self.pool.prefetch_enabled = self.config.get("prefetch", True)
 
         # Storage and Achievements (initialized in setup)
         self.storage: Optional[TriviaStorage] = None
         self.achievement_checker: Optional[AchievementChecker] = None
 
-        # Active games by channel
+        # Active games by channel, and who started them
         self.active_games: Dict[str, TriviaGame] = {}
+        self.game_starters: Dict[str, str] = {}
 
         # Load configuration with defaults
         self.default_questions = self.config.get("default_questions", 10)
@@ -136,6 +153,16 @@ class TriviaPlugin:
         self.points_decay = self.config.get("points_decay", True)
         self.emit_events = self.config.get("emit_events", True)
         self.enable_achievements = self.config.get("enable_achievements", True)
+        # Minimum CyTube rank to stop someone else's game (None: anyone may)
+        self.stop_rank = self.config.get("stop_rank")
+        # Seconds between leaderboard cache checks against storage (0: never)
+        self.leaderboard_check_interval = self.config.get("leaderboard_check_interval", 3600)
+        self._leaderboard_task: Optional[asyncio.Task] = None
+
+        # Channel state replicas for rank checks
+        self.channel_state = None
+        if self.stop_rank is not None and ChannelStateClient is not None:
+            self.channel_state = ChannelStateClient(self.nats)
 
     async def initialize(self) -> None:
         """
@@ -154,6 +181,24 @@ class TriviaPlugin:
             # We can continue without storage, but features will be limited
             # Or we could raise. For now, let's log and continue, checking self.storage later.
 
+        # Load the question pool and top it up in the background
+        self.pool.storage = self.storage
+        try:
+            await self.pool.load()
+        except Exception as e:
+            self.logger.error(f"Failed to load question pool: {e}")
+        if self.pool.available() < self.pool.low_water:
+            self.pool.request_prefetch()
+
+        # Build leaderboards from storage and keep checking them against it
+        if self.storage:
+            try:
+                await self.storage.load_leaderboards()
+            except Exception as e:
+                self.logger.error(f"Failed to load leaderboards: {e}")
+            if self.leaderboard_check_interval > 0:
+                self._leaderboard_task = asyncio.create_task(self._leaderboard_check_loop())
+
         # Subscribe to commands
         sub_start = await self.nats.subscribe(
             self.SUBJECT_START, cb=self._handle_start
@@ -211,6 +256,7 @@ class TriviaPlugin:
             except Exception as e:
                 self.logger.warning(f"Error stopping game in {channel}: {e}")
         self.active_games.clear()
+        self.game_starters.clear()
 
         # Unsubscribe from all subjects
         for sub in self._subscriptions:
@@ -220,9 +266,21 @@ class TriviaPlugin:
                 self.logger.warning(f"Error unsubscribing: {e}")
         self._subscriptions.clear()
 
-        # Close provider
+        if self._leaderboard_task:
+            self._leaderboard_task.cancel()
+            try:
+                await self._leaderboard_task
+            except asyncio.CancelledError:
+                pass
+            self._leaderboard_task = None
+
+        # Stop prefetching and close provider
+        await self.pool.close()
         await self.provider.close()
 
+        if self.channel_state:
+            await self.channel_state.stop()
+
         self._initialized = False
         self.logger.info("Plugin shutdown complete")
 
@@ -277,9 +335,9 @@ class TriviaPlugin:
                 elif part.lower() in self.CATEGORY_MAP:
                     category = self.CATEGORY_MAP[part.lower()]
 
-        # Fetch questions
+        # Take questions from the pool (fetches only if it runs short)
         try:
-            questions = await self.provider.fetch_questions(num_questions, category=category)
+            questions = await self.pool.take(channel, num_questions, category=category)
         except Exception as e:
             self.logger.error(f"Failed to fetch questions: {e}")
             if msg.reply:
@@ -319,6 +377,7 @@ class TriviaPlugin:
         )
 
         self.active_games[channel] = game
+        self.game_starters[channel] = user
 
         # Start game
         await game.start()
@@ -384,6 +443,15 @@ class TriviaPlugin:
                 })
             return
 
+        if not await self._can_stop(channel, user):
+            if msg.reply:
+                await self._respond(msg, {
+                    "success": False,
+                    "error": f"Only {self.game_starters.get(channel)} or a moderator "
+                             f"can stop this game.",
+                })
+            return
+
         # Stop the game
         await game.stop(ended_by=user)
 
@@ -393,6 +461,19 @@ class TriviaPlugin:
                 "result": {"message": f"⏹️ Game stopped by {user}."},
             })
 
+    async def _can_stop(self, channel: str, user: str) -> bool:
+        """
+        Check whether a user may stop the channel's game.
+
+        The starter always may; others need at least `stop_rank`, looked
+        up in the replicated channel state.
+        """
+        if self.stop_rank is None or user == self.game_starters.get(channel):
+            return True
+        if self.channel_state is None:
+            return False
+        return await self.channel_state.is_moderator(channel, user, self.stop_rank)
+
     async def _handle_answer(self, msg) -> None:
         """Handle !trivia answer <answer> / !a <answer> command."""
         try:
@@ -535,26 +616,16 @@ class TriviaPlugin:
         # Update stats and check achievements
         if self.storage and self.achievement_checker:
             try:
-                # Update streak
-                await self.storage.update_streak(answer.user, answer.correct)
-                
-                # Update category stats
-                if game.current_question:
-                    await self.storage.update_category_stats(
-                        answer.user,
-                        game.current_question.category,
-                        answer.correct,
-                    )
+                # Update streak (category stats are committed at game end)
+                stats = await self.storage.record_answer_streak(answer.user, answer.correct)
                 
                 # Check achievements
-                if self.enable_achievements:
-                    stats = await self.storage.get_user_stats(answer.user)
-                    if stats:
-                        new_achievements = await self.achievement_checker.check_and_award(
-                            answer.user, stats
-                        )
-                        for achievement in new_achievements:
-                            await self._announce_achievement(game.channel, answer.user, achievement)
+                if self.enable_achievements and stats:
+                    new_achievements = await self.achievement_checker.check_and_award(
+                        answer.user, stats
+                    )
+                    for achievement in new_achievements:
+                        await self._announce_achievement(game.channel, answer.user, achievement)
             except Exception as e:
                 self.logger.error(f"Error updating stats/achievements: {e}")
 
@@ -604,39 +675,20 @@ class TriviaPlugin:
         # Persist scores and check achievements
         if self.storage and leaderboard:
             try:
-                # Record game end
-                await self.storage.record_game_end(
+                # Record game end and every player's stats in one batch
+                all_stats = await self.storage.commit_game(
                     game.game_id,
-                    num_players=len(leaderboard),
+                    game.channel,
+                    leaderboard,
                     winner_id=winner.user if winner else None,
                 )
                 
-                # Update stats for each player
+                # Check achievements
                 for player in leaderboard:
                     is_winner = (player.user == winner.user) if winner else False
                     
-                    # Update user stats
-                    await self.storage.update_user_stats(
-                        user_id=player.user,
-                        questions_answered=player.total_answers,
-                        correct_answers=player.correct_answers,
-                        points_earned=player.score,
-                        won_game=is_winner,
-                        fastest_ms=int(player.fastest_time * 1000) if player.fastest_time else None,
-                    )
-                    
-                    # Update channel stats
-                    await self.storage.update_channel_stats(
-                        user_id=player.user,
-                        channel=game.channel,
-                        points=player.score,
-                        correct=player.correct_answers,
-                        won=is_winner,
-                    )
-                    
-                    # Check achievements
                     if self.enable_achievements and self.achievement_checker:
-                        stats = await self.storage.get_user_stats(player.user)
+                        stats = all_stats.get(player.user)
                         if stats:
                             game_result = GameResult(
                                 won=is_winner,
@@ -655,6 +707,7 @@ class TriviaPlugin:
         # Cleanup
         if game.channel in self.active_games:
             del self.active_games[game.channel]
+        self.game_starters.pop(game.channel, None)
 
     async def _handle_stats(self, msg) -> None:
         """Handle !trivia stats [user]."""
@@ -696,6 +749,10 @@ class TriviaPlugin:
         
         if stats.favorite_category:
             message += f"\n• Favorite: {stats.favorite_category.title()}"
+
+        rank = await self.storage.get_user_rank(target_user)
+        if rank:
+            message += f"\n• Global rank: #{rank}"
         
         if msg.reply:
             await self._respond(msg, {
@@ -781,6 +838,15 @@ class TriviaPlugin:
                 "result": {"message": "\n".join(lines)}
             })
 
+    async def _leaderboard_check_loop(self) -> None:
+        """Periodically resync the leaderboard cache with storage."""
+        while True:
+            await asyncio.sleep(self.leaderboard_check_interval)
+            try:
+                await self.storage.verify_leaderboards()
+            except Exception as e:
+                self.logger.error(f"Leaderboard consistency check failed: {e}")
+
     async def _announce_achievement(
         self, 
         channel: str, 
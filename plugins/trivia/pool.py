@@ -0,0 +1,359 @@
+"""
+Trivia Question Pool
+
+Local, persistent pool of questions in front of a QuestionProvider.
+
+Questions are fetched ahead of time by a background prefetcher,
+deduplicated, saved through TriviaStorage and indexed in memory by
+category, difficulty and type. Starting a game is a local read; the
+provider is only called at game start when the pool cannot supply
+enough questions.
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+from .providers.base import QuestionProvider
+from .question import Difficulty, Question, QuestionType
+
+logger = logging.getLogger(__name__)
+
+# (category_id, difficulty, type); category_id is None when unknown
+BucketKey = Tuple[Optional[int], Difficulty, QuestionType]
+
+
+def question_key(question: Question) -> str:
+    """
+    Stable deduplication key for a question.
+
+    Provider IDs are not stable across processes (OpenTDB's are
+    derived from hash()), so the key is a digest of the text.
+    """
+    text = f"{question.question.strip().lower()}\x00{question.correct_answer.strip().lower()}"
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+class QuestionPool:
+    """
+    Question pool with background prefetch and per-channel repeat avoidance.
+
+    Each channel remembers the last ``recent_size`` questions it was asked;
+    ``take`` prefers questions the channel has not seen and only repeats
+    the least recently asked ones when nothing else is available.
+
+    Args:
+        provider: Source of new questions.
+        storage: Optional TriviaStorage for persistence (memory only if None).
+        low_water: Top up a category when a channel has fewer unseen
+            questions than this left in it.
+        batch_size: Questions requested per prefetch.
+        max_size: Largest pool; the oldest questions are evicted beyond it.
+        recent_size: Questions remembered per channel.
+        fetch_interval: Minimum seconds between provider calls
+            (OpenTDB allows one request per 5 seconds).
+    """
+
+    def __init__(
+        self,
+        provider: QuestionProvider,
+        storage=None,
+        low_water: int = 20,
+        batch_size: int = 50,
+        max_size: int = 5000,
+        recent_size: int = 500,
+        fetch_interval: float = 5.0,
+    ):
+        self.provider = provider
+        self.storage = storage
+        self.low_water = low_water
+        self.batch_size = batch_size
+        self.max_size = max_size
+        self.recent_size = recent_size
+        self.fetch_interval = fetch_interval
+        self.prefetch_enabled = True
+
+        self._questions: Dict[str, Question] = {}  # key -> question, oldest first
+        self._row_ids: Dict[str, int] = {}
+        self._buckets: Dict[BucketKey, Dict[str, None]] = {}
+        self._bucket_of: Dict[str, BucketKey] = {}
+        self._category_ids: Dict[str, int] = {}  # category name -> provider id
+        self._recent: Dict[str, "OrderedDict[str, None]"] = {}
+
+        self._wanted: Dict[Optional[int], None] = {}
+        self._prefetch_task: Optional[asyncio.Task] = None
+        self._fetch_lock = asyncio.Lock()
+        self._last_fetch = 0.0
+
+    def __len__(self) -> int:
+        return len(self._questions)
+
+    async def load(self) -> int:
+        """
+        Load persisted questions into the pool.
+
+        Returns:
+            Number of questions loaded.
+        """
+        if not self.storage:
+            return 0
+        rows = await self.storage.load_questions()
+        for row in rows:
+            try:
+                question = Question(
+                    id=row["key"],
+                    category=row.get("category") or "",
+                    difficulty=Difficulty(row["difficulty"]),
+                    type=QuestionType(row["type"]),
+                    question=row["question"],
+                    correct_answer=row["correct_answer"],
+                    incorrect_answers=list(row.get("incorrect_answers") or []),
+                )
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Skipping invalid pooled question {row.get('id')}: {e}")
+                continue
+            if self._index(question, row.get("category_id")) and row.get("id") is not None:
+                self._row_ids[question.id] = row["id"]
+        logger.info(f"Loaded {len(self._questions)} pooled questions")
+        return len(self._questions)
+
+    async def close(self) -> None:
+        """Stop the prefetcher."""
+        self._wanted.clear()
+        if self._prefetch_task:
+            self._prefetch_task.cancel()
+            try:
+                await self._prefetch_task
+            except asyncio.CancelledError:
+                pass
+            self._prefetch_task = None
+
+    def available(
+        self,
+        channel: Optional[str] = None,
+        category: Optional[int] = None,
+        difficulty: Optional[Difficulty] = None,
+        question_type: Optional[QuestionType] = None,
+    ) -> int:
+        """Number of matching questions the channel has not been asked recently."""
+        return len(self._candidates(channel, category, difficulty, question_type))
+
+    async def take(
+        self,
+        channel: str,
+        amount: int,
+        category: Optional[int] = None,
+        difficulty: Optional[Difficulty] = None,
+        question_type: Optional[QuestionType] = None,
+    ) -> List[Question]:
+        """
+        Take questions for a game in a channel.
+
+        Serves unseen questions from the pool; if there are not enough,
+        fetches the shortfall from the provider, then falls back to the
+        channel's least recently asked questions. The questions returned
+        are recorded as asked in the channel, and a prefetch is started
+        if the pool is running low.
+
+        Args:
+            channel: Channel the game is in.
+            amount: Number of questions wanted.
+            category: Optional provider category ID.
+            difficulty: Optional difficulty level.
+            question_type: Optional question format.
+
+        Returns:
+            Up to ``amount`` questions (fresh copies, safe to shuffle).
+
+        Raises:
+            Exception: The provider's error, if it failed and the pool had
+                nothing to serve.
+        """
+        candidates = self._candidates(channel, category, difficulty, question_type)
+        error: Optional[Exception] = None
+
+        if len(candidates) < amount:
+            try:
+                await self._fetch(
+                    amount - len(candidates), category, difficulty, question_type
+                )
+            except Exception as e:
+                logger.warning(f"Provider fetch failed, serving from pool: {e}")
+                error = e
+            candidates = self._candidates(channel, category, difficulty, question_type)
+
+        keys = random.sample(candidates, min(amount, len(candidates)))
+        if len(keys) < amount:
+            # Repeat the questions this channel saw longest ago
+            matching = set(self._candidates(None, category, difficulty, question_type))
+            for key in self._recent.get(channel, ()):
+                if len(keys) >= amount:
+                    break
+                if key in matching:
+                    keys.append(key)
+
+        if not keys and error is not None:
+            raise error
+
+        self._mark_asked(channel, keys)
+        if len(candidates) - len(keys) < self.low_water:
+            self.request_prefetch(category)
+
+        return [replace(self._questions[key]) for key in keys]
+
+    def request_prefetch(self, category: Optional[int] = None) -> None:
+        """Queue a background top-up of a category (None: any category)."""
+        if not self.prefetch_enabled:
+            return
+        self._wanted[category] = None
+        if self._prefetch_task is None or self._prefetch_task.done():
+            self._prefetch_task = asyncio.create_task(self._prefetch_loop())
+
+    async def add(
+        self, questions: List[Question], category: Optional[int] = None
+    ) -> int:
+        """
+        Add questions to the pool, skipping ones already in it.
+
+        Args:
+            questions: Questions from the provider.
+            category: Category ID they were fetched with, if any.
+
+        Returns:
+            Number of new questions added.
+        """
+        added: List[Tuple[Question, Optional[int]]] = []
+        for question in questions:
+            if category is not None and question.category:
+                self._category_ids[question.category] = category
+            category_id = category
+            if category_id is None:
+                category_id = self._category_ids.get(question.category)
+            pooled = replace(question, id=question_key(question))
+            if self._index(pooled, category_id):
+                added.append((pooled, category_id))
+
+        if added and self.storage:
+            try:
+                row_ids = await self.storage.save_questions([
+                    {
+                        "key": q.id,
+                        "category": q.category,
+                        "category_id": category_id,
+                        "difficulty": q.difficulty.value,
+                        "type": q.type.value,
+                        "question": q.question,
+                        "correct_answer": q.correct_answer,
+                        "incorrect_answers": list(q.incorrect_answers),
+                    }
+                    for q, category_id in added
+                ])
+                for (q, _), row_id in zip(added, row_ids):
+                    if row_id is not None and q.id in self._questions:
+                        self._row_ids[q.id] = row_id
+            except Exception as e:
+                logger.error(f"Failed to persist pooled questions: {e}")
+
+        await self._evict()
+        return len(added)
+
+    def _index(self, question: Question, category_id: Optional[int]) -> bool:
+        """Add a question to the in-memory index; False if already present."""
+        key = question.id
+        if key in self._questions:
+            return False
+        bucket = (category_id, question.difficulty, question.type)
+        self._questions[key] = question
+        self._bucket_of[key] = bucket
+        self._buckets.setdefault(bucket, {})[key] = None
+        if category_id is not None and question.category:
+            self._category_ids.setdefault(question.category, category_id)
+        return True
+
+    async def _evict(self) -> None:
+        """Drop the oldest questions beyond max_size."""
+        while len(self._questions) > self.max_size:
+            key = next(iter(self._questions))
+            del self._questions[key]
+            bucket = self._bucket_of.pop(key)
+            del self._buckets[bucket][key]
+            if not self._buckets[bucket]:
+                del self._buckets[bucket]
+            row_id = self._row_ids.pop(key, None)
+            if row_id is not None and self.storage:
+                try:
+                    await self.storage.delete_question(row_id)
+                except Exception as e:
+                    logger.error(f"Failed to delete pooled question {key}: {e}")
+
+    def _candidates(
+        self,
+        channel: Optional[str],
+        category: Optional[int],
+        difficulty: Optional[Difficulty],
+        question_type: Optional[QuestionType],
+    ) -> List[str]:
+        """Keys of matching questions, excluding the channel's recent ones."""
+        recent = self._recent.get(channel, {}) if channel is not None else {}
+        keys: List[str] = []
+        for (bucket_category, bucket_difficulty, bucket_type), bucket in self._buckets.items():
+            if category is not None and bucket_category != category:
+                continue
+            if difficulty is not None and bucket_difficulty != difficulty:
+                continue
+            if question_type is not None and bucket_type != question_type:
+                continue
+            keys.extend(key for key in bucket if key not in recent)
+        return keys
+
+    def _mark_asked(self, channel: str, keys: List[str]) -> None:
+        """Record questions as asked in a channel."""
+        recent = self._recent.setdefault(channel, OrderedDict())
+        for key in keys:
+            recent[key] = None
+            recent.move_to_end(key)
+        while len(recent) > self.recent_size:
+            recent.popitem(last=False)
+
+    async def _fetch(
+        self,
+        amount: int,
+        category: Optional[int] = None,
+        difficulty: Optional[Difficulty] = None,
+        question_type: Optional[QuestionType] = None,
+    ) -> int:
+        """Fetch questions from the provider into the pool, rate limited."""
+        async with self._fetch_lock:
+            wait = self._last_fetch + self.fetch_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                questions = await self.provider.fetch_questions(
+                    amount,
+                    category=category,
+                    difficulty=difficulty,
+                    question_type=question_type,
+                )
+            finally:
+                self._last_fetch = time.monotonic()
+        return await self.add(questions, category)
+
+    async def _prefetch_loop(self) -> None:
+        """Top up each wanted category, one provider call at a time."""
+        while self._wanted:
+            category = next(iter(self._wanted))
+            del self._wanted[category]
+            try:
+                added = await self._fetch(self.batch_size, category)
+                logger.debug(
+                    f"Prefetched {added} new questions (category={category}, pool={len(self)})"
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Prefetch failed (category={category}): {e}")
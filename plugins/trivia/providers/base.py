@@ -7,7 +7,7 @@ Abstract base class for trivia question providers.
 from abc import ABC, abstractmethod
 from typing import List, Optional
 
-from ..question import Difficulty, Question
+from ..question import Difficulty, Question, QuestionType
 
 
 class QuestionProvider(ABC):
@@ -24,6 +24,7 @@ class QuestionProvider(ABC):
         amount: int,
         category: Optional[int] = None,
         difficulty: Optional[Difficulty] = None,
+        question_type: Optional[QuestionType] = None,
     ) -> List[Question]:
         """
         Fetch questions from the provider.
@@ -32,6 +33,7 @@ class QuestionProvider(ABC):
             amount: Number of questions to fetch
             category: Optional category ID to filter by
             difficulty: Optional difficulty level to filter by
+            question_type: Optional question format to filter by
 
         Returns:
             List of Question objects
@@ -93,6 +93,7 @@ class OpenTDBProvider(QuestionProvider):
         amount: int,
         category: Optional[int] = None,
         difficulty: Optional[Difficulty] = None,
+        question_type: Optional[QuestionType] = None,
     ) -> List[Question]:
         """
         Fetch questions from OpenTDB.
@@ -101,20 +102,27 @@ class OpenTDBProvider(QuestionProvider):
             amount: Number of questions (1-50)
             category: Optional category ID
             difficulty: Optional difficulty level
+            question_type: Optional question format (default: multiple choice)
 
         Returns:
             List of Question objects
 
         Raises:
             OpenTDBError: If API returns error
+            ValueError: If question_type is free response
             httpx.HTTPError: If network error occurs
         """
+        if question_type is None:
+            question_type = QuestionType.MULTIPLE_CHOICE
+        if question_type == QuestionType.FREE_RESPONSE:
+            raise ValueError("OpenTDB has no free response questions")
+
         client = await self._get_client()
 
         # Build query parameters
         params = {
             "amount": min(50, max(1, amount)),
-            "type": "multiple",  # Multiple choice only for now
+            "type": question_type.value,
         }
 
         if category is not None:
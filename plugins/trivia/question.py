@@ -5,11 +5,13 @@ Data models for trivia questions and answers.
 """
 
 from dataclasses import dataclass, field
-from difflib import SequenceMatcher
 from enum import Enum
-from typing import Dict, List
+from functools import cached_property
+from typing import Dict, List, Tuple
 import html
 import random
+import re
+import unicodedata
 
 
 class Difficulty(Enum):
@@ -35,6 +37,105 @@ DIFFICULTY_POINTS = {
     Difficulty.HARD: 30,
 }
 
+# Leading words ignored when comparing answers ("The Beatles" == "Beatles")
+ARTICLES = frozenset({"the", "a", "an"})
+
+TRUE_FORMS = frozenset({"t", "true", "yes", "y", "1"})
+FALSE_FORMS = frozenset({"f", "false", "no", "n", "0"})
+
+# Judged guesses remembered per question; a flood of distinct guesses
+# beyond this just stops being cached
+MAX_JUDGED_GUESSES = 4096
+
+_APOSTROPHES = re.compile(r"['\u2018\u2019`]")
+_PUNCTUATION = re.compile(r"[\W_]+")
+
+
+def _answer_words(text: str) -> List[str]:
+    """Case-folded, accent- and punctuation-free words of an answer."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    stripped = _APOSTROPHES.sub("", stripped.replace("&", " and "))
+    return _PUNCTUATION.sub(" ", stripped).split()
+
+
+def normalize_answer(text: str) -> str:
+    """
+    Normalize an answer for comparison.
+
+    Case-folds, strips accents, treats "&" as "and", drops apostrophes,
+    turns other punctuation into spaces and removes a leading article.
+    Answers that are nothing but punctuation are only case-folded.
+
+    Args:
+        text: Answer text
+
+    Returns:
+        Normalized answer, e.g. "Les Misérables!" -> "les miserables"
+    """
+    words = _answer_words(text)
+    if len(words) > 1 and words[0] in ARTICLES:
+        del words[0]
+    return " ".join(words) or text.strip().casefold()
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Bounded edit distance between two strings.
+
+    Insertions and deletions cost 1 and substitutions 2, so
+    ``1 - distance / (len(a) + len(b))`` is the same similarity ratio
+    ``difflib.SequenceMatcher`` reports for typical typos. Only the band
+    of the DP table within ``limit`` of the diagonal is filled, and the
+    computation stops as soon as a row exceeds ``limit``.
+
+    Args:
+        a: First string
+        b: Second string
+        limit: Largest distance of interest
+
+    Returns:
+        The distance, or ``limit + 1`` if it is greater than ``limit``
+    """
+    over = limit + 1
+    if abs(len(a) - len(b)) > limit:
+        return over
+
+    # Common prefix and suffix never change the distance
+    start = 0
+    end_a, end_b = len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return len(a) + len(b)
+
+    width = len(b)
+    previous = [j if j <= limit else over for j in range(width + 1)]
+    for i in range(1, len(a) + 1):
+        char = a[i - 1]
+        current = [over] * (width + 1)
+        if i <= limit:
+            current[0] = i
+        row_min = current[0]
+        for j in range(max(1, i - limit), min(width, i + limit) + 1):
+            if char == b[j - 1]:
+                cost = previous[j - 1]
+            else:
+                cost = min(previous[j], current[j - 1]) + 1
+                if cost > over:
+                    cost = over
+            current[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > limit:
+            return over
+        previous = current
+    return previous[width]
+
 
 @dataclass
 class Question:
@@ -59,11 +160,15 @@ class Question:
     correct_answer: str
     incorrect_answers: List[str]
     _shuffled_answers: List[str] = field(default_factory=list, repr=False)
+    _judged: Dict[Tuple[str, float], bool] = field(
+        default_factory=dict, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         """Initialize shuffled answers after creation."""
         # Create shuffled answer list on first access
         self._shuffled_answers = []
+        self._judged = {}
 
     @property
     def all_answers(self) -> List[str]:
@@ -98,16 +203,37 @@ class Question:
         """Base points for this question based on difficulty."""
         return DIFFICULTY_POINTS.get(self.difficulty, 10)
 
+    @cached_property
+    def normalized_answer(self) -> str:
+        """The correct answer, normalized once per question."""
+        return normalize_answer(self.correct_answer)
+
+    @cached_property
+    def _answer_with_article(self) -> str:
+        """The normalized correct answer keeping a leading article."""
+        return " ".join(_answer_words(self.correct_answer))
+
+    @cached_property
+    def _normalized_choices(self) -> Dict[str, bool]:
+        """Normalized answer choice -> whether it is the correct answer."""
+        choices = {normalize_answer(a): False for a in self.incorrect_answers}
+        choices[self.normalized_answer] = True
+        return choices
+
     def check_answer(self, answer: str, fuzzy_threshold: float = 0.85) -> bool:
         """
         Check if answer is correct.
 
         Handles:
-        - Case insensitivity
+        - Case, accents, punctuation and leading articles
         - Letter answers (A, B, C, D) for multiple choice
         - Full text answers
         - Fuzzy matching for free response
 
+        Answers are compared in normalized form (see ``normalize_answer``);
+        the question's own answers are normalized once, and each distinct
+        guess is judged once and then served from a per-question cache.
+
         Args:
             answer: The submitted answer
             fuzzy_threshold: Minimum similarity ratio for fuzzy match (0-1)
@@ -119,44 +245,55 @@ class Question:
         if not answer:
             return False
 
-        normalized_answer = answer.lower()
-        normalized_correct = self.correct_answer.lower()
-
-        # 1. Exact match (case insensitive)
-        if normalized_answer == normalized_correct:
+        key = (answer, fuzzy_threshold)
+        judged = self._judged.get(key)
+        if judged is None:
+            judged = self._judge(answer, fuzzy_threshold)
+            if len(self._judged) < MAX_JUDGED_GUESSES:
+                self._judged[key] = judged
+        return judged
+
+    def _judge(self, answer: str, fuzzy_threshold: float) -> bool:
+        """Uncached body of check_answer for a stripped, non-empty answer."""
+        has_choices = self.type in (QuestionType.MULTIPLE_CHOICE, QuestionType.TRUE_FALSE)
+        guess = normalize_answer(answer)
+        correct = self.normalized_answer
+
+        # 1. Exact match
+        if guess == correct:
             return True
 
         # 2. Letter answer (A, B, C, D) for multiple choice
-        if (
-            self.type in (QuestionType.MULTIPLE_CHOICE, QuestionType.TRUE_FALSE)
-            and len(answer) == 1
-            and answer.upper() in self.answer_map
-        ):
-            letter_answer = self.answer_map[answer.upper()]
-            return letter_answer.lower() == normalized_correct
+        if has_choices and len(answer) == 1 and answer.upper() in self.answer_map:
+            return normalize_answer(self.answer_map[answer.upper()]) == correct
 
         # 3. For true/false, accept various forms
         if self.type == QuestionType.TRUE_FALSE:
-            true_forms = {"t", "true", "yes", "y", "1"}
-            false_forms = {"f", "false", "no", "n", "0"}
-
-            if normalized_correct in ["true", "yes"]:
-                return normalized_answer in true_forms
-            elif normalized_correct in ["false", "no"]:
-                return normalized_answer in false_forms
-
-        # 4. Full text match against any answer choice
-        if self.type in (QuestionType.MULTIPLE_CHOICE, QuestionType.TRUE_FALSE):
-            for choice in self.all_answers:
-                if normalized_answer == choice.lower():
-                    return choice.lower() == normalized_correct
-
-        # 5. Fuzzy matching for free response
-        ratio = SequenceMatcher(None, normalized_answer, normalized_correct).ratio()
-        if ratio >= fuzzy_threshold:
-            return True
+            if correct in ("true", "yes"):
+                return guess in TRUE_FORMS
+            elif correct in ("false", "no"):
+                return guess in FALSE_FORMS
 
-        return False
+        # 4. Full text match against a wrong answer choice
+        if has_choices and guess in self._normalized_choices:
+            return False
+
+        # 5. Fuzzy matching for free response; a typo in a leading
+        # article ("Teh Beatles") defeats article stripping, so also
+        # compare the forms that keep it
+        if self._is_close(guess, correct, fuzzy_threshold):
+            return True
+        full_correct = self._answer_with_article
+        if not full_correct or full_correct == correct:
+            return False
+        return self._is_close(" ".join(_answer_words(answer)), full_correct, fuzzy_threshold)
+
+    @staticmethod
+    def _is_close(guess: str, correct: str, fuzzy_threshold: float) -> bool:
+        """Whether two normalized answers are at least fuzzy_threshold similar."""
+        total = len(guess) + len(correct)
+        limit = int((1 - fuzzy_threshold) * total + 1e-9)
+        return edit_distance(guess, correct, limit) <= limit
 
     def format_for_display(self) -> str:
         """
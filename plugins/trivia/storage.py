@@ -2,7 +2,12 @@ import json
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional, Tuple, Any, Dict
+from typing import TYPE_CHECKING, List, Optional, Tuple, Any, Dict
+
+from .leaderboard import LeaderboardCache
+
+if TYPE_CHECKING:
+    from .game import PlayerScore
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +69,29 @@ class TriviaStorage:
     """Database operations for trivia persistence via NATS."""
     
     PLUGIN_NAME = "trivia"
+
+    # Steps per rosey.db.row.trivia.batch request (the service's limit)
+    BATCH_STEPS = 1000
+
+    # Initial values for a new user_stats row
+    USER_STATS_DEFAULTS = {
+        "total_games": 0,
+        "games_won": 0,
+        "total_questions": 0,
+        "correct_answers": 0,
+        "total_points": 0,
+        "current_answer_streak": 0,
+        "best_answer_streak": 0,
+        "current_win_streak": 0,
+        "best_win_streak": 0
+    }
+
+    # Fields read back from writes: what the channel leaderboards and the
+    # favorite-category pick use
+    CHANNEL_BOARD_FIELDS = [
+        "channel", "user_id", "total_points", "games_played", "correct_answers"
+    ]
+    CATEGORY_RANK_FIELDS = ["category", "questions_seen"]
     
     # Schemas matching Alembic migration
     SCHEMAS = {
@@ -120,11 +148,24 @@ class TriviaStorage:
                 {"name": "questions_seen", "type": "integer"},
                 {"name": "correct_answers", "type": "integer"},
             ]
+        },
+        "questions": {
+            "fields": [
+                {"name": "key", "type": "string", "required": True},
+                {"name": "category", "type": "string"},
+                {"name": "category_id", "type": "integer"},
+                {"name": "difficulty", "type": "string", "required": True},
+                {"name": "type", "type": "string", "required": True},
+                {"name": "question", "type": "text", "required": True},
+                {"name": "correct_answer", "type": "text", "required": True},
+                {"name": "incorrect_answers", "type": "text"},
+            ]
         }
     }
     
     def __init__(self, nats_client):
         self.nc = nats_client
+        self.leaderboards = LeaderboardCache()
         
     async def register_schemas(self) -> None:
         """Register all table schemas."""
@@ -185,7 +226,11 @@ class TriviaStorage:
         if not rows:
             return None
             
-        row = rows[0]
+        return self._row_to_user_stats(rows[0])
+
+    @staticmethod
+    def _row_to_user_stats(row: Dict[str, Any]) -> UserStats:
+        """Build UserStats from a user_stats row."""
         return UserStats(
             user_id=row["user_id"],
             total_games=row.get("total_games", 0),
@@ -212,18 +257,7 @@ class TriviaStorage:
             f"rosey.db.row.{self.PLUGIN_NAME}.insert",
             {
                 "table": "user_stats",
-                "data": {
-                    "user_id": user_id,
-                    "total_games": 0,
-                    "games_won": 0,
-                    "total_questions": 0,
-                    "correct_answers": 0,
-                    "total_points": 0,
-                    "current_answer_streak": 0,
-                    "best_answer_streak": 0,
-                    "current_win_streak": 0,
-                    "best_win_streak": 0
-                }
+                "data": {"user_id": user_id, **self.USER_STATS_DEFAULTS}
             }
         )
         return result["id"]
@@ -237,55 +271,18 @@ class TriviaStorage:
         won_game: bool,
         fastest_ms: Optional[int] = None,
     ) -> Optional[UserStats]:
-        """Update user stats after a game."""
-        row_id = await self.ensure_user_stats(user_id)
-        
-        # Prepare atomic updates
-        operations = {
-            "total_games": {"$inc": 1},
-            "games_won": {"$inc": 1 if won_game else 0},
-            "total_questions": {"$inc": questions_answered},
-            "correct_answers": {"$inc": correct_answers},
-            "total_points": {"$inc": points_earned},
-        }
-        
-        # For streaks, we need to read current state first because logic is complex
-        # (reset on loss vs increment on win)
-        # But wait, this method is called at GAME END.
-        # Win streak logic:
-        if won_game:
-            # We can't do "current_win_streak + 1" and "max(best, current)" atomically easily
-            # without reading.
-            # Let's read the current stats first.
-            stats = await self.get_user_stats(user_id)
-            if stats:
-                new_current = stats.current_win_streak + 1
-                new_best = max(stats.best_win_streak, new_current)
-                operations["current_win_streak"] = {"$set": new_current}
-                operations["best_win_streak"] = {"$set": new_best}
-        else:
-            operations["current_win_streak"] = {"$set": 0}
-            
-        if fastest_ms is not None:
-            # We want min(existing, new) but existing might be null.
-            # $min operator handles null? Probably not safely.
-            # Let's read stats.
-            stats = await self.get_user_stats(user_id)
-            if stats:
-                if stats.fastest_answer_ms is None or fastest_ms < stats.fastest_answer_ms:
-                    operations["fastest_answer_ms"] = {"$set": fastest_ms}
-
-        await self._request(
-            f"rosey.db.row.{self.PLUGIN_NAME}.update",
-            {
-                "table": "user_stats",
-                "id": row_id,
-                "operations": operations
-            }
+        """Update user stats after a game (one round trip)."""
+        steps = self._user_game_steps(
+            user_id, questions_answered, correct_answers, points_earned,
+            won_game, fastest_ms
         )
-        
-        return await self.get_user_stats(user_id)
-    
+        results = await self._batch(steps)
+        rows = results[-1].get("rows", [])
+        if not rows:
+            return None
+        self.leaderboards.update_user(rows[0])
+        return self._row_to_user_stats(rows[0])
+
     async def update_streak(
         self, 
         user_id: str, 
@@ -295,35 +292,232 @@ class TriviaStorage:
         Update answer streak.
         Returns (current_streak, best_streak).
         """
-        row_id = await self.ensure_user_stats(user_id)
-        
-        # Read current stats to calculate new streaks
-        # (Atomic operations for "set to 0 if X else inc" are hard)
-        stats = await self.get_user_stats(user_id)
+        stats = await self.record_answer_streak(user_id, correct)
         if not stats:
             return 0, 0
-            
-        if correct:
-            new_current = stats.current_answer_streak + 1
-            new_best = max(stats.best_answer_streak, new_current)
-        else:
-            new_current = 0
-            new_best = stats.best_answer_streak
-            
-        await self._request(
-            f"rosey.db.row.{self.PLUGIN_NAME}.update",
+        return stats.current_answer_streak, stats.best_answer_streak
+
+    async def record_answer_streak(
+        self,
+        user_id: str,
+        correct: bool
+    ) -> Optional[UserStats]:
+        """
+        Update the answer streak atomically and return the updated stats.
+
+        One round trip: increment (or reset) the current streak, then
+        raise the best streak to it.
+        """
+        results = await self._batch([
             {
                 "table": "user_stats",
-                "id": row_id,
-                "data": {
-                    "current_answer_streak": new_current,
-                    "best_answer_streak": new_best
+                "match": {"user_id": user_id},
+                "insert": dict(self.USER_STATS_DEFAULTS),
+                "operations": {
+                    "current_answer_streak": {"$inc": 1} if correct else {"$set": 0}
                 }
+            },
+            {
+                "table": "user_stats",
+                "match": {"user_id": user_id},
+                "operations": {
+                    "best_answer_streak": {"$max": {"$field": "current_answer_streak"}}
+                },
+                "returning": True
+            }
+        ])
+        rows = results[-1].get("rows", [])
+        return self._row_to_user_stats(rows[0]) if rows else None
+
+    async def commit_game(
+        self,
+        game_id: str,
+        channel: str,
+        players: List["PlayerScore"],
+        winner_id: Optional[str],
+    ) -> Dict[str, UserStats]:
+        """
+        Commit a finished game's results.
+
+        Records the game end and applies every player's user, channel and
+        category stat changes with atomic operators in one batch request,
+        plus one more request if any favorite category changed. The number
+        of round trips does not depend on the number of players (up to
+        BATCH_STEPS steps per request). The leaderboards are updated from
+        the rows written.
+
+        Args:
+            game_id: Game identifier
+            channel: Channel the game was played in
+            players: Final leaderboard (PlayerScore objects)
+            winner_id: Winning user, if any
+
+        Returns:
+            Updated stats by user ID.
+        """
+        game_step = {
+            "table": "games",
+            "match": {"game_id": game_id},
+            "data": {
+                "num_players": len(players),
+                "winner_id": winner_id,
+                "ended_at": datetime.utcnow().isoformat(),
+                "status": "completed"
             }
+        }
+
+        # Steps per player; the user row is read back by the last user step
+        # and the category rows by the last step
+        groups = []
+        for player in players:
+            won = player.user == winner_id
+            fastest_ms = int(player.fastest_time * 1000) if player.fastest_time else None
+            steps = self._user_game_steps(
+                player.user, player.total_answers, player.correct_answers,
+                player.score, won, fastest_ms
+            )
+            user_index = len(steps) - 1
+            steps.append({
+                "table": "channel_stats",
+                "match": {"user_id": player.user, "channel": channel},
+                "insert": {
+                    "games_played": 0, "games_won": 0,
+                    "total_points": 0, "correct_answers": 0
+                },
+                "operations": {
+                    "games_played": {"$inc": 1},
+                    "games_won": {"$inc": 1 if won else 0},
+                    "total_points": {"$inc": player.score},
+                    "correct_answers": {"$inc": player.correct_answers}
+                },
+                "returning": self.CHANNEL_BOARD_FIELDS
+            })
+            categories = getattr(player, "categories", None) or {}
+            for category, (seen, correct) in categories.items():
+                steps.append({
+                    "table": "category_stats",
+                    "match": {"user_id": player.user, "category": category},
+                    "insert": {"questions_seen": 0, "correct_answers": 0},
+                    "operations": {
+                        "questions_seen": {"$inc": seen},
+                        "correct_answers": {"$inc": correct}
+                    }
+                })
+            if categories:
+                steps.append({
+                    "table": "category_stats",
+                    "match": {"user_id": player.user},
+                    "returning": self.CATEGORY_RANK_FIELDS
+                })
+            groups.append((player.user, user_index, len(categories) > 0, steps))
+
+        stats: Dict[str, UserStats] = {}
+        favorites: Dict[str, str] = {}
+        batch, members = [game_step], []
+        for group in groups + [None]:
+            if group is not None and (
+                not members or len(batch) + len(group[3]) <= self.BATCH_STEPS
+            ):
+                batch.extend(group[3])
+                members.append(group)
+                continue
+
+            results = await self._batch(batch)
+            offset = len(batch) - sum(len(g[3]) for g in members)
+            for user_id, user_index, has_categories, steps in members:
+                group_results = results[offset:offset + len(steps)]
+                offset += len(steps)
+                if len(group_results) < len(steps):
+                    continue
+                for row in group_results[user_index + 1].get("rows", []):
+                    self.leaderboards.update_channel(row)
+                user_rows = group_results[user_index].get("rows", [])
+                if not user_rows:
+                    continue
+                self.leaderboards.update_user(user_rows[0])
+                stats[user_id] = self._row_to_user_stats(user_rows[0])
+                if has_categories:
+                    favorite = self._favorite_category(group_results[-1].get("rows", []))
+                    if favorite and favorite != stats[user_id].favorite_category:
+                        favorites[user_id] = favorite
+
+            if group is None:
+                break
+            batch, members = list(group[3]), [group]
+
+        if favorites:
+            await self._batch([
+                {
+                    "table": "user_stats",
+                    "match": {"user_id": user_id},
+                    "data": {"favorite_category": favorite}
+                }
+                for user_id, favorite in favorites.items()
+            ])
+            for user_id, favorite in favorites.items():
+                stats[user_id].favorite_category = favorite
+
+        return stats
+
+    def _user_game_steps(
+        self,
+        user_id: str,
+        questions_answered: int,
+        correct_answers: int,
+        points_earned: int,
+        won_game: bool,
+        fastest_ms: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Batch steps applying one game's result to a user's stats."""
+        operations = {
+            "total_games": {"$inc": 1},
+            "games_won": {"$inc": 1 if won_game else 0},
+            "total_questions": {"$inc": questions_answered},
+            "correct_answers": {"$inc": correct_answers},
+            "total_points": {"$inc": points_earned},
+            # Win streak continues on a win, resets on a loss
+            "current_win_streak": {"$inc": 1} if won_game else {"$set": 0},
+        }
+        if fastest_ms is not None:
+            # Keeps the existing value unless faster (or unset)
+            operations["fastest_answer_ms"] = {"$min": fastest_ms}
+
+        steps = [{
+            "table": "user_stats",
+            "match": {"user_id": user_id},
+            "insert": dict(self.USER_STATS_DEFAULTS),
+            "operations": operations
+        }]
+        if won_game:
+            # Compare against the streak as just updated by the step above
+            steps.append({
+                "table": "user_stats",
+                "match": {"user_id": user_id},
+                "operations": {
+                    "best_win_streak": {"$max": {"$field": "current_win_streak"}}
+                }
+            })
+        steps[-1]["returning"] = True
+        return steps
+
+    @staticmethod
+    def _favorite_category(rows: List[dict]) -> Optional[str]:
+        """Category with the most questions seen (earliest row on ties)."""
+        best = None
+        for row in rows:
+            if best is None or (row.get("questions_seen") or 0) > (best.get("questions_seen") or 0):
+                best = row
+        return best["category"] if best else None
+
+    async def _batch(self, steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run row steps in one transaction; returns the per-step results."""
+        result = await self._request(
+            f"rosey.db.row.{self.PLUGIN_NAME}.batch",
+            {"steps": steps}
         )
-        
-        return new_current, new_best
-    
+        return result.get("results", [])
+
+
     async def update_channel_stats(
         self,
         user_id: str,
@@ -332,47 +526,33 @@ class TriviaStorage:
         correct: int,
         won: bool,
     ) -> None:
-        """Update channel-specific stats."""
-        row_id = await self._get_row_id("channel_stats", {"user_id": user_id, "channel": channel})
-        
-        if row_id:
-            # Update existing
-            await self._request(
-                f"rosey.db.row.{self.PLUGIN_NAME}.update",
-                {
-                    "table": "channel_stats",
-                    "id": row_id,
-                    "operations": {
-                        "games_played": {"$inc": 1},
-                        "games_won": {"$inc": 1 if won else 0},
-                        "total_points": {"$inc": points},
-                        "correct_answers": {"$inc": correct}
-                    }
-                }
-            )
-        else:
-            # Create new
-            await self._request(
-                f"rosey.db.row.{self.PLUGIN_NAME}.insert",
-                {
-                    "table": "channel_stats",
-                    "data": {
-                        "user_id": user_id,
-                        "channel": channel,
-                        "games_played": 1,
-                        "games_won": 1 if won else 0,
-                        "total_points": points,
-                        "correct_answers": correct
-                    }
-                }
-            )
-    
+        """Update channel-specific stats (one round trip)."""
+        results = await self._batch([{
+            "table": "channel_stats",
+            "match": {"user_id": user_id, "channel": channel},
+            "insert": {
+                "games_played": 0, "games_won": 0,
+                "total_points": 0, "correct_answers": 0
+            },
+            "operations": {
+                "games_played": {"$inc": 1},
+                "games_won": {"$inc": 1 if won else 0},
+                "total_points": {"$inc": points},
+                "correct_answers": {"$inc": correct}
+            },
+            "returning": self.CHANNEL_BOARD_FIELDS
+        }])
+        for row in results[0].get("rows", []) if results else []:
+            self.leaderboards.update_channel(row)
+
     async def get_channel_leaderboard(
         self, 
         channel: str, 
         limit: int = 10
     ) -> List[LeaderboardEntry]:
-        """Get top players for a channel."""
+        """Get top players for a channel (from the cache once loaded)."""
+        if self.leaderboards.loaded:
+            return self._entries(self.leaderboards.top(channel, limit))
         result = await self._request(
             f"rosey.db.row.{self.PLUGIN_NAME}.search",
             {
@@ -399,7 +579,9 @@ class TriviaStorage:
         self, 
         limit: int = 10
     ) -> List[LeaderboardEntry]:
-        """Get top players globally."""
+        """Get top players globally (from the cache once loaded)."""
+        if self.leaderboards.loaded:
+            return self._entries(self.leaderboards.top(None, limit))
         result = await self._request(
             f"rosey.db.row.{self.PLUGIN_NAME}.search",
             {
@@ -421,6 +603,44 @@ class TriviaStorage:
             for i, row in enumerate(rows)
         ]
     
+    async def get_user_rank(
+        self,
+        user_id: str,
+        channel: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Get a user's leaderboard rank, globally or in a channel.
+        Returns None if the user is unranked or the cache is not loaded.
+        """
+        if not self.leaderboards.loaded:
+            return None
+        return self.leaderboards.rank(user_id, channel)
+
+    async def load_leaderboards(self) -> None:
+        """Build the leaderboard cache from storage."""
+        await self.leaderboards.load(self)
+
+    async def verify_leaderboards(self) -> int:
+        """
+        Check the leaderboard cache against storage and resync it.
+        Returns the number of entries that differed.
+        """
+        return await self.leaderboards.verify(self)
+
+    @staticmethod
+    def _entries(ranked: List[Tuple[int, str, Tuple[int, int, int]]]) -> List[LeaderboardEntry]:
+        """LeaderboardEntry objects from cached (rank, user_id, score) tuples."""
+        return [
+            LeaderboardEntry(
+                rank=rank,
+                user_id=user_id,
+                total_points=points,
+                games_played=games,
+                correct_answers=correct
+            )
+            for rank, user_id, (points, games, correct) in ranked
+        ]
+
     async def record_game_start(
         self,
         game_id: str,
@@ -563,3 +783,62 @@ class TriviaStorage:
                     "data": {"favorite_category": fav_cat}
                 }
             )
+
+    async def search_all(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 1000
+    ) -> List[dict]:
+        """Load every matching row, oldest first, a page at a time."""
+        rows: List[dict] = []
+        offset = 0
+        while True:
+            payload: Dict[str, Any] = {
+                "table": table,
+                "sort": {"field": "id", "order": "asc"},
+                "limit": page_size,
+                "offset": offset
+            }
+            if filters:
+                payload["filters"] = filters
+            result = await self._request(
+                f"rosey.db.row.{self.PLUGIN_NAME}.search", payload
+            )
+            page = result.get("rows", [])
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            offset += page_size
+
+    async def load_questions(self, page_size: int = 500) -> List[dict]:
+        """Load every pooled question, oldest first, a page at a time."""
+        rows = await self.search_all("questions", page_size=page_size)
+        for row in rows:
+            row["incorrect_answers"] = json.loads(row.get("incorrect_answers") or "[]")
+        return rows
+
+    async def save_questions(self, questions: List[dict]) -> List[Optional[int]]:
+        """
+        Insert pooled questions in one request.
+        Returns the new row IDs (None where the database did not report one).
+        """
+        if not questions:
+            return []
+        data = [
+            {**q, "incorrect_answers": json.dumps(q.get("incorrect_answers", []))}
+            for q in questions
+        ]
+        result = await self._request(
+            f"rosey.db.row.{self.PLUGIN_NAME}.insert",
+            {"table": "questions", "data": data}
+        )
+        ids = result.get("ids") or []
+        return list(ids) + [None] * (len(data) - len(ids))
+
+    async def delete_question(self, row_id: int) -> None:
+        """Delete a pooled question."""
+        await self._request(
+            f"rosey.db.row.{self.PLUGIN_NAME}.delete",
+            {"table": "questions", "id": row_id}
+        )
@@ -112,4 +112,5 @@ def plugin_config():
         "default_questions": 3,
         "points_decay": True,
         "emit_events": True,
+        "prefetch": False,
     }
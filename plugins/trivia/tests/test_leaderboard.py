@@ -0,0 +1,172 @@
+"""
+Tests for the trivia leaderboard cache.
+"""
+
+import random
+
+import pytest
+
+from trivia.leaderboard import LeaderboardCache, RankedScores
+
+
+def expected_order(scores):
+    return sorted(scores, key=lambda user: (-scores[user][0], user))
+
+
+class FakeStorage:
+    """search_all() over in-memory tables."""
+
+    def __init__(self, tables=None):
+        self.tables = tables or {"user_stats": [], "channel_stats": []}
+        self.on_search = None
+
+    async def search_all(self, table, filters=None, page_size=1000):
+        if self.on_search:
+            self.on_search(table)
+        return [dict(row) for row in self.tables[table]]
+
+
+def user_row(user_id, points, games=1, correct=0):
+    return {
+        "user_id": user_id, "total_points": points,
+        "total_games": games, "correct_answers": correct
+    }
+
+
+def channel_row(channel, user_id, points, games=1, correct=0):
+    return {
+        "channel": channel, "user_id": user_id, "total_points": points,
+        "games_played": games, "correct_answers": correct
+    }
+
+
+class TestRankedScores:
+    """Test the indexable skip list."""
+
+    def test_order_and_rank(self):
+        board = RankedScores()
+        board.set("carol", 30, 1, 3)
+        board.set("alice", 50, 2, 5)
+        board.set("bob", 30, 1, 2)
+
+        assert [user for _, user, _ in board.top(10)] == ["alice", "bob", "carol"]
+        assert board.rank("alice") == 1
+        assert board.rank("carol") == 3
+        assert board.rank("dave") is None
+        assert board.top(1)[0] == (1, "alice", (50, 2, 5))
+
+    def test_update_moves_entry(self):
+        board = RankedScores()
+        for i, user in enumerate(["a", "b", "c", "d"]):
+            board.set(user, i * 10, 1, 0)
+
+        board.set("a", 100, 2, 1)
+        board.set("d", 30, 2, 5)
+
+        assert [user for _, user, _ in board.top(10)] == ["a", "d", "c", "b"]
+        assert board.get("d") == (30, 2, 5)
+        assert len(board) == 4
+
+    def test_top_with_offset(self):
+        board = RankedScores()
+        for i in range(20):
+            board.set(f"u{i:02d}", i, 1, 0)
+
+        page = board.top(5, offset=10)
+
+        assert [rank for rank, _, _ in page] == [11, 12, 13, 14, 15]
+        assert [user for _, user, _ in page] == ["u09", "u08", "u07", "u06", "u05"]
+        assert board.top(5, offset=30) == []
+
+    def test_matches_sorted_reference(self):
+        rng = random.Random(47)
+        board = RankedScores()
+        scores = {}
+        for _ in range(3000):
+            user = f"user{rng.randrange(300)}"
+            if rng.random() < 0.1:
+                assert board.remove(user) == (scores.pop(user, None) is not None)
+            else:
+                scores[user] = (rng.randrange(500), 1, 0)
+                board.set(user, *scores[user])
+
+        order = expected_order(scores)
+        assert [user for _, user, _ in board.top(len(order) + 5)] == order
+        for position, user in enumerate(order, 1):
+            assert board.rank(user) == position
+        assert [user for _, user, _ in board.top(7, offset=100)] == order[100:107]
+
+
+class TestLeaderboardCache:
+    """Test loading, updates and consistency checks."""
+
+    @pytest.mark.asyncio
+    async def test_load(self):
+        storage = FakeStorage({
+            "user_stats": [user_row("alice", 50), user_row("bob", 70)],
+            "channel_stats": [
+                channel_row("lobby", "alice", 40),
+                channel_row("lobby", "bob", 10),
+                channel_row("quiz", "bob", 60),
+            ],
+        })
+        cache = LeaderboardCache()
+
+        await cache.load(storage)
+
+        assert cache.loaded
+        assert [user for _, user, _ in cache.top()] == ["bob", "alice"]
+        assert [user for _, user, _ in cache.top("lobby")] == ["alice", "bob"]
+        assert cache.rank("bob", "quiz") == 1
+        assert cache.top("nowhere") == []
+        assert cache.rank("alice", "nowhere") is None
+
+    @pytest.mark.asyncio
+    async def test_updates_from_rows(self):
+        cache = LeaderboardCache()
+        await cache.load(FakeStorage())
+
+        cache.update_user(user_row("alice", 10))
+        cache.update_user(user_row("bob", 20))
+        cache.update_user(user_row("alice", 30, games=2))
+        cache.update_channel(channel_row("lobby", "alice", 30, games=2))
+
+        assert cache.top() == [(1, "alice", (30, 2, 0)), (2, "bob", (20, 1, 0))]
+        assert cache.rank("alice", "lobby") == 1
+
+    @pytest.mark.asyncio
+    async def test_verify_resyncs_with_storage(self):
+        storage = FakeStorage({
+            "user_stats": [user_row("alice", 50)],
+            "channel_stats": [channel_row("lobby", "alice", 50)],
+        })
+        cache = LeaderboardCache()
+        await cache.load(storage)
+
+        # A write the cache missed, and a stale cached entry
+        storage.tables["user_stats"].append(user_row("bob", 80))
+        cache.update_channel(channel_row("old", "carol", 5))
+
+        assert await cache.verify(storage) == 2
+        assert cache.rank("bob") == 1
+        assert "old" not in cache.channels
+        assert await cache.verify(storage) == 0
+
+    @pytest.mark.asyncio
+    async def test_verify_keeps_concurrent_updates(self):
+        storage = FakeStorage({
+            "user_stats": [user_row("alice", 50)],
+            "channel_stats": [],
+        })
+        cache = LeaderboardCache()
+        await cache.load(storage)
+
+        def game_ends(table):
+            if table == "channel_stats":
+                cache.update_user(user_row("alice", 90, games=2))
+
+        storage.on_search = game_ends
+        mismatches = await cache.verify(storage)
+
+        assert mismatches == 0
+        assert cache.global_board.get("alice") == (90, 2, 0)
@@ -2,6 +2,7 @@
 Tests for trivia plugin integration.
 """
 
+import asyncio
 import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock
@@ -59,8 +60,23 @@ class TestTriviaPluginLifecycle:
         assert plugin._initialized is False
         assert len(plugin._subscriptions) == 0
         assert len(plugin.active_games) == 0
+        assert plugin._leaderboard_task is None
         mock_game.stop.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_leaderboard_check_loop(self, mock_nats):
+        """Test leaderboards are periodically checked against storage."""
+        plugin = TriviaPlugin(mock_nats, {"leaderboard_check_interval": 0.01})
+        plugin.storage = MagicMock()
+        plugin.storage.verify_leaderboards = AsyncMock(side_effect=[RuntimeError("down"), 0, 0])
+
+        task = asyncio.create_task(plugin._leaderboard_check_loop())
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        # Keeps checking after a failure
+        assert plugin.storage.verify_leaderboards.await_count >= 2
+
 
 class TestHandleStart:
     """Test !trivia start command handler."""
@@ -184,6 +200,31 @@ class TestHandleStart:
         await plugin.shutdown()
 
 
+    @pytest.mark.asyncio
+    async def test_start_served_from_pool(self, mock_nats, plugin_config, mock_msg, sample_questions):
+        """Test a warm pool starts the game without calling the provider."""
+        plugin = TriviaPlugin(mock_nats, plugin_config)
+        await plugin.initialize()
+
+        await plugin.pool.add(sample_questions)
+        plugin.provider.fetch_questions = AsyncMock()
+
+        mock_msg.data = json.dumps({
+            "channel": "lobby",
+            "user": "player1",
+            "args": "3",
+        }).encode()
+
+        await plugin._handle_start(mock_msg)
+
+        response = json.loads(mock_msg.respond.call_args[0][0])
+        assert response["success"] is True
+        assert response["result"]["questions"] == 3
+        plugin.provider.fetch_questions.assert_not_called()
+
+        await plugin.shutdown()
+
+
 class TestHandleStop:
     """Test !trivia stop command handler."""
 
@@ -223,6 +264,8 @@ class TestHandleStop:
         response = json.loads(mock_msg.respond.call_args[0][0])
         assert response["success"] is True
         assert "stopped" in response["result"]["message"]
+        assert "lobby" not in plugin.active_games
+        assert "lobby" not in plugin.game_starters
 
         await plugin.shutdown()
 
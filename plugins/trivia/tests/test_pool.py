@@ -0,0 +1,322 @@
+"""
+Tests for the trivia question pool.
+"""
+
+import asyncio
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from trivia.pool import QuestionPool, question_key
+from trivia.providers.base import QuestionProvider
+from trivia.question import Difficulty, Question, QuestionType
+from trivia.storage import TriviaStorage
+
+
+def make_question(
+    n,
+    category="General Knowledge",
+    difficulty=Difficulty.EASY,
+    question_type=QuestionType.MULTIPLE_CHOICE,
+):
+    return Question(
+        id=f"p{n}",
+        category=category,
+        difficulty=difficulty,
+        type=question_type,
+        question=f"Question number {n}?",
+        correct_answer=f"Answer {n}",
+        incorrect_answers=["W", "X", "Y"],
+    )
+
+
+class FakeProvider(QuestionProvider):
+    """Offline provider serving numbered questions in order."""
+
+    def __init__(self, category_names=None):
+        self.calls = []
+        self.next = 0
+        self.error = None
+        self.category_names = category_names or {}
+
+    async def fetch_questions(
+        self, amount, category=None, difficulty=None, question_type=None
+    ):
+        self.calls.append((amount, category, difficulty, question_type))
+        if self.error:
+            raise self.error
+        name = self.category_names.get(category, "General Knowledge")
+        questions = [
+            make_question(
+                self.next + i,
+                name,
+                difficulty or Difficulty.EASY,
+                question_type or QuestionType.MULTIPLE_CHOICE,
+            )
+            for i in range(amount)
+        ]
+        self.next += amount
+        return questions
+
+    async def get_categories(self):
+        return []
+
+
+@pytest.fixture
+def provider():
+    return FakeProvider({17: "Science & Nature"})
+
+
+@pytest.fixture
+def pool(provider):
+    pool = QuestionPool(provider, low_water=5, batch_size=10, fetch_interval=0)
+    pool.prefetch_enabled = False
+    return pool
+
+
+class TestTake:
+    """Test serving questions from the pool."""
+
+    @pytest.mark.asyncio
+    async def test_cold_pool_fetches_shortfall(self, pool, provider):
+        questions = await pool.take("lobby", 3)
+
+        assert len(questions) == 3
+        assert provider.calls == [(3, None, None, None)]
+        assert len(pool) == 3
+
+    @pytest.mark.asyncio
+    async def test_warm_pool_is_local(self, pool, provider):
+        await pool.add([make_question(i) for i in range(10)])
+
+        questions = await pool.take("lobby", 5)
+
+        assert len(questions) == 5
+        assert provider.calls == []
+
+    @pytest.mark.asyncio
+    async def test_no_repeats_per_channel(self, pool, provider):
+        await pool.add([make_question(i) for i in range(10)])
+
+        first = await pool.take("lobby", 5)
+        second = await pool.take("lobby", 5)
+        other = await pool.take("other", 10)
+
+        assert not {q.id for q in first} & {q.id for q in second}
+        assert len({q.id for q in other}) == 10
+        assert provider.calls == []
+
+    @pytest.mark.asyncio
+    async def test_repeats_oldest_when_provider_fails(self, pool, provider):
+        await pool.add([make_question(i) for i in range(4)])
+        first = await pool.take("lobby", 2)
+        await pool.take("lobby", 2)
+        provider.error = ConnectionError("offline")
+
+        questions = await pool.take("lobby", 2)
+
+        assert {q.id for q in questions} == {q.id for q in first}
+
+    @pytest.mark.asyncio
+    async def test_empty_pool_raises_provider_error(self, pool, provider):
+        provider.error = ConnectionError("offline")
+
+        with pytest.raises(ConnectionError):
+            await pool.take("lobby", 3)
+
+    @pytest.mark.asyncio
+    async def test_filters_by_category_and_difficulty(self, pool, provider):
+        await pool.add([make_question(i) for i in range(5)])
+        await pool.add(
+            [make_question(i, "Science & Nature", Difficulty.HARD) for i in range(5, 10)],
+            category=17,
+        )
+
+        science = await pool.take("lobby", 5, category=17)
+        hard = await pool.take("other", 10, difficulty=Difficulty.HARD)
+
+        assert {q.category for q in science} == {"Science & Nature"}
+        assert {q.difficulty for q in hard} == {Difficulty.HARD}
+        assert len(hard) == 5
+        assert provider.calls == [(5, None, Difficulty.HARD, None)]
+
+    @pytest.mark.asyncio
+    async def test_shortfall_fetch_honours_question_type(self, pool, provider):
+        await pool.add([make_question(i) for i in range(100, 110)])
+
+        questions = await pool.take("lobby", 3, question_type=QuestionType.TRUE_FALSE)
+
+        assert len(questions) == 3
+        assert {q.type for q in questions} == {QuestionType.TRUE_FALSE}
+        assert provider.calls == [(3, None, None, QuestionType.TRUE_FALSE)]
+
+    @pytest.mark.asyncio
+    async def test_returns_copies(self, pool):
+        await pool.add([make_question(0)])
+
+        first = await pool.take("a", 1)
+        second = await pool.take("b", 1)
+
+        assert first[0] is not second[0]
+        assert first[0].id == second[0].id
+
+
+class TestAdd:
+    """Test deduplication, indexing and eviction."""
+
+    @pytest.mark.asyncio
+    async def test_deduplicates(self, pool):
+        assert await pool.add([make_question(1), make_question(2)]) == 2
+        assert await pool.add([make_question(2), make_question(3)]) == 1
+        assert len(pool) == 3
+
+    def test_key_is_stable(self):
+        question = make_question(1)
+
+        assert question_key(question) == question_key(make_question(1))
+        assert question_key(question) != question_key(make_question(2))
+
+    @pytest.mark.asyncio
+    async def test_learns_category_ids(self, pool):
+        await pool.add([make_question(1, "Science & Nature")], category=17)
+        await pool.add([make_question(2, "Science & Nature")])
+
+        assert pool.available(category=17) == 2
+
+    @pytest.mark.asyncio
+    async def test_evicts_oldest(self, provider):
+        pool = QuestionPool(provider, max_size=3)
+
+        await pool.add([make_question(i) for i in range(5)])
+
+        assert len(pool) == 3
+        assert question_key(make_question(0)) not in pool._questions
+        assert question_key(make_question(4)) in pool._questions
+
+
+class TestPrefetch:
+    """Test background top-up."""
+
+    @pytest.mark.asyncio
+    async def test_prefetch_when_low(self, provider):
+        pool = QuestionPool(provider, low_water=5, batch_size=10, fetch_interval=0)
+        await pool.add([make_question(100 + i) for i in range(8)])
+
+        await pool.take("lobby", 4)
+        await pool._prefetch_task
+
+        assert provider.calls == [(10, None, None, None)]
+        assert pool.available("lobby") == 14
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_no_prefetch_above_low_water(self, provider):
+        pool = QuestionPool(provider, low_water=2, fetch_interval=0)
+        await pool.add([make_question(i) for i in range(10)])
+
+        await pool.take("lobby", 3)
+
+        assert pool._prefetch_task is None
+
+    @pytest.mark.asyncio
+    async def test_fetches_are_rate_limited(self, provider):
+        pool = QuestionPool(provider, fetch_interval=0.2)
+        loop = asyncio.get_running_loop()
+
+        await pool._fetch(1)
+        start = loop.time()
+        await pool._fetch(1)
+
+        assert loop.time() - start >= 0.15
+
+    @pytest.mark.asyncio
+    async def test_prefetch_errors_are_logged(self, provider):
+        pool = QuestionPool(provider, fetch_interval=0)
+        provider.error = ConnectionError("offline")
+
+        pool.request_prefetch()
+        await pool._prefetch_task
+
+        assert len(pool) == 0
+
+
+class TestPersistence:
+    """Test loading and saving through TriviaStorage."""
+
+    @pytest.fixture
+    def storage(self):
+        storage = MagicMock()
+        storage.load_questions = AsyncMock(return_value=[])
+        storage.save_questions = AsyncMock(side_effect=lambda rows: list(range(1, len(rows) + 1)))
+        storage.delete_question = AsyncMock()
+        return storage
+
+    @pytest.mark.asyncio
+    async def test_load(self, provider, storage):
+        storage.load_questions.return_value = [
+            {
+                "id": 7,
+                "key": "abc",
+                "category": "Science & Nature",
+                "category_id": 17,
+                "difficulty": "hard",
+                "type": "multiple",
+                "question": "Q?",
+                "correct_answer": "A",
+                "incorrect_answers": ["B", "C", "D"],
+            },
+            {"id": 8, "key": "bad", "difficulty": "impossible", "type": "multiple"},
+        ]
+        pool = QuestionPool(provider, storage)
+
+        assert await pool.load() == 1
+        questions = await pool.take("lobby", 1, category=17)
+        assert questions[0].correct_answer == "A"
+        assert provider.calls == []
+
+    @pytest.mark.asyncio
+    async def test_add_saves_new_questions_once(self, provider, storage):
+        pool = QuestionPool(provider, storage)
+
+        await pool.add([make_question(1), make_question(2)], category=9)
+        await pool.add([make_question(2)])
+
+        storage.save_questions.assert_called_once()
+        rows = storage.save_questions.call_args[0][0]
+        assert [row["key"] for row in rows] == [
+            question_key(make_question(1)), question_key(make_question(2))
+        ]
+        assert rows[0]["category_id"] == 9
+        assert rows[0]["difficulty"] == "easy"
+
+    @pytest.mark.asyncio
+    async def test_eviction_deletes_row(self, provider, storage):
+        pool = QuestionPool(provider, storage, max_size=1)
+
+        await pool.add([make_question(1), make_question(2)])
+
+        storage.delete_question.assert_called_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_storage_round_trip(self):
+        nats = AsyncMock()
+        response = MagicMock()
+        nats.request.return_value = response
+        storage = TriviaStorage(nats)
+
+        response.data = json.dumps({"success": True, "ids": [1, 2]}).encode()
+        ids = await storage.save_questions([
+            {"key": "a", "incorrect_answers": ["x"]},
+            {"key": "b", "incorrect_answers": []},
+        ])
+        sent = json.loads(nats.request.call_args[0][1])
+        assert ids == [1, 2]
+        assert sent["table"] == "questions"
+        assert sent["data"][0]["incorrect_answers"] == '["x"]'
+
+        response.data = json.dumps({
+            "success": True, "rows": [{"id": 1, "key": "a", "incorrect_answers": '["x"]'}]
+        }).encode()
+        rows = await storage.load_questions()
+        assert rows[0]["incorrect_answers"] == ["x"]
@@ -26,7 +26,9 @@ class TestQuestionProviderBase:
         """Test default close is a no-op."""
         # Create a concrete implementation for testing
         class ConcreteProvider(QuestionProvider):
-            async def fetch_questions(self, amount, category=None, difficulty=None):
+            async def fetch_questions(
+                self, amount, category=None, difficulty=None, question_type=None
+            ):
                 return []
 
             async def get_categories(self):
@@ -154,6 +156,27 @@ class TestOpenTDBProvider:
         call_args = mock_client.get.call_args
         assert call_args[1]["params"]["difficulty"] == "hard"
 
+    @pytest.mark.asyncio
+    async def test_fetch_with_question_type(self, provider, mock_response):
+        """Test fetching with question type filter."""
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(return_value=MagicMock(
+            json=MagicMock(return_value=mock_response),
+            raise_for_status=MagicMock(),
+        ))
+        mock_client.is_closed = False
+
+        provider._client = mock_client
+
+        await provider.fetch_questions(5)
+        assert mock_client.get.call_args[1]["params"]["type"] == "multiple"
+
+        await provider.fetch_questions(5, question_type=QuestionType.TRUE_FALSE)
+        assert mock_client.get.call_args[1]["params"]["type"] == "boolean"
+
+        with pytest.raises(ValueError):
+            await provider.fetch_questions(5, question_type=QuestionType.FREE_RESPONSE)
+
     @pytest.mark.asyncio
     async def test_fetch_clamps_amount(self, provider, mock_response):
         """Test amount is clamped to valid range."""
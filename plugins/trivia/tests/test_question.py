@@ -3,12 +3,17 @@ Tests for trivia question models.
 """
 
 
+from difflib import SequenceMatcher
+
 from trivia.question import (
     Answer,
     Difficulty,
     DIFFICULTY_POINTS,
+    MAX_JUDGED_GUESSES,
     Question,
     QuestionType,
+    edit_distance,
+    normalize_answer,
 )
 
 
@@ -186,6 +191,127 @@ class TestCheckAnswer:
         assert true_false_question.check_answer(wrong_letter) is False
 
 
+    def test_normalized_forms(self):
+        """Test accents, punctuation and articles are ignored."""
+        question = Question(
+            id="q9",
+            category="Entertainment: Music",
+            difficulty=Difficulty.EASY,
+            type=QuestionType.FREE_RESPONSE,
+            question="Who recorded Abbey Road?",
+            correct_answer="The Beatles",
+            incorrect_answers=[],
+        )
+
+        assert question.check_answer("beatles") is True
+        assert question.check_answer("The Beatles!") is True
+        assert question.check_answer("a beatles") is True
+        assert question.check_answer("Teh Beatles") is True
+        assert question.check_answer("the") is False
+
+    def test_years_are_not_fuzzy(self):
+        """Test a one-digit substitution is not close enough."""
+        question = Question(
+            id="q10",
+            category="History",
+            difficulty=Difficulty.EASY,
+            type=QuestionType.FREE_RESPONSE,
+            question="When did WW2 end?",
+            correct_answer="1945",
+            incorrect_answers=[],
+        )
+
+        assert question.check_answer("1945") is True
+        assert question.check_answer("1946") is False
+
+    def test_punctuation_answer(self):
+        """Test a punctuation-only answer doesn't accept other punctuation."""
+        question = Question(
+            id="q11",
+            category="Science: Mathematics",
+            difficulty=Difficulty.EASY,
+            type=QuestionType.FREE_RESPONSE,
+            question="Which symbol means addition?",
+            correct_answer="+",
+            incorrect_answers=[],
+        )
+
+        assert question.check_answer("+") is True
+        assert question.check_answer("-") is False
+
+    def test_wrong_choice_text(self, sample_question):
+        """Test a wrong choice is rejected even when typed exactly."""
+        assert sample_question.check_answer("london.") is False
+
+    def test_judged_guesses_are_cached(self, sample_question):
+        """Test each distinct guess is judged once."""
+        sample_question.check_answer("Parris")
+        sample_question.check_answer("Parris")
+        sample_question.check_answer("Pariss", fuzzy_threshold=0.99)
+
+        assert sample_question._judged == {
+            ("Parris", 0.85): True,
+            ("Pariss", 0.99): False,
+        }
+
+    def test_judged_cache_is_bounded(self, sample_question):
+        """Test the guess cache stops growing at its limit."""
+        for i in range(MAX_JUDGED_GUESSES + 10):
+            sample_question.check_answer(f"guess {i}")
+
+        assert len(sample_question._judged) == MAX_JUDGED_GUESSES
+        assert sample_question.check_answer("Paris") is True
+
+
+class TestNormalizeAnswer:
+    """Test answer normalization."""
+
+    def test_case_accents_and_punctuation(self):
+        assert normalize_answer("  Les Misérables! ") == "les miserables"
+        assert normalize_answer("Beyoncé") == "beyonce"
+        assert normalize_answer("Rock-n-Roll") == "rock n roll"
+
+    def test_apostrophes_and_ampersand(self):
+        assert normalize_answer("Don’t Stop") == "dont stop"
+        assert normalize_answer("Tom & Jerry") == normalize_answer("Tom and Jerry")
+
+    def test_leading_article(self):
+        assert normalize_answer("The Who") == "who"
+        assert normalize_answer("An Apple") == "apple"
+        assert normalize_answer("The") == "the"
+
+    def test_punctuation_only(self):
+        assert normalize_answer("?!") == "?!"
+
+
+class TestEditDistance:
+    """Test the bounded edit distance."""
+
+    def test_identical(self):
+        assert edit_distance("paris", "paris", 0) == 0
+
+    def test_insert_delete_substitute(self):
+        assert edit_distance("paris", "parris", 3) == 1
+        assert edit_distance("paris", "pais", 3) == 1
+        assert edit_distance("1945", "1946", 3) == 2
+
+    def test_stops_past_limit(self):
+        assert edit_distance("paris", "london", 2) == 3
+        assert edit_distance("a", "abcdefgh", 2) == 3
+
+    def test_matches_sequence_matcher_ratio(self):
+        pairs = [
+            ("mount everest", "mt everest"),
+            ("leonardo da vinci", "leonardo davinci"),
+            ("photosynthesis", "photosinthesis"),
+            ("jupiter", "saturn"),
+        ]
+        for a, b in pairs:
+            total = len(a) + len(b)
+            ratio = 1 - edit_distance(a, b, total) / total
+            assert ratio == SequenceMatcher(None, a, b).ratio()
+
+
 class TestFormatForDisplay:
     """Test question display formatting."""
 
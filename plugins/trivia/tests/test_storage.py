@@ -60,44 +60,26 @@ async def test_get_user_stats_not_found(storage, mock_nats):
     stats = await storage.get_user_stats("unknown")
     assert stats is None
 
+def batch_steps(mock_nats, call=-1):
+    args = mock_nats.request.call_args_list[call][0]
+    assert args[0] == "rosey.db.row.trivia.batch"
+    return json.loads(args[1])["steps"]
+
+def user_row(**fields):
+    return {"id": 123, "user_id": "test_user", **fields}
+
 @pytest.mark.asyncio
 async def test_update_user_stats(storage, mock_nats):
-    # Sequence of calls:
-    # 1. ensure_user_stats -> search (fail) -> insert
-    # 2. get_user_stats (for win streak logic)
-    # 3. update
-    # 4. get_user_stats (return)
+    # One batch: upsert with atomic operators, then raise best win streak
+    mock_nats.request.return_value = MockNatsResponse({"success": True, "results": [
+        {"ids": [123], "created": True},
+        {"ids": [123], "created": False, "rows": [user_row(
+            total_games=1, games_won=1, current_win_streak=1, best_win_streak=1,
+            fastest_answer_ms=1200
+        )]}
+    ]})
     
-    mock_nats.request.side_effect = [
-        # ensure_user_stats -> search
-        MockNatsResponse({"success": True, "rows": []}),
-        # ensure_user_stats -> insert
-        MockNatsResponse({"success": True, "id": 123}),
-        # get_user_stats (for win streak logic)
-        MockNatsResponse({"success": True, "rows": [{
-            "user_id": "test_user",
-            "current_win_streak": 1,
-            "best_win_streak": 2,
-            "fastest_answer_ms": 2000
-        }]}),
-        # get_user_stats (for fastest answer logic) - redundant call but present in code
-        MockNatsResponse({"success": True, "rows": [{
-            "user_id": "test_user",
-            "current_win_streak": 1,
-            "best_win_streak": 2,
-            "fastest_answer_ms": 2000
-        }]}),
-        # update
-        MockNatsResponse({"success": True, "id": 123, "updated": True}),
-        # get_user_stats (return)
-        MockNatsResponse({"success": True, "rows": [{
-            "user_id": "test_user",
-            "total_games": 1,
-            "games_won": 1
-        }]})
-    ]
-    
-    await storage.update_user_stats(
+    stats = await storage.update_user_stats(
         user_id="test_user",
         questions_answered=10,
         correct_answers=8,
@@ -106,50 +88,241 @@ async def test_update_user_stats(storage, mock_nats):
         fastest_ms=1200
     )
     
-    assert mock_nats.request.call_count == 6
+    assert mock_nats.request.call_count == 1
+    assert stats.total_games == 1
+    assert stats.fastest_answer_ms == 1200
+    
+    steps = batch_steps(mock_nats)
+    assert steps[0]["match"] == {"user_id": "test_user"}
+    assert steps[0]["insert"]["total_games"] == 0
+    ops = steps[0]["operations"]
+    assert ops["total_points"] == {"$inc": 100}
+    assert ops["current_win_streak"] == {"$inc": 1}
+    assert ops["fastest_answer_ms"] == {"$min": 1200}
+    assert steps[1]["operations"] == {"best_win_streak": {"$max": {"$field": "current_win_streak"}}}
+    assert steps[1]["returning"] is True
 
 @pytest.mark.asyncio
-async def test_update_streak_correct(storage, mock_nats):
-    # 1. ensure -> search (found)
-    # 2. get_user_stats
-    # 3. update
+async def test_update_user_stats_loss_resets_win_streak(storage, mock_nats):
+    mock_nats.request.return_value = MockNatsResponse({"success": True, "results": [
+        {"ids": [123], "created": False, "rows": [user_row(current_win_streak=0)]}
+    ]})
     
-    mock_nats.request.side_effect = [
-        # ensure -> search
-        MockNatsResponse({"success": True, "rows": [{"id": 123}]}),
-        # get_user_stats
-        MockNatsResponse({"success": True, "rows": [{
-            "user_id": "test_user",
-            "current_answer_streak": 5,
-            "best_answer_streak": 10
-        }]}),
-        # update
-        MockNatsResponse({"success": True, "id": 123, "updated": True})
-    ]
+    await storage.update_user_stats("test_user", 5, 1, 10, won_game=False)
+    
+    steps = batch_steps(mock_nats)
+    assert len(steps) == 1
+    assert steps[0]["operations"]["current_win_streak"] == {"$set": 0}
+    assert "fastest_answer_ms" not in steps[0]["operations"]
+
+@pytest.mark.asyncio
+async def test_update_streak_correct(storage, mock_nats):
+    mock_nats.request.return_value = MockNatsResponse({"success": True, "results": [
+        {"ids": [123], "created": False},
+        {"ids": [123], "created": False, "rows": [user_row(
+            current_answer_streak=6, best_answer_streak=10
+        )]}
+    ]})
     
     current, best = await storage.update_streak("test_user", True)
     
     assert current == 6
     assert best == 10
+    assert mock_nats.request.call_count == 1
     
-    # Verify update payload
-    update_call = mock_nats.request.call_args_list[2]
-    payload = json.loads(update_call[0][1])
-    assert payload["data"]["current_answer_streak"] == 6
+    steps = batch_steps(mock_nats)
+    assert steps[0]["operations"] == {"current_answer_streak": {"$inc": 1}}
+    assert steps[1]["operations"] == {
+        "best_answer_streak": {"$max": {"$field": "current_answer_streak"}}
+    }
 
 @pytest.mark.asyncio
 async def test_update_streak_incorrect(storage, mock_nats):
-    mock_nats.request.side_effect = [
-        MockNatsResponse({"success": True, "rows": [{"id": 123}]}),
-        MockNatsResponse({"success": True, "rows": [{
-            "user_id": "test_user",
-            "current_answer_streak": 5,
-            "best_answer_streak": 10
-        }]}),
-        MockNatsResponse({"success": True, "id": 123, "updated": True})
-    ]
+    mock_nats.request.return_value = MockNatsResponse({"success": True, "results": [
+        {"ids": [123], "created": False},
+        {"ids": [123], "created": False, "rows": [user_row(
+            current_answer_streak=0, best_answer_streak=10
+        )]}
+    ]})
     
     current, best = await storage.update_streak("test_user", False)
     
     assert current == 0
     assert best == 10
+    assert batch_steps(mock_nats)[0]["operations"] == {"current_answer_streak": {"$set": 0}}
+
+class FakeBatchService:
+    """Answers rosey.db.row.trivia.batch requests from in-memory rows."""
+    
+    def __init__(self):
+        self.requests = []
+        self.tables = {}
+    
+    async def request(self, subject, data, timeout=None):
+        self.requests.append(subject)
+        results = []
+        for step in json.loads(data)["steps"]:
+            rows = self.tables.setdefault(step["table"], [])
+            match = step["match"]
+            found = [r for r in rows if all(r.get(k) == v for k, v in match.items())]
+            created = False
+            if not found and "insert" in step:
+                row = {"id": len(rows) + 1, **match, **step["insert"]}
+                rows.append(row)
+                found, created = [row], True
+            for row in found:
+                row.update(step.get("data") or {})
+                for field, op in (step.get("operations") or {}).items():
+                    (name, value), = op.items()
+                    if isinstance(value, dict):
+                        value = row.get(value["$field"])
+                    current = row.get(field)
+                    if name == "$inc":
+                        row[field] = current + value
+                    elif name == "$set":
+                        row[field] = value
+                    elif name == "$max":
+                        row[field] = value if current is None else max(current, value)
+                    elif name == "$min":
+                        row[field] = value if current is None else min(current, value)
+            result = {"ids": [r["id"] for r in found], "created": created}
+            returning = step.get("returning")
+            if returning is True:
+                result["rows"] = [dict(r) for r in found]
+            elif returning:
+                result["rows"] = [{k: r.get(k) for k in returning} for r in found]
+            results.append(result)
+        return MockNatsResponse({"success": True, "results": results})
+
+@pytest.mark.asyncio
+async def test_commit_game_constant_round_trips():
+    from plugins.trivia.game import PlayerScore
+    
+    service = FakeBatchService()
+    storage = TriviaStorage(service)
+    players = []
+    for i in range(20):
+        player = PlayerScore(user=f"user{i}")
+        player.record_answer(True, 10 + i, 2.5, "Science")
+        player.record_answer(i % 2 == 0, 10, 4.0, "History")
+        player.record_answer(False, 0, 5.0, "History")
+        players.append(player)
+    
+    stats = await storage.commit_game("g1", "lobby", players, winner_id="user19")
+    
+    # One batch for all stats, one to set favorite categories
+    assert service.requests == ["rosey.db.row.trivia.batch"] * 2
+    assert len(stats) == 20
+    assert stats["user19"].games_won == 1
+    assert stats["user19"].best_win_streak == 1
+    assert stats["user0"].current_win_streak == 0
+    assert stats["user0"].fastest_answer_ms == 2500
+    assert stats["user0"].total_points == 20
+    assert stats["user0"].favorite_category == "History"
+    
+    categories = {
+        (r["user_id"], r["category"]): (r["questions_seen"], r["correct_answers"])
+        for r in service.tables["category_stats"]
+    }
+    assert categories[("user0", "History")] == (2, 1)
+    assert categories[("user1", "Science")] == (1, 1)
+    channel_rows = service.tables["channel_stats"]
+    assert len(channel_rows) == 20
+    assert all(r["games_played"] == 1 for r in channel_rows)
+    
+    # A second game reuses the rows and keeps the faster time
+    players[0].fastest_time = 3.0
+    stats = await storage.commit_game("g2", "lobby", players[:1], winner_id="user0")
+    assert stats["user0"].total_games == 2
+    assert stats["user0"].current_win_streak == 1
+    assert stats["user0"].fastest_answer_ms == 2500
+    assert len(service.tables["user_stats"]) == 20
+
+@pytest.mark.asyncio
+async def test_commit_game_splits_large_batches(monkeypatch):
+    from plugins.trivia.game import PlayerScore
+    
+    service = FakeBatchService()
+    storage = TriviaStorage(service)
+    monkeypatch.setattr(TriviaStorage, "BATCH_STEPS", 5)
+    players = [PlayerScore(user=f"user{i}", total_answers=1) for i in range(4)]
+    
+    stats = await storage.commit_game("g1", "lobby", players, winner_id=None)
+    
+    # 1 game step + 2 steps per player, at most 5 per request: [game, 2 players], [2 players]
+    assert len(service.requests) == 2
+    assert sorted(stats) == [f"user{i}" for i in range(4)]
+
+@pytest.mark.asyncio
+async def test_commit_game_updates_leaderboards():
+    from plugins.trivia.game import PlayerScore
+    
+    service = FakeBatchService()
+    storage = TriviaStorage(service)
+    storage.leaderboards.loaded = True
+    players = []
+    for i, points in enumerate([30, 50, 10]):
+        player = PlayerScore(user=f"user{i}")
+        player.record_answer(True, points, 2.0, "Science")
+        players.append(player)
+    
+    await storage.commit_game("g1", "lobby", players, winner_id="user1")
+    service.requests.clear()
+    
+    channel_board = await storage.get_channel_leaderboard("lobby")
+    global_board = await storage.get_global_leaderboard(limit=2)
+    
+    # Served from memory
+    assert service.requests == []
+    assert [e.user_id for e in channel_board] == ["user1", "user0", "user2"]
+    assert [(e.rank, e.total_points, e.games_played) for e in global_board] == [(1, 50, 1), (2, 30, 1)]
+    assert await storage.get_user_rank("user2") == 3
+    assert await storage.get_user_rank("user2", "elsewhere") is None
+
+@pytest.mark.asyncio
+async def test_leaderboard_searches_until_loaded(storage, mock_nats):
+    mock_nats.request.return_value = MockNatsResponse({
+        "success": True,
+        "rows": [{"user_id": "alice", "total_points": 40, "total_games": 2, "correct_answers": 4}]
+    })
+    
+    leaderboard = await storage.get_global_leaderboard()
+    
+    assert leaderboard[0].user_id == "alice"
+    assert mock_nats.request.call_args[0][0] == "rosey.db.row.trivia.search"
+    assert await storage.get_user_rank("alice") is None
+
+@pytest.mark.asyncio
+async def test_load_leaderboards_pages(storage, mock_nats):
+    user_page = [
+        {"id": i, "user_id": f"u{i}", "total_points": i, "total_games": 1, "correct_answers": 0}
+        for i in range(1000)
+    ]
+    mock_nats.request.side_effect = [
+        MockNatsResponse({"success": True, "rows": user_page}),
+        MockNatsResponse({"success": True, "rows": [
+            {"id": 1000, "user_id": "top", "total_points": 5000, "total_games": 9, "correct_answers": 9}
+        ]}),
+        MockNatsResponse({"success": True, "rows": []}),
+    ]
+    
+    await storage.load_leaderboards()
+    
+    offsets = [json.loads(call[0][1])["offset"] for call in mock_nats.request.call_args_list]
+    assert offsets == [0, 1000, 0]
+    assert await storage.get_user_rank("top") == 1
+    assert await storage.get_user_rank("u0") == 1001
+
+@pytest.mark.asyncio
+async def test_update_channel_stats_single_request():
+    service = FakeBatchService()
+    storage = TriviaStorage(service)
+    storage.leaderboards.loaded = True
+    
+    await storage.update_channel_stats("alice", "lobby", points=25, correct=2, won=True)
+    await storage.update_channel_stats("alice", "lobby", points=5, correct=1, won=False)
+    
+    assert service.requests == ["rosey.db.row.trivia.batch"] * 2
+    row, = service.tables["channel_stats"]
+    assert (row["games_played"], row["games_won"], row["total_points"]) == (2, 1, 30)
+    assert (await storage.get_channel_leaderboard("lobby"))[0].total_points == 30
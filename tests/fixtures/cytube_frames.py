@@ -0,0 +1,197 @@
+"""
+Synthetic CyTube socket.io sessions for offline replay and benchmarks.
+
+Frames follow the shapes a CyTube server sends after joinChannel (large
+userlist and playlist snapshots) followed by steady-state traffic (chat,
+media updates, joins/leaves, queue changes) or bursts of one kind
+(chat floods, playlist edits, join/leave churn). Generation is seeded so a
+given size always yields the same frames.
+"""
+import json
+import random
+from typing import List
+
+
+def encode(event: str, *args) -> str:
+    """Encode a socket.io event frame as sent by the server."""
+    return '42' + json.dumps([event, *args], separators=(',', ':'))
+
+
+def make_user(i: int, rank: int = 1) -> dict:
+    return {
+        'name': f'user{i:05d}',
+        'rank': rank,
+        'profile': {
+            'image': f'https://example.com/avatars/{i}.png',
+            'text': f'Profile text for user {i}',
+        },
+        'meta': {
+            'afk': i % 7 == 0,
+            'muted': False,
+            'smuted': False,
+            'aliases': [f'alias{i}', f'old{i}'],
+            'ip': f'{i % 256}.{(i // 256) % 256}.x.x',
+        },
+    }
+
+
+def make_media(i: int) -> dict:
+    seconds = 120 + (i * 37) % 3600
+    return {
+        'id': f'vid{i:08d}',
+        'title': f'Some video title number {i} (Official Music Video)',
+        'seconds': seconds,
+        'duration': f'{seconds // 60:02d}:{seconds % 60:02d}',
+        'type': 'yt',
+        'meta': {},
+    }
+
+
+def make_item(i: int) -> dict:
+    return {
+        'media': make_media(i),
+        'uid': i + 1,
+        'temp': i % 3 == 0,
+        'queueby': f'user{i % 500:05d}',
+    }
+
+
+def join_frames(users: int = 1000, items: int = 2000) -> List[str]:
+    """Frames sent on channel join: handshake, userlist, playlist."""
+    return [
+        '40',
+        encode('rank', 3),
+        encode('login', {'success': True, 'name': 'bot', 'guest': False}),
+        encode('setPermissions', {'oplaylistadd': -1, 'kick': 2, 'chat': 0}),
+        encode('channelOpts', {'allow_voteskip': True, 'chat_antiflood': False}),
+        encode('usercount', users),
+        encode('userlist', [make_user(i, rank=1 + (i % 10 == 0)) for i in range(users)]),
+        encode('playlist', [make_item(i) for i in range(items)]),
+        encode('setPlaylistMeta', {'count': items, 'rawTime': items * 300, 'time': '...'}),
+        encode('setCurrent', 1),
+        encode('changeMedia', {**make_media(0), 'currentTime': 0, 'paused': False}),
+    ]
+
+
+def traffic_frames(count: int = 5000, users: int = 1000, items: int = 2000,
+                   seed: int = 1) -> List[str]:
+    """Steady-state frames: mostly chat and media updates."""
+    rng = random.Random(seed)
+    frames = []
+    next_user = users
+    next_uid = items + 1
+    now = 1_700_000_000_000
+    for n in range(count):
+        roll = rng.random()
+        now += rng.randint(50, 3000)
+        if roll < 0.55:
+            frames.append(encode('chatMsg', {
+                'username': f'user{rng.randrange(users):05d}',
+                'msg': 'hello <strong>world</strong> ' * rng.randint(1, 4),
+                'meta': {},
+                'time': now,
+            }))
+        elif roll < 0.80:
+            frames.append(encode('mediaUpdate', {
+                'currentTime': n * 0.5, 'paused': False,
+            }))
+        elif roll < 0.86:
+            frames.append(encode('addUser', make_user(next_user)))
+            next_user += 1
+        elif roll < 0.91:
+            frames.append(encode('userLeave', {'name': f'user{rng.randrange(users):05d}'}))
+        elif roll < 0.95:
+            frames.append(encode('queue', {'item': make_item(next_uid - 1),
+                                            'after': next_uid - 1}))
+            next_uid += 1
+        elif roll < 0.97:
+            frames.append(encode('usercount', users + rng.randint(-20, 20)))
+        elif roll < 0.99:
+            frames.append(encode('setAFK', {'name': f'user{rng.randrange(users):05d}',
+                                            'afk': rng.random() < 0.5}))
+        else:
+            frames.append('2')  # server ping
+    return frames
+
+
+def chat_flood_frames(count: int = 5000, users: int = 1000,
+                      seed: int = 1) -> List[str]:
+    """Back-to-back chat messages from many users (plus the odd PM)."""
+    rng = random.Random(seed)
+    now = 1_700_000_000_000
+    frames = []
+    for n in range(count):
+        now += rng.randint(1, 40)
+        event = 'pm' if n % 50 == 49 else 'chatMsg'
+        frames.append(encode(event, {
+            'username': f'user{rng.randrange(users):05d}',
+            'msg': 'spam ' * rng.randint(1, 20),
+            'meta': {},
+            'time': now,
+        }))
+    return frames
+
+
+def playlist_burst_frames(count: int = 1000, items: int = 2000,
+                          seed: int = 1) -> List[str]:
+    """Rapid playlist edits against a playlist of ``items`` entries.
+
+    Mostly queue appends, with deletes, moves and setTemp mixed in. Every
+    uid referenced exists at that point in the burst.
+    """
+    rng = random.Random(seed)
+    uids = list(range(1, items + 1))
+    next_uid = items + 1
+    frames = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.6 or len(uids) < 2:
+            frames.append(encode('queue', {'item': make_item(next_uid - 1),
+                                            'after': uids[-1]}))
+            uids.append(next_uid)
+            next_uid += 1
+        elif roll < 0.75:
+            uid = uids.pop(rng.randrange(len(uids)))
+            frames.append(encode('delete', {'uid': uid}))
+        elif roll < 0.9:
+            uid = uids.pop(rng.randrange(len(uids)))
+            after = uids[rng.randrange(len(uids))]
+            uids.insert(uids.index(after) + 1, uid)
+            frames.append(encode('moveVideo', {'from': uid, 'after': after}))
+        else:
+            frames.append(encode('setTemp', {'uid': rng.choice(uids),
+                                              'temp': rng.random() < 0.5}))
+    frames.append(encode('setPlaylistMeta', {'count': len(uids),
+                                             'rawTime': len(uids) * 300,
+                                             'time': '...'}))
+    return frames
+
+
+def churn_frames(count: int = 1000, users: int = 1000) -> List[str]:
+    """Users joining and then leaving again, with usercount updates."""
+    frames = []
+    for i in range(users, users + count):
+        frames.append(encode('addUser', make_user(i)))
+        frames.append(encode('usercount', users + 1))
+        frames.append(encode('userLeave', {'name': f'user{i:05d}'}))
+        frames.append(encode('usercount', users))
+    return frames
+
+
+def session_frames(users: int = 1000, items: int = 2000, traffic: int = 5000,
+                   seed: int = 1) -> List[str]:
+    """A full session: join snapshot followed by steady-state traffic."""
+    return join_frames(users, items) + traffic_frames(traffic, users, items, seed)
+
+
+def burst_session_frames(users: int = 1000, items: int = 2000,
+                         seed: int = 1) -> List[str]:
+    """A session made of back-to-back bursts of each kind."""
+    return (
+        join_frames(users, items)
+        + playlist_burst_frames(1000, items, seed)
+        + chat_flood_frames(3000, users, seed)
+        + churn_frames(500, users)
+        + [encode('mediaUpdate', {'currentTime': t * 0.5, 'paused': False})
+           for t in range(500)]
+    )
@@ -0,0 +1,219 @@
+"""
+Offline CyTube stand-in: a socket.io websocket server replaying sessions.
+
+Speaks just enough Engine.IO v3 / socket.io for lib.socket_io.SocketIO and
+lib.connection.CyTubeConnection to connect unmodified:
+
+- ``get()`` answers the HTTP requests (socketconfig JSON and the polling
+  handshake carrying the sid)
+- the websocket handshake (``2probe`` / ``3probe`` / ``5``)
+- ``joinChannel`` (answered with a connect packet) and ``login``
+- client pings
+
+After ``joinChannel`` the server replays a ``ReplaySession`` - synthetic
+(see tests/fixtures/cytube_frames.py) or recorded - and finishes with a
+``REPLAY_DONE`` event so consumers know where the session ends. Frames are
+paced by their recorded offsets divided by ``speed``; ``speed=0`` sends
+them back to back.
+
+Usage:
+    session = ReplaySession.from_frames(session_frames(1000, 2000, 5000))
+    async with CytubeReplayServer(session) as server:
+        conn = server.connection()
+        await conn.connect()
+        async for event, data in conn.recv_events():
+            if event == REPLAY_DONE:
+                break
+"""
+import asyncio
+import itertools
+import json
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import websockets
+
+from lib.connection import CyTubeConnection
+from lib.socket_io import SocketIO, decode_event
+from tests.fixtures.cytube_frames import encode
+
+REPLAY_DONE = 'replayDone'
+
+
+class ReplaySession:
+    """Frames with their offsets (seconds) from the start of the session.
+
+    Recorded sessions are stored as JSON Lines, one
+    ``{"t": offset, "frame": raw_frame}`` object per websocket message
+    received from the server.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[float, str]]):
+        self.entries: List[Tuple[float, str]] = list(entries)
+
+    @classmethod
+    def from_frames(cls, frames: Iterable[str], interval: float = 0.001) -> 'ReplaySession':
+        """Space synthetic frames ``interval`` seconds apart."""
+        return cls((i * interval, frame) for i, frame in enumerate(frames))
+
+    @classmethod
+    def load(cls, path) -> 'ReplaySession':
+        with open(path, encoding='utf-8') as f:
+            return cls(
+                (float(entry['t']), entry['frame'])
+                for entry in map(json.loads, filter(str.strip, f))
+            )
+
+    def save(self, path) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            for offset, frame in self.entries:
+                f.write(json.dumps({'t': offset, 'frame': frame}) + '\n')
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def duration(self) -> float:
+        return self.entries[-1][0] if self.entries else 0.0
+
+    @property
+    def event_count(self) -> int:
+        """Number of frames SocketIO turns into events."""
+        return sum(1 for _, frame in self.entries if frame[:1] == '4')
+
+
+class CytubeReplayServer:
+    """Local socket.io server replaying a session to each client.
+
+    Attributes:
+        session: Session replayed after each joinChannel
+        speed: Replay speed multiplier (0 = as fast as possible)
+        url: Base HTTP URL (use as CyTubeConnection domain)
+        received: (event, data) emitted by clients, in arrival order
+        replayed: Set once a replay (including REPLAY_DONE) has been sent
+        connections: Number of websocket connections accepted
+    """
+
+    PING_INTERVAL = 25000
+    PING_TIMEOUT = 60000
+
+    def __init__(self, session: ReplaySession, speed: float = 0.0,
+                 host: str = '127.0.0.1', port: int = 0):
+        if speed < 0:
+            raise ValueError('speed must be >= 0')
+        self.session = session
+        self.speed = speed
+        self.host = host
+        self.port = port
+        self.url: Optional[str] = None
+        self.received: List[Tuple[str, object]] = []
+        self.replayed = asyncio.Event()
+        self.connections = 0
+        self._sids = itertools.count(1)
+        self._server = None
+        self._tasks: set = set()
+
+    async def start(self) -> 'CytubeReplayServer':
+        self._server = await websockets.serve(
+            self._handle, self.host, self.port, max_size=None
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.url = f'http://{self.host}:{self.port}'
+        return self
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> 'CytubeReplayServer':
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    # ------------------------------------------------------------------
+    # Client side helpers
+    # ------------------------------------------------------------------
+
+    async def get(self, url: str) -> str:
+        """HTTP GET stand-in for CyTubeConnection and SocketIO."""
+        if '/socketconfig/' in url:
+            return json.dumps({'servers': [{'url': self.url, 'secure': False}]})
+        if 'transport=polling' in url:
+            payload = json.dumps({
+                'sid': f'replay{next(self._sids)}',
+                'upgrades': ['websocket'],
+                'pingInterval': self.PING_INTERVAL,
+                'pingTimeout': self.PING_TIMEOUT,
+            })
+            return f'{len(payload) + 1}:0{payload}'
+        raise ValueError(f'unexpected request: {url}')
+
+    async def socket_io(self, url: str, loop=None) -> SocketIO:
+        """socket.io connect function for CyTubeConnection."""
+        return await SocketIO.connect(url, retry=0, loop=loop, get=self.get)
+
+    def connection(self, **kwargs) -> CyTubeConnection:
+        """CyTubeConnection wired to this server."""
+        kwargs.setdefault('channel', 'replay')
+        kwargs.setdefault('user', 'bot')
+        kwargs.setdefault('password', 'secret')
+        return CyTubeConnection(
+            self.url,
+            get_func=self.get,
+            socket_io_func=self.socket_io,
+            **kwargs
+        )
+
+    # ------------------------------------------------------------------
+    # Server side
+    # ------------------------------------------------------------------
+
+    async def _handle(self, websocket) -> None:
+        self.connections += 1
+        try:
+            if await websocket.recv() != '2probe':
+                return
+            await websocket.send('3probe')
+            if await websocket.recv() != '5':
+                return
+
+            async for message in websocket:
+                if message[:1] == '2':
+                    await websocket.send('3' + message[1:])
+                elif message[:1] == '4':
+                    await self._handle_event(websocket, *decode_event(message))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    async def _handle_event(self, websocket, event: str, data) -> None:
+        self.received.append((event, data))
+        if event == 'joinChannel':
+            await websocket.send('40')
+            task = asyncio.create_task(self._replay(websocket))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        elif event == 'login':
+            await websocket.send(encode('login', {
+                'success': True, 'name': (data or {}).get('name', ''), 'guest': False,
+            }))
+
+    async def _replay(self, websocket) -> None:
+        start = time.perf_counter()
+        try:
+            for n, (offset, frame) in enumerate(self.session.entries):
+                if self.speed:
+                    delay = start + offset / self.speed - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                elif n % 256 == 0:
+                    await asyncio.sleep(0)  # let the server read pings
+                await websocket.send(frame)
+            await websocket.send(encode(REPLAY_DONE, {'frames': len(self.session)}))
+            self.replayed.set()
+        except websockets.exceptions.ConnectionClosed:
+            pass
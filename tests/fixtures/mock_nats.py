@@ -2,8 +2,8 @@
 Mock NATS client for testing without requiring a real NATS server
 """
 import asyncio
-from typing import Callable, Dict, List, Optional
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -12,10 +12,12 @@ class MockMsg:
     subject: str
     data: bytes
     reply: Optional[str] = None
+    _client: Any = field(default=None, repr=False, compare=False)
 
-    def respond(self, data: bytes):
-        """Mock respond method"""
-        pass
+    async def respond(self, data: bytes):
+        """Publish a reply to the request's inbox"""
+        if self._client is not None and self.reply:
+            await self._client.publish(self.reply, data)
 
 
 class MockSubscription:
@@ -96,7 +98,7 @@ class MockNATSClient:
         """
         Mock publish - deliver to matching subscriptions
         """
-        msg = MockMsg(subject=subject, data=payload, reply=reply)
+        msg = MockMsg(subject=subject, data=payload, reply=reply, _client=self)
 
         # Find matching subscriptions (only active ones)
         for sub_pattern, subs_list in list(self.subscriptions.items()):
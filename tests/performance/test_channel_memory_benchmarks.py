@@ -0,0 +1,92 @@
+"""
+Memory benchmarks for channel state (lib.user, lib.playlist).
+
+Builds the userlist and playlist of a large channel - 5,000 users and
+10,000 playlist items parsed from CyTube snapshot frames - and measures
+the bytes retained per object with tracemalloc. Strings are shared with
+the parsed snapshot, so the figures are the per-object overhead of
+User / PlaylistItem (+ MediaLink and the playlist index node) plus their
+container entries.
+"""
+
+import gc
+import json
+import time
+import tracemalloc
+from unittest.mock import patch
+
+from lib.playlist import Playlist
+from lib.user import User, UserList
+from tests.fixtures.cytube_frames import make_item, make_user
+
+USERS = 5000
+ITEMS = 10000
+
+
+def parsed(records):
+    """Round-trip through JSON so objects look like decoded frames."""
+    return json.loads(json.dumps(records))
+
+
+def retained(build):
+    """Bytes still allocated after build() returns its result."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return after - before, result
+
+
+class TestChannelStateMemory:
+    """Benchmark memory held by the userlist and playlist."""
+
+    def test_userlist_memory(self):
+        users = parsed([make_user(i) for i in range(USERS)])
+
+        def build():
+            userlist = UserList()
+            userlist.reset(User.from_data(data) for data in users)
+            return userlist
+
+        size, userlist = retained(build)
+
+        per_user = size / USERS
+        print(f"\n  {USERS} users: {size / 1e6:.2f} MB ({per_user:.0f} B/user)")
+        assert len(userlist) == USERS
+        assert per_user < 200
+
+    def test_playlist_memory(self):
+        items = parsed([make_item(i) for i in range(ITEMS)])
+
+        def build():
+            playlist = Playlist()
+            for data in items:
+                playlist.add(None, data)
+            playlist.queue  # materialized list included
+            return playlist
+
+        size, playlist = retained(build)
+
+        per_item = size / ITEMS
+        print(f"\n  {ITEMS} items: {size / 1e6:.2f} MB ({per_item:.0f} B/item)")
+        assert playlist.duration == sum(d['media']['seconds'] for d in items)
+        assert per_item < 350
+
+    def test_userlist_snapshot_skips_uncloaking(self):
+        users = parsed([make_user(i) for i in range(USERS)])
+
+        with patch('lib.user.uncloak_ip') as uncloak:
+            start = time.perf_counter()
+            userlist = UserList()
+            userlist.reset(User.from_data(data) for data in users)
+            elapsed = time.perf_counter() - start
+
+        print(f"\n  {USERS} user snapshot: {elapsed * 1000:.1f}ms")
+        assert uncloak.call_count == 0  # deferred until uncloaked_ip is read
+        assert all(user.ip is not None for user in userlist.values())
+        assert elapsed < 0.1
@@ -0,0 +1,75 @@
+"""
+Performance benchmarks for plugins.countdown.recurrence.expand_rules.
+
+Expands 10k random daily / weekly / monthly rules over a year (about 1.4M
+occurrences) in one batch, compared against calling
+RecurrenceRule.next_occurrence() in a loop per rule.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from datetime import time as time_of_day
+
+from plugins.countdown.recurrence import RecurrenceRule, RecurrenceType, expand_rules
+from tests.performance.baseline_loader import (
+    get_baseline_value,
+    get_min_acceptable,
+    log_performance,
+)
+
+RULES = 10_000
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+UNTIL = START + timedelta(days=365)
+
+
+def make_rules(seed=1):
+    rng = random.Random(seed)
+    rules = []
+    for _ in range(RULES):
+        kind = rng.choice(list(RecurrenceType))
+        rules.append(RecurrenceRule(
+            type=kind,
+            time_of_day=time_of_day(hour=rng.randrange(24), minute=rng.randrange(60)),
+            day_of_week=rng.randrange(7) if kind == RecurrenceType.WEEKLY else None,
+            day_of_month=rng.randint(1, 31) if kind == RecurrenceType.MONTHLY else None,
+        ))
+    return rules
+
+
+def iterate(rule):
+    occurrences = []
+    current = rule.next_occurrence(START)
+    while current <= UNTIL:
+        occurrences.append(current)
+        current = rule.next_occurrence(current)
+    return tuple(occurrences)
+
+
+class TestRecurrenceExpansion:
+    """Benchmark batch recurrence expansion."""
+
+    def test_expand_10k_rules_over_a_year(self):
+        rules = make_rules()
+
+        start = time.perf_counter()
+        expanded = expand_rules(rules, after=START, until=UNTIL)
+        batch = time.perf_counter() - start
+
+        start = time.perf_counter()
+        looped = [iterate(rule) for rule in rules]
+        loop = time.perf_counter() - start
+
+        occurrences = sum(map(len, expanded))
+        ops = occurrences / batch
+        print(
+            f"\n  {RULES} rules, {occurrences} occurrences: "
+            f"batch {batch * 1000:.0f}ms, next_occurrence loop {loop * 1000:.0f}ms"
+        )
+        log_performance(
+            "countdown_recurrence_expand", ops,
+            get_baseline_value("countdown_recurrence_expand"), "occurrences/sec"
+        )
+        assert expanded == looped
+        assert ops > get_min_acceptable("countdown_recurrence_expand")
+        assert batch < loop
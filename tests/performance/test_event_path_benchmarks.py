@@ -0,0 +1,290 @@
+"""
+End-to-end event path benchmarks against the offline CyTube replay server.
+
+Replays a synthetic session (join snapshot, playlist burst, chat flood,
+join/leave churn, media updates - see tests/fixtures/cytube_frames.py)
+through a real websocket connection and measures, for:
+
+- lib.bot.Bot: SocketIO -> CyTubeConnection._normalize_event ->
+  Bot.trigger -> NATS publishes
+- bot.rosey.core.cytube_connector.CytubeConnector: SocketIO ->
+  connector handlers -> EventBus.publish -> NATS publishes
+
+events/sec (uninstrumented run, gated by baseline.json), per-stage latency
+(instrumented run) and memory (tracemalloc run). NATS is replaced by a
+recorder so only the client-side cost of publishing is measured. The
+replay server shares the event loop (and tracemalloc) with the client, so
+events/sec is a lower bound and memory includes the server's send buffers.
+
+Run with ``pytest tests/performance/test_event_path_benchmarks.py -s``
+to see the report.
+"""
+
+import asyncio
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from functools import wraps
+from types import SimpleNamespace
+
+import pytest
+
+from bot.rosey.core.cytube_connector import CytubeConnector
+from bot.rosey.core.event_bus import EventBus
+from lib import socket_io
+from lib.bot import Bot
+from tests.fixtures.cytube_frames import burst_session_frames
+from tests.fixtures.cytube_server import REPLAY_DONE, CytubeReplayServer, ReplaySession
+from tests.performance.baseline_loader import (
+    get_baseline_value,
+    get_min_acceptable,
+    log_performance,
+)
+
+
+class RecordingNATS:
+    """NATS client stand-in counting publishes per subject."""
+
+    is_connected = True
+
+    def __init__(self):
+        self.published = Counter()
+        self.bytes = 0
+        self._sids = 0
+
+    async def publish(self, subject, payload=b'', reply='', headers=None):
+        self.published[subject] += 1
+        self.bytes += len(payload)
+
+    async def subscribe(self, subject, queue='', cb=None):
+        self._sids += 1
+        return SimpleNamespace(_id=self._sids)
+
+    @property
+    def total(self):
+        return sum(self.published.values())
+
+
+class StageTimer:
+    """Records call durations of wrapped functions, per stage."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def timed(self, stage, func):
+        samples = self.samples[stage]
+        clock = time.perf_counter_ns
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                start = clock()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    samples.append(clock() - start)
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = clock()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    samples.append(clock() - start)
+        return wrapper
+
+    def wrap(self, obj, name, stage=None):
+        setattr(obj, name, self.timed(stage or name, getattr(obj, name)))
+
+    def report(self):
+        lines = []
+        for stage, samples in self.samples.items():
+            ordered = sorted(samples)
+            n = len(ordered)
+            lines.append(
+                f"    {stage:<14} n={n:<6} mean={sum(ordered) / n / 1000:8.1f}us "
+                f"p50={ordered[n // 2] / 1000:8.1f}us "
+                f"p99={ordered[min(n - 1, n * 99 // 100)] / 1000:8.1f}us"
+            )
+        return '\n'.join(lines)
+
+
+class SocketChannel:
+    """Channel for CytubeConnector fed from a connected SocketIO.
+
+    CytubeConnector registers ``handler(data)`` callbacks by raw CyTube
+    event name; pump() dispatches socket events to them.
+    """
+
+    def __init__(self, socket, name='replay'):
+        self.socket = socket
+        self.name = name
+        self.handlers = defaultdict(list)
+
+    def on(self, event, handler):
+        self.handlers[event].append(handler)
+
+    def off(self, event, handler):
+        self.handlers[event].remove(handler)
+
+    async def pump(self):
+        """Dispatch events until REPLAY_DONE; returns the event count."""
+        count = 0
+        while True:
+            event, data = await self.socket.recv()
+            count += 1
+            if event == REPLAY_DONE:
+                return count
+            for handler in self.handlers.get(event, ()):
+                await handler(data)
+
+
+@pytest.fixture(scope='module')
+def session():
+    return ReplaySession.from_frames(burst_session_frames(users=1000, items=2000))
+
+
+async def replay_bot(session, timer=None):
+    """Replay through Bot; returns (events, seconds, nats, bot)."""
+    async with CytubeReplayServer(session) as server:
+        connection = server.connection()
+        nats = RecordingNATS()
+        bot = Bot(connection, nats)
+        await connection.connect()
+        if timer:
+            timer.wrap(connection, '_normalize_event', 'normalize')
+            timer.wrap(bot, 'trigger')
+            timer.wrap(nats, 'publish', 'nats_publish')
+
+        events = 0
+        start = time.perf_counter()
+        try:
+            # Bot.run()'s receive loop
+            async for event, data in connection.recv_events():
+                await bot.trigger(event, data)
+                events += 1
+                if event == REPLAY_DONE:
+                    break
+            return events, time.perf_counter() - start, nats, bot
+        finally:
+            await connection.disconnect()
+
+
+async def replay_connector(session, timer=None):
+    """Replay through CytubeConnector; returns (events, seconds, nats, connector)."""
+    async with CytubeReplayServer(session) as server:
+        connection = server.connection()
+        await connection.connect()
+        nats = RecordingNATS()
+        bus = EventBus()
+        bus._nc = nats
+        channel = SocketChannel(connection.socket)
+        connector = CytubeConnector(bus, channel)
+        assert await connector.start()
+        if timer:
+            for event, handlers in channel.handlers.items():
+                channel.handlers[event] = [timer.timed('handler', h) for h in handlers]
+            timer.wrap(bus, 'publish', 'bus_publish')
+            timer.wrap(nats, 'publish', 'nats_publish')
+
+        start = time.perf_counter()
+        try:
+            events = await channel.pump()
+            return events, time.perf_counter() - start, nats, connector
+        finally:
+            await connector.stop()
+            await connection.disconnect()
+
+
+def instrument_decode(monkeypatch, timer):
+    monkeypatch.setattr(socket_io, 'decode_event', timer.timed('decode', socket_io.decode_event))
+
+
+async def measure_memory(replay, session):
+    tracemalloc.start()
+    try:
+        result = await replay(session)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current, peak, result
+
+
+class TestBotEventPath:
+    """Benchmark lib.bot.Bot fed by CyTubeConnection."""
+
+    async def test_throughput(self, session):
+        events, elapsed, nats, bot = await replay_bot(session)
+
+        ops = events / elapsed
+        print(
+            f"\n  Bot: {events} events in {elapsed * 1000:.0f}ms, "
+            f"{nats.total} NATS publishes ({nats.bytes / 1e3:.0f} KB)"
+        )
+        log_performance(
+            "event_path_bot_replay", ops,
+            get_baseline_value("event_path_bot_replay"), "events/sec"
+        )
+        assert events == session.event_count + 3  # + join ack, login, REPLAY_DONE
+        assert ops > get_min_acceptable("event_path_bot_replay")
+
+        # Every chat line is published exactly once
+        chats = sum(1 for _, f in session.entries if f.startswith('42["chatMsg"'))
+        assert nats.published['rosey.db.message.log'] == chats
+        assert len(bot.channel.userlist) == 1000
+
+    async def test_stage_latency(self, session, monkeypatch):
+        timer = StageTimer()
+        instrument_decode(monkeypatch, timer)
+
+        events, _, _, _ = await replay_bot(session, timer)
+
+        print(f"\n  Bot stages over {events} events:\n{timer.report()}")
+        assert len(timer.samples['normalize']) == events
+        assert len(timer.samples['trigger']) >= events
+
+    async def test_memory(self, session):
+        current, peak, (events, _, _, bot) = await measure_memory(replay_bot, session)
+
+        print(
+            f"\n  Bot memory: peak {peak / 1e6:.1f} MB, retained {current / 1e6:.1f} MB "
+            f"({len(bot.channel.userlist)} users, {len(bot.channel.playlist.queue)} items)"
+        )
+        assert events == session.event_count + 3
+
+
+class TestConnectorEventPath:
+    """Benchmark CytubeConnector publishing to the EventBus."""
+
+    async def test_throughput(self, session):
+        events, elapsed, nats, connector = await replay_connector(session)
+
+        ops = events / elapsed
+        print(
+            f"\n  CytubeConnector: {events} events in {elapsed * 1000:.0f}ms, "
+            f"{nats.total} NATS publishes ({nats.bytes / 1e3:.0f} KB)"
+        )
+        log_performance(
+            "event_path_connector_replay", ops,
+            get_baseline_value("event_path_connector_replay"), "events/sec"
+        )
+        assert events == session.event_count + 3
+        assert ops > get_min_acceptable("event_path_connector_replay")
+        assert connector.get_statistics()['errors'] == 0
+        assert nats.total == connector.get_statistics()['events_received']
+
+    async def test_stage_latency(self, session, monkeypatch):
+        timer = StageTimer()
+        instrument_decode(monkeypatch, timer)
+
+        events, _, _, _ = await replay_connector(session, timer)
+
+        print(f"\n  CytubeConnector stages over {events} events:\n{timer.report()}")
+        assert len(timer.samples['bus_publish']) == len(timer.samples['nats_publish'])
+
+    async def test_memory(self, session):
+        current, peak, (events, _, _, _) = await measure_memory(replay_connector, session)
+
+        print(f"\n  CytubeConnector memory: peak {peak / 1e6:.1f} MB, "
+              f"retained {current / 1e6:.1f} MB")
+        assert events == session.event_count + 3
@@ -0,0 +1,90 @@
+"""
+Performance benchmarks for lib.util.MessageParser.
+
+Parses a synthetic chat log shaped like CyTube traffic: mostly plain or
+lightly formatted lines, links and emote images as CyTube renders them,
+and bursts of repeated emote spam. The single-pass tokenizer (with and
+without its result cache) is compared against the original HTMLParser
+implementation in tests/fixtures/message_parser_reference.py.
+"""
+
+import random
+import time
+
+from lib.util import MessageParser
+from tests.fixtures.message_parser_reference import ReferenceMessageParser
+from tests.performance.baseline_loader import (
+    get_baseline_value,
+    get_min_acceptable,
+    log_performance,
+)
+
+MESSAGES = 20000
+
+WORDS = ['hello', 'lol', 'this', 'song', 'is', 'great', 'skip', 'what', 'gg', 'nice', '&gt;']
+EMOTES = [
+    '<img class="channel-emote" src="https://i.example.com/%s.png" title=":%s:">' % (name, name)
+    for name in ('kappa', 'pog', 'lul', 'pepega', 'catjam')
+]
+
+
+def chat_log(count=MESSAGES, seed=35):
+    rng = random.Random(seed)
+    log = []
+    while len(log) < count:
+        roll = rng.random()
+        text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 12)))
+        if roll < 0.45:
+            log.append(text)
+        elif roll < 0.6:
+            tag = rng.choice(['strong', 'em', 'code', 's'])
+            log.append(f'{text} <{tag}>{rng.choice(WORDS)}</{tag}>')
+        elif roll < 0.7:
+            url = f'https://example.com/watch?v={rng.randrange(10**6)}&amp;t=1'
+            log.append(
+                f'{text} <a href="{url}" target="_blank" rel="noopener noreferrer">{url}</a>'
+            )
+        elif roll < 0.75:
+            log.append(f'<span class="spoiler">{text}</span>')
+        else:
+            # Emote spam: the same few lines over and over
+            spam = ' '.join([rng.choice(EMOTES)] * rng.randint(1, 3))
+            log.extend([spam] * rng.randint(1, 20))
+    return log[:count]
+
+
+def parse_all(parser, log):
+    start = time.perf_counter()
+    results = [parser.parse(msg) for msg in log]
+    return time.perf_counter() - start, results
+
+
+class TestMessageParser:
+    """Benchmark chat message conversion."""
+
+    def test_chat_log(self):
+        log = chat_log()
+
+        reference_time, expected = parse_all(ReferenceMessageParser(), log)
+        uncached = MessageParser()
+        uncached.CACHE_SIZE = 0
+        uncached_time, uncached_results = parse_all(uncached, log)
+        cached_time, results = parse_all(MessageParser(), log)
+
+        assert results == expected
+        assert uncached_results == expected
+
+        ops_per_sec = len(log) / cached_time
+        print(
+            f"\n  {len(log)} messages ({len(set(log))} distinct): "
+            f"HTMLParser {reference_time * 1000:.1f}ms, "
+            f"tokenizer {uncached_time * 1000:.1f}ms, "
+            f"tokenizer+cache {cached_time * 1000:.1f}ms"
+        )
+        log_performance(
+            "message_parser_chat_log", ops_per_sec,
+            get_baseline_value("message_parser_chat_log"), "messages/sec"
+        )
+        assert ops_per_sec > get_min_acceptable("message_parser_chat_log")
+        assert uncached_time < reference_time
+        assert cached_time < uncached_time
@@ -0,0 +1,119 @@
+"""
+Performance benchmarks for lib.playlist.Playlist.
+
+Simulates a large channel: a 10k item playlist snapshot followed by a
+storm of queue / moveVideo / delete events, the operations the CyTube
+event handlers apply. The indexed Playlist is compared against the plain
+list algorithm it replaced (list.index / insert / remove with
+PlaylistItem.__eq__ comparisons).
+"""
+
+import random
+import time
+
+from lib.playlist import Playlist, PlaylistItem
+from tests.fixtures.cytube_frames import make_item
+from tests.performance.baseline_loader import (
+    get_baseline_value,
+    get_min_acceptable,
+    log_performance,
+)
+
+ITEMS = 10000
+OPS = 5000
+
+
+class ListPlaylist:
+    """The previous list-backed implementation, for comparison."""
+
+    def __init__(self):
+        self.queue = []
+
+    def add(self, after, item):
+        if not isinstance(item, PlaylistItem):
+            item = PlaylistItem(item)
+        if not isinstance(after, int):
+            self.queue.append(item)
+        else:
+            self.queue.insert(self.queue.index(after) + 1, item)
+
+    def remove(self, item):
+        self.queue.remove(item)
+
+    def move(self, item, after):
+        item = self.queue[self.queue.index(item)]
+        self.remove(item)
+        self.add(after, item)
+
+
+def make_ops(seed=1):
+    """Random (op, args) over uids that exist when applied."""
+    rng = random.Random(seed)
+    uids = list(range(1, ITEMS + 1))
+    next_uid = ITEMS + 1
+    ops = []
+    for _ in range(OPS):
+        roll = rng.random()
+        if roll < 0.4:
+            ops.append(('add', (rng.choice(uids), make_item(next_uid - 1))))
+            uids.append(next_uid)
+            next_uid += 1
+        elif roll < 0.6:
+            uid = uids.pop(rng.randrange(len(uids)))
+            ops.append(('remove', (uid,)))
+        else:
+            uid, after = rng.sample(uids, 2)
+            ops.append(('move', (uid, after)))
+    return ops
+
+
+def run(playlist, snapshot, ops):
+    start = time.perf_counter()
+    for data in snapshot:
+        playlist.add(None, data)
+    for op, args in ops:
+        getattr(playlist, op)(*args)
+    return time.perf_counter() - start
+
+
+class TestPlaylistOperations:
+    """Benchmark playlist event handling on a large playlist."""
+
+    def test_event_storm(self):
+        snapshot = [make_item(i) for i in range(ITEMS)]
+        ops = make_ops()
+
+        indexed = Playlist()
+        indexed_time = run(indexed, snapshot, ops)
+        listed = ListPlaylist()
+        list_time = run(listed, snapshot, ops)
+
+        assert [item.uid for item in indexed.queue] == [item.uid for item in listed.queue]
+        assert indexed.duration == sum(item.duration for item in listed.queue)
+
+        ops_per_sec = (ITEMS + OPS) / indexed_time
+        print(
+            f"\n  {ITEMS} items + {OPS} queue/move/delete: "
+            f"indexed {indexed_time * 1000:.1f}ms, list {list_time * 1000:.1f}ms"
+        )
+        log_performance(
+            "playlist_event_ops", ops_per_sec,
+            get_baseline_value("playlist_event_ops"), "ops/sec"
+        )
+        assert ops_per_sec > get_min_acceptable("playlist_event_ops")
+        assert indexed_time < list_time
+
+    def test_lookup_and_index(self):
+        playlist = Playlist()
+        for i in range(ITEMS):
+            playlist.add(None, make_item(i))
+        uids = random.Random(2).sample(range(1, ITEMS + 1), 2000)
+
+        start = time.perf_counter()
+        for uid in uids:
+            playlist.get(uid)
+            playlist.index(uid)
+        elapsed = time.perf_counter() - start
+
+        print(f"\n  2000 get+index on {ITEMS} items: {elapsed * 1000:.2f}ms")
+        assert elapsed < 0.05
@@ -0,0 +1,99 @@
+"""
+Performance benchmarks for BotDatabase.row_random.
+
+A 1M-row plugin table (SQLite, in memory) with 10% of ids deleted at
+random, sampled by:
+
+- row_random (MIN/MAX lookup, then primary-key probes of random ids)
+- ORDER BY random() LIMIT 1, which sorts the whole table per pick
+"""
+
+import time
+
+from sqlalchemy import func, select, text
+
+from common.database import BotDatabase
+from common.models import Base
+from tests.performance.baseline_loader import (
+    get_baseline_value,
+    get_min_acceptable,
+    log_performance,
+)
+
+ROWS = 1_000_000
+PICKS = 500
+
+
+async def make_db():
+    db = BotDatabase(':memory:')
+    async with db.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    db._is_connected = True
+    await db.schema_registry.load_cache()
+    await db.schema_registry.register_schema("bench", "quotes", {
+        "fields": [
+            {"name": "text", "type": "text", "required": True},
+            {"name": "score", "type": "integer", "required": False}
+        ]
+    })
+    async with db.engine.begin() as conn:
+        await conn.execute(text(
+            'WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :rows) '
+            'INSERT INTO "bench_quotes" (id, text, score, created_at, updated_at) '
+            "SELECT i, 'quote ' || i, i % 100, datetime('now'), datetime('now') FROM n"
+        ), {"rows": ROWS})
+        await conn.execute(text(
+            'DELETE FROM "bench_quotes" WHERE abs(random()) % 10 = 0'
+        ))
+    return db
+
+
+class TestRowRandom:
+    """Benchmark random row selection on a large table."""
+
+    async def test_row_random_throughput(self):
+        db = await make_db()
+        try:
+            table = await db.get_table("bench_quotes")
+
+            start = time.perf_counter()
+            picks = [
+                (await db.row_random("bench", "quotes"))["rows"][0]["id"]
+                for _ in range(PICKS)
+            ]
+            elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            sample = await db.row_random("bench", "quotes", count=100)
+            sample_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            filtered = await db.row_random(
+                "bench", "quotes", filters={"score": {"$gte": 99}}, count=10
+            )
+            filtered_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            async with db.session_factory() as session:
+                for _ in range(3):
+                    await session.execute(select(table).order_by(func.random()).limit(1))
+            legacy_elapsed = (time.perf_counter() - start) / 3
+
+            ops = PICKS / elapsed
+            print(
+                f"\n  {ROWS} rows: row_random {elapsed / PICKS * 1000:.3f}ms/pick, "
+                f"count=100 {sample_elapsed * 1000:.1f}ms, "
+                f"1% filter count=10 {filtered_elapsed * 1000:.1f}ms; "
+                f"ORDER BY random() {legacy_elapsed * 1000:.1f}ms/pick"
+            )
+            log_performance(
+                "row_random_picks", ops,
+                get_baseline_value("row_random_picks"), "picks/sec"
+            )
+            assert ops > get_min_acceptable("row_random_picks")
+            assert elapsed / PICKS < legacy_elapsed
+            assert len(set(row["id"] for row in sample["rows"])) == 100
+            assert all(row["score"] >= 99 for row in filtered["rows"])
+            assert len(set(picks)) > PICKS * 0.95
+        finally:
+            await db.close()
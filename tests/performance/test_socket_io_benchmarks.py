@@ -0,0 +1,289 @@
+"""
+Performance benchmarks for socket.io frame decoding and response matching.
+
+Replays a synthetic CyTube session (large userlist/playlist snapshots plus
+chat-heavy steady-state traffic, see tests/fixtures/cytube_frames.py)
+through lib.socket_io:
+
+- decode_event() throughput, stdlib json vs the active JSON backend
+- the SocketIO receive loop end to end (frames -> events queue)
+- response matching with many pending emit() waiters, indexed vs scanned
+- 100 concurrent Bot.add_media() calls correlated over one connection
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from lib import socket_io
+from lib.bot import Bot
+from lib.connection import CyTubeConnection
+from lib.socket_io import SocketIO, SocketIOResponse, decode_event
+from tests.fixtures.cytube_frames import encode, session_frames, traffic_frames
+from tests.performance.baseline_loader import (
+    get_baseline_value,
+    get_min_acceptable,
+    log_performance,
+)
+
+
+class ReplayWebSocket:
+    """Websocket stand-in returning recorded frames, then blocking."""
+
+    def __init__(self, frames):
+        self.frames = iter(frames)
+        self.sent = []
+        self.exhausted = asyncio.Event()
+
+    async def recv(self):
+        try:
+            return next(self.frames)
+        except StopIteration:
+            self.exhausted.set()
+            await asyncio.Event().wait()
+
+    async def send(self, data):
+        self.sent.append(data)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return session_frames(users=2000, items=4000, traffic=20000)
+
+
+def decode_all(frames, loads):
+    start = time.perf_counter()
+    for data in frames:
+        if data[:1] == '4':
+            decode_event(data, loads)
+    return time.perf_counter() - start
+
+
+class TestFrameDecoding:
+    """Benchmark decode_event()."""
+
+    def test_decode_throughput(self, frames):
+        total_bytes = sum(len(f) for f in frames)
+
+        stdlib = min(decode_all(frames, json.loads) for _ in range(3))
+        active = min(decode_all(frames, socket_io.json_loads) for _ in range(3))
+
+        ops = len(frames) / active
+        print(
+            f"\n  {len(frames)} frames ({total_bytes / 1e6:.1f} MB): "
+            f"json {stdlib * 1000:.1f}ms, {socket_io.JSON_BACKEND} {active * 1000:.1f}ms"
+        )
+        log_performance(
+            "socketio_decode_frames", ops,
+            get_baseline_value("socketio_decode_frames"), "frames/sec"
+        )
+        assert ops > get_min_acceptable("socketio_decode_frames")
+
+        if socket_io.JSON_BACKEND != 'json':
+            # The optional backend must not be slower than the stdlib
+            assert active < stdlib * 1.1
+
+    def test_large_snapshot_frames(self, frames):
+        snapshots = [f for f in frames if f.startswith(('42["userlist"', '42["playlist"'))]
+        assert len(snapshots) == 2
+
+        elapsed = min(decode_all(snapshots, socket_io.json_loads) for _ in range(5))
+
+        print(
+            f"\n  userlist+playlist ({sum(map(len, snapshots)) / 1e3:.0f} KB): "
+            f"{elapsed * 1000:.2f}ms"
+        )
+        assert elapsed < 0.5
+
+
+class TestReceiveLoop:
+    """Benchmark the SocketIO receive loop end to end."""
+
+    async def test_replay_session(self, frames):
+        websocket = ReplayWebSocket(frames)
+        io = SocketIO(websocket, {'pingInterval': 60000}, 0, asyncio.get_running_loop())
+        expected = sum(1 for f in frames if f[:1] == '4')
+
+        start = time.perf_counter()
+        received = 0
+        try:
+            while received < expected:
+                await io.recv()
+                received += 1
+        finally:
+            elapsed = time.perf_counter() - start
+            await io.close()
+
+        ops = received / elapsed
+        print(f"\n  replayed {received} events in {elapsed * 1000:.0f}ms")
+        log_performance(
+            "socketio_replay_frames", ops,
+            get_baseline_value("socketio_replay_frames"), "events/sec"
+        )
+        assert ops > get_min_acceptable("socketio_replay_frames")
+        assert '3' in websocket.sent  # server pings were answered
+
+
+class TestResponseMatching:
+    """Benchmark pending-response matching with many waiters."""
+
+    WAITERS = 100
+
+    def make_io(self):
+        io = SocketIO.__new__(SocketIO)
+        io.response = {}
+        io.response_index = {}
+        return io
+
+    def run_matching(self, io, events):
+        start = time.perf_counter()
+        for event, data in events:
+            if io.response or event in io.response_index:
+                io._match_response(event, data)
+        return time.perf_counter() - start
+
+    async def test_indexed_vs_scanned(self):
+        calls = {'indexed': 0, 'scanned': 0}
+        events = [decode_event(f) for f in traffic_frames(20000) if f[:1] == '4']
+
+        def make_match(kind, media_id):
+            def match(event, data):
+                calls[kind] += 1
+                if event != 'queue':
+                    return False
+                return data['item']['media']['id'] == media_id
+            return match
+
+        indexed, scanned = self.make_io(), self.make_io()
+        for i in range(self.WAITERS):
+            media_id = f'pending{i}'  # never arrives
+            indexed._add_response(SocketIOResponse(
+                SocketIOResponse.expects('queue', 'queueFail')(make_match('indexed', media_id))
+            ))
+            scanned._add_response(SocketIOResponse(make_match('scanned', media_id)))
+
+        indexed_time = self.run_matching(indexed, events)
+        scanned_time = self.run_matching(scanned, events)
+
+        queue_events = sum(1 for event, _ in events if event == 'queue')
+        print(
+            f"\n  {len(events)} events, {self.WAITERS} waiters: "
+            f"indexed {indexed_time * 1000:.1f}ms ({calls['indexed']} match calls), "
+            f"scanned {scanned_time * 1000:.1f}ms ({calls['scanned']} match calls)"
+        )
+        assert calls['indexed'] == queue_events * self.WAITERS
+        assert calls['scanned'] == len(events) * self.WAITERS
+        assert indexed_time < scanned_time
+
+    async def test_single_waiter_resolves_among_traffic(self):
+        io = self.make_io()
+        response = SocketIOResponse(SocketIOResponse.match_event(r'^login$'))
+        io._add_response(response)
+        events = [decode_event(f) for f in traffic_frames(1000) if f[:1] == '4']
+        events.append(decode_event(encode('login', {'success': True})))
+
+        for event, data in events:
+            if io.response or event in io.response_index:
+                match = io._match_response(event, data)
+                if match is not None:
+                    match.set((event, data))
+
+        assert response.future.result() == ('login', {'success': True})
+
+
+class QueueServer:
+    """Websocket stand-in answering ``queue`` emits once a batch is in flight.
+
+    Replies arrive in reverse order, interleaved with chat traffic, so every
+    pending waiter is registered while the others resolve.
+    """
+
+    def __init__(self, bot_name, batch, traffic):
+        self.bot_name = bot_name
+        self.batch = batch
+        self.traffic = traffic
+        self.incoming = asyncio.Queue()
+        self.pending = []
+        self.sent = []
+
+    async def recv(self):
+        return await self.incoming.get()
+
+    async def send(self, data):
+        self.sent.append(data)
+        if not data.startswith('42["queue"'):
+            return
+        self.pending.append(json.loads(data[2:])[1])
+        if len(self.pending) < self.batch:
+            return
+        for media, chat in zip(reversed(self.pending), self.traffic):
+            self.incoming.put_nowait(chat)
+            self.incoming.put_nowait(encode('queue', {
+                'item': {
+                    'media': {'type': media['type'], 'id': media['id']},
+                    'queueby': self.bot_name,
+                },
+                'after': None,
+            }))
+        self.pending = []
+
+    async def close(self):
+        pass
+
+
+class TestConcurrentEmit:
+    """Benchmark emit() response correlation with many calls in flight."""
+
+    IN_FLIGHT = 100
+    ROUNDS = 20
+
+    async def test_concurrent_add_media(self, mock_nats_client):
+        chat = [f for f in traffic_frames(self.IN_FLIGHT * 4) if f.startswith('42["chatMsg"')]
+        server = QueueServer('bench', self.IN_FLIGHT, chat)
+        connection = CyTubeConnection('https://cytu.be', 'bench', response_timeout=5.0)
+        connection.socket = SocketIO(
+            server, {'pingInterval': 60000}, 0, asyncio.get_running_loop()
+        )
+        bot = Bot(connection, mock_nats_client)
+        bot.user.name = 'bench'
+        bot.user.rank = 3.0
+        bot.channel.permissions = {
+            'oplaylistadd': 0.0, 'oplaylistnext': 0.0, 'addnontemp': 0.0,
+        }
+
+        async def drain():
+            while True:
+                await connection.socket.recv()
+
+        drainer = asyncio.create_task(drain())
+        try:
+            start = time.perf_counter()
+            for r in range(self.ROUNDS):
+                items = await asyncio.gather(*(
+                    bot.add_media(f'https://youtu.be/r{r}v{i}')
+                    for i in range(self.IN_FLIGHT)
+                ))
+                assert [item['item']['media']['id'] for item in items] == [
+                    f'r{r}v{i}' for i in range(self.IN_FLIGHT)
+                ]
+            elapsed = time.perf_counter() - start
+            assert connection.socket.response_index == {}
+        finally:
+            drainer.cancel()
+            await connection.socket.close()
+
+        ops = self.IN_FLIGHT * self.ROUNDS / elapsed
+        print(
+            f"\n  {self.ROUNDS} x {self.IN_FLIGHT} concurrent add_media: "
+            f"{elapsed * 1000:.0f}ms"
+        )
+        log_performance(
+            "socketio_concurrent_add_media", ops,
+            get_baseline_value("socketio_concurrent_add_media"), "calls/sec"
+        )
+        assert ops > get_min_acceptable("socketio_concurrent_add_media")
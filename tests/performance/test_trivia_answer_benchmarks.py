@@ -0,0 +1,128 @@
+"""
+Performance benchmarks for plugins.trivia.question.Question.check_answer.
+
+A channel spamming a free-response question: 1,000 guesses per question,
+a mix of near misses, wrong answers and repeats, judged by:
+
+- check_answer (normalized once, bounded edit distance, cached verdicts)
+- the SequenceMatcher check it replaced, which lowercased both strings
+  and ran a full diff on every guess
+"""
+
+import random
+import time
+from difflib import SequenceMatcher
+
+from plugins.trivia.question import Difficulty, Question, QuestionType
+from tests.performance.baseline_loader import (
+    get_baseline_value,
+    get_min_acceptable,
+    log_performance,
+)
+
+GUESSES = 1_000
+ANSWERS = [
+    "Leonardo da Vinci",
+    "The Treaty of Westphalia",
+    "Mitochondria",
+    "Photosynthesis",
+    "Mount Kilimanjaro",
+    "Les Misérables",
+    "Ludwig van Beethoven",
+    "Tenochtitlan",
+    "The Great Gatsby",
+    "Saint Petersburg",
+    "Marie Curie",
+    "Antoine de Saint-Exupéry",
+]
+WRONG = ["paris", "napoleon", "i dont know", "lol", "the moon", "42", "einstein"]
+
+
+def legacy_check(answer, correct, fuzzy_threshold=0.85):
+    """The previous free-response path of check_answer."""
+    normalized_answer = answer.strip().lower()
+    normalized_correct = correct.lower()
+    if normalized_answer == normalized_correct:
+        return True
+    ratio = SequenceMatcher(None, normalized_answer, normalized_correct).ratio()
+    return ratio >= fuzzy_threshold
+
+
+def typo(text, rng):
+    """Insert, drop or swap one character."""
+    i = rng.randrange(len(text))
+    op = rng.randrange(3)
+    if op == 0:
+        return text[:i] + rng.choice("aeiourst") + text[i:]
+    if op == 1:
+        return text[:i] + text[i + 1:]
+    return text[:i] + rng.choice("aeiourst") + text[i + 1:]
+
+
+def make_guesses(answer, rng):
+    """1,000 guesses: about half distinct, the rest repeats."""
+    distinct = []
+    for _ in range(GUESSES // 2):
+        kind = rng.random()
+        if kind < 0.4:
+            distinct.append(typo(typo(answer, rng), rng))
+        elif kind < 0.7:
+            distinct.append(rng.choice(WRONG))
+        else:
+            distinct.append(rng.choice(ANSWERS))
+    return distinct + [rng.choice(distinct) for _ in range(GUESSES - len(distinct))]
+
+
+def make_question(n, answer):
+    return Question(
+        id=f"b{n}",
+        category="General Knowledge",
+        difficulty=Difficulty.MEDIUM,
+        type=QuestionType.FREE_RESPONSE,
+        question=f"Question {n}?",
+        correct_answer=answer,
+        incorrect_answers=[],
+    )
+
+
+class TestTriviaAnswerMatching:
+    """Benchmark answer checking under a guess flood."""
+
+    def test_check_answer_throughput(self):
+        rng = random.Random(46)
+        rounds = [
+            (make_question(n, answer), make_guesses(answer, rng))
+            for n, answer in enumerate(ANSWERS)
+        ]
+        total = len(rounds) * GUESSES
+
+        start = time.perf_counter()
+        verdicts = [
+            question.check_answer(guess)
+            for question, guesses in rounds
+            for guess in guesses
+        ]
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        legacy = [
+            legacy_check(guess, question.correct_answer)
+            for question, guesses in rounds
+            for guess in guesses
+        ]
+        legacy_elapsed = time.perf_counter() - start
+
+        ops = total / elapsed
+        print(
+            f"\n  {total} guesses over {len(rounds)} questions: {elapsed * 1000:.1f}ms "
+            f"({sum(verdicts)} correct); SequenceMatcher {legacy_elapsed * 1000:.1f}ms "
+            f"({sum(legacy)} correct)"
+        )
+        log_performance(
+            "trivia_answer_checks", ops,
+            get_baseline_value("trivia_answer_checks"), "guesses/sec"
+        )
+        assert ops > get_min_acceptable("trivia_answer_checks")
+        assert elapsed < legacy_elapsed
+        # Every exact answer is still accepted
+        assert all(question.check_answer(question.correct_answer) for question, _ in rounds)
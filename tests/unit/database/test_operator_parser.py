@@ -2,8 +2,10 @@
 
 import pytest
 from datetime import datetime
-from sqlalchemy import Table, Column, Integer, String, DateTime, Float, Boolean, MetaData
+from sqlalchemy import Table, Column, Integer, String, DateTime, Float, Boolean, MetaData, select
+from sqlalchemy.dialects import postgresql, sqlite
 
+from common.query_parsers.full_text import fts5_query, index_statements, search_fields
 from common.query_parsers.operator_parser import OperatorParser
 
 
@@ -814,6 +816,41 @@ class TestUpdateOperators:
         # Should use func.least()
         assert 'least' in str(updates['score']).lower()
 
+    def test_max_min_compile_for_sqlite(self, sample_schema, sample_table):
+        """Test $max/$min compile to NULL-safe max()/min() on SQLite."""
+        from sqlalchemy.dialects import sqlite
+
+        parser = OperatorParser(sample_schema)
+        updates = parser.parse_update_operations(
+            {'score': {'$max': 100}, 'rating': {'$min': 1.5}}, sample_table
+        )
+
+        score_sql = str(updates['score'].compile(dialect=sqlite.dialect()))
+        rating_sql = str(updates['rating'].compile(dialect=sqlite.dialect()))
+        assert score_sql.startswith('max(coalesce(')
+        assert rating_sql.startswith('min(coalesce(')
+        assert 'greatest' not in score_sql.lower()
+
+    def test_field_reference_value(self, sample_schema, sample_table):
+        """Test {'$field': name} uses another column of the row."""
+        parser = OperatorParser(sample_schema)
+        updates = parser.parse_update_operations(
+            {'score': {'$max': {'$field': 'rating'}}, 'rating': {'$inc': {'$field': 'score'}}},
+            sample_table
+        )
+
+        assert 'test_table.rating' in str(updates['score'])
+        assert 'test_table.score' in str(updates['rating'])
+
+    def test_field_reference_validation(self, sample_schema, sample_table):
+        """Test invalid field references are rejected."""
+        parser = OperatorParser(sample_schema)
+
+        with pytest.raises(ValueError, match="not in schema"):
+            parser.parse_update_operations({'score': {'$max': {'$field': 'nope'}}}, sample_table)
+        with pytest.raises(TypeError, match="must be a literal"):
+            parser.parse_update_operations({'score': {'$max': {'$gt': 1}}}, sample_table)
+
     def test_multiple_update_operations(self, sample_schema, sample_table):
         """Test multiple update operations in one call."""
         parser = OperatorParser(sample_schema)
@@ -1378,3 +1415,80 @@ class TestMultiFieldSorting:
 
         with pytest.raises(TypeError, match="must be dict"):
             parser.parse_sort(sort, sample_table)
+
+
+class TestFullTextSearch:
+    """Test $search parsing and the full-text helpers."""
+
+    @pytest.fixture
+    def search_schema(self):
+        return {
+            'fields': [
+                {'name': 'text', 'type': 'text', 'search': True},
+                {'name': 'author', 'type': 'string', 'search': True},
+                {'name': 'score', 'type': 'integer'}
+            ]
+        }
+
+    @pytest.fixture
+    def search_table(self):
+        return Table(
+            'quote-db_quotes',
+            MetaData(),
+            Column('id', Integer, primary_key=True),
+            Column('text', String(1000)),
+            Column('author', String(255)),
+            Column('score', Integer)
+        )
+
+    def test_search_fields(self, search_schema, sample_schema):
+        """Test indexed fields are collected in schema order."""
+        assert search_fields(search_schema) == ['text', 'author']
+        assert search_fields(sample_schema) == []
+
+    def test_fts5_query_quotes_terms(self):
+        """Test user input cannot inject FTS5 syntax."""
+        assert fts5_query('Einstein OR "rel*ativity"') == '"einstein" "or" "rel" "ativity"'
+        assert fts5_query('bacon', 'author') == '"author" : ("bacon")'
+
+    def test_search_combined_with_filters(self, search_schema, search_table):
+        """Test $search adds one clause alongside other filters."""
+        parser = OperatorParser(search_schema)
+
+        clauses = parser.parse_filters(
+            {'$search': 'knowledge', 'score': {'$gte': 1}}, search_table
+        )
+
+        assert len(clauses) == 2
+        sql = str(select(search_table).where(*clauses).compile(dialect=sqlite.dialect()))
+        assert '"quote-db_quotes_fts" MATCH' in sql
+
+    def test_postgresql_uses_tsvector(self, search_schema, search_table):
+        """Test PostgreSQL matches the GIN-indexed tsvector expression."""
+        parser = OperatorParser(search_schema)
+
+        clauses = parser.parse_filters({'author': {'$search': 'bacon'}}, search_table)
+        sql = str(select(search_table).where(*clauses).compile(dialect=postgresql.dialect()))
+
+        document = "to_tsvector('english', coalesce(\"text\", '') || ' ' || coalesce(\"author\", ''))"
+        assert f"{document} @@ plainto_tsquery" in sql
+        assert document in index_statements('quote-db_quotes', ['text', 'author'], True)[0]
+
+    def test_search_errors(self, search_schema, sample_schema, search_table, sample_table):
+        """Test $search needs a string and an indexed table or field."""
+        with pytest.raises(TypeError, match="requires string value"):
+            OperatorParser(search_schema).parse_filters({'$search': ['x']}, search_table)
+        with pytest.raises(ValueError, match="not full-text indexed"):
+            OperatorParser(search_schema).parse_filters(
+                {'score': {'$search': 'x'}}, search_table
+            )
+        with pytest.raises(ValueError, match="no full-text indexed fields"):
+            OperatorParser(sample_schema).parse_filters({'$search': 'x'}, sample_table)
+
+    def test_validate_filter_dict_accepts_search(self, search_schema):
+        """Test validation accepts top-level and field-level $search."""
+        parser = OperatorParser(search_schema)
+
+        parser.validate_filter_dict({'$search': 'x', 'author': {'$search': 'y'}})
+        with pytest.raises(ValueError, match="not full-text indexed"):
+            parser.validate_filter_dict({'score': {'$search': 'x'}})
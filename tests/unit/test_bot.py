@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import asyncio
+
 import pytest
 import json
 from unittest.mock import Mock, AsyncMock
@@ -417,6 +419,74 @@ class TestBotUserEvents:
         assert bot_simple.channel.userlist.count == 42
 
 
+class TestBotReconnect:
+    """Test reconnection backoff and userlist diffing"""
+
+    @pytest.mark.asyncio
+    async def test_userlist_after_reconnect_publishes_difference(self, bot_simple, mock_nats_client):
+        """A second userlist publishes only users who joined or left"""
+        await bot_simple.trigger('user_list', {'users': [
+            {'name': name, 'rank': 1.0} for name in ['a', 'b', 'c']
+        ]})
+        assert mock_nats_client.publish.call_count == 0
+
+        await bot_simple.trigger('user_list', {'users': [
+            {'name': name, 'rank': 1.0} for name in ['b', 'c', 'd']
+        ]})
+
+        published = [
+            (call.args[0], json.loads(call.args[1])['username'])
+            for call in mock_nats_client.publish.call_args_list
+        ]
+        assert published == [('rosey.db.user.left', 'a'), ('rosey.db.user.joined', 'd')]
+        assert sorted(bot_simple.channel.userlist) == ['b', 'c', 'd']
+
+    @pytest.mark.asyncio
+    async def test_replays_avoided_counted(self, mock_nats_client):
+        """Users present across a reconnect are counted in ConnectionStats"""
+        bot = Bot.from_cytube('http://test.com', 'channel', nats_client=mock_nats_client)
+        users = {'users': [{'name': 'user%d' % i} for i in range(10)]}
+
+        await bot.trigger('user_list', users)
+        await bot.trigger('user_list', users)
+
+        assert bot.connection.stats.user_replays_avoided == 10
+        assert mock_nats_client.publish.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_run_backs_off_with_jitter(self, mock_connection, mock_nats_client, monkeypatch):
+        """run() waits longer after each consecutive connection failure"""
+        from lib.connection.errors import ConnectionError as ConnError
+        from lib import bot as bot_module
+
+        delays = []
+        real_sleep = asyncio.sleep
+        real_backoff_delay = bot_module.backoff_delay
+
+        def backoff_delay(*args):
+            delays.append(real_backoff_delay(*args))
+            return delays[-1]
+
+        async def sleep(delay):
+            if len(delays) == 5:
+                raise asyncio.CancelledError
+            await real_sleep(0)
+
+        monkeypatch.setattr(bot_module, 'backoff_delay', backoff_delay)
+        monkeypatch.setattr(bot_module.asyncio, 'sleep', sleep)
+        mock_connection.is_connected = False
+        mock_connection.connect = AsyncMock(side_effect=ConnError('down'))
+        bot = Bot(mock_connection, mock_nats_client, restart_delay=1.0, max_restart_delay=8.0)
+
+        await bot.run()
+
+        assert mock_connection.connect.call_count == 5
+        mock_connection.reconnect.assert_not_called()
+        for attempt, delay in enumerate(delays, 1):
+            nominal = min(8.0, 2 ** (attempt - 1))
+            assert nominal / 2 <= delay <= nominal
+
+
 class TestBotPlaylistEvents:
     """Test Bot playlist-related event handlers"""
 
@@ -562,6 +632,64 @@ class TestBotChannelEvents:
         assert bot_simple.channel.voteskip_need == 5
 
 
+class TestBotOutbound:
+    """Test chat/pm through the outbound scheduler"""
+
+    @pytest.fixture(autouse=True)
+    def can_chat(self, bot_simple):
+        bot_simple.channel.permissions = {'chat': 0.0}
+        bot_simple.user.rank = 1.0
+
+    @pytest.mark.asyncio
+    async def test_chat_sends_through_scheduler(self, bot_simple, mock_connection):
+        """chat() sends immediately while within the flood limits"""
+        result = await bot_simple.chat('hello', meta={'bold': True})
+
+        assert result == {'msg': 'hello', 'meta': {'bold': True}}
+        mock_connection.send_message.assert_called_once_with('hello', meta={'bold': True})
+        assert bot_simple.outbound.sent == 1
+
+    @pytest.mark.asyncio
+    async def test_pm_not_connected(self, bot_simple, mock_connection):
+        """pm() raises ChannelError when the connection is down"""
+        from lib.connection.errors import NotConnectedError
+        from lib.error import ChannelError
+        mock_connection.send_pm = AsyncMock(side_effect=NotConnectedError('down'))
+
+        with pytest.raises(ChannelError, match='not connected'):
+            await bot_simple.pm('alice', 'hi')
+
+    @pytest.mark.asyncio
+    async def test_channel_flood_settings_applied(self, bot_simple):
+        """channelOpts antiflood params configure the token bucket"""
+        await bot_simple.trigger('channelOpts', {
+            'chat_antiflood': True,
+            'chat_antiflood_params': {'burst': 6, 'sustained': 2, 'cooldown': 5},
+        })
+
+        assert bot_simple.outbound.bucket.burst == 6
+        assert bot_simple.outbound.bucket.rate == 2.0
+
+    @pytest.mark.asyncio
+    async def test_burst_is_coalesced(self, bot_simple, mock_connection):
+        """Replies beyond the burst are joined into one line"""
+        bot_simple.outbound.bucket.configure(100.0, 1)
+
+        await asyncio.gather(*(bot_simple.chat('line%d' % i) for i in range(4)))
+
+        sent = [call.args[0] for call in mock_connection.send_message.call_args_list]
+        assert sent == ['line0', 'line1 line2 line3']
+
+    @pytest.mark.asyncio
+    async def test_noflood_throttles(self, bot_simple):
+        """noflood empties the bucket"""
+        await bot_simple.trigger('noflood', {'msg': 'Rate limited'})
+
+        assert bot_simple.outbound.throttled == 1
+        assert bot_simple.outbound.bucket.tokens == 0
+        await bot_simple.outbound.close()
+
+
 class TestBotErrorHandling:
     """Test Bot error events and exception handling"""
 
@@ -0,0 +1,420 @@
+"""
+Unit tests for lib/channel_state.py: delta publishing and replicas.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from lib.bot import Bot
+from lib.channel_state import (
+    ChannelStateClient,
+    ChannelStatePublisher,
+    ChannelStateReplica,
+    item_data,
+    state_subject,
+    user_data,
+)
+from lib.connection import CyTubeConnection
+from lib.playlist import PlaylistItem
+from lib.socket_io import decode_event
+from lib.user import User
+from tests.fixtures.cytube_frames import (
+    churn_frames,
+    encode,
+    join_frames,
+    make_item,
+    make_user,
+    playlist_burst_frames,
+)
+from tests.fixtures.mock_nats import MockNATSClient
+
+
+@pytest.fixture
+async def nats():
+    client = MockNATSClient()
+    await client.connect()
+    yield client
+    await client.close()
+
+
+@pytest.fixture
+async def bot(nats):
+    connection = CyTubeConnection('http://localhost', channel='lobby')
+    bot = Bot(connection, nats)
+    bot.channel.name = 'lobby'
+    return bot
+
+
+@pytest.fixture
+async def publisher(bot):
+    publisher = ChannelStatePublisher(bot)
+    await publisher.start()
+    yield publisher
+    await publisher.stop()
+
+
+async def feed(bot, frames):
+    """Run frames through the connection's normalization and the bot."""
+    for frame in frames:
+        if frame[:2] != '42':
+            continue
+        normalized = bot.connection._normalize_event(*decode_event(frame))
+        if normalized:
+            await bot.trigger(*normalized)
+
+
+async def settle():
+    """Let deltas, requests and replies propagate through the mock NATS."""
+    for _ in range(50):
+        await asyncio.sleep(0)
+
+
+def state(channel):
+    playlist = channel.playlist
+    return (
+        sorted((u.name, u.rank, u.afk, u.muted) for u in channel.userlist.values()),
+        [item_data(item) for item in playlist],
+        playlist.current.uid if playlist.current is not None else None,
+        playlist.locked,
+    )
+
+
+class TestSerialization:
+    """Test wire format helpers."""
+
+    def test_subjects_are_per_channel(self):
+        assert state_subject('lobby', 'delta') == 'rosey.state.lobby.delta'
+
+    def test_user_data_omits_ip(self):
+        data = user_data(User.from_data(make_user(1)))
+
+        assert data['name'] == 'user00001'
+        assert 'ip' not in data['meta']
+        assert User.from_data(data).rank == 1
+
+    def test_item_data_round_trips(self):
+        data = make_item(3)
+        data['media'] = {key: data['media'][key] for key in ('type', 'id', 'title', 'seconds')}
+
+        assert item_data(PlaylistItem(data)) == data
+
+
+class TestChannelStatePublisher:
+    """Test deltas recorded from bot events."""
+
+    async def test_deltas_follow_bot_events(self, bot, publisher):
+        await feed(bot, join_frames(users=5, items=3) + [
+            encode('queue', {'item': make_item(10), 'after': 2}),
+            encode('moveVideo', {'from': 11, 'after': 1}),
+            encode('delete', {'uid': 3}),
+            encode('setTemp', {'uid': 1, 'temp': False}),
+            encode('setUserRank', {'name': 'user00001', 'rank': 3}),
+            encode('setAFK', {'name': 'user00002', 'afk': True}),
+            encode('userLeave', {'name': 'user00003'}),
+            encode('setPlaylistLocked', True),
+        ])
+
+        ops = [delta['op'] for delta in publisher.history]
+        assert ops == [
+            'users', 'playlist', 'playlist.meta', 'item.add', 'item.move',
+            'item.remove', 'item.meta', 'user.meta', 'user.meta',
+            'user.remove', 'playlist.meta',
+        ]
+        assert [delta['seq'] for delta in publisher.history] == list(range(1, 12))
+        assert publisher.history[3] == {
+            'seq': 4, 'op': 'item.add', 'after': 2, 'item': item_data(bot.channel.playlist.get(11)),
+        }
+
+    async def test_one_message_per_burst(self, bot, nats, publisher):
+        messages = []
+
+        async def on_delta(msg):
+            messages.append(json.loads(msg.data))
+
+        await nats.subscribe(publisher.subject, cb=on_delta)
+        await feed(bot, join_frames(users=5, items=5) + playlist_burst_frames(50, items=5))
+        await settle()
+
+        assert len(messages) == 1
+        assert messages[0]['seq'] == publisher.seq
+        assert len(messages[0]['deltas']) == publisher.seq
+
+    async def test_delta_size_independent_of_channel_size(self, bot, nats, publisher):
+        messages = []
+
+        async def on_delta(msg):
+            messages.append(msg.data)
+
+        await feed(bot, join_frames(users=500, items=1000))
+        await settle()
+        await nats.subscribe(publisher.subject, cb=on_delta)
+        await feed(bot, [encode('queue', {'item': make_item(2000), 'after': 500})])
+        await settle()
+
+        assert len(messages) == 1
+        assert len(messages[0]) < 400
+        assert len(json.dumps(publisher.snapshot())) > 100000
+
+    async def test_failed_handler_records_nothing(self, bot, publisher):
+        await feed(bot, [encode('delete', {'uid': 42})])
+
+        assert publisher.seq == 0
+
+    async def test_snapshot_request(self, bot, nats, publisher):
+        await feed(bot, join_frames(users=4, items=2))
+
+        response = await nats.request(state_subject('lobby', 'snapshot'), b'')
+        snapshot = json.loads(response.data)
+
+        assert snapshot['seq'] == publisher.seq == 3
+        assert snapshot['epoch'] == publisher.epoch
+        assert len(snapshot['users']) == 4
+        assert [item['uid'] for item in snapshot['items']] == [1, 2]
+        assert snapshot['current'] == 1
+
+    async def test_resume_request(self, bot, nats, publisher):
+        await feed(bot, join_frames(users=4, items=2))
+
+        response = await nats.request(
+            state_subject('lobby', 'resume'), json.dumps({'since': 1}).encode()
+        )
+
+        assert [d['seq'] for d in json.loads(response.data)['deltas']] == [2, 3]
+
+    async def test_deltas_since_beyond_history(self, bot):
+        publisher = ChannelStatePublisher(bot, history=2)
+        for i in range(5):
+            publisher.record('playlist.meta', locked=bool(i % 2))
+
+        assert [d['seq'] for d in publisher.deltas_since(3)] == [4, 5]
+        assert publisher.deltas_since(5) == []
+        assert publisher.deltas_since(2) is None
+
+
+class TestChannelStateReplica:
+    """Test replicas converging on the bot's channel state."""
+
+    async def test_replica_follows_live_changes(self, bot, nats, publisher):
+        replica = ChannelStateReplica(nats, 'lobby')
+        await replica.start()
+
+        await feed(bot, join_frames(users=30, items=40) + playlist_burst_frames(200, items=40)
+                   + churn_frames(20, users=30) + [
+                       encode('setUserRank', {'name': 'user00004', 'rank': 2}),
+                       encode('setUserMeta', {'name': 'user00005',
+                                              'meta': {'afk': True, 'muted': True}}),
+                       encode('setCurrent', 7),
+                   ])
+        await settle()
+
+        assert replica.seq == publisher.seq
+        assert state(replica.channel) == state(bot.channel)
+        assert replica.resyncs == 1
+        await replica.stop()
+
+    async def test_late_replica_starts_from_snapshot(self, bot, nats, publisher):
+        await feed(bot, join_frames(users=10, items=10))
+        replica = ChannelStateReplica(nats, 'lobby')
+        await replica.start()
+
+        await feed(bot, playlist_burst_frames(30, items=10))
+        await settle()
+
+        assert state(replica.channel) == state(bot.channel)
+        await replica.stop()
+
+    async def test_missing_deltas_fetched_with_resume(self, bot, nats, publisher):
+        replica = ChannelStateReplica(nats, 'lobby')
+        await replica.start()
+        await feed(bot, join_frames(users=5, items=5))
+        await settle()
+
+        # Deltas that never reach the replica
+        publisher.record('playlist.meta', locked=True)
+        bot.channel.playlist.locked = True
+        publisher._pending.clear()
+
+        await feed(bot, [encode('queue', {'item': make_item(20), 'after': 5})])
+        await settle()
+
+        assert replica.resyncs == 1
+        assert replica.seq == publisher.seq
+        assert state(replica.channel) == state(bot.channel)
+        await replica.stop()
+
+    async def test_resync_when_history_is_gone(self, bot, nats):
+        publisher = ChannelStatePublisher(bot, history=1)
+        await publisher.start()
+        replica = ChannelStateReplica(nats, 'lobby')
+        await replica.start()
+        await feed(bot, join_frames(users=5, items=5))
+        await settle()
+
+        for _ in range(3):
+            bot.channel.playlist.locked = not bot.channel.playlist.locked
+            publisher.record('playlist.meta', locked=bot.channel.playlist.locked)
+        publisher._pending.clear()
+        await feed(bot, [encode('delete', {'uid': 2})])
+        await settle()
+
+        assert replica.resyncs == 2
+        assert state(replica.channel) == state(bot.channel)
+        await replica.stop()
+        await publisher.stop()
+
+    async def test_resync_when_resumed_delta_fails(self, bot, nats, publisher):
+        replica = ChannelStateReplica(nats, 'lobby')
+        await replica.start()
+        await feed(bot, join_frames(users=5, items=5))
+        await settle()
+
+        # The replica diverged, and misses a delta it can't apply
+        replica.channel.playlist.remove(3)
+        bot.channel.playlist.get(3).temp = True
+        publisher.record('item.meta', uid=3, temp=True)
+        publisher._pending.clear()
+
+        await replica.resume()
+
+        assert replica.resyncs == 2
+        assert replica.seq == publisher.seq
+        assert state(replica.channel) == state(bot.channel)
+        await replica.stop()
+
+    async def test_resync_when_resumed_deltas_have_gap(self, bot, nats, publisher):
+        replica = ChannelStateReplica(nats, 'lobby')
+        await replica.start()
+        await feed(bot, join_frames(users=5, items=5))
+        await settle()
+
+        for _ in range(3):
+            bot.channel.playlist.locked = not bot.channel.playlist.locked
+            publisher.record('playlist.meta', locked=bot.channel.playlist.locked)
+        publisher._pending.clear()
+        del publisher.history[-2]
+
+        await replica.resume()
+
+        assert replica.resyncs == 2
+        assert replica.seq == publisher.seq
+        assert state(replica.channel) == state(bot.channel)
+        await replica.stop()
+
+    async def test_publisher_restart_triggers_resync(self, bot, nats, publisher):
+        replica = ChannelStateReplica(nats, 'lobby')
+        await replica.start()
+        await feed(bot, join_frames(users=5, items=5))
+        await settle()
+        await publisher.stop()
+
+        restarted = ChannelStatePublisher(bot)
+        restarted.epoch = publisher.epoch + 1
+        await restarted.start()
+        await feed(bot, [encode('delete', {'uid': 1})])
+        await settle()
+
+        assert replica.epoch == restarted.epoch
+        assert replica.resyncs == 2
+        assert state(replica.channel) == state(bot.channel)
+        await replica.stop()
+        await restarted.stop()
+
+
+class TestReplicaQueries:
+    """Test lookups answered from the replica."""
+
+    @pytest.fixture
+    async def replica(self, bot, nats, publisher):
+        await feed(bot, join_frames(users=5, items=5) + [
+            encode('setUserRank', {'name': 'user00002', 'rank': 2}),
+        ])
+        replica = ChannelStateReplica(nats, 'lobby')
+        await replica.start()
+        yield replica
+        await replica.stop()
+
+    async def test_online_and_rank(self, replica, publisher):
+        assert [user['name'] for user in replica.online()] == [
+            'user%05d' % i for i in range(5)
+        ]
+        assert replica.rank('user00002') == 2
+        assert replica.rank('nobody') is None
+        assert replica.version == (publisher.epoch, publisher.seq)
+
+    async def test_is_moderator(self, replica):
+        assert replica.is_moderator('user00002')
+        assert not replica.is_moderator('user00001')
+        assert not replica.is_moderator('nobody')
+        assert replica.is_moderator('user00001', min_rank=1)
+
+    async def test_media_and_playlist_slice(self, replica, bot):
+        assert replica.current_media() == item_data(bot.channel.playlist.current)
+        assert [item['uid'] for item in replica.playlist_slice(1, 2)] == [2, 3]
+        assert len(replica.playlist_slice()) == 5
+
+    async def test_resync_after_failed_start(self, bot, nats):
+        replica = ChannelStateReplica(nats, 'lobby', timeout=0.01)
+        with pytest.raises(asyncio.TimeoutError):
+            await replica.start()
+
+        publisher = ChannelStatePublisher(bot)
+        await publisher.start()
+        await feed(bot, join_frames(users=3, items=2))
+        await settle()
+
+        assert replica.ready
+        assert state(replica.channel) == state(bot.channel)
+        await replica.stop()
+        await publisher.stop()
+
+
+class TestChannelStateClient:
+    """Test the plugin-side cache."""
+
+    async def test_lookups_are_local(self, bot, nats, publisher):
+        await feed(bot, join_frames(users=5, items=1) + [
+            encode('setUserRank', {'name': 'user00003', 'rank': 3}),
+        ])
+        client = ChannelStateClient(nats)
+        requests = 0
+        request = nats.request
+
+        async def counting_request(*args, **kwargs):
+            nonlocal requests
+            requests += 1
+            return await request(*args, **kwargs)
+
+        nats.request = counting_request
+
+        assert await client.is_moderator('lobby', 'user00003')
+        for _ in range(100):
+            assert not await client.is_moderator('lobby', 'user00001')
+        assert requests == 1  # the snapshot
+
+        await feed(bot, [encode('setUserRank', {'name': 'user00001', 'rank': 2})])
+        await settle()
+        assert await client.is_moderator('lobby', 'user00001')
+        assert await client.rank('lobby', 'nobody') is None
+        assert requests == 1
+        await client.stop()
+
+    async def test_concurrent_first_use_starts_one_replica(self, bot, nats, publisher):
+        client = ChannelStateClient(nats)
+
+        replicas = await asyncio.gather(*(client.replica('lobby') for _ in range(10)))
+
+        assert len({id(replica) for replica in replicas}) == 1
+        await client.stop()
+
+    async def test_unavailable_state_is_retried_later(self, nats):
+        client = ChannelStateClient(nats, timeout=0.01, retry_interval=60)
+
+        assert not await client.is_moderator('lobby', 'user00001')
+        assert await client.online('lobby') is None
+        assert 'lobby' not in client.replicas
+
+        client.retry_interval = 0
+        assert await client.current_media('lobby') is None
+        await client.stop()
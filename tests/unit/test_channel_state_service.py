@@ -0,0 +1,116 @@
+"""
+Unit tests for common/channel_state_service.py: state queries over NATS.
+"""
+
+import json
+
+import pytest
+
+from common.channel_state_service import ChannelStateService
+from lib.bot import Bot
+from lib.channel_state import ChannelStatePublisher, state_subject
+from lib.connection import CyTubeConnection
+from tests.fixtures.cytube_frames import encode, join_frames
+from tests.fixtures.mock_nats import MockNATSClient
+from tests.unit.test_channel_state import feed, settle
+
+
+@pytest.fixture
+async def nats():
+    client = MockNATSClient()
+    await client.connect()
+    yield client
+    await client.close()
+
+
+@pytest.fixture
+async def bot(nats):
+    connection = CyTubeConnection('http://localhost', channel='lobby')
+    bot = Bot(connection, nats)
+    bot.channel.name = 'lobby'
+    return bot
+
+
+@pytest.fixture
+async def publisher(bot):
+    publisher = ChannelStatePublisher(bot)
+    await publisher.start()
+    await feed(bot, join_frames(users=4, items=6) + [
+        encode('setUserRank', {'name': 'user00001', 'rank': 2}),
+    ])
+    yield publisher
+    await publisher.stop()
+
+
+@pytest.fixture
+async def service(nats, publisher):
+    service = ChannelStateService(nats, ['lobby'])
+    await service.start()
+    yield service
+    await service.stop()
+
+
+async def query(nats, kind, request=None):
+    response = await nats.request(
+        state_subject('lobby', f'query.{kind}'),
+        json.dumps(request or {}).encode()
+    )
+    return json.loads(response.data)
+
+
+class TestChannelStateService:
+    """Test queries answered from the replica."""
+
+    async def test_users(self, nats, publisher, service):
+        response = await query(nats, 'users')
+
+        assert response['success'] is True
+        assert (response['epoch'], response['seq']) == (publisher.epoch, publisher.seq)
+        assert [user['name'] for user in response['result']] == [
+            'user%05d' % i for i in range(4)
+        ]
+
+    async def test_user(self, nats, service):
+        moderator = (await query(nats, 'user', {'name': 'user00001'}))['result']
+        missing = (await query(nats, 'user', {'name': 'nobody'}))['result']
+
+        assert moderator == {'name': 'user00001', 'rank': 2, 'online': True, 'moderator': True}
+        assert missing['online'] is False
+        assert missing['moderator'] is False
+
+    async def test_user_requires_name(self, nats, service):
+        response = await query(nats, 'user')
+
+        assert response['success'] is False
+        assert response['error']['code'] == 'INVALID_REQUEST'
+
+    async def test_media(self, nats, bot, service):
+        response = await query(nats, 'media')
+
+        assert response['result']['uid'] == bot.channel.playlist.current.uid
+
+    async def test_playlist_slice(self, nats, service):
+        result = (await query(nats, 'playlist', {'start': 2, 'count': 3}))['result']
+
+        assert result['total'] == 6
+        assert [item['uid'] for item in result['items']] == [3, 4, 5]
+        assert (await query(nats, 'playlist', {'start': -1}))['success'] is False
+
+    async def test_answers_follow_deltas(self, nats, bot, publisher, service):
+        await feed(bot, [encode('userLeave', {'name': 'user00002'})])
+        await settle()
+
+        response = await query(nats, 'users')
+
+        assert response['seq'] == publisher.seq
+        assert 'user00002' not in [user['name'] for user in response['result']]
+        assert service.queries == 1
+
+    async def test_not_ready_without_publisher(self, nats):
+        service = ChannelStateService(nats, ['lobby'], timeout=0.01)
+        await service.start()
+
+        response = await query(nats, 'users')
+
+        assert response['error']['code'] == 'NOT_READY'
+        await service.stop()
@@ -0,0 +1,219 @@
+"""
+Unit tests for the materialized channel stats snapshot.
+"""
+
+import json
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from common.channel_stats import ChannelStatsSnapshot, TopChatters
+from common.database import BotDatabase
+from common.models import Base
+
+
+@pytest.fixture
+async def db():
+    """In-memory database with tables created."""
+    test_db = BotDatabase(':memory:')
+    async with test_db.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield test_db
+    await test_db.engine.dispose()
+
+
+async def chat(db, snapshot, username, lines=1):
+    for _ in range(lines):
+        snapshot.record_chat(username, await db.user_chat_message(username, 'hi'))
+
+
+async def join(db, snapshot, username):
+    snapshot.record_user_joined(await db.user_joined(username))
+
+
+class TestTopChatters:
+    """Test bounded top-N structure."""
+
+    def test_keeps_highest_counts(self):
+        top = TopChatters(capacity=3)
+        for name, lines in [('a', 5), ('b', 1), ('c', 3), ('d', 4), ('e', 2)]:
+            top.offer(name, lines)
+
+        assert top.top() == [('a', 5), ('d', 4), ('c', 3)]
+
+    def test_member_update_reorders(self):
+        top = TopChatters(capacity=2)
+        top.offer('a', 5)
+        top.offer('b', 3)
+        top.offer('b', 9)
+
+        assert top.top() == [('b', 9), ('a', 5)]
+
+    def test_evicts_true_minimum_after_updates(self):
+        top = TopChatters(capacity=2)
+        top.offer('a', 1)
+        top.offer('b', 2)
+        for lines in range(2, 50):
+            top.offer('a', lines)  # a overtakes b, leaving stale heap entries
+
+        top.offer('c', 10)
+
+        assert top.top() == [('a', 49), ('c', 10)]
+        assert len(top._heap) <= 4 * top.capacity + 1
+
+    def test_ignores_zero_and_ties_with_minimum(self):
+        top = TopChatters(capacity=1)
+        top.offer('a', 0)
+        assert len(top) == 0
+
+        top.offer('a', 2)
+        top.offer('b', 2)
+        assert top.top() == [('a', 2)]
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            TopChatters(capacity=0)
+
+
+class TestDatabaseReturnValues:
+    """Test the values the snapshot consumes."""
+
+    async def test_user_joined_reports_new_user(self, db):
+        assert await db.user_joined('alice') is True
+        assert await db.user_joined('alice') is False
+
+    async def test_user_chat_message_returns_total(self, db):
+        await db.user_joined('alice')
+        assert await db.user_chat_message('alice', 'one') == 1
+        assert await db.user_chat_message('alice', 'two') == 2
+
+    async def test_user_chat_message_unknown_user(self, db):
+        assert await db.user_chat_message('ghost', 'boo') is None
+
+    async def test_get_channel_stats_defaults(self, db):
+        stats = await db.get_channel_stats()
+        assert stats['max_users'] == 0
+        assert stats['max_users_timestamp'] is None
+
+
+class TestChannelStatsSnapshot:
+    """Test snapshot build and incremental maintenance."""
+
+    async def test_first_get_rebuilds(self, db):
+        await db.user_joined('alice')
+        await db.user_chat_message('alice', 'hi')
+        await db.update_high_water_mark(5, 8)
+        snapshot = ChannelStatsSnapshot(db)
+
+        stats = await snapshot.get()
+
+        assert stats['total_users_seen'] == 1
+        assert stats['top_chatters'] == [{'username': 'alice', 'chat_lines': 1}]
+        assert stats['high_water_mark']['users'] == 5
+        assert stats['high_water_mark']['timestamp'] is not None
+        assert stats['high_water_connected']['users'] == 8
+        assert snapshot.rebuilds == 1
+
+    async def test_incremental_updates_match_database(self, db):
+        snapshot = ChannelStatsSnapshot(db, top_n=3)
+        await snapshot.get()
+
+        for name, lines in [('a', 4), ('b', 1), ('c', 6), ('d', 2), ('e', 5)]:
+            await join(db, snapshot, name)
+            await chat(db, snapshot, name, lines)
+        await join(db, snapshot, 'a')  # returning user
+        await db.update_high_water_mark(7, 9)
+        snapshot.record_high_water(7, 9)
+
+        stats = await snapshot.get()
+
+        assert snapshot.rebuilds == 1  # served from memory
+        assert stats['total_users_seen'] == await db.get_total_users_seen()
+        expected = await db.get_top_chatters(limit=3)
+        assert stats['top_chatters'] == [
+            {'username': row['username'], 'chat_lines': row['total_chat_lines']}
+            for row in expected
+        ]
+        assert stats['high_water_mark']['users'] == 7
+        assert stats['high_water_connected']['users'] == 9
+
+    async def test_updates_before_load_are_ignored(self, db):
+        snapshot = ChannelStatsSnapshot(db)
+        await join(db, snapshot, 'alice')
+
+        stats = await snapshot.get()
+
+        assert stats['total_users_seen'] == 1  # counted once, by the load
+
+    async def test_stale_snapshot_is_rebuilt(self, db):
+        snapshot = ChannelStatsSnapshot(db, max_staleness=60)
+        await snapshot.get()
+        await db.user_joined('bypassed')  # write not seen by the snapshot
+
+        assert (await snapshot.get())['total_users_seen'] == 0
+
+        snapshot.reconciled_at -= 120
+        assert (await snapshot.get())['total_users_seen'] == 1
+        assert snapshot.rebuilds == 2
+
+    async def test_persist_and_reload(self, db):
+        snapshot = ChannelStatsSnapshot(db)
+        await snapshot.get()
+        await join(db, snapshot, 'alice')
+        await chat(db, snapshot, 'alice', 3)
+
+        assert await snapshot.persist() is True
+        assert await snapshot.persist() is False  # nothing new
+
+        restored = ChannelStatsSnapshot(db)
+        stats = await restored.get()
+
+        assert restored.rebuilds == 0
+        assert stats['total_users_seen'] == 1
+        assert stats['top_chatters'] == [{'username': 'alice', 'chat_lines': 3}]
+
+    async def test_expired_persisted_copy_is_ignored(self, db):
+        snapshot = ChannelStatsSnapshot(db, max_staleness=60)
+        await snapshot.get()
+        snapshot.reconciled_at = time.time() - 120
+        await snapshot.persist()
+
+        restored = ChannelStatsSnapshot(db, max_staleness=60)
+        await restored.get()
+
+        assert restored.rebuilds == 1
+
+
+class TestServiceIntegration:
+    """Test DatabaseService serving stats from the snapshot."""
+
+    async def test_channel_stats_query(self, db):
+        from common.database_service import DatabaseService
+
+        nats = Mock()
+        nats.publish = AsyncMock()
+        service = DatabaseService(nats, ':memory:')
+        await service.db.engine.dispose()
+        service.db = db
+        service.stats_snapshot.db = db
+
+        def event(payload):
+            msg = Mock()
+            msg.data = json.dumps(payload).encode()
+            msg.reply = 'reply'
+            return msg
+
+        await service._handle_channel_stats_query(event({}))
+        await service._handle_user_joined(event({'username': 'alice'}))
+        await service._handle_message_log(event({'username': 'alice', 'message': 'hi'}))
+        await service._handle_high_water(event({'chat_count': 3, 'connected_count': 4}))
+        await service._handle_channel_stats_query(event({}))
+
+        response = json.loads(nats.publish.call_args[0][1].decode())
+        assert response['success'] is True
+        assert response['total_users_seen'] == 1
+        assert response['top_chatters'] == [{'username': 'alice', 'chat_lines': 1}]
+        assert response['high_water_mark']['users'] == 3
+        assert response['high_water_connected']['users'] == 4
+        assert service.stats_snapshot.rebuilds == 1
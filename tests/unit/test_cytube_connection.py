@@ -244,6 +244,70 @@ class TestConnectionLifecycle:
         await connection.reconnect()
 
 
+class TestReconnectCaching:
+    """Test socket config caching and reconnection statistics."""
+
+    def _login(self, mock_socket):
+        mock_socket.emit.side_effect = [
+            ('', {}), ('login', {'success': True}),
+            ('', {}), ('login', {'success': True}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_socket_config_reused_within_ttl(self, connection, mock_socket, mock_http_get):
+        """Reconnecting within the TTL skips the socket config request."""
+        connection.socket_io_func = AsyncMock(return_value=mock_socket)
+        self._login(mock_socket)
+
+        await connection.connect()
+        await connection.disconnect()
+        await connection.connect()
+
+        assert mock_http_get.call_count == 1
+        assert connection.stats.socket_config_cache_hits == 1
+        assert connection.socket_io_func.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_socket_config_refetched_after_ttl(self, connection, mock_socket, mock_http_get):
+        """A zero TTL fetches the socket config on every connect."""
+        connection.socket_config_ttl = 0
+        connection.socket_io_func = AsyncMock(return_value=mock_socket)
+        self._login(mock_socket)
+
+        await connection.connect()
+        await connection.disconnect()
+        await connection.connect()
+
+        assert mock_http_get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_socket_connect_invalidates_config(self, connection, mock_socket, mock_http_get):
+        """A socket.io server that cannot be reached is looked up again."""
+        connection.socket_io_func = AsyncMock(side_effect=[OSError('refused'), mock_socket])
+        self._login(mock_socket)
+
+        with pytest.raises(ConnectionError):
+            await connection.connect()
+        await connection.connect()
+
+        assert mock_http_get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_reconnect_time_recorded(self, connection, mock_socket):
+        """Time from disconnect to reconnect is recorded in stats."""
+        connection.socket_io_func = AsyncMock(return_value=mock_socket)
+        self._login(mock_socket)
+
+        await connection.connect()
+        assert connection.stats.reconnects == 0
+        await connection.disconnect()
+        await connection.connect()
+
+        assert connection.stats.reconnects == 1
+        assert connection.stats.last_reconnect_time is not None
+        assert connection.stats.total_reconnect_time == connection.stats.last_reconnect_time
+
+
 class TestAuthentication:
     """Test channel join and user authentication."""
 
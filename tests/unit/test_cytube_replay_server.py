@@ -0,0 +1,176 @@
+"""
+Unit tests for the offline CyTube replay server (tests/fixtures/cytube_server.py).
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from lib.bot import Bot
+from lib.playlist import Playlist
+from tests.fixtures.cytube_frames import (
+    churn_frames,
+    encode,
+    join_frames,
+    make_item,
+    playlist_burst_frames,
+)
+from tests.fixtures.cytube_server import REPLAY_DONE, CytubeReplayServer, ReplaySession
+
+
+async def collect(connection):
+    events = []
+    async for event, data in connection.recv_events():
+        events.append((event, data))
+        if event == REPLAY_DONE:
+            return events
+
+
+class TestReplaySession:
+    """Test session construction and persistence."""
+
+    def test_from_frames(self):
+        session = ReplaySession.from_frames(['40', '2', encode('a')], interval=0.5)
+
+        assert session.entries[-1] == (1.0, encode('a'))
+        assert session.duration == 1.0
+        assert session.event_count == 2  # pings are not events
+
+    def test_save_and_load(self, tmp_path):
+        session = ReplaySession.from_frames(join_frames(5, 5))
+        path = tmp_path / 'session.jsonl'
+
+        session.save(path)
+
+        assert ReplaySession.load(path).entries == session.entries
+
+    def test_playlist_burst_references_existing_uids(self):
+        playlist = Playlist()
+        for i in range(50):
+            playlist.add(None, make_item(i))
+
+        for frame in playlist_burst_frames(300, items=50):
+            event, data = json.loads(frame[2:])
+            if event == 'queue':
+                playlist.add(data['after'], data['item'])
+            elif event == 'delete':
+                playlist.remove(data['uid'])
+            elif event == 'moveVideo':
+                playlist.move(data['from'], data['after'])
+            elif event == 'setTemp':
+                playlist.get(data['uid'])
+
+        assert len({item.uid for item in playlist.queue}) == len(playlist.queue)
+
+
+class TestCytubeReplayServer:
+    """Test CyTubeConnection against the replay server."""
+
+    async def test_connect_and_replay(self):
+        frames = [encode('chatMsg', {'username': 'a', 'msg': 'hi', 'time': 1000})]
+        async with CytubeReplayServer(ReplaySession.from_frames(frames)) as server:
+            connection = server.connection()
+            await connection.connect()
+            try:
+                events = await collect(connection)
+            finally:
+                await connection.disconnect()
+
+        names = [event for event, _ in events]
+        assert 'message' in names
+        assert names[-1] == REPLAY_DONE
+        assert [event for event, _ in server.received] == ['joinChannel', 'login']
+        assert server.received[0][1] == {'name': 'replay'}
+
+    async def test_speed_paces_replay(self):
+        session = ReplaySession.from_frames([encode('tick')] * 5, interval=0.1)
+        async with CytubeReplayServer(session, speed=2.0) as server:
+            connection = server.connection()
+            await connection.connect()
+            start = time.perf_counter()
+            try:
+                await collect(connection)
+            finally:
+                await connection.disconnect()
+
+        # 0.4s of recorded time at 2x
+        assert time.perf_counter() - start >= 0.15
+
+    def test_negative_speed_rejected(self):
+        with pytest.raises(ValueError):
+            CytubeReplayServer(ReplaySession([]), speed=-1)
+
+    async def test_client_emits_are_recorded(self):
+        async with CytubeReplayServer(ReplaySession([])) as server:
+            connection = server.connection()
+            await connection.connect()
+            try:
+                await collect(connection)
+                await connection.send_message('hello')
+                for _ in range(50):
+                    if len(server.received) == 3:
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                await connection.disconnect()
+
+        assert server.received[-1] == ('chatMsg', {'msg': 'hello', 'meta': {}})
+
+
+class TestBotReplay:
+    """Test Bot handling a replayed session."""
+
+    async def test_handlers_run_once_per_event(self):
+        frames = join_frames(users=20, items=10) + churn_frames(5, users=20) + [
+            encode('chatMsg', {'username': 'user00001', 'msg': 'hi', 'time': 1000}),
+        ]
+        nats = Mock()
+        nats.publish = AsyncMock()
+
+        async with CytubeReplayServer(ReplaySession.from_frames(frames)) as server:
+            connection = server.connection()
+            bot = Bot(connection, nats)
+            await connection.connect()
+            try:
+                async for event, data in connection.recv_events():
+                    await bot.trigger(event, data)
+                    if event == REPLAY_DONE:
+                        break
+            finally:
+                await connection.disconnect()
+
+        subjects = [call.args[0] for call in nats.publish.call_args_list]
+        assert subjects.count('rosey.db.message.log') == 1
+        assert subjects.count('rosey.db.user.joined') == 5
+        assert subjects.count('rosey.db.user.left') == 5
+        assert len(bot.channel.userlist) == 20
+        assert len(bot.channel.playlist.queue) == 10
+
+    async def test_reconnect_does_not_replay_users(self):
+        frames = join_frames(users=20, items=10)
+        nats = Mock()
+        nats.publish = AsyncMock()
+
+        async with CytubeReplayServer(ReplaySession.from_frames(frames)) as server:
+            connection = server.connection()
+            bot = Bot(connection, nats)
+            for _ in range(2):
+                await connection.connect()
+                try:
+                    async for event, data in connection.recv_events():
+                        await bot.trigger(event, data)
+                        if event == REPLAY_DONE:
+                            break
+                finally:
+                    await connection.disconnect()
+
+        subjects = [call.args[0] for call in nats.publish.call_args_list]
+        assert 'rosey.db.user.joined' not in subjects
+        assert 'rosey.db.user.left' not in subjects
+        assert connection.stats.user_replays_avoided == 20
+        assert connection.stats.socket_config_cache_hits == 1
+        assert connection.stats.reconnects == 1
+        assert server.connections == 2
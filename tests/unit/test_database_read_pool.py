@@ -0,0 +1,198 @@
+"""
+Unit tests for BotDatabase read-pool routing.
+
+Read-only operations (kv_get, row_search, stats queries, SQL SELECTs) go to
+an optional read pool: a replica URL or a read-only SQLite pool on the same
+file. Tests use two SQLite files to stand in for a primary and a replica.
+"""
+
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from common.database import BotDatabase
+from common.models import Base
+from lib.storage.sql_executor import PreparedStatementExecutor
+
+
+async def _create_tables(db: BotDatabase) -> None:
+    async with db.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+@pytest.fixture
+async def primary_path(tmp_path):
+    path = str(tmp_path / "primary.db")
+    db = BotDatabase(path)
+    await _create_tables(db)
+    await db.engine.dispose()
+    return path
+
+
+@pytest.fixture
+async def ro_db(primary_path):
+    """Database with a read-only SQLite pool on the same file."""
+    db = BotDatabase(primary_path, sqlite_read_pool=True)
+    yield db
+    await db.engine.dispose()
+    await db.read_engine.dispose()
+
+
+@pytest.fixture
+async def replica_db(primary_path, tmp_path):
+    """Database whose reads go to a separate (stale) replica file."""
+    replica_path = str(tmp_path / "replica.db")
+    replica = BotDatabase(replica_path)
+    await _create_tables(replica)
+    await replica.kv_set("test", "key", "replica-value")
+    await replica.engine.dispose()
+
+    db = BotDatabase(primary_path, read_database_url=replica_path)
+    yield db
+    await db.engine.dispose()
+    await db.read_engine.dispose()
+
+
+class TestReadPoolConfiguration:
+    """Test read pool setup."""
+
+    async def test_disabled_by_default(self, primary_path):
+        db = BotDatabase(primary_path)
+        try:
+            assert db.has_read_pool is False
+            assert db.read_engine is None
+            assert db.get_pool_metrics()["read"] is None
+        finally:
+            await db.engine.dispose()
+
+    async def test_sqlite_read_pool_uses_read_only_uri(self, ro_db):
+        assert ro_db.has_read_pool is True
+        assert ro_db.read_database_url.endswith("?mode=ro&uri=true")
+        assert "file:" in ro_db.read_database_url
+
+    async def test_sqlite_read_pool_ignored_for_memory(self):
+        db = BotDatabase(":memory:", sqlite_read_pool=True)
+        try:
+            assert db.has_read_pool is False
+        finally:
+            await db.engine.dispose()
+
+    async def test_read_url_accepts_file_path(self, replica_db):
+        assert replica_db.read_database_url.startswith("sqlite+aiosqlite:///")
+
+
+class TestReadRouting:
+    """Test routing of read-only operations."""
+
+    async def test_kv_get_uses_read_pool(self, ro_db):
+        await ro_db.kv_set("test", "key", {"a": 1})
+
+        result = await ro_db.kv_get("test", "key")
+
+        assert result == {"exists": True, "value": {"a": 1}}
+        metrics = ro_db.get_pool_metrics()
+        assert metrics["read"]["sessions"] == 1
+        assert metrics["primary"]["sessions"] == 1  # the kv_set
+
+    async def test_stats_queries_use_read_pool(self, ro_db):
+        await ro_db.user_joined("alice")
+        await ro_db.user_chat_message("alice", "hi")
+
+        assert await ro_db.get_total_users_seen() == 1
+        assert await ro_db.get_top_chatters(limit=5) == [
+            {'username': 'alice', 'total_chat_lines': 1}
+        ]
+        assert (await ro_db.get_user_stats("alice"))["total_chat_lines"] == 1
+
+        assert ro_db.get_pool_metrics()["read"]["sessions"] == 3
+
+    async def test_read_session_rejects_writes(self, ro_db):
+        with pytest.raises(OperationalError):
+            async with ro_db._get_read_session() as session:
+                await session.execute(text(
+                    "INSERT INTO plugin_kv_storage (plugin_name, key, value_json, "
+                    "created_at, updated_at) VALUES ('p', 'k', '1', 0, 0)"
+                ))
+
+        assert ro_db.get_pool_metrics()["read"]["errors"] == 1
+
+    async def test_reads_go_to_replica(self, replica_db):
+        await replica_db.kv_set("test", "key", "primary-value")
+
+        result = await replica_db.kv_get("test", "key")
+
+        assert result["value"] == "replica-value"
+
+    async def test_primary_reads_escape_hatch(self, replica_db):
+        await replica_db.kv_set("test", "key", "primary-value")
+
+        with replica_db.primary_reads():
+            result = await replica_db.kv_get("test", "key")
+
+        assert result["value"] == "primary-value"
+        metrics = replica_db.get_pool_metrics()
+        assert metrics["primary_reads"] == 1
+        assert metrics["read"]["sessions"] == 0
+
+    async def test_writes_never_use_read_pool(self, replica_db):
+        await replica_db.kv_set("test", "new", 1)
+        await replica_db.kv_delete("test", "new")
+
+        assert replica_db.get_pool_metrics()["read"]["sessions"] == 0
+
+
+class TestSQLExecutorRouting:
+    """Test SQL API statement routing."""
+
+    async def test_select_uses_read_pool(self, replica_db):
+        executor = PreparedStatementExecutor(replica_db)
+
+        result = await executor.execute(
+            "test", "SELECT value_json FROM plugin_kv_storage WHERE key = 'key'"
+        )
+
+        assert result["rows"] == [{"value_json": json.dumps("replica-value")}]
+        assert replica_db.get_pool_metrics()["read"]["sessions"] == 1
+
+    async def test_write_uses_primary(self, replica_db):
+        executor = PreparedStatementExecutor(replica_db)
+
+        await executor.execute(
+            "test", "DELETE FROM plugin_kv_storage WHERE key = 'missing'",
+            allow_write=True,
+        )
+
+        metrics = replica_db.get_pool_metrics()
+        assert metrics["read"]["sessions"] == 0
+        assert metrics["primary"]["sessions"] == 1
+
+
+class TestServiceConsistentFlag:
+    """Test the read-your-writes flag on DatabaseService read handlers."""
+
+    async def test_consistent_request_reads_primary(self, replica_db):
+        from common.database_service import DatabaseService
+
+        service = DatabaseService(Mock(), ":memory:")
+        await service.db.engine.dispose()
+        service.db = replica_db
+        await replica_db.kv_set("test", "key", "primary-value")
+
+        msg = Mock()
+        msg.respond = AsyncMock()
+        msg.data = json.dumps({
+            "plugin_name": "test", "key": "key", "consistent": True
+        }).encode()
+        await service._handle_kv_get(msg)
+
+        response = json.loads(msg.respond.call_args[0][0].decode())
+        assert response["data"]["value"] == "primary-value"
+
+        msg.data = json.dumps({"plugin_name": "test", "key": "key"}).encode()
+        await service._handle_kv_get(msg)
+
+        response = json.loads(msg.respond.call_args[0][0].decode())
+        assert response["data"]["value"] == "replica-value"
@@ -645,6 +645,90 @@ class TestRowUpdate:
         with pytest.raises(ValueError, match="Cannot convert"):
             await db.row_update("test", "items", row_id, {"count": "not_a_number"})
 
+    async def test_update_returning_operations(self, db):
+        """Test returning gives the values this update wrote."""
+        await db.schema_registry.register_schema("test", "items", {
+            "fields": [
+                {"name": "name", "type": "string", "required": True},
+                {"name": "score", "type": "integer", "required": False}
+            ]
+        })
+        row_id = (await db.row_insert("test", "items", {"name": "a", "score": 5}))['id']
+
+        result = await db.row_update(
+            "test", "items", row_id,
+            operations={"score": {"$inc": 3}}, returning=["score", "updated_at"]
+        )
+
+        assert result['updated'] is True
+        assert result['data']['score'] == 8
+        assert set(result['data']) == {"score", "updated_at"}
+        assert isinstance(result['data']['updated_at'], str)
+
+    async def test_update_returning_concurrent_increments(self, db):
+        """Test concurrent increments each see their own result."""
+        import asyncio
+        await db.schema_registry.register_schema("test", "items", {
+            "fields": [{"name": "score", "type": "integer", "required": False}]
+        })
+        row_id = (await db.row_insert("test", "items", {"score": 0}))['id']
+
+        results = await asyncio.gather(*[
+            db.row_update(
+                "test", "items", row_id,
+                operations={"score": {"$inc": 1}}, returning=["score"]
+            )
+            for _ in range(10)
+        ])
+
+        assert sorted(r['data']['score'] for r in results) == list(range(1, 11))
+
+    async def test_update_returning_data_mode_and_missing_row(self, db):
+        """Test returning with data updates and for a missing row."""
+        await db.schema_registry.register_schema("test", "items", {
+            "fields": [{"name": "name", "type": "string", "required": True}]
+        })
+        row_id = (await db.row_insert("test", "items", {"name": "a"}))['id']
+
+        result = await db.row_update(
+            "test", "items", row_id, {"name": "b"}, returning=["id", "name"]
+        )
+        assert result['data'] == {"id": row_id, "name": "b"}
+
+        result = await db.row_update("test", "items", 999, {"name": "c"}, returning=["name"])
+        assert result == {"exists": False}
+
+    async def test_update_returning_without_native_support(self, db, monkeypatch):
+        """Test the select-in-transaction path gives the same response."""
+        await db.schema_registry.register_schema("test", "items", {
+            "fields": [{"name": "score", "type": "integer", "required": False}]
+        })
+        row_id = (await db.row_insert("test", "items", {"score": 1}))['id']
+        monkeypatch.setattr(db.engine.dialect, "update_returning", False)
+
+        result = await db.row_update(
+            "test", "items", row_id, operations={"score": {"$mul": 4}}, returning=["score"]
+        )
+        assert result == {"id": row_id, "updated": True, "data": {"score": 4}}
+
+        result = await db.row_update("test", "items", 999, {"score": 1}, returning=["score"])
+        assert result == {"exists": False}
+
+    async def test_update_returning_validates_fields(self, db):
+        """Test unknown or malformed returning fields are rejected."""
+        await db.schema_registry.register_schema("test", "items", {
+            "fields": [{"name": "name", "type": "string", "required": True}]
+        })
+        row_id = (await db.row_insert("test", "items", {"name": "a"}))['id']
+
+        with pytest.raises(ValueError, match="Unknown returning field"):
+            await db.row_update("test", "items", row_id, {"name": "b"}, returning=["nope"])
+        with pytest.raises(ValueError, match="non-empty list"):
+            await db.row_update("test", "items", row_id, {"name": "b"}, returning="name")
+
+        select_result = await db.row_select("test", "items", row_id)
+        assert select_result['data']['name'] == "a"
+
 
 class TestRowDelete:
     """Test row_delete method for idempotent deletion."""
@@ -1069,3 +1153,362 @@ class TestRowSearch:
 
         assert result['count'] == 1
         assert result['rows'][0]['name'] == "item2"
+
+
+# ==================== row_batch() Tests ====================
+
+STATS_SCHEMA = {
+    "fields": [
+        {"name": "user_id", "type": "string", "required": True},
+        {"name": "points", "type": "integer", "required": False},
+        {"name": "streak", "type": "integer", "required": False},
+        {"name": "best_streak", "type": "integer", "required": False},
+        {"name": "fastest_ms", "type": "integer", "required": False}
+    ]
+}
+
+
+class TestRowBatch:
+    """Test row_batch method for transactional multi-row writes."""
+
+    async def test_upsert_creates_then_updates(self, db):
+        """Test insert-if-missing followed by atomic operations."""
+        await db.schema_registry.register_schema("test", "stats", STATS_SCHEMA)
+        step = {
+            "table": "stats",
+            "match": {"user_id": "alice"},
+            "insert": {"points": 0},
+            "operations": {"points": {"$inc": 10}},
+            "returning": True
+        }
+
+        first = await db.row_batch("test", [step])
+        second = await db.row_batch("test", [step])
+
+        assert first['results'][0]['created'] is True
+        assert first['results'][0]['rows'][0]['points'] == 10
+        assert second['results'][0]['created'] is False
+        assert second['results'][0]['ids'] == first['results'][0]['ids']
+        assert second['results'][0]['rows'][0]['points'] == 20
+
+    async def test_steps_see_earlier_steps(self, db):
+        """Test a $field reference reads the value written by a previous step."""
+        await db.schema_registry.register_schema("test", "stats", STATS_SCHEMA)
+        await db.row_insert("test", "stats", {"user_id": "bob", "streak": 4, "best_streak": 4})
+
+        result = await db.row_batch("test", [
+            {"table": "stats", "match": {"user_id": "bob"},
+             "operations": {"streak": {"$inc": 1}}},
+            {"table": "stats", "match": {"user_id": "bob"},
+             "operations": {"best_streak": {"$max": {"$field": "streak"}}},
+             "returning": True}
+        ])
+
+        row = result['results'][1]['rows'][0]
+        assert (row['streak'], row['best_streak']) == (5, 5)
+        assert 'rows' not in result['results'][0]
+
+    async def test_conditional_min_max_handle_null(self, db):
+        """Test $min/$max on SQLite, including a NULL current value."""
+        await db.schema_registry.register_schema("test", "stats", STATS_SCHEMA)
+        await db.row_insert("test", "stats", {"user_id": "carol", "best_streak": 7})
+
+        async def apply(operations):
+            result = await db.row_batch("test", [{
+                "table": "stats", "match": {"user_id": "carol"},
+                "operations": operations, "returning": True
+            }])
+            return result['results'][0]['rows'][0]
+
+        row = await apply({"fastest_ms": {"$min": 900}, "best_streak": {"$max": 3}})
+        assert (row['fastest_ms'], row['best_streak']) == (900, 7)
+        row = await apply({"fastest_ms": {"$min": 1200}, "best_streak": {"$max": 9}})
+        assert (row['fastest_ms'], row['best_streak']) == (900, 9)
+
+    async def test_read_only_step(self, db):
+        """Test a step without changes returns matching rows."""
+        await db.schema_registry.register_schema("test", "stats", STATS_SCHEMA)
+        await db.row_insert("test", "stats", [
+            {"user_id": "a", "points": 1}, {"user_id": "b", "points": 2}
+        ])
+
+        result = await db.row_batch("test", [{
+            "table": "stats", "match": {"points": {"$gte": 1}}, "returning": True
+        }])
+
+        assert [r['user_id'] for r in result['results'][0]['rows']] == ["a", "b"]
+
+    async def test_failure_rolls_back_batch(self, db):
+        """Test a failing step undoes earlier steps."""
+        await db.schema_registry.register_schema("test", "stats", STATS_SCHEMA)
+        await db.row_insert("test", "stats", {"user_id": "dave", "points": 5})
+
+        with pytest.raises(Exception):
+            await db.row_batch("test", [
+                {"table": "stats", "match": {"user_id": "dave"},
+                 "operations": {"points": {"$inc": 5}}},
+                # Fails at execution time: NOT NULL constraint on user_id
+                {"table": "stats", "match": {"user_id": "dave"},
+                 "data": {"user_id": None}}
+            ])
+
+        rows = await db.row_search("test", "stats", filters={"user_id": "dave"})
+        assert rows['rows'][0]['points'] == 5
+
+    async def test_returning_field_list(self, db, monkeypatch):
+        """Test returning a field list, natively and via select."""
+        await db.schema_registry.register_schema("test", "stats", STATS_SCHEMA)
+        step = {
+            "table": "stats", "match": {"user_id": "erin"},
+            "insert": {"points": 0}, "operations": {"points": {"$inc": 4}},
+            "returning": ["user_id", "points"]
+        }
+
+        result = await db.row_batch("test", [step])
+        assert result["results"][0]["rows"] == [{"user_id": "erin", "points": 4}]
+
+        monkeypatch.setattr(db.engine.dialect, "update_returning", False)
+        result = await db.row_batch("test", [step])
+        assert result["results"][0]["rows"] == [{"user_id": "erin", "points": 8}]
+
+        with pytest.raises(ValueError, match="Unknown returning field"):
+            await db.row_batch("test", [{**step, "returning": ["nope"]}])
+
+    async def test_validates_steps_before_running(self, db):
+        """Test invalid steps are rejected with their index."""
+        await db.schema_registry.register_schema("test", "stats", STATS_SCHEMA)
+
+        with pytest.raises(ValueError, match="Step 1"):
+            await db.row_batch("test", [
+                {"table": "stats", "match": {"user_id": "x"}, "insert": {}},
+                {"table": "stats", "match": {"user_id": "x"},
+                 "operations": {"id": {"$set": 3}}}
+            ])
+        with pytest.raises(ValueError, match="plain equality"):
+            await db.row_batch("test", [{
+                "table": "stats", "match": {"points": {"$gt": 1}}, "insert": {"user_id": "x"}
+            }])
+        with pytest.raises(ValueError, match="not registered"):
+            await db.row_batch("test", [{"table": "missing", "match": {"id": 1}}])
+
+        rows = await db.row_search("test", "stats")
+        assert rows['count'] == 0
+
+
+# ==================== Full-text search Tests ====================
+
+QUOTES_SCHEMA = {
+    "fields": [
+        {"name": "text", "type": "text", "required": True, "search": True},
+        {"name": "author", "type": "string", "required": False, "search": True},
+        {"name": "score", "type": "integer", "required": False}
+    ]
+}
+
+
+class TestRowFullTextSearch:
+    """Test $search with the SQLite FTS5 index."""
+
+    async def insert_quotes(self, db):
+        await db.schema_registry.register_schema("quote-db", "quotes", QUOTES_SCHEMA)
+        await db.row_insert("quote-db", "quotes", [
+            {"text": "Imagination is more important than knowledge", "author": "Albert Einstein"},
+            {"text": "Knowledge is power", "author": "Francis Bacon"},
+            {"text": "Knowledge, knowledge and more knowledge!", "author": "Anonymous"},
+            {"text": "The unexamined life is not worth living", "author": "Socrates"},
+        ])
+
+    async def test_search_matches_all_words_ranked(self, db):
+        """Test every word must match and denser matches rank first."""
+        await self.insert_quotes(db)
+
+        result = await db.row_search("quote-db", "quotes", filters={"$search": "knowledge"})
+        assert [row['author'] for row in result['rows']][0] == "Anonymous"
+        assert result['count'] == 3
+
+        result = await db.row_search("quote-db", "quotes", filters={"$search": "KNOWLEDGE power."})
+        assert [row['author'] for row in result['rows']] == ["Francis Bacon"]
+
+    async def test_search_stems_and_spans_fields(self, db):
+        """Test stemming and matching across text and author."""
+        await self.insert_quotes(db)
+
+        result = await db.row_search("quote-db", "quotes", filters={"$search": "imagine einstein"})
+        assert [row['author'] for row in result['rows']] == ["Albert Einstein"]
+
+        result = await db.row_search("quote-db", "quotes", filters={"$search": "lives"})
+        assert [row['author'] for row in result['rows']] == ["Socrates"]
+
+    async def test_field_search_and_other_filters(self, db):
+        """Test field-level $search and combining with other filters and sorts."""
+        await self.insert_quotes(db)
+        await db.row_update("quote-db", "quotes", 2, {"score": 5})
+
+        result = await db.row_search(
+            "quote-db", "quotes", filters={"author": {"$search": "bacon"}}
+        )
+        assert [row['id'] for row in result['rows']] == [2]
+
+        # "knowledge" is in text, not author
+        result = await db.row_search(
+            "quote-db", "quotes", filters={"author": {"$search": "knowledge"}}
+        )
+        assert result['count'] == 0
+
+        result = await db.row_search(
+            "quote-db", "quotes",
+            filters={"$search": "knowledge", "score": {"$gte": 1}}
+        )
+        assert [row['id'] for row in result['rows']] == [2]
+
+        result = await db.row_search(
+            "quote-db", "quotes", filters={"$search": "knowledge"},
+            sort={"field": "id", "order": "desc"}, limit=2
+        )
+        assert [row['id'] for row in result['rows']] == [3, 2]
+        assert result['truncated'] is True
+
+    async def test_index_follows_updates_and_deletes(self, db):
+        """Test triggers keep the index in sync with the table."""
+        await self.insert_quotes(db)
+
+        await db.row_update("quote-db", "quotes", 4, {"text": "Know thyself"})
+        await db.row_delete("quote-db", "quotes", 2)
+
+        result = await db.row_search("quote-db", "quotes", filters={"$search": "unexamined"})
+        assert result['count'] == 0
+        result = await db.row_search("quote-db", "quotes", filters={"$search": "thyself"})
+        assert [row['id'] for row in result['rows']] == [4]
+        result = await db.row_search("quote-db", "quotes", filters={"$search": "power"})
+        assert result['count'] == 0
+
+    async def test_search_without_words_matches_nothing(self, db):
+        """Test a query of only punctuation returns no rows."""
+        await self.insert_quotes(db)
+
+        result = await db.row_search("quote-db", "quotes", filters={"$search": " ?! "})
+        assert result['count'] == 0
+
+    async def test_search_requires_index(self, db):
+        """Test $search on a table or field without an index is rejected."""
+        await self.insert_quotes(db)
+        await db.schema_registry.register_schema("test", "items", {
+            "fields": [{"name": "name", "type": "string", "required": True}]
+        })
+
+        with pytest.raises(ValueError, match="no full-text indexed fields"):
+            await db.row_search("test", "items", filters={"$search": "x"})
+        with pytest.raises(ValueError, match="not full-text indexed"):
+            await db.row_search("quote-db", "quotes", filters={"score": {"$search": "x"}})
+        with pytest.raises(TypeError, match="requires string value"):
+            await db.row_search("quote-db", "quotes", filters={"$search": 5})
+
+    async def test_index_added_to_existing_table(self, db):
+        """Test re-registering with search fields indexes existing rows."""
+        plain = {"fields": [
+            {k: v for k, v in field.items() if k != "search"}
+            for field in QUOTES_SCHEMA["fields"]
+        ]}
+        await db.schema_registry.register_schema("quote-db", "quotes", plain)
+        await db.row_insert("quote-db", "quotes", {"text": "Knowledge is power"})
+
+        assert await db.schema_registry.register_schema(
+            "quote-db", "quotes", QUOTES_SCHEMA
+        ) is False
+
+        result = await db.row_search("quote-db", "quotes", filters={"$search": "power"})
+        assert result['count'] == 1
+        schema = db.schema_registry.get_schema("quote-db", "quotes")
+        assert [f['name'] for f in schema['fields'] if f.get('search')] == ["text", "author"]
+
+
+# ==================== row_random() Tests ====================
+
+class TestRowRandom:
+    """Test row_random uniform sampling."""
+
+    async def insert_items(self, db, n=50):
+        await db.schema_registry.register_schema("test", "items", {
+            "fields": [
+                {"name": "name", "type": "string", "required": True},
+                {"name": "score", "type": "integer", "required": False}
+            ]
+        })
+        if n:
+            await db.row_insert("test", "items", [
+                {"name": f"item{i}", "score": i % 10} for i in range(1, n + 1)
+            ])
+
+    async def test_returns_distinct_rows(self, db):
+        """Test count rows are returned without replacement."""
+        await self.insert_items(db)
+
+        result = await db.row_random("test", "items", count=20)
+
+        assert result['count'] == 20
+        ids = [row['id'] for row in result['rows']]
+        assert len(set(ids)) == 20
+        assert isinstance(result['rows'][0]['created_at'], str)
+
+    async def test_count_larger_than_table(self, db):
+        """Test asking for more rows than exist returns them all."""
+        await self.insert_items(db, n=5)
+
+        result = await db.row_random("test", "items", count=10)
+
+        assert sorted(row['id'] for row in result['rows']) == [1, 2, 3, 4, 5]
+
+    async def test_empty_table(self, db):
+        """Test an empty table returns no rows."""
+        await self.insert_items(db, n=0)
+
+        result = await db.row_random("test", "items")
+
+        assert result == {"rows": [], "count": 0}
+
+    async def test_filters_apply(self, db):
+        """Test only matching rows are sampled."""
+        await self.insert_items(db, n=200)
+
+        result = await db.row_random("test", "items", filters={"score": 3}, count=5)
+
+        assert result['count'] == 5
+        assert all(row['score'] == 3 for row in result['rows'])
+
+    async def test_sparse_matches_fall_back(self, db):
+        """Test a filter matching few rows in a wide id range still finds them."""
+        await self.insert_items(db, n=1000)
+        for row_id in (17, 503, 998):
+            await db.row_update("test", "items", row_id, {"name": "rare"})
+
+        result = await db.row_random("test", "items", filters={"name": "rare"}, count=3)
+
+        assert sorted(row['id'] for row in result['rows']) == [17, 503, 998]
+
+    async def test_uniform_despite_gaps(self, db):
+        """Test rows after a gap in ids are not favoured."""
+        await self.insert_items(db, n=40)
+        # Leave 4 rows, one straight after a long gap
+        for row_id in range(1, 41):
+            if row_id not in (1, 2, 3, 40):
+                await db.row_delete("test", "items", row_id)
+
+        counts = {1: 0, 2: 0, 3: 0, 40: 0}
+        for _ in range(400):
+            result = await db.row_random("test", "items")
+            counts[result['rows'][0]['id']] += 1
+
+        assert all(60 <= n <= 140 for n in counts.values()), counts
+
+    async def test_validation(self, db):
+        """Test invalid requests are rejected."""
+        await self.insert_items(db, n=1)
+
+        with pytest.raises(ValueError, match="not registered"):
+            await db.row_random("test", "missing")
+        with pytest.raises(ValueError, match="positive integer"):
+            await db.row_random("test", "items", count=0)
+        with pytest.raises(ValueError, match="cannot exceed"):
+            await db.row_random("test", "items", count=5000)
+        with pytest.raises(ValueError, match="not found in schema"):
+            await db.row_random("test", "items", filters={"nope": 1})
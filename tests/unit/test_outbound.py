@@ -0,0 +1,218 @@
+"""
+Unit tests for lib/outbound.py: flood-controlled outbound chat.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from lib.error import ChannelError
+from lib.outbound import (
+    PRIORITY_AMBIENT,
+    PRIORITY_MODERATION,
+    PRIORITY_NORMAL,
+    OutboundScheduler,
+    TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Recorder:
+    """send() stand-in recording (kind, target, text, meta)."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def __call__(self, kind, target, text, meta):
+        self.sent.append((kind, target, text, meta))
+
+
+@pytest.fixture
+def send():
+    return Recorder()
+
+
+async def submit_all(scheduler, *messages):
+    """Submit (kind, target, text, priority) tuples concurrently, in order."""
+    tasks = []
+    for kind, target, text, priority in messages:
+        tasks.append(asyncio.ensure_future(
+            scheduler.submit(kind, target, text, priority=priority)
+        ))
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+
+
+class TestTokenBucket:
+    """Test TokenBucket."""
+
+    def test_burst_then_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(2.0, 3, clock)
+
+        assert [bucket.try_take() for _ in range(4)] == [True, True, True, False]
+        assert bucket.wait_time() == pytest.approx(0.5)
+
+        clock.now = 0.5
+        assert bucket.try_take()
+        assert not bucket.try_take()
+
+    def test_refill_capped_at_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(1.0, 2, clock)
+        bucket.drain()
+
+        clock.now = 100
+        assert [bucket.try_take() for _ in range(3)] == [True, True, False]
+
+    def test_configure_keeps_tokens(self):
+        clock = FakeClock()
+        bucket = TokenBucket(1.0, 10, clock)
+        bucket.try_take()
+
+        bucket.configure(5.0, 4)
+
+        assert bucket.tokens == 4
+        assert bucket.rate == 5.0
+
+
+class TestOutboundScheduler:
+    """Test pacing, lanes and coalescing."""
+
+    async def test_sends_immediately_with_tokens(self, send):
+        scheduler = OutboundScheduler(send, burst=2)
+
+        await scheduler.submit('chat', None, 'hello', {'color': 'red'})
+
+        assert send.sent == [('chat', None, 'hello', {'color': 'red'})]
+        assert scheduler._worker is None
+
+    async def test_paced_to_sustained_rate(self, send):
+        scheduler = OutboundScheduler(send, burst=2, sustained=100.0)
+        start = time.monotonic()
+
+        await submit_all(scheduler, *[
+            ('pm', 'user%d' % i, 'hi', PRIORITY_NORMAL) for i in range(8)
+        ])
+
+        assert [target for _, target, _, _ in send.sent] == ['user%d' % i for i in range(8)]
+        assert time.monotonic() - start >= 6 / 100.0 * 0.9
+        assert scheduler.stats()['latency_max'] > 0
+
+    async def test_priority_lanes(self, send):
+        scheduler = OutboundScheduler(send, burst=1, sustained=100.0)
+
+        await submit_all(
+            scheduler,
+            ('chat', None, '/first', PRIORITY_NORMAL),
+            ('pm', 'a', 'ambient', PRIORITY_AMBIENT),
+            ('pm', 'b', 'normal', PRIORITY_NORMAL),
+            ('chat', None, '/kick troll', PRIORITY_MODERATION),
+        )
+
+        assert [text for _, _, text, _ in send.sent] == [
+            '/first', '/kick troll', 'normal', 'ambient'
+        ]
+
+    async def test_coalesces_same_target(self, send):
+        scheduler = OutboundScheduler(send, burst=1, sustained=100.0)
+
+        await submit_all(scheduler, *[
+            ('chat', None, 'line%d' % i, PRIORITY_NORMAL) for i in range(5)
+        ] + [('pm', 'bob', 'a', PRIORITY_NORMAL), ('pm', 'bob', 'b', PRIORITY_NORMAL)])
+
+        assert send.sent == [
+            ('chat', None, 'line0', None),
+            ('chat', None, 'line1 line2 line3 line4', None),
+            ('pm', 'bob', 'a b', None),
+        ]
+        assert scheduler.coalesced == 4
+        assert scheduler.sent == 3
+
+    async def test_coalescing_respects_max_length_and_commands(self, send):
+        scheduler = OutboundScheduler(send, burst=1, sustained=100.0, max_length=12)
+
+        await submit_all(
+            scheduler,
+            ('chat', None, 'x', PRIORITY_NORMAL),
+            ('chat', None, 'aaaaa', PRIORITY_NORMAL),
+            ('chat', None, 'bbbbb', PRIORITY_NORMAL),
+            ('chat', None, 'ccccc', PRIORITY_NORMAL),
+            ('chat', None, '/afk', PRIORITY_NORMAL),
+            ('chat', None, 'd', PRIORITY_NORMAL),
+        )
+
+        assert [text for _, _, text, _ in send.sent] == [
+            'x', 'aaaaa bbbbb', 'ccccc', '/afk', 'd'
+        ]
+
+    async def test_send_error_reaches_every_caller(self):
+        send = AsyncMock(side_effect=[None, ChannelError('not connected')])
+        scheduler = OutboundScheduler(send, burst=1, sustained=100.0)
+
+        first = asyncio.ensure_future(scheduler.submit('chat', None, 'a'))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(scheduler.submit('chat', None, 'b'))
+        third = asyncio.ensure_future(scheduler.submit('chat', None, 'c'))
+        results = await asyncio.gather(first, second, third, return_exceptions=True)
+
+        assert results[0] is None
+        assert isinstance(results[1], ChannelError)
+        assert results[2] is results[1]
+
+    async def test_queue_full(self, send):
+        scheduler = OutboundScheduler(send, burst=1, sustained=0.001, max_queue=1)
+        await scheduler.submit('chat', None, 'a')
+        pending = asyncio.ensure_future(scheduler.submit('chat', None, 'b'))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ChannelError):
+            await scheduler.submit('chat', None, 'c')
+
+        await scheduler.close()
+        with pytest.raises(ChannelError):
+            await pending
+
+    async def test_noflood_resends_last_line_after_cooldown(self, send):
+        scheduler = OutboundScheduler(send, burst=5, sustained=100.0, cooldown=0.05)
+        await scheduler.submit('chat', None, 'dropped')
+        start = time.monotonic()
+
+        scheduler.on_noflood()
+        await scheduler.submit('chat', None, 'next')
+
+        assert [text for _, _, text, _ in send.sent] == ['dropped', 'dropped next']
+        assert time.monotonic() - start >= 0.04
+        assert scheduler.throttled == 1
+
+    def test_configure_from_channel_options(self, send):
+        scheduler = OutboundScheduler(send)
+
+        scheduler.configure({
+            'chat_antiflood': True,
+            'chat_antiflood_params': {'burst': 10, 'sustained': 3, 'cooldown': 7},
+        })
+        assert (scheduler.bucket.burst, scheduler.bucket.rate, scheduler.cooldown) == (10, 3.0, 7.0)
+
+        scheduler.configure({'chat_antiflood': False, 'chat_antiflood_params': {'burst': 1}})
+        assert scheduler.bucket.burst == 10
+
+    async def test_stats(self, send):
+        scheduler = OutboundScheduler(send, burst=1, sustained=100.0)
+
+        await submit_all(scheduler, *[('pm', str(i), 'x', PRIORITY_AMBIENT) for i in range(3)])
+        stats = scheduler.stats()
+
+        assert stats['depth'] == 0
+        assert stats['lanes'] == {PRIORITY_MODERATION: 0, PRIORITY_NORMAL: 0, PRIORITY_AMBIENT: 0}
+        assert stats['sent'] == 3
+        assert stats['latency_p50'] <= stats['latency_p99'] <= stats['latency_max']
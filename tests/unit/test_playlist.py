@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import random
+
 import pytest
 from lib.playlist import PlaylistItem, Playlist
 from lib.media_link import MediaLink
@@ -97,6 +99,11 @@ class TestPlaylistItemInit:
         item = PlaylistItem(sample_item_data)
         assert item.duration == 0
 
+    def test_no_instance_dict(self, sample_item):
+        """PlaylistItem and its MediaLink use __slots__"""
+        assert not hasattr(sample_item, '__dict__')
+        assert not hasattr(sample_item.link, '__dict__')
+
     def test_init_long_title(self, sample_item_data):
         """Create PlaylistItem with long title"""
         sample_item_data['media']['title'] = 'A' * 200
@@ -639,3 +646,105 @@ class TestPlaylistEdgeCases:
         # Can compare with PlaylistItem
         item = playlist.get(2)
         assert playlist.current == item
+
+
+def make_data(uid, seconds=100):
+    return {
+        'uid': uid,
+        'temp': False,
+        'queueby': 'user',
+        'media': {'type': 'yt', 'id': f'v{uid}', 'title': f'V{uid}', 'seconds': seconds}
+    }
+
+
+class TestPlaylistIndexing:
+    """Test the uid index and linked list behind Playlist"""
+
+    def test_duration_tracks_changes(self, playlist_with_items):
+        """duration is the sum of item durations after each change"""
+        playlist = playlist_with_items
+        assert playlist.duration == 60 + 120 + 180
+        playlist.add(1, make_data(10, seconds=30))
+        assert playlist.duration == 390
+        playlist.move(10, 3)
+        assert playlist.duration == 390
+        playlist.remove(2)
+        assert playlist.duration == 270
+        playlist.clear()
+        assert playlist.duration == 0
+
+    def test_add_duplicate_uid_raises_error(self, playlist_with_items):
+        """Adding an existing uid raises ValueError and changes nothing"""
+        playlist = playlist_with_items
+        with pytest.raises(ValueError):
+            playlist.add(None, make_data(2))
+        assert [item.uid for item in playlist.queue] == [1, 2, 3]
+
+    def test_add_returns_item(self):
+        """add() returns the PlaylistItem it inserted"""
+        playlist = Playlist()
+        item = playlist.add(None, make_data(1))
+        assert item is playlist.get(1)
+
+    def test_move_after_missing_keeps_item(self, playlist_with_items):
+        """A failed move leaves the playlist unchanged"""
+        playlist = playlist_with_items
+        with pytest.raises(ValueError):
+            playlist.move(1, 999)
+        with pytest.raises(ValueError):
+            playlist.move(1, 1)
+        assert [item.uid for item in playlist.queue] == [1, 2, 3]
+
+    def test_contains_and_iter(self, playlist_with_items):
+        """Membership by uid or item, iteration in order"""
+        playlist = playlist_with_items
+        assert 2 in playlist
+        assert playlist.get(3) in playlist
+        assert 999 not in playlist
+        assert [item.uid for item in playlist] == [1, 2, 3]
+
+    def test_queue_list_reused_across_appends(self, playlist_with_items):
+        """Appends extend the materialized queue in place"""
+        playlist = playlist_with_items
+        queue = playlist.queue
+        playlist.add(None, make_data(4))
+        playlist.add(4, make_data(5))
+        assert playlist.queue is queue
+        assert [item.uid for item in queue] == [1, 2, 3, 4, 5]
+
+    def test_queue_assignment(self, sample_item):
+        """Assigning queue rebuilds the index"""
+        playlist = Playlist()
+        playlist.queue = [sample_item, PlaylistItem(make_data(7, seconds=20))]
+        assert playlist.get(7).duration == 20
+        assert playlist.index(7) == 1
+        assert playlist.duration == 200
+
+    def test_matches_list_model(self):
+        """Random operation sequence matches a plain list implementation"""
+        rng = random.Random(7)
+        playlist, model = Playlist(), []
+        next_uid = 1
+        for _ in range(2000):
+            roll = rng.random()
+            if roll < 0.4 or len(model) < 2:
+                after = rng.choice(model) if model and rng.random() < 0.5 else None
+                playlist.add(after, make_data(next_uid, seconds=next_uid % 7))
+                model.insert(model.index(after) + 1 if after else len(model), next_uid)
+                next_uid += 1
+            elif roll < 0.6:
+                uid = rng.choice(model)
+                playlist.remove(uid)
+                model.remove(uid)
+            elif roll < 0.9:
+                uid, after = rng.sample(model, 2)
+                playlist.move(uid, after)
+                model.remove(uid)
+                model.insert(model.index(after) + 1, uid)
+            else:
+                uid = rng.choice(model)
+                assert playlist.index(uid) == model.index(uid)
+            if rng.random() < 0.1:
+                assert [item.uid for item in playlist.queue] == model
+        assert [item.uid for item in playlist.queue] == model
+        assert playlist.duration == sum(uid % 7 for uid in model)
@@ -180,6 +180,29 @@ class TestSchemaValidation:
         assert valid is False
         assert "boolean" in error.lower()
 
+    async def test_validate_schema_search_flag(self, registry):
+        """Test 'search' must be boolean and only on string/text fields."""
+        valid, error = registry.validate_schema({
+            "fields": [{"name": "title", "type": "string", "search": "yes"}]
+        })
+        assert valid is False
+        assert "boolean" in error.lower()
+
+        valid, error = registry.validate_schema({
+            "fields": [{"name": "count", "type": "integer", "search": True}]
+        })
+        assert valid is False
+        assert "full-text" in error
+
+        valid, _ = registry.validate_schema({
+            "fields": [
+                {"name": "title", "type": "string", "search": True},
+                {"name": "body", "type": "text", "search": True},
+                {"name": "count", "type": "integer", "search": False}
+            ]
+        })
+        assert valid is True
+
     async def test_validate_schema_not_dict(self, registry):
         """Test schema that is not a dict."""
         valid, error = registry.validate_schema("not a dict")
@@ -0,0 +1,222 @@
+"""
+Unit tests for lib/socket_io.py frame decoding and response matching.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from lib import socket_io
+from lib.error import SocketIOError
+from lib.socket_io import SocketIO, SocketIOResponse, decode_event
+
+
+class FakeWebSocket:
+    """In-memory websocket feeding queued frames to SocketIO."""
+
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.sent = []
+        self.closed = False
+
+    async def recv(self):
+        return await self.incoming.get()
+
+    async def send(self, data):
+        self.sent.append(data)
+
+    async def close(self):
+        self.closed = True
+
+    def feed(self, frame):
+        self.incoming.put_nowait(frame)
+
+
+@pytest.fixture
+async def io():
+    websocket = FakeWebSocket()
+    sio = SocketIO(websocket, {'pingInterval': 60000}, 0, asyncio.get_running_loop())
+    yield sio
+    await sio.close()
+
+
+def frame(event, *args):
+    return '42' + json.dumps([event, *args])
+
+
+class TestDecodeEvent:
+    """Test decode_event()."""
+
+    def test_event_with_data(self):
+        assert decode_event(frame('chatMsg', {'msg': 'hi'})) == ('chatMsg', {'msg': 'hi'})
+
+    def test_event_without_data(self):
+        assert decode_event(frame('needPassword')) == ('needPassword', None)
+
+    def test_event_with_multiple_args(self):
+        assert decode_event(frame('ev', 1, 2)) == ('ev', [1, 2])
+
+    def test_connect_and_disconnect_packets(self):
+        assert decode_event('40') == ('', None)
+        assert decode_event('41/ns') == ('/ns', None)
+
+    @pytest.mark.parametrize('data', ['4', '42{}', '42[]', '42[', '42"x"'])
+    def test_malformed(self, data):
+        with pytest.raises(ValueError):
+            decode_event(data)
+
+    def test_custom_loads(self):
+        calls = []
+
+        def loads(payload):
+            calls.append(payload)
+            return json.loads(payload)
+
+        decode_event(frame('ev', 1), loads=loads)
+        assert calls == ['["ev", 1]']
+
+    def test_backend_name(self):
+        assert socket_io.JSON_BACKEND in ('json', 'orjson')
+
+
+class TestResponseEvents:
+    """Test expected-event metadata on match functions."""
+
+    def test_match_event_literal(self):
+        assert SocketIOResponse.match_event(r'^login$').events == {'login'}
+
+    def test_match_event_alternation(self):
+        match = SocketIOResponse.match_event(r'^(needPassword|)$')
+        assert match.events == {'needPassword', ''}
+
+    def test_match_event_pattern_not_indexed(self):
+        assert not hasattr(SocketIOResponse.match_event(r'^chat.*$'), 'events')
+
+    async def test_expects_decorator(self):
+        @SocketIOResponse.expects('queue', 'queueFail')
+        def match(event, data):
+            return True
+
+        assert SocketIOResponse(match).events == {'queue', 'queueFail'}
+
+
+class TestSocketIORecv:
+    """Test the receive loop."""
+
+    async def test_events_are_queued(self, io):
+        io.websocket.feed(frame('chatMsg', {'msg': 'hi'}))
+
+        assert await asyncio.wait_for(io.recv(), 1) == ('chatMsg', {'msg': 'hi'})
+
+    async def test_ping_is_answered(self, io):
+        io.websocket.feed('2probe')
+        io.websocket.feed(frame('done'))
+        await asyncio.wait_for(io.recv(), 1)
+
+        assert '3probe' in io.websocket.sent
+
+    async def test_invalid_frame_is_skipped(self, io):
+        io.websocket.feed('42not json')
+        io.websocket.feed(frame('ok'))
+
+        assert await asyncio.wait_for(io.recv(), 1) == ('ok', None)
+        assert io.error is None
+
+    async def test_indexed_response(self, io):
+        calls = []
+
+        @SocketIOResponse.expects('queue')
+        def match(event, data):
+            calls.append(event)
+            return data['id'] == 2
+
+        task = asyncio.create_task(io.emit('queue', {'id': 2}, match, 1))
+        await asyncio.sleep(0)
+        assert set(io.response_index) == {'queue'}
+
+        io.websocket.feed(frame('chatMsg', {}))
+        io.websocket.feed(frame('queue', {'id': 1}))
+        io.websocket.feed(frame('queue', {'id': 2}))
+
+        assert await task == ('queue', {'id': 2})
+        assert calls == ['queue', 'queue']  # chatMsg never reached the matcher
+        assert io.response_index == {}
+
+    async def test_unindexed_response(self, io):
+        task = asyncio.create_task(
+            io.emit('x', {}, lambda ev, data: ev.startswith('re'), 1)
+        )
+        await asyncio.sleep(0)
+        assert len(io.response) == 1
+
+        io.websocket.feed(frame('reply', 1))
+
+        assert await task == ('reply', 1)
+        assert io.response == {}
+
+    async def test_response_timeout_cleans_index(self, io):
+        res = await io.emit('login', {}, SocketIOResponse.match_event(r'^login$'), 0.05)
+
+        assert res is None
+        assert io.response_index == {}
+        assert not hasattr(io, 'response_lock')
+
+        # A late response for the timed-out waiter is ignored
+        io.websocket.feed(frame('login', {}))
+        assert await asyncio.wait_for(io.recv(), 1) == ('login', {})
+        assert io.error is None
+
+    async def test_concurrent_responses_resolve_out_of_order(self, io):
+        def make_match(media_id):
+            @SocketIOResponse.expects('queue')
+            def match(event, data):
+                return data['id'] == media_id
+            return match
+
+        tasks = [asyncio.create_task(io.emit('queue', {'id': i}, make_match(i), 1))
+                 for i in range(5)]
+        await asyncio.sleep(0)
+        assert len(io.response_index['queue']) == 5
+
+        for i in reversed(range(5)):
+            io.websocket.feed(frame('queue', {'id': i}))
+
+        assert await asyncio.gather(*tasks) == [('queue', {'id': i}) for i in range(5)]
+        assert io.response_index == {}
+
+    async def test_resolved_response_is_removed_and_timer_cancelled(self, io):
+        task = asyncio.create_task(
+            io.emit('login', {}, SocketIOResponse.match_event(r'^login$'), 10)
+        )
+        await asyncio.sleep(0)
+        (response,) = io.response_index['login'].values()
+        assert response.timer is not None
+
+        io.websocket.feed(frame('login', {'success': True}))
+
+        assert await task == ('login', {'success': True})
+        assert response.timer is None
+        assert io.response_index == {}
+
+    async def test_cancelled_emit_removes_response(self, io):
+        task = asyncio.create_task(
+            io.emit('login', {}, SocketIOResponse.match_event(r'^login$'), 10)
+        )
+        await asyncio.sleep(0)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert io.response_index == {}
+
+    async def test_close_cancels_pending_responses(self, io):
+        task = asyncio.create_task(
+            io.emit('login', {}, SocketIOResponse.match_event(r'^login$'))
+        )
+        await asyncio.sleep(0)
+
+        await io.close()
+
+        with pytest.raises(SocketIOError):
+            await task
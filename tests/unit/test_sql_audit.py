@@ -5,6 +5,7 @@ Tests the SQLAuditLogger class including query logging, slow query
 detection, and metrics collection.
 """
 
+import asyncio
 import logging
 from unittest.mock import MagicMock
 
@@ -438,3 +439,122 @@ class TestSQLAuditLogger:
 
         assert metrics.total_queries == 2
         assert metrics.total_slow_queries == 1
+
+
+class TestAuditSampling:
+    """Tests for sampling of successful queries."""
+
+    @pytest.fixture
+    def logger(self):
+        """Create logger that samples out every successful query."""
+        return SQLAuditLogger(
+            logger=MagicMock(spec=logging.Logger),
+            slow_logger=MagicMock(spec=logging.Logger),
+            slow_query_threshold_ms=500.0,
+            sample_rate=0.0,
+        )
+
+    def test_fast_success_sampled_out(self, logger):
+        """Test fast successful queries are skipped but still counted."""
+        entry = logger.log_query("p", "SELECT 1", [], 1, 10.0)
+
+        assert entry is None
+        logger.logger.log.assert_not_called()
+        assert logger.get_metrics("p").total_queries == 1
+        assert logger.get_pipeline_stats()["sampled_out"] == 1
+
+    def test_slow_query_always_logged(self, logger):
+        """Test slow queries bypass sampling."""
+        entry = logger.log_query("p", "SELECT 1", [], 1, 600.0)
+
+        assert entry is not None
+        logger.logger.log.assert_called_once()
+        logger.slow_logger.log.assert_called_once()
+
+    def test_error_always_logged(self, logger):
+        """Test errors bypass sampling."""
+        entry = logger.log_error("p", "SELECT 1", [], ValueError("x"), 1.0)
+
+        assert entry is not None
+        logger.logger.error.assert_called_once()
+
+    def test_sample_rate_clamped(self):
+        """Test sample rate is clamped to [0, 1]."""
+        assert SQLAuditLogger(sample_rate=5.0).sample_rate == 1.0
+        assert SQLAuditLogger(sample_rate=-1.0).sample_rate == 0.0
+
+
+class TestAuditQueue:
+    """Tests for queued (background) emission."""
+
+    def _make_logger(self, queue_size=100):
+        return SQLAuditLogger(
+            logger=MagicMock(spec=logging.Logger),
+            slow_logger=MagicMock(spec=logging.Logger),
+            queue_size=queue_size,
+        )
+
+    @pytest.mark.asyncio
+    async def test_inline_before_start(self):
+        """Test entries are emitted inline until start() is called."""
+        logger = self._make_logger()
+
+        entry = logger.log_query("p", "SELECT 1", [], 1, 10.0)
+
+        assert entry is not None
+        logger.logger.log.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_queued_entries_emitted_by_drain_task(self):
+        """Test queued entries are deferred and emitted in the background."""
+        logger = self._make_logger()
+        await logger.start()
+
+        assert logger.log_query("p", "SELECT 1", [], 1, 10.0) is None
+        assert logger.log_error("p", "SELECT 1", [], ValueError("x"), 1.0) is None
+        logger.logger.log.assert_not_called()
+
+        await asyncio.sleep(0.01)
+
+        logger.logger.log.assert_called_once()
+        logger.logger.error.assert_called_once()
+        assert logger.get_pipeline_stats()["emitted"] == 2
+        await logger.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_queue(self):
+        """Test stop() emits entries still waiting in the queue."""
+        logger = self._make_logger()
+        await logger.start()
+
+        for i in range(10):
+            logger.log_query("p", f"SELECT {i}", [], 1, 10.0)
+        await logger.stop()
+
+        assert logger.logger.log.call_count == 10
+        assert logger.get_pipeline_stats()["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_and_counts(self):
+        """Test records are dropped, not blocked on, when the queue is full."""
+        logger = self._make_logger(queue_size=2)
+        await logger.start()
+
+        for _ in range(5):
+            logger.log_query("p", "SELECT 1", [], 1, 10.0)
+
+        assert logger.get_pipeline_stats()["dropped"] == 3
+        assert logger.get_metrics("p").total_queries == 5
+        await logger.stop()
+
+    @pytest.mark.asyncio
+    async def test_timestamp_captured_at_log_time(self):
+        """Test deferred entries keep the time the query was logged."""
+        logger = self._make_logger()
+        await logger.start()
+
+        logger.log_query("p", "SELECT 1", [], 1, 10.0)
+        await logger.stop()
+
+        audit = logger.logger.log.call_args.kwargs["extra"]["audit"]
+        assert audit["timestamp"].endswith("+00:00")
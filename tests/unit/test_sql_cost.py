@@ -0,0 +1,231 @@
+"""
+Unit tests for the EXPLAIN-based query cost guard.
+
+Tests plan parsing for SQLite and PostgreSQL, policy evaluation against a
+real SQLite database, plan caching, and interruption of timed-out SQLite
+statements by PreparedStatementExecutor.
+"""
+
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from lib.storage.sql_cost import (
+    CostPolicy,
+    QueryCostError,
+    QueryCostGuard,
+    parse_postgresql_plan,
+    parse_sqlite_plan,
+)
+from lib.storage.sql_errors import TimeoutError
+from lib.storage.sql_executor import PreparedStatementExecutor
+
+
+class SQLiteDatabase:
+    """Minimal database exposing _get_session like BotDatabase."""
+
+    is_postgresql = False
+
+    def __init__(self, path: str) -> None:
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def _get_session(self):
+        session = self.session_factory()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+@pytest.fixture
+async def database(tmp_path):
+    """SQLite database with a 3000-row table and a 10-row table."""
+    db = SQLiteDatabase(str(tmp_path / "cost.db"))
+    async with db.engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE p__big (id INTEGER PRIMARY KEY, a TEXT)"))
+        await conn.execute(text("CREATE TABLE p__small (id INTEGER PRIMARY KEY, b TEXT)"))
+        await conn.execute(text(
+            "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 3000) "
+            "INSERT INTO p__big (a) SELECT x FROM n"
+        ))
+        await conn.execute(text(
+            "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 10) "
+            "INSERT INTO p__small (b) SELECT x FROM n"
+        ))
+    yield db
+    await db.engine.dispose()
+
+
+class TestParseSQLitePlan:
+    """Tests for parse_sqlite_plan."""
+
+    def test_scan_is_full_scan(self):
+        """Test SCAN lines are reported as full scans."""
+        plan = parse_sqlite_plan(["SCAN p__t"])
+        assert plan.full_scans == ["p__t"]
+
+    def test_legacy_scan_table_format(self):
+        """Test pre-3.36 'SCAN TABLE' detail format."""
+        plan = parse_sqlite_plan(["SCAN TABLE p__t"])
+        assert plan.full_scans == ["p__t"]
+
+    def test_search_is_not_full_scan(self):
+        """Test index lookups are not full scans."""
+        plan = parse_sqlite_plan(["SEARCH p__t USING INTEGER PRIMARY KEY (rowid=?)"])
+        assert plan.full_scans == []
+
+    def test_aliases_resolved(self):
+        """Test aliases in plan lines map back to table names."""
+        plan = parse_sqlite_plan(
+            ["SCAN a", "SCAN b"],
+            "SELECT * FROM p__x a, p__y AS b WHERE a.id = b.id",
+        )
+        assert plan.full_scans == ["p__x", "p__y"]
+
+    def test_temp_btree_and_constant_row(self):
+        """Test temp B-tree detection and pseudo-table filtering."""
+        plan = parse_sqlite_plan(["SCAN CONSTANT ROW", "USE TEMP B-TREE FOR ORDER BY"])
+        assert plan.full_scans == []
+        assert plan.uses_temp_btree is True
+
+
+class TestParsePostgreSQLPlan:
+    """Tests for parse_postgresql_plan."""
+
+    def test_seq_scans_collected(self):
+        """Test Seq Scan nodes anywhere in the tree are full scans."""
+        output = [{
+            "Plan": {
+                "Node Type": "Nested Loop",
+                "Plans": [
+                    {"Node Type": "Seq Scan", "Relation Name": "p__x"},
+                    {"Node Type": "Index Scan", "Relation Name": "p__y"},
+                ],
+            }
+        }]
+        plan = parse_postgresql_plan(output)
+        assert plan.full_scans == ["p__x"]
+
+    def test_json_text_accepted(self):
+        """Test EXPLAIN output given as JSON text."""
+        plan = parse_postgresql_plan('[{"Plan": {"Node Type": "Seq Scan", "Relation Name": "t"}}]')
+        assert plan.full_scans == ["t"]
+
+
+class TestCostPolicy:
+    """Tests for CostPolicy and guard configuration."""
+
+    def test_from_config(self):
+        """Test building a guard from config dicts."""
+        guard = QueryCostGuard.from_config({
+            "default": {"max_full_scan_rows": 10},
+            "plugins": {"analytics": {"max_full_scan_rows": None}},
+        })
+        assert guard.get_policy("other").max_full_scan_rows == 10
+        assert guard.get_policy("analytics").max_full_scan_rows is None
+
+    def test_no_policy_means_unchecked(self):
+        """Test plugins without a policy are not checked."""
+        assert QueryCostGuard().get_policy("p") is None
+
+
+class TestQueryCostGuard:
+    """Tests for QueryCostGuard against a real SQLite database."""
+
+    async def test_rejects_large_full_scan(self, database):
+        """Test full scans above the row limit are rejected."""
+        guard = QueryCostGuard(default_policy=CostPolicy(max_full_scan_rows=1000))
+
+        async with database._get_session() as session:
+            with pytest.raises(QueryCostError) as exc_info:
+                await guard.check(session, "p", "SELECT * FROM p__big WHERE a = 'x'")
+
+        assert exc_info.value.code == "QUERY_TOO_EXPENSIVE"
+        assert exc_info.value.details["table"] == "p__big"
+        assert guard.rejections == 1
+
+    async def test_allows_indexed_lookup_and_small_scan(self, database):
+        """Test index lookups and small table scans pass."""
+        guard = QueryCostGuard(default_policy=CostPolicy(max_full_scan_rows=1000))
+
+        async with database._get_session() as session:
+            await guard.check(session, "p", "SELECT * FROM p__big WHERE id = 5")
+            await guard.check(session, "p", "SELECT * FROM p__small")
+
+        assert guard.rejections == 0
+
+    async def test_rejects_unindexed_cross_join(self, database):
+        """Test cross joins are rejected on the scan product."""
+        guard = QueryCostGuard(
+            default_policy=CostPolicy(max_full_scan_rows=None, max_scan_product=10000)
+        )
+
+        async with database._get_session() as session:
+            with pytest.raises(QueryCostError) as exc_info:
+                await guard.check(session, "p", "SELECT * FROM p__big a, p__small b")
+
+        assert exc_info.value.details["rows"] == 30000
+
+    async def test_plans_cached_by_fingerprint(self, database):
+        """Test queries differing only in literals reuse the cached plan."""
+        guard = QueryCostGuard(default_policy=CostPolicy())
+
+        async with database._get_session() as session:
+            await guard.check(session, "p", "SELECT * FROM p__big WHERE id = 1")
+            await guard.check(session, "p", "SELECT * FROM p__big WHERE id = 2")
+
+        assert guard.get_metrics()["plan_cache_hits"] == 1
+        assert guard.get_metrics()["plan_cache_size"] == 1
+
+    async def test_per_plugin_override(self, database):
+        """Test a plugin policy overrides the default."""
+        guard = QueryCostGuard(
+            default_policy=CostPolicy(max_full_scan_rows=1000),
+            plugin_policies={"analytics": CostPolicy(max_full_scan_rows=None)},
+        )
+
+        async with database._get_session() as session:
+            await guard.check(session, "analytics", "SELECT * FROM p__big")
+
+    async def test_executor_surfaces_cost_error(self, database):
+        """Test the executor raises QueryCostError without running the query."""
+        executor = PreparedStatementExecutor(
+            database,
+            cost_guard=QueryCostGuard(default_policy=CostPolicy(max_full_scan_rows=1000)),
+        )
+
+        with pytest.raises(QueryCostError):
+            await executor.execute(plugin="p", query="SELECT * FROM p__big")
+
+
+class TestTimeoutInterrupt:
+    """Tests for interrupting timed-out SQLite statements."""
+
+    async def test_runaway_query_interrupted(self, database):
+        """Test a runaway query stops at the timeout instead of running on."""
+        executor = PreparedStatementExecutor(database)
+
+        start = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            await executor.execute(
+                plugin="p",
+                query="SELECT COUNT(*) FROM p__big a, p__big b, p__big c",
+                timeout_ms=200,
+            )
+        elapsed = time.perf_counter() - start
+
+        assert executor.interrupted_count == 1
+        assert elapsed < 2.0
+
+        # Connection is usable again right away
+        result = await executor.execute(plugin="p", query="SELECT COUNT(*) AS n FROM p__small")
+        assert result["rows"] == [{"n": 10}]
@@ -380,10 +380,10 @@ class TestHandlerLifecycle:
         
         await handler.start()
         
-        nats_client.subscribe.assert_called_once()
-        call_args = nats_client.subscribe.call_args
-        assert call_args[0][0] == "rosey.db.sql.*.execute"
+        subjects = [c[0][0] for c in nats_client.subscribe.call_args_list]
+        assert subjects == ["rosey.db.sql.*.execute", "rosey.db.sql.admin.stats"]
         assert handler.subscription is mock_subscription
+        assert handler.stats_subscription is mock_subscription
 
     @pytest.mark.asyncio
     async def test_stop_unsubscribes_from_nats(self) -> None:
@@ -400,8 +400,9 @@ class TestHandlerLifecycle:
         await handler.start()
         await handler.stop()
         
-        mock_subscription.unsubscribe.assert_called_once()
+        assert mock_subscription.unsubscribe.call_count == 2
         assert handler.subscription is None
+        assert handler.stats_subscription is None
 
     @pytest.mark.asyncio
     async def test_stop_without_start_is_safe(self) -> None:
@@ -548,6 +549,81 @@ class TestHandleExecute:
         
         assert handler.error_count == initial_error_count + 1
 
+    @pytest.mark.asyncio
+    async def test_handle_execute_audits_success(self, handler: SQLExecutionHandler) -> None:
+        """Test successful queries are handed to the audit logger."""
+        msg = self._make_msg(
+            "rosey.db.sql.test.execute",
+            {"query": "SELECT 1", "params": []},
+        )
+        handler.audit_logger = MagicMock()
+
+        with patch.object(handler, "_execute_query", new_callable=AsyncMock) as mock_exec:
+            mock_exec.return_value = {"rows": [], "row_count": 0}
+            await handler.handle_execute(msg)
+
+        handler.audit_logger.log_query.assert_called_once()
+        assert handler.audit_logger.log_query.call_args.kwargs["plugin"] == "test"
+
+    @pytest.mark.asyncio
+    async def test_handle_execute_audits_error(self, handler: SQLExecutionHandler) -> None:
+        """Test failed requests are audited as errors."""
+        msg = self._make_msg("rosey.db.sql.test.execute", {"params": "bad"})
+        handler.audit_logger = MagicMock()
+
+        await handler.handle_execute(msg)
+
+        handler.audit_logger.log_error.assert_called_once()
+        kwargs = handler.audit_logger.log_error.call_args.kwargs
+        assert kwargs["query"] == ""
+        assert kwargs["params"] == []
+
+    @pytest.mark.asyncio
+    async def test_handle_stats_returns_query_shapes(self, handler: SQLExecutionHandler) -> None:
+        """Test the admin stats subject reports per-shape statistics."""
+        handler.audit_logger.log_query("test", "SELECT * FROM test__t WHERE id = $1", [1], 1, 3.0)
+        msg = self._make_msg(handler.STATS_SUBJECT, {"limit": 5})
+
+        await handler.handle_stats(msg)
+
+        response = json.loads(msg.respond.call_args[0][0])
+        assert response["summary"]["fingerprints"] == 1
+        assert response["shapes"][0]["fingerprint"] == "select * from test__t where id = ?"
+        assert "p99_ms" in response["shapes"][0]
+
+    @pytest.mark.asyncio
+    async def test_handle_stats_prometheus(self, handler: SQLExecutionHandler) -> None:
+        """Test the admin stats subject can return Prometheus text."""
+        handler.audit_logger.log_query("test", "SELECT 1", [], 1, 3.0)
+        msg = self._make_msg(handler.STATS_SUBJECT, {"format": "prometheus"})
+
+        await handler.handle_stats(msg)
+
+        assert b"rosey_sql_query_duration_ms" in msg.respond.call_args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_handle_stats_invalid_sort(self, handler: SQLExecutionHandler) -> None:
+        """Test invalid stats requests get an error response."""
+        msg = self._make_msg(handler.STATS_SUBJECT, {"sort_by": "nope"})
+
+        await handler.handle_stats(msg)
+
+        response = json.loads(msg.respond.call_args[0][0])
+        assert "error" in response
+
+    @pytest.mark.asyncio
+    async def test_start_stop_manages_audit_pipeline(self) -> None:
+        """Test start() queues audit entries and stop() flushes them."""
+        nats_client = MagicMock()
+        nats_client.subscribe = AsyncMock(return_value=MagicMock(unsubscribe=AsyncMock()))
+        handler = SQLExecutionHandler(nats_client=nats_client, database=MagicMock())
+
+        await handler.start()
+        assert handler.audit_logger._drain_task is not None
+
+        await handler.stop()
+        assert handler.audit_logger._drain_task is None
+
 
 # =============================================================================
 # Test Metrics
@@ -0,0 +1,158 @@
+"""
+Unit tests for per-query-shape SQL statistics.
+
+Tests query fingerprinting, the log-linear latency histogram and the
+bounded QueryStatsCollector.
+"""
+
+import pytest
+
+from lib.storage.sql_stats import (
+    LatencyHistogram,
+    QueryStatsCollector,
+    fingerprint_query,
+)
+
+
+class TestFingerprintQuery:
+    """Tests for fingerprint_query."""
+
+    def test_placeholders_collapsed(self):
+        """Test $N, ? and :name placeholders normalize to ?."""
+        assert fingerprint_query("SELECT * FROM t WHERE a = $1") == (
+            "select * from t where a = ?"
+        )
+        assert fingerprint_query("SELECT * FROM t WHERE a = ?") == (
+            "select * from t where a = ?"
+        )
+        assert fingerprint_query("SELECT * FROM t WHERE a = :a") == (
+            "select * from t where a = ?"
+        )
+
+    def test_literals_collapsed(self):
+        """Test string and numeric literals normalize to ?."""
+        fp = fingerprint_query("SELECT * FROM t WHERE name = 'it''s' AND n > 42.5")
+        assert fp == "select * from t where name = ? and n > ?"
+
+    def test_identifiers_with_digits_preserved(self):
+        """Test digits inside identifiers are not treated as literals."""
+        assert "table2" in fingerprint_query("SELECT * FROM table2 WHERE id = 1")
+
+    def test_in_list_collapsed(self):
+        """Test IN lists of any length share a fingerprint."""
+        short = fingerprint_query("SELECT * FROM t WHERE id IN ($1, $2)")
+        long = fingerprint_query("SELECT * FROM t WHERE id IN ($1, $2, $3, $4)")
+        assert short == long == "select * from t where id in (?)"
+
+    def test_multi_row_values_collapsed(self):
+        """Test multi-row VALUES lists share a fingerprint."""
+        one = fingerprint_query("INSERT INTO t (a, b) VALUES ($1, $2)")
+        many = fingerprint_query("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)")
+        assert one == many
+
+    def test_whitespace_case_and_comments(self):
+        """Test formatting differences do not change the fingerprint."""
+        a = fingerprint_query("SELECT id\n  FROM t -- comment\n WHERE x = 1")
+        b = fingerprint_query("select id from t /* c */ where x = 2")
+        assert a == b
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_empty(self):
+        """Test empty histogram reports zero."""
+        assert LatencyHistogram().percentile(99) == 0.0
+
+    def test_single_value_exact(self):
+        """Test single value percentiles clamp to the recorded value."""
+        hist = LatencyHistogram()
+        hist.record(12.345)
+        assert hist.percentile(50) == 12.345
+        assert hist.percentile(99) == 12.345
+
+    def test_percentiles_within_relative_error(self):
+        """Test percentiles are within the histogram's relative error."""
+        hist = LatencyHistogram()
+        for i in range(1, 1001):
+            hist.record(float(i))
+
+        for pct, expected in ((50, 500.0), (95, 950.0), (99, 990.0)):
+            assert hist.percentile(pct) == pytest.approx(expected, rel=0.07)
+
+    def test_bucket_count_bounded(self):
+        """Test wide value ranges use a bounded number of buckets."""
+        hist = LatencyHistogram()
+        for i in range(100000):
+            hist.record(i * 0.3)
+        assert hist.bucket_count < 400
+
+
+class TestQueryStatsCollector:
+    """Tests for QueryStatsCollector."""
+
+    def test_record_groups_by_shape(self):
+        """Test queries differing only in literals share stats."""
+        stats = QueryStatsCollector()
+        stats.record("p", "SELECT * FROM p__t WHERE id = 1", 2.0, row_count=1)
+        stats.record("p", "SELECT * FROM p__t WHERE id = 2", 4.0, row_count=1)
+
+        top = stats.top()
+        assert len(top) == 1
+        assert top[0]["count"] == 2
+        assert top[0]["rows_total"] == 2
+        assert top[0]["total_time_ms"] == 6.0
+
+    def test_error_rate(self):
+        """Test errors are counted per shape."""
+        stats = QueryStatsCollector()
+        stats.record("p", "SELECT 1", 1.0)
+        stats.record("p", "SELECT 1", 1.0, is_error=True)
+
+        assert stats.top()[0]["error_rate"] == 0.5
+
+    def test_top_sorted_and_filtered(self):
+        """Test top() ordering and plugin filter."""
+        stats = QueryStatsCollector()
+        stats.record("a", "SELECT * FROM a__x", 1.0)
+        stats.record("b", "SELECT * FROM b__y", 50.0)
+
+        assert stats.top()[0]["plugin"] == "b"
+        assert [s["plugin"] for s in stats.top(plugin="a")] == ["a"]
+
+    def test_top_invalid_sort_key(self):
+        """Test unknown sort keys are rejected."""
+        with pytest.raises(ValueError):
+            QueryStatsCollector().top(sort_by="fingerprint")
+
+    def test_eviction_keeps_expensive_shapes(self):
+        """Test eviction drops the shapes with least total time."""
+        stats = QueryStatsCollector(max_fingerprints=10, evict_fraction=0.2)
+        stats.record("p", "SELECT * FROM p__hot", 1000.0)
+        for i in range(20):
+            stats.record("p", f"SELECT * FROM p__cold{i}x", 0.1)
+
+        summary = stats.get_summary()
+        assert summary["fingerprints"] <= 10
+        assert summary["evicted"] > 0
+        assert stats.get("SELECT * FROM p__hot") is not None
+
+    def test_to_prometheus(self):
+        """Test Prometheus export contains quantiles and counters."""
+        stats = QueryStatsCollector()
+        stats.record("quote-db", "SELECT * FROM quote_db__quotes", 5.0, row_count=3)
+
+        text = stats.to_prometheus()
+
+        assert "# TYPE rosey_sql_query_duration_ms summary" in text
+        assert 'plugin="quote-db"' in text
+        assert 'quantile="0.99"' in text
+        assert "rosey_sql_query_rows_total" in text
+        assert text.endswith("\n")
+
+    def test_reset(self):
+        """Test reset clears all shapes."""
+        stats = QueryStatsCollector()
+        stats.record("p", "SELECT 1", 1.0)
+        stats.reset()
+        assert stats.get_summary()["fingerprints"] == 0
@@ -3,6 +3,8 @@ Unit tests for lib/user.py
 
 Tests the User and UserList classes.
 """
+from unittest.mock import patch
+
 import pytest
 from lib.user import User, UserList
 
@@ -150,6 +152,81 @@ class TestUserProperties:
         assert user.ip is None
         assert user.uncloaked_ip is None
 
+    def test_uncloaked_ip_is_lazy_and_cached(self):
+        """uncloak_ip runs on first read of uncloaked_ip, once."""
+        user = User()
+        with patch('lib.user.uncloak_ip', return_value=['127.0.0.1']) as uncloak:
+            user.ip = 'yFA.j8g.iXh.gvS'
+            assert uncloak.call_count == 0
+            assert user.uncloaked_ip == ['127.0.0.1']
+            assert user.uncloaked_ip == ['127.0.0.1']
+            assert uncloak.call_count == 1
+
+            user.ip = '127.0.ou9.RBl'
+            assert user.uncloaked_ip == ['127.0.0.1']
+            assert uncloak.call_count == 2
+
+    def test_uncloaked_ip_assignment(self):
+        """uncloaked_ip can be set explicitly."""
+        user = User(meta={'ip': '1.2.3.x'})
+        user.uncloaked_ip = ['1.2.3.4']
+        assert user.uncloaked_ip == ['1.2.3.4']
+
+    def test_no_instance_dict(self):
+        """User uses __slots__."""
+        user = User()
+        assert not hasattr(user, '__dict__')
+        with pytest.raises(AttributeError):
+            user.unknown_attribute = 1
+
+
+class TestUserFromData:
+    """Test User.from_data()."""
+
+    def test_cytube_format(self):
+        """CyTube userlist entry."""
+        user = User.from_data({
+            'name': 'alice', 'rank': 2,
+            'profile': {'image': 'a.png', 'text': 'hi'},
+            'meta': {'afk': True, 'muted': True, 'ip': '1.2.x.x', 'aliases': ['al']},
+        })
+        assert user.name == 'alice'
+        assert user.rank == 2
+        assert user.image == 'a.png'
+        assert user.text == 'hi'
+        assert user.afk is False  # top-level 'afk' wins, as in Bot._add_user
+        assert user.muted is True
+        assert user.smuted is False
+        assert user.ip == '1.2.x.x'
+        assert user.aliases == ['al']
+        assert user.password is None
+
+    def test_normalized_format(self):
+        """Normalized user_data from CyTubeConnection."""
+        user = User.from_data({
+            'username': 'bob', 'rank': 1, 'is_afk': True, 'is_moderator': False,
+            'meta': {},
+        })
+        assert user.name == 'bob'
+        assert user.afk is True
+        assert user.ip is None
+        assert user.uncloaked_ip is None
+
+    def test_matches_constructor(self):
+        """Same state as User(name, rank, meta) for the same data."""
+        meta = {'afk': False, 'muted': True, 'smuted': True, 'ip': None, 'aliases': ['x']}
+        built = User(name='carol', rank=3, meta=meta)
+        loaded = User.from_data({'name': 'carol', 'rank': 3, 'meta': meta})
+        for attr in User.__slots__:
+            assert getattr(built, attr) == getattr(loaded, attr), attr
+
+    def test_missing_fields(self):
+        """Empty data yields an unnamed guest."""
+        user = User.from_data({})
+        assert user.name == ''
+        assert user.rank == 0
+        assert user.meta['aliases'] == []
+
 
 class TestUserUpdate:
     """Test User update method."""
@@ -343,6 +420,62 @@ class TestUserList:
         assert list(userlist.values()) == [user1, user2]
 
 
+class TestUserListReset:
+    """Test UserList.reset()."""
+
+    def test_replaces_users(self):
+        userlist = UserList()
+        userlist.add(User(name='old'))
+        userlist.reset(User(name=name) for name in ['a', 'b'])
+        assert sorted(userlist) == ['a', 'b']
+
+    def test_duplicate_name_last_wins(self):
+        userlist = UserList()
+        userlist.reset([User(name='a', rank=1), User(name='a', rank=2)])
+        assert len(userlist) == 1
+        assert userlist['a'].rank == 2
+
+    def test_keeps_count(self):
+        userlist = UserList()
+        userlist.count = 5
+        userlist.reset([User(name='a')])
+        assert userlist.count == 5
+
+
+class TestUserListSync:
+    """Test UserList.sync()."""
+
+    def test_returns_difference(self):
+        userlist = UserList()
+        userlist.reset(User(name=name) for name in ['a', 'b', 'c'])
+
+        joined, left, kept = userlist.sync(User(name=name) for name in ['b', 'c', 'd'])
+
+        assert joined == ['d']
+        assert left == ['a']
+        assert kept == 2
+        assert sorted(userlist) == ['b', 'c', 'd']
+
+    def test_updates_kept_users(self):
+        userlist = UserList()
+        userlist.add(User(name='a', rank=1))
+
+        userlist.sync([User(name='a', rank=3)])
+
+        assert userlist['a'].rank == 3
+
+    def test_leader_follows_snapshot(self):
+        userlist = UserList()
+        userlist.reset(User(name=name) for name in ['a', 'b'])
+        userlist.leader = 'a'
+
+        userlist.sync([User(name='a'), User(name='c')])
+        assert userlist.leader is userlist['a']
+
+        userlist.sync([User(name='c')])
+        assert userlist.leader is None
+
+
 class TestUserEdgeCases:
     """Test edge cases and boundary conditions."""
 
@@ -3,16 +3,20 @@ Unit tests for lib/util.py
 
 Tests MessageParser, sequence utilities, async HTTP, and IP cloaking functions.
 """
+import random
+
 import pytest
 from unittest.mock import Mock, patch
 from lib.util import (
     MessageParser,
+    backoff_delay,
     to_sequence,
     get,
     ip_hash,
     cloak_ip,
     uncloak_ip
 )
+from tests.fixtures.message_parser_reference import ReferenceMessageParser
 
 
 class TestMessageParser:
@@ -162,6 +166,90 @@ class TestMessageParser:
         assert '`code`' in result
 
 
+class TestMessageParserDifferential:
+    """Test the tokenizer against the original HTMLParser implementation."""
+
+    FRAGMENTS = [
+        'hello', ' ', 'world', 'é', '&amp;', '&lt;', '&amp;lt;', '&#39;', '&#x41;',
+        '&nbsp;', '&quot', '&', ';', '<', '>', '/', '"', "'", '=',
+        '<strong>', '</strong>', '<em>', '</em>', '<code>', '</code>', '<s>', '</s>',
+        '<STRONG>', '</Strong >', '<br>', '<br/>', '<unknown attr>',
+        '<span class="spoiler">', '<span class=spoiler>', '</span>',
+        "<span class='spoiler' class='x'>", '<div\nclass="spoiler">',
+        '<a href="http://x.com/?a=1&amp;b=2" target="_blank">', '<a href=http://x/>',
+        '<a href>', '</a>', '<img src="http://i/e.png" title=":kappa:"/>',
+        '<img class="channel-emote" src="e.gif" />',
+        # Only HTMLParser handles these
+        '<!-- c -->', '<script>', '</script>', '<style>', '<textarea>', '<?pi?>',
+        '<!DOCTYPE x>', '</>', '< b>', '<b\vx>', '<x-y>', '<a href="x"title="y">', '<p a=>',
+    ]
+
+    MARKUPS = [
+        MessageParser.DEFAULT_MARKUP,
+        None,
+        [],
+        [('b', None, '**', '**'), (None, {'class': 'spoiler'}, None, '|'), ('span', {}, '<', None)],
+    ]
+
+    @pytest.mark.parametrize('markup', MARKUPS)
+    def test_random_messages_match_reference(self, markup):
+        """Test random tag soup converts exactly like the original parser."""
+        rng = random.Random(35)
+        parser = MessageParser(markup)
+        reference = ReferenceMessageParser(markup)
+
+        for _ in range(5000):
+            msg = ''.join(rng.choice(self.FRAGMENTS) for _ in range(rng.randint(0, 8)))
+            assert parser.parse(msg) == reference.parse(msg), msg
+            assert parser.tags == reference.tags, msg
+
+    @pytest.mark.parametrize('msg', [
+        'just text &amp; entities',
+        '<strong>bold</strong> <em>it</em> <code>x</code> <s>no</s>',
+        '<span class="spoiler">hidden</span>',
+        '<a href="https://example.com/watch?v=1&amp;t=2" target="_blank" '
+        'rel="noopener noreferrer">https://example.com</a>',
+        '<img class="channel-emote" src="https://i.imgur.com/x.png" title="Kappa">',
+        '<strong>unclosed <em>nested',
+    ])
+    def test_cytube_messages_use_tokenizer(self, msg):
+        """Test messages CyTube produces never need the HTMLParser fallback."""
+        parser = MessageParser()
+
+        assert parser._tokenize(msg) is not None
+        assert parser.parse(msg) == ReferenceMessageParser().parse(msg)
+
+    def test_cache_hit_restores_state(self):
+        """Test a cached result still sets message and tags."""
+        parser = MessageParser()
+        first = parser.parse('<strong>open')
+        parser.parse('other')
+
+        assert parser.parse('<strong>open') == first == '*open*'
+        assert parser.message == '*open*'
+        assert parser.tags == [('strong', '*')]
+
+    def test_cache_is_bounded(self):
+        """Test the least recently used message is evicted."""
+        parser = MessageParser()
+        parser.CACHE_SIZE = 2
+        parser.parse('a')
+        parser.parse('b')
+        parser.parse('a')
+        parser.parse('c')
+
+        assert list(parser._cache) == ['a', 'c']
+
+    def test_markup_change_clears_cache(self):
+        """Test assigning markup recompiles the table and drops cached results."""
+        parser = MessageParser()
+        assert parser.parse('<strong>x</strong>') == '*x*'
+
+        parser.markup = [('strong', None, '**', '**')]
+
+        assert parser.parse('<strong>x</strong>') == '**x**'
+
+
 class TestToSequence:
     """Test to_sequence utility function."""
 
@@ -206,6 +294,30 @@ class TestToSequence:
         assert result == (original,)
 
 
+class TestBackoffDelay:
+    """Test backoff_delay jittered exponential backoff."""
+
+    def test_doubles_per_attempt(self):
+        delays = [backoff_delay(n, 1.0, 60.0, rand=lambda: 1.0) for n in range(1, 6)]
+        assert delays == [1.0, 2.0, 4.0, 8.0, 16.0]
+
+    def test_capped(self):
+        assert backoff_delay(20, 1.0, 60.0, rand=lambda: 1.0) == 60.0
+
+    def test_jitter_between_half_and_full(self):
+        rng = random.Random(1)
+        delays = [backoff_delay(3, 5.0, 60.0, rand=rng.random) for _ in range(1000)]
+        assert 10.0 <= min(delays) < 11.0
+        assert 19.0 < max(delays) <= 20.0
+        assert len(set(delays)) == 1000
+
+    def test_many_attempts_do_not_overflow(self):
+        assert backoff_delay(10000, 1.0, 60.0, rand=lambda: 1.0) == 60.0
+
+    def test_attempt_zero_uses_base(self):
+        assert backoff_delay(0, 5.0, 60.0, rand=lambda: 1.0) == 5.0
+
+
 class TestAsyncGet:
     """Test async HTTP get function."""
 